@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from trade_app.adapters.parquet.hot_tier import build_hot_tier, hot_tier_is_fresh
+from trade_app.adapters.parquet.layout import discover_datasets
+
+"""
+Parquet → ホット層（正規化済み・無圧縮 Arrow IPC）への一括変換
+
+  {ROOT}/{symbol}/{tf}/ohlcv.arrow
+
+読込側（parquet_pull）は元 Parquet より新しいホット層があればメモリマップで読む。
+元 Parquet を更新（追記/再取込）した後は再実行する（古いホット層は自動で無視される）。
+
+使い方（PowerShell 例）:
+
+  uv run python tools/build_hot_tier.py --symbols EURUSD,USDJPY --timeframes m15,h1
+
+  # 最新でも作り直す
+  uv run python tools/build_hot_tier.py --force
+"""
+
+
+def _split(s: str | None) -> set[str] | None:
+    if not s:
+        return None
+    return {x.strip() for x in s.split(",") if x.strip()}
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Build memory-mappable Arrow hot tier from Parquet.")
+    p.add_argument(
+        "--root",
+        type=Path,
+        default=Path(os.environ.get("VBT_PARQUET_ROOT", "./data/parquet")),
+        help="Parquet ルート（既定: VBT_PARQUET_ROOT or ./data/parquet）",
+    )
+    p.add_argument("--symbols", default=None, help="カンマ区切り（省略時は全シンボル）")
+    p.add_argument("--timeframes", default=None, help="カンマ区切り（省略時は全TF）")
+    p.add_argument("--force", action="store_true", help="最新でも作り直す")
+    args = p.parse_args(argv)
+
+    root = args.root.resolve()
+    symbols = _split(args.symbols)
+    tfs = _split(args.timeframes)
+    targets = [
+        (sym, tf)
+        for sym, tf in discover_datasets(root)
+        if (symbols is None or sym in symbols) and (tfs is None or tf in tfs)
+    ]
+    if not targets:
+        print(f"[WARN] No Parquet dataset found under {root}")
+        return 1
+    for sym, tf in targets:
+        if not args.force and hot_tier_is_fresh(root, sym, tf):
+            print(f"[SKIP] Up to date: {sym} {tf}")
+            continue
+        path = build_hot_tier(root, sym, tf)
+        print(f"[OK] {sym} {tf} -> {path} ({path.stat().st_size / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
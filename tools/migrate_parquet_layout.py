@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from trade_app.adapters.parquet.layout import discover_single_files, migrate_file_to_hive
+
+"""
+単一ファイル {ROOT}/{symbol}/{tf}/ohlcv.parquet → hive レイアウトへの移行
+
+  {ROOT}/symbol={symbol}/tf={tf}/year=YYYY/month=MM/part-0.parquet
+
+使い方（PowerShell 例）:
+
+  uv run python tools/migrate_parquet_layout.py --symbols EURUSD,USDJPY --timeframes m15,h1
+
+  # 移行後に元ファイルを削除（読込側は hive を優先するため残しても動作は同じ）
+  uv run python tools/migrate_parquet_layout.py --remove-source
+"""
+
+
+def _split(s: str | None) -> set[str] | None:
+    if not s:
+        return None
+    return {x.strip() for x in s.split(",") if x.strip()}
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Migrate ohlcv.parquet files to hive layout.")
+    p.add_argument(
+        "--root",
+        type=Path,
+        default=Path(os.environ.get("VBT_PARQUET_ROOT", "./data/parquet")),
+        help="Parquet ルート（既定: VBT_PARQUET_ROOT or ./data/parquet）",
+    )
+    p.add_argument("--symbols", default=None, help="カンマ区切り（省略時は全シンボル）")
+    p.add_argument("--timeframes", default=None, help="カンマ区切り（省略時は全TF）")
+    p.add_argument("--remove-source", action="store_true", help="移行後に元ファイルを削除")
+    args = p.parse_args(argv)
+
+    root = args.root.resolve()
+    symbols = _split(args.symbols)
+    tfs = _split(args.timeframes)
+    targets = [
+        (sym, tf)
+        for sym, tf in discover_single_files(root)
+        if (symbols is None or sym in symbols) and (tfs is None or tf in tfs)
+    ]
+    if not targets:
+        print(f"[WARN] No ohlcv.parquet found under {root}")
+        return 1
+    for sym, tf in targets:
+        paths = migrate_file_to_hive(root, sym, tf, remove_source=args.remove_source)
+        print(f"[OK] {sym} {tf} -> {len(paths)} partitions")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -10,6 +10,8 @@ import MetaTrader5 as mt5
 import pandas as pd
 import typer
 
+from trade_app.adapters.parquet.parquet_sink_adapter import ParquetSinkAdapter
+
 """
 MT5 → Parquet 一括エクスポート（UTC, OHLCV）
 
@@ -22,6 +24,9 @@ MT5 → Parquet 一括エクスポート（UTC, OHLCV）
   uv run python tools/mt5_to_parquet_once.py --symbols EURUSD,USDJPY \
     --timeframes h1,h4 --start 2024-01-01 --end 2024-12-31
 
+  # 夜間更新: 保存済みの最終足以降だけ取得して末尾へ追記
+  uv run python tools/mt5_to_parquet_once.py --incremental --end 2025-12-31
+
 必要要件:
 - MetaTrader5 (pip)
 - pandas, pyarrow
@@ -59,12 +64,20 @@ def export(
     start: Annotated[str, typer.Option(help="UTC開始日 YYYY-MM-DD")] = "2024-01-01",
     end: Annotated[str, typer.Option(help="UTC終了日 YYYY-MM-DD")] = "2024-12-31",
     root_dir: Annotated[Path, typer.Option(help="出力ルート")] = Path(VBT_PARQUET_ROOT),
+    row_group_freq: Annotated[
+        str, typer.Option(help="行グループの区切り: year/month/week/day/none")
+    ] = "month",
+    incremental: Annotated[
+        bool, typer.Option(help="保存済みの最終足以降だけ取得して追記する")
+    ] = False,
 ) -> int:
     start_ts = dt.datetime.fromisoformat(start).replace(tzinfo=dt.UTC)
     end_ts = dt.datetime.fromisoformat(end).replace(tzinfo=dt.UTC)
 
     root = Path(root_dir)
     root.mkdir(parents=True, exist_ok=True)
+    sink = ParquetSinkAdapter()
+    rg_freq = None if row_group_freq.strip().lower() in {"", "none"} else row_group_freq
 
     if not mt5.initialize():
         raise RuntimeError("MT5 initialize failed")
@@ -82,14 +95,33 @@ def export(
             for tf_str, tf_enum in tf_pairs:
                 out_dir = root / sym / tf_str
                 out_dir.mkdir(parents=True, exist_ok=True)
-                rates = mt5.copy_rates_range(sym, tf_enum, start_ts, end_ts)
+                last = (
+                    sink.last_timestamp(out_dir, sym, tf_str, filename="ohlcv.parquet")
+                    if incremental
+                    else None
+                )
+                fetch_start = start_ts if last is None else max(start_ts, last.to_pydatetime())
+                if fetch_start > end_ts:
+                    print(f"[SKIP] Up to date: {sym} {tf_str} last={last}")
+                    continue
+                rates = mt5.copy_rates_range(sym, tf_enum, fetch_start, end_ts)
                 df = _norm_df_from_rates(rates)
+                if df is not None and last is not None:
+                    # 境界の足は保存済み側を残す
+                    df = df[df.index > last]
                 if df is None or df.empty:
                     print(f"[WARN] No data: {sym} {tf_str}")
                     continue
-                # シングルファイル形式（推奨レイアウトA）
-                out_path = out_dir / "ohlcv.parquet"
-                df.to_parquet(out_path, engine="pyarrow")
+                if last is not None:
+                    out_path = sink.append(
+                        df, out_dir, sym, tf_str, filename="ohlcv.parquet", row_group_freq=rg_freq
+                    )
+                    print(f"[OK] Appended {out_path} rows={len(df)} after={last}")
+                    continue
+                # シングルファイル形式（推奨レイアウトA）。期間区切りの行グループ＋統計付き
+                out_path = sink.write(
+                    df, out_dir, sym, tf_str, filename="ohlcv.parquet", row_group_freq=rg_freq
+                )
                 print(f"[OK] Wrote {out_path} rows={len(df)}")
     finally:
         # mt5.shutdown() が失敗しても無視
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from trade_app.adapters.native.stops import resolve_stops
+
+"""
+NativeBacktestAdapter の照合用フィクスチャ（vectorbt の評価額）を記録する
+
+vectorbt が入った環境で実行し、tests/src4/fixtures/native_vs_vbt.npz を作り直す。
+テスト（test_native_backtest.py）はこの npz だけを読むので vectorbt 無しで照合できる。
+params → from_signals 引数の変換は vbtpro_bindings.portfolio_from_signals と同じ規則
+（sl/tp の正規化は adapters/native/stops、max_bars_hold は exits | entries.shift(N)）。
+
+使い方:
+
+  uv run --with vectorbt python tools/record_native_fixtures.py
+"""
+
+DEFAULT_OUT = Path("trade_app/tests/src4/fixtures/native_vs_vbt.npz")
+N_BARS = 400
+# シグナル名 -> 立つ確率
+SIGNAL_RATES = {"entries": 0.06, "exits": 0.04, "short_entries": 0.04, "short_exits": 0.04}
+
+# ケース名 -> (params, ショートを使うか)
+CASES: dict[str, tuple[dict, bool]] = {
+    "plain": ({"fees": 0.0005, "slippage": 0.0002}, False),
+    "sl": ({"fees": 0.0005, "sl_pct": 0.01}, False),
+    "sl_tp_rr": ({"fees": 0.0005, "sl_pct": 0.008, "rr": 1.5}, False),
+    "trail": ({"sl_pct": 0.01, "sl_trail": True}, False),
+    "atr": ({"sl_atr_mult": 1.5, "tp_atr_mult": 3.0, "atr_window": 10}, False),
+    "accumulate": ({"size": 1.0, "accumulate": True, "fees": 0.001}, False),
+    "hold": ({"max_bars_hold": 7, "slippage": 0.0005}, False),
+    "short": ({"size": 2.0, "fees": 0.0005, "tp_pct": 0.01}, True),
+    "value": ({"size": 50.0, "size_type": "value", "slippage": 0.001, "sl_pct": 0.01}, True),
+    "accumulate_short": ({"size": 0.5, "accumulate": True, "sl_pct": 0.02, "fees": 0.001}, True),
+}
+
+
+def _market(seed: int = 17) -> tuple[pd.DataFrame, dict[str, np.ndarray]]:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.6, N_BARS))
+    open_ = np.r_[close[0], close[:-1]] + rng.normal(0, 0.3, N_BARS)
+    spread = np.abs(rng.normal(0, 0.5, N_BARS))
+    frame = pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - np.abs(rng.normal(0, 0.5, N_BARS)),
+            "close": close,
+        },
+        index=pd.date_range("2024-01-01", periods=N_BARS, freq="h", tz="UTC"),
+    )
+    return frame, {name: rng.random(N_BARS) < rate for name, rate in SIGNAL_RATES.items()}
+
+
+def _vbt_value(frame: pd.DataFrame, sig: dict[str, np.ndarray], params: dict, short: bool):
+    import vectorbt as vbt  # noqa: PLC0415
+
+    p = dict(params)
+    sl, tp = resolve_stops(p, frame)
+    entries, exits = pd.Series(sig["entries"], frame.index), pd.Series(sig["exits"], frame.index)
+    s_entries = pd.Series(sig["short_entries"] & short, frame.index)
+    s_exits = pd.Series(sig["short_exits"] & short, frame.index)
+    hold = int(p.get("max_bars_hold", 0) or 0)
+    if hold > 0:
+        exits = exits | entries.shift(hold, fill_value=False)
+        s_exits = s_exits | s_entries.shift(hold, fill_value=False)
+    pf = vbt.Portfolio.from_signals(
+        close=frame["close"],
+        entries=entries,
+        exits=exits,
+        short_entries=s_entries,
+        short_exits=s_exits,
+        price=frame["open"],
+        open=frame["open"],
+        high=frame["high"],
+        low=frame["low"],
+        sl_stop=pd.Series(sl, frame.index),
+        tp_stop=pd.Series(tp, frame.index),
+        sl_trail=bool(p.get("sl_trail", False)),
+        fees=float(p.get("fees", 0.0)),
+        slippage=float(p.get("slippage", 0.0)),
+        init_cash=float(p.get("init_cash", 100.0)),
+        size=float(p.get("size", np.inf)),
+        size_type=str(p.get("size_type", "amount")),
+        accumulate=bool(p.get("accumulate", False)),
+    )
+    return pf.value().to_numpy()
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Record vectorbt reference values for native tests.")
+    ap.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    args = ap.parse_args(argv)
+    frame, sig = _market()
+    arrays = {c: frame[c].to_numpy() for c in ("open", "high", "low", "close")}
+    arrays.update(sig)
+    arrays["cases"] = np.array(
+        json.dumps({k: {"params": p, "short": s} for k, (p, s) in CASES.items()})
+    )
+    for name, (params, short) in CASES.items():
+        arrays[f"value_{name}"] = _vbt_value(frame, sig, params, short)
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(args.out, **arrays)
+    print(f"[OK] {args.out}: {len(CASES)} cases x {N_BARS} bars")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import yaml
+
+from trade_app.adapters.parquet.feature_store import (
+    DEFAULT_STORE_DIR,
+    DEFAULT_STORE_MB,
+    ArrowFeatureStore,
+)
+from trade_app.adapters.parquet.layout import discover_datasets
+from trade_app.adapters.sampler.sobol_sampler import SobolSamplerAdapter
+from trade_app.adapters.vbtpro.derived_feed import data_feed_from_env
+from trade_app.adapters.yaml.spec_loader_yaml import YamlSpecLoader
+from trade_app.apps.features.feature_calc import DefaultFeatureCalculator
+from trade_app.apps.features.feature_memo import FeatureMemo
+from trade_app.apps.features.pipeline.plan_builder import DefaultPlanBuilder
+from trade_app.apps.features.pipeline.run_pipeline_full import run_pipeline_full
+from trade_app.apps.research.explorer.spec_binding import bind_params_to_spec
+
+"""
+特徴量ストア（runs/.feature_store）をユニバース全体について事前計算する
+
+spec YAML の space から Sobol 点を取り、各点で束縛した features を
+全シンボル×TF の OHLCV で計算してストアへ保存する（既にあるものは読むだけ）。
+探索側は GDX_FEATURE_STORE=1 で同じストアを引く。
+
+ストアのキーは読み込んだフレームの内容ハッシュを含むため、探索（autotune）と同じ
+--start/--end を必須で受け、同じ経路（data_feed_from_env + run_pipeline_full。
+GDX_LAZY_FEATURES / GDX_WARMUP_LOOKBACK / GDX_DERIVED_TF も同じ解釈）で読む。
+期間が autotune と一致しないと、ここで温めた出力は引かれない。
+
+使い方（PowerShell 例）:
+
+  uv run python tools/warm_feature_store.py spec.yaml --start 2020-01-01 --end 2024-12-31 \
+      --points 64 --timeframes m15,h1
+
+  # 容量上限を指定
+  uv run python tools/warm_feature_store.py spec.yaml --start 2020-01-01 --end 2024-12-31 \
+      --max-mb 4096
+"""
+
+
+def _split(s: str | None) -> set[str] | None:
+    if not s:
+        return None
+    return {x.strip() for x in s.split(",") if x.strip()}
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Precompute indicator outputs into the feature store.")
+    p.add_argument("spec", type=Path, help="features/space を含む YAML")
+    p.add_argument(
+        "--root",
+        type=Path,
+        default=Path(os.environ.get("VBT_PARQUET_ROOT", "./data/parquet")),
+        help="Parquet ルート（既定: VBT_PARQUET_ROOT or ./data/parquet）",
+    )
+    p.add_argument(
+        "--store",
+        type=Path,
+        default=Path(os.environ.get("GDX_FEATURE_STORE_DIR", "") or DEFAULT_STORE_DIR),
+        help="ストアの場所（既定: GDX_FEATURE_STORE_DIR or runs/.feature_store）",
+    )
+    p.add_argument("--max-mb", type=float, default=float(DEFAULT_STORE_MB), help="容量上限")
+    p.add_argument("--symbols", default=None, help="カンマ区切り（省略時は全シンボル）")
+    p.add_argument("--timeframes", default=None, help="カンマ区切り（省略時は全TF）")
+    p.add_argument("--start", required=True, help="autotune の --start と同じ値（UTC）")
+    p.add_argument("--end", required=True, help="autotune の --end と同じ値（UTC）")
+    p.add_argument("--tz", default="UTC", help="autotune の --tz と同じ値")
+    p.add_argument("--points", type=int, default=32, help="space から取る Sobol 点の数")
+    p.add_argument("--seed", type=int, default=42)
+    args = p.parse_args(argv)
+
+    root = args.root.resolve()
+    os.environ["VBT_PARQUET_ROOT"] = str(root)  # feed の読込先を揃える
+    features_spec, plan_spec = YamlSpecLoader().load(args.spec)
+    with args.spec.open("r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f) or {}
+    space = raw.get("space") or (features_spec.pop("_space", {}) | plan_spec.pop("_space", {}))
+    points = SobolSamplerAdapter().sample(space, args.points, seed=args.seed) or [{}]
+    bound = [
+        (bind_params_to_spec(features_spec, pt), bind_params_to_spec(plan_spec, pt))
+        for pt in points
+    ]
+    specs = list({repr(b): b for b in bound}.values())
+
+    symbols = _split(args.symbols)
+    tfs = _split(args.timeframes)
+    targets = [
+        (sym, tf)
+        for sym, tf in discover_datasets(root)
+        if (symbols is None or sym in symbols) and (tfs is None or tf in tfs)
+    ]
+    if not targets:
+        print(f"[WARN] No Parquet dataset found under {root}")
+        return 1
+
+    store = ArrowFeatureStore(args.store, max_bytes=int(args.max_mb * 1024 * 1024))
+    # プロセス内メモは使わない（全出力をストアへ通す）
+    calc = DefaultFeatureCalculator(memo=FeatureMemo(0), store=store)
+    feed = data_feed_from_env()
+    planner = DefaultPlanBuilder()
+    # autotune と同じ Timestamp で渡す（読込範囲・フレームが一致する）
+    start, end = pd.Timestamp(args.start, tz="UTC"), pd.Timestamp(args.end, tz="UTC")
+    for sym, tf in targets:
+        bars = 0
+        for f_spec, p_spec in specs:
+            out = run_pipeline_full(
+                feed=feed,
+                calc=calc,
+                planner=planner,
+                feature_spec=f_spec,
+                plan_spec=p_spec,
+                symbols=[sym],
+                start=start,
+                end=end,
+                timeframe=tf,
+                tz=args.tz,
+            )
+            bars = len(out.ohlcv.frame)
+        print(f"[OK] {sym} {tf}: {len(specs)} specs x {bars} bars")
+    gc = store.gc()
+    print(f"[GC] removed={gc['removed']} files={gc['files']} bytes={gc['bytes'] / 1e6:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+vectorbt を使わない BacktestPort 実装（simulator.simulate の薄いラッパ）。
+
+- params は VbtProBacktestAdapter と同じキーを受ける（fees/slippage/init_cash/size/size_type/
+  accumulate/max_entries/sl_stop/tp_stop/sl_pct/tp_pct/rr/sl_atr_mult/tp_atr_mult/atr_window/
+  sl_trail/max_bars_hold）。sl/tp の正規化と max_bars_hold（exits | entries.shift(N)）の規則は
+  bindings.portfolio_from_signals と同じ。約定・ストップ・accumulate は vbt の from_signals 既定に
+  合わせてある（tools/record_native_fixtures.py で記録した評価額と tests/src4 で照合）
+- 返り値: equity_curve（終値評価の Series）/ total_return / trades（決済済みの件数）/
+  trade_records（1ポジション1行の DataFrame）
+- run_many: (bars × K) のシグナル行列を1回の simulate_many で回し、列ごとの評価額を
+  (bars, K) の1つの配列で返す。列ごとの params（sl/tp/fees 等）は column_params で上書き
+- backtester_from_env: GDX_BACKTEST_ENGINE=native|vbt|auto（auto は vectorbt(pro) が
+  import できれば vbt、無ければ native）
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import math
+import os
+from collections.abc import Mapping
+from typing import Any, ClassVar
+
+import numpy as np
+import pandas as pd
+
+from trade_app.adapters.native.simulator import (
+    REASONS,
+    RECORD_FIELDS,
+    SIZE_AMOUNT,
+    SIZE_TYPES,
+    simulate,
+    simulate_many,
+)
+from trade_app.adapters.native.stops import StopRows, resolve_stops, stop_terms
+from trade_app.adapters.vbtpro.backtest_adapter import VbtProBacktestAdapter
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+from trade_app.domain.ports.backtest import BacktestPort
+
+_VBT_MODULES = ("vectorbtpro", "vectorbt")
+_MATRIX_NDIM = 2
+
+
+def _scalars(p: Mapping[str, Any]) -> tuple[Any, ...]:
+    """simulate の列ごとのスカラー引数（trail, max_hold, fees, slippage, init_cash, size,
+    size_type, accumulate, max_entries）"""
+    size_type = str(p.get("size_type", "amount")).lower()
+    if size_type not in SIZE_TYPES:
+        raise ValueError(f"unsupported size_type: {size_type}")
+    hold = p.get("max_bars_hold")
+    size = p.get("size")
+    return (
+        bool(p.get("sl_trail", False)),
+        int(hold) if isinstance(hold, int | float) and hold > 0 else 0,
+        float(p.get("fees", 0.0) or 0.0),
+        float(p.get("slippage", 0.0) or 0.0),
+        float(p.get("init_cash", 100.0)),
+        math.inf if size is None else float(size),
+        SIZE_TYPES.get(size_type, SIZE_AMOUNT),
+        bool(p.get("accumulate", False)),
+        int(p.get("max_entries", 0) or 0),
+    )
+
+
+def _flags(s: pd.Series | None, index: pd.Index) -> np.ndarray:
+    if s is None:
+        return np.zeros(len(index), dtype=bool)
+    return s.reindex(index).fillna(False).to_numpy(dtype=bool)
+
+
+class NativeBacktestAdapter(BacktestPort):
+    """組込みの単一パス約定シミュレータで from_signals 契約を実行する（vectorbt 不要）"""
+
+    __responsibility__: ClassVar[str] = "vectorbt 無しで NextOpen 約定の検証を実行する"
+
+    def run_from_signals(
+        self,
+        ohlcv: OhlcvFrameDTO,
+        entries: pd.Series,
+        exits: pd.Series,
+        params: Mapping[str, Any] | None = None,
+        *,
+        short_entries: pd.Series | None = None,
+        short_exits: pd.Series | None = None,
+    ) -> Mapping[str, Any]:
+        """short_exits を省略すると exits がショートも決済する（decide の exits ブロックは共通）"""
+        df = ohlcv.frame
+        if "open" not in df.columns:
+            raise ValueError("open column is required for NextOpen execution")
+        p = dict(params or {})
+        index = df.index
+        sl, tp = resolve_stops(p, df)
+        equity, recs = simulate(
+            *(df[c].to_numpy(dtype=float) for c in ("open", "high", "low", "close")),
+            _flags(entries, index),
+            _flags(exits, index),
+            _flags(short_entries, index),
+            _flags(short_exits if short_exits is not None else exits, index),
+            sl,
+            tp,
+            *_scalars(p),
+        )
+        eq = pd.Series(equity, index=index, name="equity")
+        records = self._records(recs, index)
+        start = float(p.get("init_cash", 100.0))
+        return {
+            "engine": "native",
+            "index": index,
+            "equity_curve": eq,
+            "total_return": float(eq.iloc[-1]) / start - 1.0 if len(eq) and start > 0 else 0.0,
+            "trades": int((records["status"] == "closed").sum()),
+            "trade_records": records,
+        }
+
+    def run_many(
+        self,
+        ohlcv: OhlcvFrameDTO,
+        entries: np.ndarray | pd.DataFrame,
+        exits: np.ndarray | pd.DataFrame | pd.Series,
+        params: Mapping[str, Any] | None = None,
+        *,
+        column_params: list[Mapping[str, Any]] | None = None,
+        short_entries: np.ndarray | pd.DataFrame | None = None,
+        short_exits: np.ndarray | pd.DataFrame | pd.Series | None = None,
+    ) -> Mapping[str, Any]:
+        """
+        K 列を1回で検証する。entries は (bars, K)、exits 等は (bars, K) か全列共通の (bars,)。
+        列 k の params は params に column_params[k] を重ねたもの（run_from_signals と同じ解釈）。
+        ATR 等の sl/tp は列間で基準行を共有し、bars × K の比率行列は作らない。
+        返り値: equity（(bars, K) の ndarray）/ total_return・trades（(K,)）
+        """
+        df = ohlcv.frame
+        if "open" not in df.columns:
+            raise ValueError("open column is required for NextOpen execution")
+        n = len(df.index)
+        le = _matrix(entries, n, None)
+        k_all = le.shape[0]
+        lx = _matrix(exits, n, k_all)
+        se = _matrix(short_entries, n, k_all)
+        sx = _matrix(short_exits if short_exits is not None else exits, n, k_all)
+        if column_params is not None and len(column_params) != k_all:
+            raise ValueError("column_params length must match the number of columns")
+        base = dict(params or {})
+        cols = [{**base, **(column_params[k] if column_params else {})} for k in range(k_all)]
+        rows = StopRows(df)
+        terms = [stop_terms(p, rows) for p in cols]
+        per_col = list(zip(*(_scalars(p) for p in cols), strict=True)) if cols else [()] * 9
+        dtypes = (bool, np.int64, float, float, float, float, np.int64, bool, np.int64)
+        equity, trades = simulate_many(
+            *(df[c].to_numpy(dtype=float) for c in ("open", "high", "low", "close")),
+            le,
+            lx,
+            se,
+            sx,
+            rows.matrix(),
+            np.array([t[0][0] for t in terms], dtype=np.int64),
+            np.array([t[0][1] for t in terms], dtype=float),
+            np.array([t[1][0] for t in terms], dtype=np.int64),
+            np.array([t[1][1] for t in terms], dtype=float),
+            *(np.array(v, dtype=dt) for v, dt in zip(per_col, dtypes, strict=True)),
+        )
+        start = np.array([p.get("init_cash", 100.0) for p in cols], dtype=float)
+        last = equity[:, -1] if n else start
+        with np.errstate(divide="ignore", invalid="ignore"):
+            total = np.where(start > 0, last / start - 1.0, 0.0)
+        return {
+            "engine": "native",
+            "index": df.index,
+            "equity": equity.T,
+            "total_return": total,
+            "trades": trades,
+        }
+
+    @staticmethod
+    def _records(recs: np.ndarray, index: pd.Index) -> pd.DataFrame:
+        out = pd.DataFrame(recs, columns=list(RECORD_FIELDS))
+        for c in ("entry_idx", "exit_idx", "direction", "reason", "n_entries"):
+            out[c] = out[c].astype(np.int64)
+        out.insert(2, "entry_time", index[out["entry_idx"].to_numpy()])
+        out.insert(3, "exit_time", index[out["exit_idx"].to_numpy()])
+        out["reason"] = out["reason"].map(REASONS)
+        out["status"] = np.where(out["reason"] == "open", "open", "closed")
+        return out
+
+    def run_cv(
+        self,
+        ohlcv: OhlcvFrameDTO,
+        entries: pd.Series,
+        exits: pd.Series,
+        splits: list[tuple[pd.Index, pd.Index]],
+        params: Mapping[str, Any] | None = None,
+    ) -> list[Mapping[str, Any]]:
+        out: list[Mapping[str, Any]] = []
+        for _train_idx, test_idx in splits:
+            o_test = OhlcvFrameDTO(frame=ohlcv.frame.loc[test_idx], freq=ohlcv.freq)
+            out.append(
+                self.run_from_signals(o_test, entries.loc[test_idx], exits.loc[test_idx], params)
+            )
+        return out
+
+
+def _matrix(v: Any, n: int, k_all: int | None) -> np.ndarray:
+    """(bars, K) / (bars,) の bool → simulate_many 用の C 連続な (K, bars)"""
+    if v is None:
+        return np.zeros((k_all or 0, n), dtype=bool)
+    a = np.asarray(v, dtype=bool)
+    if a.ndim == 1:
+        a = np.broadcast_to(a[:, None], (n, 1 if k_all is None else k_all))
+    if a.ndim != _MATRIX_NDIM or a.shape[0] != n or (k_all is not None and a.shape[1] != k_all):
+        raise ValueError(f"signal matrix must be (bars, K) aligned to ohlcv: got {a.shape}")
+    return np.ascontiguousarray(a.T)
+
+
+def _has_vbt() -> bool:
+    return any(importlib.util.find_spec(m) is not None for m in _VBT_MODULES)
+
+
+def backtester_from_env() -> BacktestPort:
+    """GDX_BACKTEST_ENGINE（native / vbt / auto。既定 auto）で BacktestPort を選ぶ"""
+    engine = os.getenv("GDX_BACKTEST_ENGINE", "auto").strip().lower()
+    if engine == "native" or (engine == "auto" and not _has_vbt()):
+        return NativeBacktestAdapter()
+    return VbtProBacktestAdapter()
@@ -0,0 +1,332 @@
+"""
+ネイティブ（numpy/numba）の単一パス約定シミュレータ。vbt の from_signals(price="open") 相当の契約:
+
+- 約定はシグナルの立ったバーの Open（decide の pre_shift=1 で「前バー判定→次足Open」になる）。
+  買いは Open×(1+slippage)、売りは Open×(1-slippage)。手数料は約定代金×fees
+- 同じバーで entry と exit（または long と short の entry）が両方立つものは無視
+  （vbt の既定 ignore）。ロング保有中の short entry はドテン（決済してから新規）
+- ストップ（vbt 既定の stop_entry_price=close / stop_exit_price=stoplimit と同じ）: sl/tp の基準は
+  エントリーしたバーの終値。次のバーから、そのバーのシグナルより先に判定し（当たったバーでは
+  シグナルを見ない）、Open が既に水準を越えていれば Open、そうでなければ水準の価格で約定
+  （slippage 無し。同じバーで両方なら sl 優先）。sl_trail は基準を保有中の高値（ショートは安値）へ
+  動かす。比率はバー配列で渡せる（ATR 相対など。建てたバーの値）。NaN は無効（0 は基準ちょうど）。
+  買い増しでは NaN でない側の基準・比率をそのバーで置き直す
+- max_bars_hold: vbtpro_bindings.portfolio_from_signals と同じ規則。N 本前に entry シグナルが
+  立っていたバーを exit シグナルとして扱う（exits | entries.shift(N)。約定の有無や建玉の
+  起点とは無関係。同じバーの entry とは他の exit と同じく相殺）。決済理由は time
+- サイズ: size_type が amount なら数量（inf は可能な最大）、value は金額（Open で数量に換算）、
+  percent は余力に対する比率。買いは現金で切り詰める。ショートは数量/金額指定なら切り詰めない
+  （vbt の lock_cash=False）。inf/percent のショートは余力（現金−ショート建玉の評価額）まで
+- accumulate=True なら保有中の同方向 entry で買い増し、exit/反対 entry も size ぶん減らすだけ
+  （vbt の accumulate=True。反対 entry で建玉を越えた分は反対方向の新規）。max_entries は段数上限
+  （0 は無制限。vbt OSS には無いネイティブ独自のキー）
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - numba 無しは同じ関数を Python で回す
+    numba = None
+
+SIZE_AMOUNT, SIZE_VALUE, SIZE_PERCENT = 0, 1, 2
+SIZE_TYPES = {"amount": SIZE_AMOUNT, "value": SIZE_VALUE, "percent": SIZE_PERCENT}
+
+# 決済理由（trade_records の reason 列）
+R_SIGNAL, R_SL, R_TP, R_TRAIL, R_TIME, R_OPEN = 0, 1, 2, 3, 4, 5
+REASONS = {R_SIGNAL: "signal", R_SL: "sl", R_TP: "tp", R_TRAIL: "trail", R_TIME: "time"}
+REASONS[R_OPEN] = "open"
+
+# 取引記録の列（float64 の行列で持つ）
+RECORD_FIELDS = (
+    "entry_idx",
+    "exit_idx",
+    "direction",
+    "size",
+    "entry_price",
+    "exit_price",
+    "fees",
+    "pnl",
+    "return",
+    "reason",
+    "n_entries",
+)
+
+
+def _njit(fn: Callable[..., Any]) -> Callable[..., Any]:
+    if numba is None:
+        return fn
+    return numba.njit(cache=True, nogil=True)(fn)
+
+
+@_njit
+def _units(
+    cash: float, pos: float, d: float, o: float, px: float, fees: float, size: float, size_type: int
+) -> float:
+    """d 方向へ新規/買い増しする数量（約定価格 px。金額指定は Open の o で数量に直す）"""
+    want = size / o if size_type == SIZE_VALUE else size
+    if d < 0.0 and size_type != SIZE_PERCENT and not math.isinf(want):
+        return want  # 数量/金額指定のショートは現金で切り詰めない（vbt の lock_cash=False）
+    # 買いは現金、ショートの inf/percent は余力（現金−ショート建玉の評価額）で切り詰める
+    free = cash if d > 0.0 else cash - 2.0 * max(-pos, 0.0) * px
+    if free <= 0.0 or px <= 0.0:
+        return 0.0
+    afford = free / (px * (1.0 + fees))
+    if size_type == SIZE_PERCENT:
+        return size * afford
+    return min(want, afford)
+
+
+@_njit
+def _reduce(held: float, o: float, size: float, size_type: int) -> float:
+    """accumulate 時の exit/反対 entry が減らす数量（size ぶん。percent は建玉に対する比率）"""
+    if size_type == SIZE_PERCENT:
+        return size * held
+    return size / o if size_type == SIZE_VALUE else size
+
+
+@_njit
+def _stop_fill(pos: float, base: float, stop: float, o: float, lo: float, hi: float, below: bool):
+    """vbt の get_stop_price_nb と同じ判定。水準 base×(1∓stop) に Open が既に届いていれば Open、
+    バー内に入れば水準、届かなければ NaN。below はロングの sl 側（ショートは tp 側）"""
+    if math.isnan(stop) or stop < 0.0:
+        return math.nan
+    if (pos > 0.0) == below:
+        lvl = base * (1.0 - stop)
+        if o <= lvl:
+            return o
+    else:
+        lvl = base * (1.0 + stop)
+        if lvl <= o:
+            return o
+    if lo <= lvl <= hi:
+        return lvl
+    return math.nan
+
+
+@_njit
+def _record(
+    recs: np.ndarray,
+    m: int,
+    first: int,
+    t: int,
+    pos: float,
+    avg: float,
+    px: float,
+    fees_paid: float,
+    reason: int,
+    n_in: int,
+) -> None:
+    d = 1.0 if pos > 0.0 else -1.0
+    units = abs(pos)
+    pnl = d * (px - avg) * units - fees_paid
+    recs[m, 0] = first
+    recs[m, 1] = t
+    recs[m, 2] = d
+    recs[m, 3] = units
+    recs[m, 4] = avg
+    recs[m, 5] = px
+    recs[m, 6] = fees_paid
+    recs[m, 7] = pnl
+    recs[m, 8] = pnl / (avg * units) if avg * units > 0.0 else 0.0
+    recs[m, 9] = reason
+    recs[m, 10] = n_in
+
+
+@_njit
+def simulate(  # noqa: PLR0915
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    long_entries: np.ndarray,
+    long_exits: np.ndarray,
+    short_entries: np.ndarray,
+    short_exits: np.ndarray,
+    sl: np.ndarray,
+    tp: np.ndarray,
+    trail: bool,
+    max_hold: int,
+    fees: float,
+    slippage: float,
+    init_cash: float,
+    size: float,
+    size_type: int,
+    accumulate: bool,
+    max_entries: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """(各バー終値時点の評価額, 取引記録 (trades × RECORD_FIELDS))"""
+    n = open_.shape[0]
+    equity = np.empty(n)
+    recs = np.zeros((n + 1, 11))
+    m = 0
+    cash = init_cash
+    pos = 0.0
+    avg = 0.0
+    sl_base = 0.0  # sl の基準（トレーリングでは保有中の高値/安値へ動く）
+    tp_base = 0.0
+    sl_k = math.nan
+    tp_k = math.nan
+    first = -1
+    n_in = 0
+    paid = 0.0
+    for t in range(n):
+        o = open_[t]
+        # a) ストップ（前のバーまでに建てた玉だけ）。当たったバーではシグナルを見ない
+        px = math.nan
+        reason = -1
+        if pos != 0.0:
+            px = _stop_fill(pos, sl_base, sl_k, o, low[t], high[t], True)
+            if not math.isnan(px):
+                reason = R_TRAIL if trail else R_SL
+            else:
+                px = _stop_fill(pos, tp_base, tp_k, o, low[t], high[t], False)
+                reason = R_TP
+            if trail and not math.isnan(sl_k):
+                sl_base = max(sl_base, high[t]) if pos > 0.0 else min(sl_base, low[t])
+        if not math.isnan(px):
+            # ストップは水準そのもので約定（slippage 無し、手数料あり）
+            fee = abs(pos) * px * fees
+            cash += pos * px - fee
+            _record(recs, m, first, t, pos, avg, px, paid + fee, reason, n_in)
+            m += 1
+            pos = 0.0
+            equity[t] = cash
+            continue
+        # b) シグナル（Open で約定）。max_hold 本前の entry シグナルは exit シグナル
+        le = long_entries[t]
+        se = short_entries[t]
+        lt = max_hold > 0 and t >= max_hold and long_entries[t - max_hold]
+        st = max_hold > 0 and t >= max_hold and short_entries[t - max_hold]
+        lx = long_exits[t] or lt
+        sx = short_exits[t] or st
+        if le and lx:
+            le = lx = False
+        if se and sx:
+            se = sx = False
+        if le and se:
+            le = se = False
+        want = size
+        want_type = size_type
+        if (pos > 0.0 and (lx or se)) or (pos < 0.0 and (sx or le)):
+            d = 1.0 if pos > 0.0 else -1.0
+            px = o * (1.0 - d * slippage)
+            held = abs(pos)
+            units = held
+            if accumulate:
+                # 買い増しモードでは exit/反対 entry も size ぶん減らすだけ
+                # （vbt の accumulate=True）。反対 entry で建玉を越えた分は反対方向の新規になる
+                units = min(held, _reduce(held, o, size, size_type))
+                want = _reduce(held, o, size, size_type) - units
+                want_type = SIZE_AMOUNT
+            fee = units * px * fees
+            share = paid * units / held
+            cash += d * units * px - fee
+            # exit シグナルが保有期間の規則だけから来たものは time
+            timed = (pos > 0.0 and not se and not long_exits[t]) or (
+                pos < 0.0 and not le and not short_exits[t]
+            )
+            reason = R_TIME if timed else R_SIGNAL
+            _record(recs, m, first, t, d * units, avg, px, share + fee, reason, n_in)
+            m += 1
+            paid -= share
+            pos = 0.0 if units >= held else pos - d * units
+        can_add = accumulate and (max_entries <= 0 or n_in < max_entries)
+        if (le or se) and (pos == 0.0 or (can_add and (pos > 0.0) == le)) and want > 0.0:
+            d = 1.0 if le else -1.0
+            px = o * (1.0 + d * slippage)
+            units = _units(cash, pos, d, o, px, fees, want, want_type)
+            if units > 0.0:
+                fee = units * px * fees
+                cash -= d * units * px + fee
+                # ストップの基準はこのバーの終値（vbt の stop_entry_price=close）。
+                # 買い増しでは有効な比率の側だけ基準を置き直す（upon_stop_update=override）
+                if pos == 0.0 or not math.isnan(sl[t]):
+                    sl_base = close[t]
+                    sl_k = sl[t]
+                if pos == 0.0 or not math.isnan(tp[t]):
+                    tp_base = close[t]
+                    tp_k = tp[t]
+                if pos == 0.0:
+                    first = t
+                    n_in = 0
+                    paid = 0.0
+                    avg = px
+                else:
+                    avg = (avg * abs(pos) + px * units) / (abs(pos) + units)
+                pos += d * units
+                paid += fee
+                n_in += 1
+        equity[t] = cash + pos * close[t]
+    if pos != 0.0:
+        # 未決済は最終終値で評価した記録を残す（手数料は未計上）
+        _record(recs, m, first, n - 1, pos, avg, close[n - 1], paid, R_OPEN, n_in)
+        m += 1
+    return equity, recs[:m].copy()
+
+
+@_njit
+def simulate_many(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    long_entries: np.ndarray,
+    long_exits: np.ndarray,
+    short_entries: np.ndarray,
+    short_exits: np.ndarray,
+    stop_rows: np.ndarray,
+    sl_row: np.ndarray,
+    sl_scale: np.ndarray,
+    tp_row: np.ndarray,
+    tp_scale: np.ndarray,
+    trail: np.ndarray,
+    max_hold: np.ndarray,
+    fees: np.ndarray,
+    slippage: np.ndarray,
+    init_cash: np.ndarray,
+    size: np.ndarray,
+    size_type: np.ndarray,
+    accumulate: np.ndarray,
+    max_entries: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    K 列を1回の呼び出しで simulate する。シグナルは (K, bars)、列ごとのパラメータは (K,)。
+    sl/tp は stop_rows[行] × 倍率（stops.StopRows）。返り値は (評価額 (K, bars), 決済件数 (K,))
+    """
+    k_all = long_entries.shape[0]
+    equity = np.empty((k_all, open_.shape[0]))
+    trades = np.zeros(k_all, dtype=np.int64)
+    for k in range(k_all):
+        eq, recs = simulate(
+            open_,
+            high,
+            low,
+            close,
+            long_entries[k],
+            long_exits[k],
+            short_entries[k],
+            short_exits[k],
+            stop_rows[sl_row[k]] * sl_scale[k],
+            stop_rows[tp_row[k]] * tp_scale[k],
+            trail[k],
+            max_hold[k],
+            fees[k],
+            slippage[k],
+            init_cash[k],
+            size[k],
+            size_type[k],
+            accumulate[k],
+            max_entries[k],
+        )
+        equity[k] = eq
+        for r in range(recs.shape[0]):
+            if recs[r, 9] != R_OPEN:
+                trades[k] += 1
+    return equity, trades
@@ -0,0 +1,97 @@
+"""
+sl/tp 指定（params）をバーごとの比率へ解決する（bindings.portfolio_from_signals と同じ規則）。
+
+- 優先順: sl_stop/tp_stop → sl_pct/tp_pct → rr（tp = rr × sl）→ ATR 倍（atr_window）
+- StopRows: 多列（run_many）向けの因数分解表現。各列の比率を「共有の基準行 × 列ごとの倍率」で持つ
+  （定数は 1 の行 × 値、ATR は ATR 相対の行 × 倍率）。bars × K の float 行列を作らずに済む
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Mapping
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+_ONES: Hashable = "ones"
+
+
+def atr_rel(frame: pd.DataFrame, window: int) -> pd.Series:
+    """bindings の ATR 相対（対 close）と同じ式"""
+    high, low, close = (frame[c].astype(float) for c in ("high", "low", "close"))
+    prev_close = close.shift(1)
+    tr = np.maximum(high - low, np.maximum(high - prev_close, low - prev_close))
+    atr = tr.ewm(alpha=1.0 / float(window), adjust=False, min_periods=window).mean()
+    return (atr / close.replace(0, np.nan)).fillna(0.0)
+
+
+class StopRows:
+    """基準行（bars 長の配列）の登録簿。term() は (行番号, 倍率) を返す"""
+
+    __responsibility__ = "列ごとの sl/tp 比率を共有の基準行と倍率に因数分解して保持"
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        self.frame = frame
+        self._keys: dict[Hashable, int] = {}
+        self._rows: list[np.ndarray] = []
+
+    def _row(self, key: Hashable, make: Any) -> int:
+        if key not in self._keys:
+            self._keys[key] = len(self._rows)
+            self._rows.append(np.ascontiguousarray(make(), dtype=float))
+        return self._keys[key]
+
+    def ones(self) -> int:
+        return self._row(_ONES, lambda: np.ones(len(self.frame)))
+
+    def atr(self, window: int) -> int:
+        return self._row(("atr", int(window)), lambda: atr_rel(self.frame, int(window)).to_numpy())
+
+    def series(self, v: pd.Series | pd.DataFrame) -> int:
+        s = v.iloc[:, 0] if isinstance(v, pd.DataFrame) else v
+        return self._row(("series", id(v)), lambda: s.reindex(self.frame.index).to_numpy())
+
+    def matrix(self) -> np.ndarray:
+        return np.vstack(self._rows) if self._rows else np.ones((1, len(self.frame)))
+
+    def term(self, v: Any) -> tuple[int, float]:
+        """比率の指定 → (行番号, 倍率)。None は無効（NaN）"""
+        if v is None:
+            return self.ones(), float("nan")
+        if isinstance(v, tuple):
+            return v  # 解決済み（ATR の項）
+        if isinstance(v, pd.Series | pd.DataFrame):
+            return self.series(v), 1.0
+        return self.ones(), float(v)
+
+
+def stop_terms(
+    params: Mapping[str, Any], rows: StopRows
+) -> tuple[tuple[int, float], tuple[int, float]]:
+    """params の sl/tp を ((sl 行, 倍率), (tp 行, 倍率)) に解決"""
+    p = dict(params)
+    sl = p.get("sl_stop")
+    tp = p.get("tp_stop")
+    if sl is None and p.get("sl_pct") is not None:
+        sl = float(p["sl_pct"])
+    if tp is None and p.get("tp_pct") is not None:
+        tp = float(p["tp_pct"])
+    if tp is None and p.get("rr") is not None and sl is not None:
+        tp = float(p["rr"]) * float(sl)
+    sl_mult, tp_mult = p.get("sl_atr_mult"), p.get("tp_atr_mult")
+    if (sl_mult is not None or tp_mult is not None) and (sl is None or tp is None):
+        row = rows.atr(int(p.get("atr_window", 14)))
+        if sl is None and sl_mult is not None:
+            sl = (row, float(sl_mult))
+        if tp is None and tp_mult is not None:
+            tp = (row, float(tp_mult))
+    return rows.term(sl), rows.term(tp)
+
+
+def resolve_stops(params: Mapping[str, Any], frame: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """(sl 比率, tp 比率) のバー配列（無効は NaN）"""
+    rows = StopRows(frame)
+    (sl_row, sl_k), (tp_row, tp_k) = stop_terms(params, rows)
+    mat = rows.matrix()
+    return mat[sl_row] * sl_k, mat[tp_row] * tp_k
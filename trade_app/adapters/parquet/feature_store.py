@@ -0,0 +1,143 @@
+"""
+インジ出力の永続ストア（内容アドレス・Arrow IPC 無圧縮）。
+- キー（feature_memo.store_key）ごとに {ROOT}/{key[:2]}/{key}.arrow を1つ。列は値だけを持ち、
+  index はキーに含まれる（= 呼び手の frame.index と同一）ので保存しない
+- 単一出力は列 "value"、マルチ出力は出力キーを列名にする。Series 名はスキーマメタデータ
+- 書込は一時ファイル → os.replace で原子的に置換（並列プロセスの同一キーは後勝ちで同内容）
+- 読込でファイルの mtime を更新し、gc() は mtime の古い順に消してサイズ上限に収める
+- GDX_FEATURE_STORE=1 で有効、GDX_FEATURE_STORE_DIR（既定 runs/.feature_store）、
+  GDX_FEATURE_STORE_MB（既定 2048）
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+from pathlib import Path
+from typing import Any, ClassVar
+
+import pandas as pd
+
+from trade_app.domain.ports.feature_store import FeatureStorePort
+
+DEFAULT_STORE_DIR = Path("runs/.feature_store")
+DEFAULT_STORE_MB = 2048
+_SUFFIX = ".arrow"
+_META_KEY = b"gdx.feature"
+_SINGLE = "value"
+# 書込量がこの割合（上限比）を超えるたびに gc する
+_GC_EVERY = 0.1
+_TRUTHY = ("1", "true", "yes", "on")
+
+
+class ArrowFeatureStore(FeatureStorePort):
+    __responsibility__: ClassVar[str] = "インジ出力をキー単位の Arrow ファイルへ保存・再利用"
+
+    def __init__(self, root: Path | str = DEFAULT_STORE_DIR, *, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self._written = 0
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{_SUFFIX}"
+
+    def get(self, key: str, index: pd.Index) -> pd.Series | dict[str, pd.Series] | None:
+        import pyarrow as pa  # noqa: PLC0415
+
+        path = self.path(key)
+        if not path.exists():
+            return None
+        try:
+            # メモリマップせず読み切る（gc が使用中のファイルを消せるように）
+            with pa.OSFile(str(path), "rb") as source:
+                table = pa.ipc.open_file(source).read_all()
+            meta = json.loads((table.schema.metadata or {}).get(_META_KEY, b"{}"))
+        except (OSError, pa.ArrowInvalid, ValueError):
+            return None
+        if table.num_rows != len(index):
+            return None
+        cols = {n: table.column(n).to_numpy(zero_copy_only=False) for n in table.column_names}
+        with contextlib.suppress(OSError):
+            os.utime(path)  # LRU 用の最終使用時刻
+        if meta.get("kind") == "series":
+            return pd.Series(cols[_SINGLE], index=index, name=meta.get("name"))
+        return {k: pd.Series(v, index=index, name=k) for k, v in cols.items()}
+
+    def put(self, key: str, value: pd.Series | dict[str, pd.Series]) -> None:
+        import pyarrow as pa  # noqa: PLC0415
+
+        if isinstance(value, pd.Series):
+            meta = {"kind": "series", "name": value.name}
+            arrays = {_SINGLE: value}
+        elif isinstance(value, dict):
+            meta = {"kind": "dict"}
+            arrays = value
+        else:
+            return
+        try:
+            table = pa.table({str(k): pa.array(s.to_numpy()) for k, s in arrays.items()})
+            header = json.dumps(meta).encode()
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+            return  # object 列・名前が JSON 化できない等は保存しない
+        table = table.replace_schema_metadata({_META_KEY: header})
+
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+        try:
+            with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as w:
+                w.write_table(table, max_chunksize=max(1, table.num_rows))
+            os.replace(tmp, path)
+            self._written += path.stat().st_size
+        except OSError:
+            return
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        if self._written > self.max_bytes * _GC_EVERY:
+            self.gc()
+
+    def _files(self) -> list[tuple[float, int, Path]]:
+        out: list[tuple[float, int, Path]] = []
+        for p in self.root.glob(f"*/*{_SUFFIX}"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue  # 他プロセスの gc で消えた
+            out.append((st.st_mtime, st.st_size, p))
+        return out
+
+    def gc(self, max_bytes: int | None = None) -> dict[str, Any]:
+        limit = self.max_bytes if max_bytes is None else int(max_bytes)
+        files = sorted(self._files(), key=lambda f: f[0])
+        total = sum(f[1] for f in files)
+        removed = 0
+        for _mtime, size, p in files:
+            if total <= limit:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._written = 0
+        return {"removed": removed, "files": len(files) - removed, "bytes": total}
+
+    def stats(self) -> dict[str, Any]:
+        files = self._files()
+        return {"files": len(files), "bytes": sum(f[1] for f in files), "max_bytes": self.max_bytes}
+
+
+def feature_store_from_env() -> ArrowFeatureStore | None:
+    """GDX_FEATURE_STORE が真ならストアを返す（既定は無効 = None）"""
+    if os.getenv("GDX_FEATURE_STORE", "").strip().lower() not in _TRUTHY:
+        return None
+    root = os.getenv("GDX_FEATURE_STORE_DIR", "").strip() or DEFAULT_STORE_DIR
+    raw = os.getenv("GDX_FEATURE_STORE_MB", str(DEFAULT_STORE_MB)).strip()
+    try:
+        mb = float(raw)
+    except ValueError:
+        mb = float(DEFAULT_STORE_MB)
+    return ArrowFeatureStore(root, max_bytes=int(mb * 1024 * 1024))
@@ -0,0 +1,151 @@
+"""
+OHLCV のホット層（Arrow IPC = Feather v2・無圧縮）。
+- Parquet を一度だけ正規化（UTC・重複除去・ソート）して {ROOT}/{symbol}/{tf}/ohlcv.arrow に保存
+- 読込はメモリマップで開き、列はコピーせずに DataFrame 化する
+  （同じファイルを読む複数プロセスは OS のページキャッシュを共有する）
+- 元 Parquet の指紋（相対パス/mtime/size）をスキーマメタデータに持ち、元が更新されたら使わない
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from trade_app.adapters.parquet.layout import read_ohlcv, source_files
+from trade_app.adapters.parquet.ohlcv_dataset import scan_bounds
+
+HOT_FILENAME = "ohlcv.arrow"
+_SOURCE_META_KEY = b"gdx.source"
+_INDEX_NAME = "time"
+_NS_PER_UNIT = {"s": 1_000_000_000, "ms": 1_000_000, "us": 1_000, "ns": 1}
+
+
+def hot_tier_path(root: Path, symbol: str, timeframe: str) -> Path:
+    return root / symbol / timeframe / HOT_FILENAME
+
+
+def source_signature(root: Path, symbol: str, timeframe: str) -> str:
+    """元 Parquet 群の指紋（JSON 文字列）。ファイルが無ければ "[]" """
+    items: list[list[Any]] = []
+    for p in source_files(root, symbol, timeframe):
+        st = p.stat()
+        items.append([p.relative_to(root).as_posix(), int(st.st_mtime_ns), int(st.st_size)])
+    return json.dumps(items)
+
+
+def build_hot_tier(root: Path, symbol: str, timeframe: str) -> Path:
+    """元 Parquet（file/hive）を正規化済みの無圧縮 Arrow IPC に変換（原子的に置換）"""
+    import pyarrow as pa  # noqa: PLC0415
+
+    sig = source_signature(root, symbol, timeframe)  # 読込前に取る（読込中の更新は次回検出）
+    if sig == "[]":
+        raise FileNotFoundError(f"No Parquet found under {root} for {symbol}/{timeframe}")
+    df = read_ohlcv(root, symbol, timeframe)
+    df.index.name = _INDEX_NAME
+    table = pa.Table.from_pandas(df, preserve_index=True).combine_chunks()
+    # 読込側は int64 ns で二分探索するため、元の単位（µs 等）に関わらず ns で保存する
+    pos = table.schema.get_field_index(_INDEX_NAME)
+    table = table.set_column(pos, _INDEX_NAME, table.column(pos).cast(pa.timestamp("ns", tz="UTC")))
+    meta = dict(table.schema.metadata or {})
+    meta[_SOURCE_META_KEY] = sig.encode()
+    table = table.replace_schema_metadata(meta)
+
+    path = hot_tier_path(root, symbol, timeframe)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+    try:
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            # 1 レコードバッチ＝各列が連続領域（読込側でゼロコピー化できる）
+            writer.write_table(table, max_chunksize=max(1, table.num_rows))
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return path
+
+
+def _open(path: Path):
+    import pyarrow as pa  # noqa: PLC0415
+
+    with pa.memory_map(str(path), "r") as source:
+        # 戻り値のバッファはマップ領域を参照し続ける（close 後も有効）
+        return pa.ipc.open_file(source).read_all()
+
+
+def hot_tier_is_fresh(root: Path, symbol: str, timeframe: str) -> bool:
+    path = hot_tier_path(root, symbol, timeframe)
+    if not path.exists():
+        return False
+    meta = _open(path).schema.metadata or {}
+    return meta.get(_SOURCE_META_KEY, b"").decode() == source_signature(root, symbol, timeframe)
+
+
+def _single_chunk(col):
+    return col.chunk(0) if col.num_chunks == 1 else col.combine_chunks()
+
+
+def _column_numpy(arr) -> np.ndarray:
+    try:
+        return arr.to_numpy(zero_copy_only=True)
+    except Exception:
+        # null を含む等でゼロコピー不可（稀）
+        return arr.to_numpy(zero_copy_only=False)
+
+
+def table_to_frame(
+    table,
+    start: Any = None,
+    end: Any = None,
+    columns: Sequence[str] | None = None,
+) -> pd.DataFrame:
+    """
+    正規化済みテーブルから [start, end] と列を切り出して DataFrame 化。
+    - 期間は time 列の二分探索で決め、列はマップ領域をそのまま参照（読み取り専用）
+    - index（int64 ns）だけは tz 付与のため 1 回コピーされる
+    - ns 以外の単位で保存された time 列（旧ファイル）はスキーマの単位から ns に換算する
+    """
+    import pyarrow as pa  # noqa: PLC0415
+
+    col = _single_chunk(table.column(_INDEX_NAME))
+    unit = getattr(col.type, "unit", "ns")
+    ns = _column_numpy(col.view(pa.int64()))
+    if unit != "ns":
+        ns = ns * _NS_PER_UNIT[unit]
+    lo, hi = scan_bounds(start, end)
+    a = 0 if lo is None else int(np.searchsorted(ns, lo.value, side="left"))
+    b = len(ns) if hi is None else int(np.searchsorted(ns, hi.value, side="right"))
+    b = max(a, b)
+
+    names = [n for n in table.column_names if n != _INDEX_NAME]
+    if columns is not None:
+        by_lower = {n.lower(): n for n in names}
+        names = [by_lower[c.lower()] for c in columns if c.lower() in by_lower]
+
+    cols = {n.lower(): _column_numpy(_single_chunk(table.column(n)).slice(a, b - a)) for n in names}
+    index = pd.DatetimeIndex(ns[a:b].view("M8[ns]"), name=_INDEX_NAME).tz_localize("UTC")
+    return pd.DataFrame(cols, index=index, copy=False)
+
+
+def read_hot_tier(
+    root: Path,
+    symbol: str,
+    timeframe: str,
+    start: Any = None,
+    end: Any = None,
+    columns: Sequence[str] | None = None,
+) -> pd.DataFrame | None:
+    """ホット層から読む。未作成または元 Parquet より古い場合は None（呼び手は Parquet へ）"""
+    path = hot_tier_path(root, symbol, timeframe)
+    if not path.exists():
+        return None
+    table = _open(path)
+    meta = table.schema.metadata or {}
+    if meta.get(_SOURCE_META_KEY, b"").decode() != source_signature(root, symbol, timeframe):
+        return None
+    return table_to_frame(table, start, end, columns)
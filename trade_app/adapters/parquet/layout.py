@@ -0,0 +1,256 @@
+"""
+OHLCV Parquet の保存レイアウト。
+- file: {ROOT}/{symbol}/{tf}/ohlcv.parquet（単一ファイル・従来形式）
+- hive: {ROOT}/symbol={symbol}/tf={tf}/year=YYYY/month=MM/part-*.parquet
+  （月単位パーティション。書込は該当月だけ既存行とマージして置換し、読込は期間が重なる月だけ開く）
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from trade_app.adapters.parquet.ohlcv_dataset import (
+    align_dtypes_to,
+    max_index_timestamp,
+    normalize_timeseries,
+    read_ohlcv_parquet,
+    scan_bounds,
+    write_time_bounded_parquet,
+)
+
+LAYOUT_FILE = "file"
+LAYOUT_HIVE = "hive"
+SINGLE_FILENAME = "ohlcv.parquet"
+PART_FILENAME = "part-0.parquet"
+PART_PATTERN = "part-{n}.parquet"
+
+
+def single_file_path(root: Path, symbol: str, timeframe: str) -> Path:
+    return root / symbol / timeframe / SINGLE_FILENAME
+
+
+def hive_dir(root: Path, symbol: str, timeframe: str) -> Path:
+    return root / f"symbol={symbol}" / f"tf={timeframe}"
+
+
+def hive_partition_dir(root: Path, symbol: str, timeframe: str, year: int, month: int) -> Path:
+    return hive_dir(root, symbol, timeframe) / f"year={year:04d}" / f"month={month:02d}"
+
+
+def _kv(name: str) -> tuple[str, str] | None:
+    if "=" not in name:
+        return None
+    k, v = name.split("=", 1)
+    return k, v
+
+
+def iter_hive_partitions(root: Path, symbol: str, timeframe: str) -> Iterator[tuple[int, Path]]:
+    """(year*12 + month-1, パーティションdir) を月順で列挙"""
+    base = hive_dir(root, symbol, timeframe)
+    if not base.is_dir():
+        return
+    found: list[tuple[int, Path]] = []
+    for ydir in base.iterdir():
+        ykv = _kv(ydir.name)
+        if not ydir.is_dir() or ykv is None or ykv[0] != "year":
+            continue
+        for mdir in ydir.iterdir():
+            mkv = _kv(mdir.name)
+            if not mdir.is_dir() or mkv is None or mkv[0] != "month":
+                continue
+            try:
+                found.append((int(ykv[1]) * 12 + int(mkv[1]) - 1, mdir))
+            except ValueError:
+                continue
+    yield from sorted(found)
+
+
+def _part_files(pdir: Path) -> list[Path]:
+    return sorted(p for p in pdir.glob("*.parquet") if not p.name.startswith("."))
+
+
+def list_hive_files(
+    root: Path, symbol: str, timeframe: str, start: Any = None, end: Any = None
+) -> list[Path]:
+    """期間 [start, end] と重なる月パーティションのファイルだけを返す（パーティション枝刈り）"""
+    lo, hi = scan_bounds(start, end)
+    lo_m = None if lo is None else lo.year * 12 + lo.month - 1
+    hi_m = None if hi is None else hi.year * 12 + hi.month - 1
+    out: list[Path] = []
+    for ym, pdir in iter_hive_partitions(root, symbol, timeframe):
+        if lo_m is not None and ym < lo_m:
+            continue
+        if hi_m is not None and ym > hi_m:
+            continue
+        out.extend(_part_files(pdir))
+    return out
+
+
+def resolve_layout(root: Path, symbol: str, timeframe: str) -> str | None:
+    """保存済みレイアウトを判定（hive 優先。どちらも無ければ None）"""
+    if any(True for _ in iter_hive_partitions(root, symbol, timeframe)):
+        return LAYOUT_HIVE
+    if single_file_path(root, symbol, timeframe).exists():
+        return LAYOUT_FILE
+    return None
+
+
+def source_files(root: Path, symbol: str, timeframe: str) -> list[Path]:
+    """保存済みの全ファイル（hive 優先。無ければ空）"""
+    layout = resolve_layout(root, symbol, timeframe)
+    if layout == LAYOUT_HIVE:
+        return list_hive_files(root, symbol, timeframe)
+    if layout == LAYOUT_FILE:
+        return [single_file_path(root, symbol, timeframe)]
+    return []
+
+
+def read_ohlcv(
+    root: Path,
+    symbol: str,
+    timeframe: str,
+    start: Any = None,
+    end: Any = None,
+    columns: Any = None,
+) -> pd.DataFrame:
+    """レイアウトを自動判定して [start, end] を読む（hive は重なる月だけ開く）"""
+    layout = resolve_layout(root, symbol, timeframe)
+    if layout == LAYOUT_HIVE:
+        files = list_hive_files(root, symbol, timeframe, start, end)
+        if not files:
+            # 期間外: スキーマだけ得るため1ファイル開き、フィルタで全行落とす
+            files = list_hive_files(root, symbol, timeframe)[:1]
+        return read_ohlcv_parquet(files, start, end, columns)
+    if layout == LAYOUT_FILE:
+        return read_ohlcv_parquet(single_file_path(root, symbol, timeframe), start, end, columns)
+    raise FileNotFoundError(f"No Parquet found under {root} for {symbol}/{timeframe}")
+
+
+def _month_groups(df: pd.DataFrame) -> Iterator[tuple[int, int, pd.DataFrame]]:
+    naive = df.index.tz_convert("UTC").tz_localize(None)
+    keys = naive.year * 12 + naive.month - 1
+    for ym in pd.unique(keys):
+        year, month = divmod(int(ym), 12)
+        yield year, month + 1, df[keys == ym]
+
+
+def write_hive_partitions(
+    df: pd.DataFrame,
+    root: Path,
+    symbol: str,
+    timeframe: str,
+    *,
+    compression: str = "snappy",
+    filename: str = PART_FILENAME,
+) -> list[Path]:
+    """
+    df を月ごとに分けて各パーティションへ書く（該当月のファイルだけを原子的に置換）。
+    - 月の途中だけの df でも既存の行は残す（既存と結合し、時刻が重なる行は df 側を採る）
+    - 他の月のパーティションには触れない
+    """
+    df = normalize_timeseries(df.copy())
+    if df.empty:
+        return []
+    if df.index.name is None:
+        df.index.name = "time"
+    paths: list[Path] = []
+    for year, month, part in _month_groups(df):
+        pdir = hive_partition_dir(root, symbol, timeframe, year, month)
+        existing = _part_files(pdir) if pdir.is_dir() else []
+        rows = part
+        if existing:
+            old = read_ohlcv_parquet(existing)
+            old = old[~old.index.isin(part.index)]
+            rows = align_dtypes_to(part, existing[0])
+            rows = pd.concat([rows, old[[c for c in rows.columns if c in old.columns]]])
+            rows = rows.sort_index()
+        path = write_time_bounded_parquet(
+            rows, pdir / filename, row_group_freq="month", compression=compression
+        )
+        # 追記で増えた part-N は置換後の月には不要（重複行の原因になる）
+        for stale in _part_files(pdir):
+            if stale != path:
+                stale.unlink()
+        paths.append(path)
+    return paths
+
+
+def append_hive_partitions(
+    df: pd.DataFrame,
+    root: Path,
+    symbol: str,
+    timeframe: str,
+    *,
+    compression: str = "snappy",
+) -> list[Path]:
+    """
+    df を月パーティションへ追記する。既存の月には新しい part-N ファイルを足すだけで、
+    既存ファイルは書き換えない（各ファイルは一時ファイル経由で原子的に作成）。
+    """
+    df = normalize_timeseries(df.copy())
+    if df.empty:
+        return []
+    if df.index.name is None:
+        df.index.name = "time"
+    paths: list[Path] = []
+    for year, month, part in _month_groups(df):
+        pdir = hive_partition_dir(root, symbol, timeframe, year, month)
+        existing = _part_files(pdir) if pdir.is_dir() else []
+        rows = align_dtypes_to(part, existing[0]) if existing else part
+        n = len(existing)
+        while (pdir / PART_PATTERN.format(n=n)).exists():
+            n += 1
+        path = pdir / PART_PATTERN.format(n=n)
+        paths.append(
+            write_time_bounded_parquet(rows, path, row_group_freq="month", compression=compression)
+        )
+    return paths
+
+
+def last_hive_timestamp(root: Path, symbol: str, timeframe: str) -> pd.Timestamp | None:
+    """hive の最終時刻（末尾の月パーティションの統計だけを見る）"""
+    parts = list(iter_hive_partitions(root, symbol, timeframe))
+    for _ym, pdir in reversed(parts):
+        files = _part_files(pdir)
+        if files:
+            return max_index_timestamp(files)
+    return None
+
+
+def migrate_file_to_hive(
+    root: Path, symbol: str, timeframe: str, *, remove_source: bool = False
+) -> list[Path]:
+    """単一ファイル {symbol}/{tf}/ohlcv.parquet を hive レイアウトへ変換"""
+    src = single_file_path(root, symbol, timeframe)
+    if not src.exists():
+        raise FileNotFoundError(src)
+    df = read_ohlcv_parquet(src)
+    paths = write_hive_partitions(df, root, symbol, timeframe)
+    if remove_source:
+        os.remove(src)
+    return paths
+
+
+def discover_single_files(root: Path) -> list[tuple[str, str]]:
+    """ROOT 配下の単一ファイルレイアウト (symbol, tf) を列挙"""
+    out: list[tuple[str, str]] = []
+    for p in sorted(root.glob(f"*/*/{SINGLE_FILENAME}")):
+        sym, tf = p.parent.parent.name, p.parent.name
+        if "=" in sym:
+            continue
+        out.append((sym, tf))
+    return out
+
+
+def discover_datasets(root: Path) -> list[tuple[str, str]]:
+    """ROOT 配下の (symbol, tf) を両レイアウトから列挙（重複除去・ソート済み）"""
+    found = set(discover_single_files(root))
+    for tdir in root.glob("symbol=*/tf=*"):
+        if tdir.is_dir():
+            found.add((tdir.parent.name.split("=", 1)[1], tdir.name.split("=", 1)[1]))
+    return sorted(found)
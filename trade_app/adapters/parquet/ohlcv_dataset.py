@@ -0,0 +1,252 @@
+"""
+OHLCV Parquet の読み書き（pyarrow 直結）。
+- 読込: pyarrow.dataset で時間フィルタと列射影をスキャンに押し込む
+  （行グループ統計で [start, end] 外の行グループはデコードしない）
+- 書込: 時刻ソート済み・期間で区切った行グループ＋統計付きで保存
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Sequence
+from itertools import pairwise
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# 行グループ区切りの別名 → pandas Period 頻度
+ROW_GROUP_FREQS: dict[str, str] = {
+    "year": "Y",
+    "month": "M",
+    "week": "W",
+    "day": "D",
+}
+
+
+def normalize_timeseries(df: pd.DataFrame) -> pd.DataFrame:
+    """DatetimeIndexをUTCに正規化し、重複を除去してソート。
+    - tz-naiveも強制的にUTCとみなしてtz-aware化
+    - インデックスが日時でない場合はto_datetimeを試みる
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        try:
+            df.index = pd.to_datetime(df.index, utc=True)
+        except Exception:
+            return df
+    # tz-naive -> UTC
+    elif df.index.tz is None:
+        df.index = df.index.tz_localize("UTC")
+    else:
+        # 一旦UTCへ
+        df.index = df.index.tz_convert("UTC")
+    if df.index.has_duplicates:
+        df = df[~df.index.duplicated()]
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    return df
+
+
+def _to_utc(ts: pd.Timestamp) -> pd.Timestamp:
+    return ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC")
+
+
+def scan_bounds(start: Any, end: Any) -> tuple[pd.Timestamp | None, pd.Timestamp | None]:
+    """
+    押し込み用の [lo, hi]（UTC, 両端含む）。
+    文字列は df.loc の部分文字列スライスと同じく期間全体を含める
+    （例: end="2024-12-31" → 同日 23:59:59.999999999 まで）。
+    """
+
+    def _one(v: Any, upper: bool) -> pd.Timestamp | None:
+        if v is None:
+            return None
+        if isinstance(v, str):
+            try:
+                p = pd.Period(v)
+                return _to_utc(p.end_time if upper else p.start_time)
+            except Exception:
+                pass
+        return _to_utc(pd.Timestamp(v))
+
+    return _one(start, False), _one(end, True)
+
+
+def _index_column(schema) -> str | None:
+    meta = schema.pandas_metadata or {}
+    for c in meta.get("index_columns", []):
+        if isinstance(c, str):
+            return c
+    return "time" if "time" in schema.names else None
+
+
+def read_ohlcv_parquet(
+    path: Path | str | Sequence[Path | str],
+    start: Any = None,
+    end: Any = None,
+    columns: Sequence[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Parquet（単一/複数ファイル）から [start, end] と列を押し込んで読む。
+    戻り値は UTC 正規化済み・列名小文字の DataFrame。
+    """
+    import pyarrow as pa  # noqa: PLC0415
+    import pyarrow.dataset as ds  # noqa: PLC0415
+
+    sources = [str(p) for p in path] if isinstance(path, list | tuple) else str(path)
+    dataset = ds.dataset(sources, format="parquet")
+    schema = dataset.schema
+    idx_col = _index_column(schema)
+    if idx_col is None:
+        raise ValueError("time index column not found in parquet schema")
+
+    names = [n for n in schema.names if n != idx_col]
+    if columns is not None:
+        by_lower = {n.lower(): n for n in names}
+        names = [by_lower[c.lower()] for c in columns if c.lower() in by_lower]
+
+    lo, hi = scan_bounds(start, end)
+    expr = None
+    field_type = schema.field(idx_col).type
+    for bound, is_lo in ((lo, True), (hi, False)):
+        if bound is None:
+            continue
+        scalar = pa.scalar(bound.value, type=pa.int64()).cast(pa.timestamp("ns", tz="UTC"))
+        scalar = scalar.cast(field_type, safe=False)
+        cond = ds.field(idx_col) >= scalar if is_lo else ds.field(idx_col) <= scalar
+        expr = cond if expr is None else (expr & cond)
+
+    table = dataset.to_table(columns=[*names, idx_col], filter=expr)
+    df = table.to_pandas()
+    if idx_col in df.columns:
+        df = df.set_index(idx_col)
+    df.index.name = idx_col
+    df = normalize_timeseries(df)
+    if start is not None or end is not None:
+        df = df.loc[start:end]
+    df.columns = [str(c).lower() for c in df.columns]
+    return df
+
+
+def _period_starts(index: pd.DatetimeIndex, freq: str) -> np.ndarray:
+    """各期間（月など）の先頭位置。index はソート済み前提"""
+    naive = index.tz_convert("UTC").tz_localize(None) if index.tz is not None else index
+    codes = naive.to_period(ROW_GROUP_FREQS.get(freq.lower(), freq)).asi8
+    if len(codes) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+
+
+def write_time_bounded_parquet(
+    df: pd.DataFrame,
+    path: Path,
+    *,
+    row_group_freq: str = "month",
+    compression: str = "snappy",
+) -> Path:
+    """
+    時刻ソート・重複除去した上で、期間ごと（既定: 月）に1行グループとして書く。
+    - 各行グループは time の min/max 統計を持つため、読込時の押し込みで枝刈りできる
+    - 一時ファイルに書いてから置換（途中失敗で既存ファイルを壊さない）
+    """
+    import pyarrow as pa  # noqa: PLC0415
+    import pyarrow.parquet as pq  # noqa: PLC0415
+
+    df = normalize_timeseries(df.copy())
+    if df.index.name is None:
+        df.index.name = "time"
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    starts = _period_starts(df.index, row_group_freq)
+    bounds = [*starts.tolist(), len(df)]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+    try:
+        with pq.ParquetWriter(
+            tmp, table.schema, compression=compression, write_statistics=True
+        ) as writer:
+            for a, b in pairwise(bounds):
+                writer.write_table(table.slice(a, b - a), row_group_size=max(1, b - a))
+            if len(df) == 0:
+                writer.write_table(table)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return path
+
+
+def row_group_time_ranges(path: Path) -> list[tuple[Any, Any]]:
+    """行グループごとの time の (min, max) 統計（診断・テスト用）"""
+    import pyarrow.parquet as pq  # noqa: PLC0415
+
+    pf = pq.ParquetFile(path)
+    name = _index_column(pf.schema_arrow) or "time"
+    col_i = pf.schema_arrow.get_field_index(name)
+    out: list[tuple[Any, Any]] = []
+    for i in range(pf.metadata.num_row_groups):
+        st = pf.metadata.row_group(i).column(col_i).statistics
+        out.append((st.min, st.max) if st is not None and st.has_min_max else (None, None))
+    return out
+
+
+def max_index_timestamp(paths: Sequence[Path]) -> pd.Timestamp | None:
+    """
+    保存済みファイル群の最終時刻（UTC）。
+    行グループの max 統計だけを読む（統計が無い場合のみ time 列を読む）。
+    """
+    import pyarrow.parquet as pq  # noqa: PLC0415
+
+    last: pd.Timestamp | None = None
+    for path in paths:
+        pf = pq.ParquetFile(path)
+        name = _index_column(pf.schema_arrow) or "time"
+        col_i = pf.schema_arrow.get_field_index(name)
+        for i in range(pf.metadata.num_row_groups):
+            rg = pf.metadata.row_group(i)
+            if rg.num_rows == 0:
+                continue
+            st = rg.column(col_i).statistics
+            if st is not None and st.has_min_max:
+                ts = pd.Timestamp(st.max)
+            else:
+                col = pf.read_row_group(i, columns=[name]).column(0)
+                ts = pd.Timestamp(col.to_pandas().max())
+            ts = _to_utc(ts)
+            if last is None or ts > last:
+                last = ts
+    return last
+
+
+def align_dtypes_to(df: pd.DataFrame, path: Path) -> pd.DataFrame:
+    """既存ファイルのスキーマに列 dtype を合わせる（追記でスキーマが割れないように）"""
+    import pyarrow.parquet as pq  # noqa: PLC0415
+
+    dtypes = pq.read_schema(path).empty_table().to_pandas().dtypes
+    common = {c: dtypes[c] for c in df.columns if c in dtypes.index and df[c].dtype != dtypes[c]}
+    return df.astype(common) if common else df
+
+
+def append_time_bounded_parquet(
+    df: pd.DataFrame,
+    path: Path,
+    *,
+    row_group_freq: str = "month",
+    compression: str = "snappy",
+) -> Path:
+    """
+    既存ファイルの末尾に df を追記する（時刻が重なる行は既存側を残す）。
+    Parquet は追記不可のため既存＋新規を期間区切りの行グループで書き直し、原子的に置換する。
+    """
+    if not path.exists():
+        return write_time_bounded_parquet(
+            df, path, row_group_freq=row_group_freq, compression=compression
+        )
+    existing = read_ohlcv_parquet(path)
+    df = align_dtypes_to(normalize_timeseries(df.copy()), path)
+    combined = pd.concat([existing, df[[c for c in existing.columns if c in df.columns]]])
+    combined.index.name = existing.index.name
+    return write_time_bounded_parquet(
+        combined, path, row_group_freq=row_group_freq, compression=compression
+    )
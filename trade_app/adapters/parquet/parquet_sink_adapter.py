@@ -5,6 +5,18 @@ from typing import ClassVar
 
 import pandas as pd
 
+from trade_app.adapters.parquet.layout import (
+    LAYOUT_HIVE,
+    append_hive_partitions,
+    hive_dir,
+    last_hive_timestamp,
+    write_hive_partitions,
+)
+from trade_app.adapters.parquet.ohlcv_dataset import (
+    append_time_bounded_parquet,
+    max_index_timestamp,
+    write_time_bounded_parquet,
+)
 from trade_app.domain.ports.parquet_sink import ParquetSinkPort
 
 
@@ -13,7 +25,7 @@ class ParquetSinkAdapter(ParquetSinkPort):
 
     __responsibility__: ClassVar[str] = "Parquet書き出しの実装（ローカルFS想定）"
     __debt_reason__: ClassVar[dict[str, str]] = {
-        "reason": "クラウド/パーティション分割は将来対応（ここで吸収）",
+        "reason": "クラウド対応は将来（ここで吸収）",
         "owner": "infra",
     }
 
@@ -27,9 +39,59 @@ class ParquetSinkAdapter(ParquetSinkPort):
         filename: str | None = None,
         engine: str = "pyarrow",
         compression: str = "snappy",
+        row_group_freq: str | None = None,
+        layout: str | None = None,
     ) -> Path:
+        if layout == LAYOUT_HIVE:
+            # base_dir を ROOT とみなし symbol=/tf=/year=/month= に分割（該当月だけ置換）
+            write_hive_partitions(df, base_dir, symbol, timeframe, compression=compression)
+            return hive_dir(base_dir, symbol, timeframe)
         base_dir.mkdir(parents=True, exist_ok=True)
-        fname = filename or f"{symbol}_{timeframe}.parquet"
-        path = base_dir / fname
+        path = self._file_path(base_dir, symbol, timeframe, filename)
+        if row_group_freq:
+            # 時刻ソート＋期間区切りの行グループ（読込側の期間押し込みで枝刈り可能）
+            return write_time_bounded_parquet(
+                df, path, row_group_freq=row_group_freq, compression=compression
+            )
         df.to_parquet(path, engine=engine, compression=compression, index=True)
         return path
+
+    @staticmethod
+    def _file_path(base_dir: Path, symbol: str, timeframe: str, filename: str | None) -> Path:
+        return base_dir / (filename or f"{symbol}_{timeframe}.parquet")
+
+    def last_timestamp(
+        self,
+        base_dir: Path,
+        symbol: str,
+        timeframe: str,
+        *,
+        filename: str | None = None,
+        layout: str | None = None,
+    ) -> pd.Timestamp | None:
+        if layout == LAYOUT_HIVE:
+            return last_hive_timestamp(base_dir, symbol, timeframe)
+        path = self._file_path(base_dir, symbol, timeframe, filename)
+        return max_index_timestamp([path]) if path.exists() else None
+
+    def append(
+        self,
+        df: pd.DataFrame,
+        base_dir: Path,
+        symbol: str,
+        timeframe: str,
+        *,
+        filename: str | None = None,
+        compression: str = "snappy",
+        row_group_freq: str | None = None,
+        layout: str | None = None,
+    ) -> Path:
+        if layout == LAYOUT_HIVE:
+            # 既存月には part-N を足すだけ（既存ファイルは書き換えない）
+            append_hive_partitions(df, base_dir, symbol, timeframe, compression=compression)
+            return hive_dir(base_dir, symbol, timeframe)
+        base_dir.mkdir(parents=True, exist_ok=True)
+        path = self._file_path(base_dir, symbol, timeframe, filename)
+        return append_time_bounded_parquet(
+            df, path, row_group_freq=row_group_freq or "month", compression=compression
+        )
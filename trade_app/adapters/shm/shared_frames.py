@@ -0,0 +1,208 @@
+"""
+DataFrame（時刻 index＋数値列）を multiprocessing.shared_memory に載せて
+プロセス間でコピーせずに共有する。
+
+ブロック配置（1フレーム＝1ブロック、各領域 nrows*8 バイト）:
+  [index int64 ns (UTC)] [col0 float64] [col1 float64] ...
+
+- 親（publisher）が一度だけ読み込んで書き込み、子は名前で attach して読み取り専用ビューを作る
+- ハンドル（SharedFrameHandle）は小さく picklable なので、そのままワーカー引数に渡せる
+- OHLCV だけでなく特徴量パネル（列＝特徴量名）も同じ形式で載せられる
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import uuid
+from collections.abc import Hashable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, ClassVar
+
+import numpy as np
+import pandas as pd
+
+_ITEM = 8  # int64 / float64
+
+
+@dataclass(frozen=True)
+class SharedFrameHandle:
+    """共有ブロックの所在と形（picklable）"""
+
+    name: str
+    nrows: int
+    columns: tuple[str, ...]
+    index_name: str | None = "time"
+
+    @property
+    def nbytes(self) -> int:
+        return (len(self.columns) + 1) * max(1, self.nrows) * _ITEM
+
+
+def _views(buf, handle: SharedFrameHandle) -> tuple[np.ndarray, list[np.ndarray]]:
+    n = handle.nrows
+    index = np.ndarray((n,), dtype=np.int64, buffer=buf, offset=0)
+    cols = [
+        np.ndarray((n,), dtype=np.float64, buffer=buf, offset=(i + 1) * n * _ITEM)
+        for i in range(len(handle.columns))
+    ]
+    return index, cols
+
+
+def frame_from_block(
+    buf, handle: SharedFrameHandle, a: int = 0, b: int | None = None, columns=None
+) -> pd.DataFrame:
+    """
+    共有ブロックの [a, b) 行を DataFrame 化（列は共有領域への読み取り専用ビュー）。
+    index（int64 ns）だけは tz 付与のため 1 回コピーされる。
+    """
+    index, cols = _views(buf, handle)
+    b = handle.nrows if b is None else b
+    wanted = handle.columns if columns is None else tuple(columns)
+    data: dict[str, np.ndarray] = {}
+    for name in wanted:
+        arr = cols[handle.columns.index(name)][a:b]
+        arr.flags.writeable = False
+        data[name] = arr
+    idx = pd.DatetimeIndex(index[a:b].view("M8[ns]"), name=handle.index_name).tz_localize("UTC")
+    return pd.DataFrame(data, index=idx, copy=False)
+
+
+def index_view(buf, handle: SharedFrameHandle) -> np.ndarray:
+    """時刻（int64 ns, UTC）の読み取り専用ビュー（期間の二分探索用）"""
+    index, _ = _views(buf, handle)
+    index.flags.writeable = False
+    return index
+
+
+class SharedFramePublisher:
+    """
+    親プロセス側: フレームを共有メモリへ書き出し、ハンドルを配る。
+    with 文（または close()）で全ブロックを解放（unlink）する。
+    """
+
+    __responsibility__: ClassVar[str] = "共有メモリブロックの作成・寿命管理（親プロセス）"
+
+    def __init__(self, prefix: str = "gdx") -> None:
+        self._prefix = f"{prefix}_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        self._blocks: dict[Hashable, tuple[shared_memory.SharedMemory, SharedFrameHandle]] = {}
+
+    def __enter__(self) -> SharedFramePublisher:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def handles(self) -> dict[Hashable, SharedFrameHandle]:
+        return {k: h for k, (_shm, h) in self._blocks.items()}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(h.nbytes for _shm, h in self._blocks.values())
+
+    def publish_frame(self, key: Hashable, df: pd.DataFrame) -> SharedFrameHandle:
+        """
+        df を1ブロックに書き出す（同じ key は置き換え）。
+        - index は UTC へ変換して int64 ns、列は float64 に揃える
+        """
+        if not isinstance(df.index, pd.DatetimeIndex) or df.index.tz is None:
+            raise ValueError("Data index must be timezone-aware")
+        columns = tuple(str(c) for c in df.columns)
+        self.release(key)
+        handle = SharedFrameHandle(
+            name=f"{self._prefix}_{len(self._blocks)}_{uuid.uuid4().hex[:6]}",
+            nrows=len(df),
+            columns=columns,
+            index_name=df.index.name,
+        )
+        shm = shared_memory.SharedMemory(name=handle.name, create=True, size=handle.nbytes)
+        index, cols = _views(shm.buf, handle)
+        index[:] = df.index.tz_convert("UTC").as_unit("ns").asi8  # µs 等の Index も ns で保存
+        for dst, c in zip(cols, df.columns, strict=True):
+            dst[:] = df[c].to_numpy(dtype=np.float64, na_value=np.nan)
+        del index, cols  # close() 前にビューを手放す
+        self._blocks[key] = (shm, handle)
+        return handle
+
+    def publish_ohlcv(
+        self,
+        feed,
+        symbols: Iterable[str],
+        timeframes: Iterable[str],
+        *,
+        start: str | None = None,
+        end: str | None = None,
+        columns: Sequence[str] = ("open", "high", "low", "close", "volume"),
+        tz: str = "UTC",
+    ) -> dict[tuple[str, str], SharedFrameHandle]:
+        """
+        DataFeedPort から (symbol, timeframe) ごとに1回だけ読み、共有ブロックへ載せる。
+        データが無い組合せ（FileNotFoundError）は飛ばす（子側でも同じ例外になる）。
+        """
+        out: dict[tuple[str, str], SharedFrameHandle] = {}
+        for sym in symbols:
+            for tf in timeframes:
+                try:
+                    dto = feed.load(
+                        [sym], start=start, end=end, columns=tuple(columns), timeframe=tf, tz=tz
+                    )
+                except FileNotFoundError:
+                    continue
+                out[(sym, tf)] = self.publish_frame((sym, tf), dto.frame)
+        return out
+
+    def release(self, key: Hashable) -> None:
+        item = self._blocks.pop(key, None)
+        if item is None:
+            return
+        shm, _h = item
+        with contextlib.suppress(BufferError):
+            shm.close()
+        with contextlib.suppress(FileNotFoundError):
+            shm.unlink()
+
+    def close(self) -> None:
+        for key in list(self._blocks):
+            self.release(key)
+
+
+class SharedFrameReader:
+    """子プロセス側: ハンドルから attach してビューを作る（attach は名前ごとに1回）"""
+
+    __responsibility__: ClassVar[str] = "共有メモリブロックへの attach と読み取り専用ビュー生成"
+
+    def __init__(self) -> None:
+        self._attached: dict[str, shared_memory.SharedMemory] = {}
+
+    def __getstate__(self) -> dict[str, Any]:
+        # attach 済みの領域は送らない（送り先プロセスで改めて attach する）
+        return {}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__()  # type: ignore[misc]
+
+    def buffer(self, handle: SharedFrameHandle):
+        shm = self._attached.get(handle.name)
+        if shm is None:
+            shm = shared_memory.SharedMemory(name=handle.name)
+            self._attached[handle.name] = shm
+        return shm.buf
+
+    def frame(self, handle: SharedFrameHandle, columns=None) -> pd.DataFrame:
+        return frame_from_block(self.buffer(handle), handle, columns=columns)
+
+    def close(self) -> None:
+        """ビューが残っていると閉じられない（その場合はプロセス終了時に解放）"""
+        for shm in self._attached.values():
+            with contextlib.suppress(BufferError):
+                shm.close()
+        self._attached.clear()
+
+
+def frames_from_handles(
+    reader: SharedFrameReader, handles: Mapping[Hashable, SharedFrameHandle]
+) -> dict[Hashable, pd.DataFrame]:
+    """特徴量パネル等をまとめて attach する小ヘルパ"""
+    return {k: reader.frame(h) for k, h in handles.items()}
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, ClassVar
+
+import numpy as np
+import pandas as pd
+
+from trade_app.adapters.parquet.ohlcv_dataset import scan_bounds
+from trade_app.adapters.shm.shared_frames import (
+    SharedFrameHandle,
+    SharedFrameReader,
+    frame_from_block,
+    index_view,
+)
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+from trade_app.domain.ports.data_feed import DataFeedPort
+
+_ONE_NS = pd.Timedelta(1, unit="ns")
+
+
+class SharedMemoryDataFeed(DataFeedPort):
+    """
+    親プロセスが共有メモリに載せた OHLCV を読む DataFeedPort（ワーカー側）。
+    - handles: {(symbol, timeframe): SharedFrameHandle}
+      （SharedFramePublisher.publish_ohlcv の戻り値）
+    - 列は共有領域への読み取り専用ビュー（ワーカー数が増えても RAM は増えない）
+    - 期間は時刻列の二分探索で切り出す（文字列は df.loc と同じく期間全体を含む）
+    - fallback と published（親が載せた [start, end]）を渡すと、その外側にはみ出た分だけ
+      fallback（元の feed）から読んで継ぎ足す（ウォームアップの読み足しなど）
+    """
+
+    __responsibility__: ClassVar[str] = "共有メモリ上の OHLCV を DTO として返す Port 実装"
+
+    def __init__(
+        self,
+        handles: Mapping[tuple[str, str], SharedFrameHandle],
+        reader: SharedFrameReader | None = None,
+        *,
+        fallback: DataFeedPort | None = None,
+        published: tuple[Any, Any] = (None, None),
+    ) -> None:
+        self._handles = dict(handles)
+        self._reader = reader or SharedFrameReader()
+        self._fallback = fallback
+        self._lo, self._hi = scan_bounds(*published)
+
+    def _one(
+        self,
+        symbol: str,
+        timeframe: str | None,
+        start: str | None,
+        end: str | None,
+        columns: Sequence[str],
+    ) -> pd.DataFrame:
+        handle = self._handles.get((symbol, str(timeframe or "")))
+        if handle is None:
+            raise FileNotFoundError(f"not published to shared memory: {symbol}/{timeframe}")
+        buf = self._reader.buffer(handle)
+        ns = index_view(buf, handle)
+        lo, hi = scan_bounds(start, end)
+        a = 0 if lo is None else int(np.searchsorted(ns, lo.value, side="left"))
+        b = len(ns) if hi is None else int(np.searchsorted(ns, hi.value, side="right"))
+        wanted = [c for c in (str(c).lower() for c in columns) if c in handle.columns]
+        frame = frame_from_block(buf, handle, a, max(a, b), wanted)
+        if self._fallback is None:
+            return frame
+        parts = [frame]
+        if self._lo is not None and (lo is None or lo < self._lo):
+            parts.insert(0, self._outside(symbol, timeframe, start, self._lo - _ONE_NS, columns))
+        if self._hi is not None and (hi is None or hi > self._hi):
+            parts.append(self._outside(symbol, timeframe, self._hi + _ONE_NS, end, columns))
+        parts = [p[frame.columns] for p in parts if len(p)]
+        return pd.concat(parts) if len(parts) > 1 else frame
+
+    def _outside(
+        self, symbol: str, timeframe: str | None, start: Any, end: Any, columns: Sequence[str]
+    ) -> pd.DataFrame:
+        """公開範囲の外側を元の feed から読む（データが無ければ空）"""
+        try:
+            return self._fallback.load([symbol], start, end, columns, timeframe).frame
+        except FileNotFoundError:
+            return pd.DataFrame()
+
+    def load(
+        self,
+        symbols: Iterable[str],
+        start: str | None = None,
+        end: str | None = None,
+        columns: Sequence[str] = ("open", "high", "low", "close", "volume"),
+        timeframe: str | None = None,
+        tz: str = "UTC",
+    ) -> OhlcvFrameDTO:
+        symbols = list(symbols)
+        parts = [self._one(sym, timeframe, start, end, columns) for sym in symbols]
+        df = parts[0] if len(parts) == 1 else pd.concat(parts, axis=1, keys=symbols)
+        if "open" not in df.columns:
+            raise ValueError("open column is required")
+        return OhlcvFrameDTO(frame=df, freq=None)
+
+    def close(self) -> None:
+        self._reader.close()
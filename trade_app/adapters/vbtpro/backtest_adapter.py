@@ -4,11 +4,21 @@ import contextlib
 from collections.abc import Mapping
 from typing import Any, ClassVar
 
+import numpy as np
 import pandas as pd
 
+from trade_app.adapters.native.stops import StopRows, stop_terms
 from trade_app.adapters.vbtpro import vbtpro_bindings as vb
 from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+from trade_app.domain.dto.packed_signals import PackedSignalsDTO
+from trade_app.domain.dto.signals import EventSignalsDTO
 from trade_app.domain.ports.backtest import BacktestPort
+from trade_app.domain.services.signal_events import time_exit_events
+
+# column_params で sl_stop/tp_stop に解決済みにするキー（bindings で二重に解決させない）
+_STOP_KEYS = ("sl_stop", "tp_stop", "sl_pct", "tp_pct", "rr", "sl_atr_mult", "tp_atr_mult")
+# sl/tp の解決に使うだけのキー（列ごとに違ってよい）
+_STOP_ONLY_KEYS = ("atr_window",)
 
 
 class VbtProBacktestAdapter(BacktestPort):
@@ -59,6 +69,145 @@ class VbtProBacktestAdapter(BacktestPort):
             result.update(vb.portfolio_metrics(pf))
         return result
 
+    def run_from_events(
+        self,
+        ohlcv: OhlcvFrameDTO,
+        events: EventSignalsDTO,
+        params: Mapping[str, Any] | None = None,
+    ) -> Mapping[str, Any]:
+        """
+        イベント位置のシグナルで run_from_signals する。max_bars_hold の強制 exit は
+        イベントのまま足し、bool 化は from_signals へ渡す直前の1回だけ
+        """
+        if not ohlcv.frame.index.equals(events.index):
+            raise ValueError("events.index must match ohlcv index")
+        p = dict(params or {})
+        hold = p.get("max_bars_hold")
+        if isinstance(hold, int | float) and int(hold) > 0:
+            events = time_exit_events(events, int(hold))
+            p.pop("max_bars_hold")
+        entries = pd.Series(events.mask("entries"), index=events.index)
+        exits = pd.Series(events.mask("exits"), index=events.index)
+        return self.run_from_signals(ohlcv, entries, exits, p)
+
+    def run_from_packed(
+        self,
+        ohlcv: OhlcvFrameDTO,
+        packed: PackedSignalsDTO,
+        params: Mapping[str, Any] | None = None,
+        *,
+        chunk: int = 256,
+    ) -> list[Mapping[str, Any]]:
+        """
+        ビット詰めの K 列を chunk 列ずつ bool の DataFrame に戻して from_signals へ
+        （列方向に並べた1回の実行。展開するのは常に chunk 列ぶんだけ）
+        """
+        if not ohlcv.frame.index.equals(packed.index):
+            raise ValueError("packed.index must match ohlcv index")
+        out: list[Mapping[str, Any]] = []
+        for lo in range(0, packed.n_columns, chunk):
+            hi = min(lo + chunk, packed.n_columns)
+            cols = pd.RangeIndex(lo, hi)
+            entries = pd.DataFrame(packed.entries.columns(lo, hi), packed.index, cols)
+            exits = pd.DataFrame(packed.exits.columns(lo, hi), packed.index, cols)
+            out.append(self.run_from_signals(ohlcv, entries, exits, params))
+        return out
+
+    def run_many(
+        self,
+        ohlcv: OhlcvFrameDTO,
+        entries: np.ndarray | pd.DataFrame,
+        exits: np.ndarray | pd.DataFrame | pd.Series,
+        params: Mapping[str, Any] | None = None,
+        *,
+        column_params: list[Mapping[str, Any]] | None = None,
+    ) -> Mapping[str, Any]:
+        """
+        (bars, K) のシグナルを列方向に並べた1回の from_signals で回す（vbt のブロードキャスト）。
+        column_params は sl/tp 系のキーだけを列ごとに解決して sl_stop/tp_stop に渡す
+        （全列同じなら値、違えば (bars, K) の DataFrame）。他のキー（fees/size/max_bars_hold 等）は
+        全列で同じ値なら params として渡し、列ごとに違えば ValueError（列方向に渡せないため）
+        """
+        df = ohlcv.frame
+        e = np.asarray(entries, dtype=bool)
+        k_all = e.shape[1]
+        cols = pd.RangeIndex(k_all)
+        x = np.asarray(exits, dtype=bool)
+        if x.ndim == 1:
+            x = np.broadcast_to(x[:, None], e.shape)
+        p = dict(params or {})
+        if column_params is not None:
+            if len(column_params) != k_all:
+                raise ValueError("column_params length must match the number of columns")
+            shared = self._column_scalars(p, column_params)
+            stops = self._column_stops(df, cols, p, column_params)
+            for key in _STOP_KEYS:
+                p.pop(key, None)
+            p.update(shared)
+            p.update(stops)
+        res = dict(
+            self.run_from_signals(
+                ohlcv, pd.DataFrame(e, df.index, cols), pd.DataFrame(x, df.index, cols), p
+            )
+        )
+        value = getattr(res["portfolio"], "value", None)
+        if value is not None:
+            value = value() if callable(value) else value
+            equity = np.asarray(value, dtype=float).reshape(len(df.index), k_all)
+            start = equity[0] if len(equity) else np.zeros(k_all)
+            with contextlib.suppress(Exception):
+                start = np.asarray(res["portfolio"].init_cash, dtype=float)
+            res["equity"] = equity
+            with np.errstate(divide="ignore", invalid="ignore"):
+                res["total_return"] = np.where(start > 0, equity[-1] / start - 1.0, 0.0)
+        return res
+
+    @staticmethod
+    def _column_scalars(
+        params: Mapping[str, Any], column_params: list[Mapping[str, Any]]
+    ) -> dict[str, Any]:
+        """sl/tp 系以外のキーの値（全列で同じもの）。列ごとに違うキーがあれば ValueError"""
+        keys = {k for cp in column_params for k in cp}
+        keys -= {*_STOP_KEYS, *_STOP_ONLY_KEYS}
+        out: dict[str, Any] = {}
+        varying: list[str] = []
+        for key in sorted(keys):
+            values = [cp.get(key, params.get(key)) for cp in column_params]
+            if all(v == values[0] for v in values):
+                out[key] = values[0]
+            else:
+                varying.append(key)
+        if varying:
+            raise ValueError(
+                f"column_params vary in keys the vbt path cannot broadcast: {varying} "
+                "(only sl/tp keys may differ per column; use the native adapter)"
+            )
+        return out
+
+    @staticmethod
+    def _column_stops(
+        df: pd.DataFrame,
+        cols: pd.Index,
+        params: Mapping[str, Any],
+        column_params: list[Mapping[str, Any]],
+    ) -> dict[str, Any]:
+        """列ごとの sl/tp を sl_stop/tp_stop（スカラー or (bars, K)）に解決"""
+        rows = StopRows(df)
+        terms = [stop_terms({**params, **cp}, rows) for cp in column_params]
+        ones = rows.ones()
+        mat = rows.matrix()
+        out: dict[str, Any] = {}
+        for key, side in (("sl_stop", 0), ("tp_stop", 1)):
+            row = np.array([t[side][0] for t in terms])
+            scale = np.array([t[side][1] for t in terms])
+            if np.isnan(scale).all():
+                out[key] = None
+            elif (row == row[0]).all() and (scale == scale[0]).all() and row[0] == ones:
+                out[key] = float(scale[0])
+            else:
+                out[key] = pd.DataFrame(mat[row].T * scale, df.index, cols)
+        return out
+
     def run_cv(
         self,
         ohlcv: OhlcvFrameDTO,
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
-from collections.abc import Iterable, Sequence
-from typing import ClassVar
+from collections.abc import Callable, Hashable, Iterable, Sequence
+from typing import Any, ClassVar
 
 import pandas as pd
 
 from trade_app.adapters.vbtpro import vbtpro_bindings as vb
+from trade_app.adapters.vbtpro.frame_cache import OhlcvFrameCache, shared_frame_cache
 from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
 from trade_app.domain.ports.data_feed import DataFeedPort
 from trade_app.utils.timing import build_logger, time_phase
 
+# pickle 時のプロセス共有キャッシュの目印
+_SHARED_CACHE = "__shared_frame_cache__"
+
 
 class VbtProDataFeedAdapter(DataFeedPort):
     """ParquetData.pull() 経由でOHLCVを取得（UTC awareを保証）"""
@@ -20,8 +24,32 @@ class VbtProDataFeedAdapter(DataFeedPort):
         "owner": "infra",
     }
 
-    def __init__(self, pull_fn: callable | None = None) -> None:
+    def __init__(
+        self,
+        pull_fn: callable | None = None,
+        *,
+        cache: OhlcvFrameCache | None = None,
+        fingerprint_fn: Callable[[Iterable[str], str | None], Hashable] | None = None,
+    ) -> None:
         self._pull = pull_fn or vb.parquet_pull
+        # 既定の pull ではプロセス共有キャッシュを使う。
+        # pull_fn を差し替えた場合は明示 cache 指定時のみ有効（テスト等で意図せず共有しない）
+        if cache is None and pull_fn is None:
+            cache = shared_frame_cache()
+        self._cache = cache
+        self._fingerprint = fingerprint_fn or vb.parquet_fingerprint
+
+    def __getstate__(self) -> dict[str, Any]:
+        # プロセス共有キャッシュは送らず、復元先プロセスの共有キャッシュへ付け替える
+        state = self.__dict__.copy()
+        if self._cache is not None and self._cache is shared_frame_cache():
+            state["_cache"] = _SHARED_CACHE
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        if state.get("_cache") == _SHARED_CACHE:
+            state["_cache"] = shared_frame_cache()
+        self.__dict__.update(state)
 
     def load(
         self,
@@ -32,11 +60,22 @@ class VbtProDataFeedAdapter(DataFeedPort):
         timeframe: str | None = None,
         tz: str = "UTC",
     ) -> OhlcvFrameDTO:
+        symbols = list(symbols)
+        key = None
+        if self._cache is not None and self._cache.enabled:
+            key = OhlcvFrameCache.make_key(
+                symbols, start, end, columns, timeframe, tz, self._fingerprint(symbols, timeframe)
+            )
+            hit = self._cache.get(key)
+            if hit is not None:
+                # 読み取り専用フレームを共有（列名変更が波及しないよう浅いコピーのみ）
+                return OhlcvFrameDTO(frame=hit.copy(deep=False), freq=None)
+
         log = build_logger()
         with time_phase(
             log,
             "parquet_pull",
-            symbol=",".join(list(symbols)),
+            symbol=",".join(symbols),
             timeframe=str(timeframe or ""),
             session="",
         ):
@@ -48,4 +87,10 @@ class VbtProDataFeedAdapter(DataFeedPort):
         # Open必須（次足Open約定のため）
         if "open" not in df.columns:
             raise ValueError("open column is required")
+        if key is not None:
+            df = self._cache.put(key, df).copy(deep=False)
         return OhlcvFrameDTO(frame=df, freq=None)
+
+    def cache_stats(self) -> dict[str, int]:
+        """キャッシュのヒット/ミス等（無効時は空）"""
+        return self._cache.stats() if self._cache is not None else {}
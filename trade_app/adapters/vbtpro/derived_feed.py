@@ -0,0 +1,214 @@
+"""
+最細粒度だけを保存し、粗い時間足はその場で畳んで返す DataFeedPort。
+
+- 要求 tf が保存済みならそのまま元の feed で読む。無ければ、tf を割り切る保存済みの足のうち
+  最も粗いものを読んで畳む（m15 だけ保存して m30/h1/h2/h4/d1 を作る）
+- 集約は utils.resample.resample_ohlcv（区間の先頭位置で reduceat）。session_tz/day_start で
+  ブローカーの日付境界に揃える（例 America/New_York 17:00。元の足がその境界を割り切る場合のみ）
+- 期間: 区間の開始が [start, end] に入る足を返す（end を含む区間は最後まで元の足を読む）
+- 畳んだフレームは OhlcvFrameCache（既定はプロセス共有）に載せる。キーは元の足の指紋を含むので
+  元 Parquet が更新されれば作り直す
+- 保存足の一覧（discover_datasets）は ROOT ごとに1回だけ引いて覚える。load はまず覚えた一覧で
+  元の足を決めてキャッシュを引き、元の足の指紋が前回と変わった（更新/削除）ときだけ引き直す
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Hashable, Iterable, Sequence
+from pathlib import Path
+from typing import Any, ClassVar
+
+import pandas as pd
+
+from trade_app.adapters.parquet.layout import discover_datasets
+from trade_app.adapters.vbtpro import vbtpro_bindings as vb
+from trade_app.adapters.vbtpro.data_feed_adapter import VbtProDataFeedAdapter
+from trade_app.adapters.vbtpro.frame_cache import OhlcvFrameCache, shared_frame_cache
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+from trade_app.domain.ports.data_feed import DataFeedPort
+from trade_app.utils.resample import bin_start, resample_ohlcv
+from trade_app.utils.timeframes import timeframe_delta
+
+_SHARED_CACHE = "__shared_frame_cache__"
+_ONE_NS = pd.Timedelta(1, unit="ns")
+# 冬/夏のオフセットを確かめる時点
+_DST_PROBES = (pd.Timestamp("2020-01-15", tz="UTC"), pd.Timestamp("2020-07-15", tz="UTC"))
+
+
+def _utc(ts: Any) -> pd.Timestamp:
+    t = pd.Timestamp(ts)
+    return t.tz_localize("UTC") if t.tz is None else t.tz_convert("UTC")
+
+
+class DerivedTimeframeDataFeed(DataFeedPort):
+    """保存済みの細かい足から粗い時間足を導出する feed（保存済みの tf はそのまま読む）"""
+
+    __responsibility__: ClassVar[str] = "最細粒度の保存足から任意の粗い時間足を導出して返す"
+
+    def __init__(
+        self,
+        base: DataFeedPort | None = None,
+        *,
+        root: Path | str | None = None,
+        session_tz: str | None = None,
+        day_start: str | None = None,
+        cache: OhlcvFrameCache | None = None,
+        fingerprint_fn: Callable[[Iterable[str], str | None], Hashable] | None = None,
+    ) -> None:
+        self._base = base or VbtProDataFeedAdapter()
+        self._root = Path(root) if root is not None else None
+        self._tz = session_tz
+        self._day_start = day_start
+        self._cache = cache if cache is not None else shared_frame_cache()
+        self._fingerprint = fingerprint_fn or vb.parquet_fingerprint
+        # ROOT -> {symbol: 保存済み tf}、(ROOT, symbols, 元の足) -> 前回見た指紋
+        self._stored: dict[Path, dict[str, frozenset[str]]] = {}
+        self._seen: dict[tuple[Path, tuple[str, ...], str], Hashable] = {}
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        if self._cache is shared_frame_cache():
+            state["_cache"] = _SHARED_CACHE
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        if state.get("_cache") == _SHARED_CACHE:
+            state["_cache"] = shared_frame_cache()
+        self.__dict__.update(state)
+
+    @property
+    def root(self) -> Path:
+        if self._root is not None:
+            return self._root
+        return Path(os.environ.get("VBT_PARQUET_ROOT", "data/parquet")).resolve()
+
+    def _aligned(self, step: pd.Timedelta) -> bool:
+        """元の足の区間がブローカーの日付境界（DST の両オフセット）を割り切るか"""
+        if self._tz is None and self._day_start is None:
+            return True
+        for t in _DST_PROBES:
+            if bin_start(t, "d1", tz=self._tz, day_start=self._day_start).value % step.value:
+                return False
+        return True
+
+    def _stored_sets(self, refresh: bool = False) -> dict[str, frozenset[str]]:
+        root = self.root
+        if refresh or root not in self._stored:
+            found: dict[str, set[str]] = {}
+            for sym, tf in discover_datasets(root):
+                found.setdefault(sym, set()).add(tf)
+            self._stored[root] = {sym: frozenset(tfs) for sym, tfs in found.items()}
+        return self._stored[root]
+
+    def source_timeframe(
+        self, symbols: Sequence[str], timeframe: str | None, *, refresh: bool = False
+    ) -> str | None:
+        """
+        読む保存足。要求 tf が保存済みならそれ、無ければ割り切る最も粗い足（無ければ None）。
+        保存足の一覧は覚えたものを使う（refresh=True で引き直す）
+        """
+        target = timeframe_delta(timeframe)
+        by_symbol = self._stored_sets(refresh)
+        stored: frozenset[str] | None = None
+        for sym in symbols:
+            tfs = by_symbol.get(sym, frozenset())
+            stored = tfs if stored is None else stored & tfs
+        stored = stored or frozenset()
+        if timeframe in stored or target is None:
+            return timeframe
+        candidates = [
+            (step, tf)
+            for tf in stored
+            if (step := timeframe_delta(tf)) is not None
+            and step < target
+            and target % step == pd.Timedelta(0)
+            and self._aligned(step)
+        ]
+        return max(candidates)[1] if candidates else None
+
+    def _resolve(self, symbols: list[str], timeframe: str | None) -> tuple[str | None, Hashable]:
+        """(読む保存足, 導出するならその指紋)。覚えた一覧で決め、外れたときだけ引き直す"""
+        source: str | None = None
+        fingerprint: Hashable = None
+        for refresh in (False, True):
+            source = self.source_timeframe(symbols, timeframe, refresh=refresh)
+            if source is None:
+                continue  # 覚えた一覧の後に保存足が増えたかもしれない
+            if source == timeframe:
+                return source, None
+            fingerprint = self._fingerprint(symbols, source)
+            seen = (self.root, tuple(symbols), source)
+            if refresh or (fingerprint and self._seen.get(seen, fingerprint) == fingerprint):
+                self._seen[seen] = fingerprint
+                break
+            # 元の足が更新/削除された: 保存足の一覧を引き直す
+        return source, fingerprint
+
+    def load(
+        self,
+        symbols: Iterable[str],
+        start: str | None = None,
+        end: str | None = None,
+        columns: Sequence[str] = ("open", "high", "low", "close", "volume"),
+        timeframe: str | None = None,
+        tz: str = "UTC",
+    ) -> OhlcvFrameDTO:
+        symbols = list(symbols)
+        source, fingerprint = self._resolve(symbols, timeframe)
+        if source is None or source == timeframe:
+            # 保存済み（または導出できない: 元の feed のエラーをそのまま返す）
+            return self._base.load(symbols, start, end, columns, timeframe, tz)
+
+        key = None
+        if self._cache.enabled:
+            anchor = f"{timeframe}<{source}@{self._tz or 'UTC'}/{self._day_start or '00:00'}"
+            key = OhlcvFrameCache.make_key(symbols, start, end, columns, anchor, tz, fingerprint)
+            hit = self._cache.get(key)
+            if hit is not None:
+                return OhlcvFrameDTO(frame=hit.copy(deep=False), freq=None)
+
+        parts = [
+            self._derive(sym, source, str(timeframe), start, end, columns, tz) for sym in symbols
+        ]
+        df = parts[0] if len(parts) == 1 else pd.concat(parts, axis=1, keys=symbols)
+        if key is not None:
+            df = self._cache.put(key, df).copy(deep=False)
+        return OhlcvFrameDTO(frame=df, freq=None)
+
+    def _derive(
+        self,
+        symbol: str,
+        source: str,
+        timeframe: str,
+        start: Any,
+        end: Any,
+        columns: Sequence[str],
+        tz: str,
+    ) -> pd.DataFrame:
+        anchor = {"tz": self._tz, "day_start": self._day_start}
+        lo = None if start is None else _utc(start)
+        hi = None
+        if end is not None:
+            # end を含む区間の最後の元の足まで読む
+            step = timeframe_delta(timeframe)
+            hi = bin_start(_utc(end), timeframe, **anchor) + step - _ONE_NS
+        frame = self._base.load([symbol], lo, hi, columns, source, tz).frame
+        out = resample_ohlcv(frame, timeframe, **anchor)
+        if lo is not None:
+            # start が区間の途中なら、その区間は欠けるので返さない
+            out = out.loc[out.index >= lo]
+        return out
+
+
+def data_feed_from_env() -> DataFeedPort:
+    """
+    GDX_DERIVED_TF=1 なら DerivedTimeframeDataFeed（GDX_BROKER_TZ / GDX_BROKER_DAY_START で
+    日付境界を指定）、それ以外は VbtProDataFeedAdapter
+    """
+    if os.getenv("GDX_DERIVED_TF", "").strip().lower() not in ("1", "true", "yes", "on"):
+        return VbtProDataFeedAdapter()
+    return DerivedTimeframeDataFeed(
+        session_tz=os.getenv("GDX_BROKER_TZ") or None,
+        day_start=os.getenv("GDX_BROKER_DAY_START") or None,
+    )
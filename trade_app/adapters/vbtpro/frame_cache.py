@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Hashable, Iterable, Sequence
+from typing import Any, ClassVar
+
+import pandas as pd
+
+from trade_app.utils.lru import ByteBudgetLRU
+
+# 既定のバイト予算（MB）。GDX_OHLCV_CACHE_MB=0 で無効化
+DEFAULT_CACHE_MB = 512
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """DataFrame の実データ量（index込み・浅い計測）"""
+    return int(df.memory_usage(index=True, deep=False).sum())
+
+
+def freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    列配列を読み取り専用にした DataFrame を返す（データはコピーしない）。
+    - キャッシュ共有中の in-place 書き換えを ValueError で検出するため
+    """
+    cols: dict[Any, Any] = {}
+    for c in df.columns:
+        arr = df[c].to_numpy()
+        arr.flags.writeable = False
+        cols[c] = arr
+    return pd.DataFrame(cols, index=df.index, copy=False)
+
+
+def _key_part(v: Any) -> Hashable:
+    if v is None:
+        return None
+    if isinstance(v, pd.Timestamp):
+        return v.isoformat()
+    return str(v)
+
+
+class OhlcvFrameCache:
+    """
+    正規化済み OHLCV フレームのプロセス内キャッシュ。
+    キー: (symbols, timeframe, start, end, columns, tz, ファイル指紋[mtime/size])
+    - ヒット時は読み取り専用フレームをそのまま返す（コピーしない）
+    - Parquet が更新されると指紋が変わるため自然に再読込される
+    """
+
+    __responsibility__: ClassVar[str] = "OHLCV 読込結果の再利用（バイト予算・LRU）"
+
+    def __init__(self, max_bytes: int) -> None:
+        self._lru: ByteBudgetLRU[pd.DataFrame] = ByteBudgetLRU(max_bytes, frame_nbytes)
+
+    @property
+    def enabled(self) -> bool:
+        return self._lru.enabled
+
+    @staticmethod
+    def make_key(
+        symbols: Iterable[str],
+        start: Any,
+        end: Any,
+        columns: Sequence[str],
+        timeframe: str | None,
+        tz: str,
+        fingerprint: Hashable,
+    ) -> Hashable:
+        return (
+            tuple(str(s) for s in symbols),
+            str(timeframe or ""),
+            _key_part(start),
+            _key_part(end),
+            tuple(str(c).lower() for c in columns),
+            str(tz),
+            fingerprint,
+        )
+
+    def get(self, key: Hashable) -> pd.DataFrame | None:
+        return self._lru.get(key)
+
+    def put(self, key: Hashable, df: pd.DataFrame) -> pd.DataFrame:
+        """凍結したフレームを登録して返す（予算外でも凍結済みを返す）"""
+        frozen = freeze_frame(df)
+        return self._lru.put(key, frozen)
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return self._lru.stats()
+
+
+_shared: OhlcvFrameCache | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_frame_cache() -> OhlcvFrameCache:
+    """プロセス共有のキャッシュ（予算は GDX_OHLCV_CACHE_MB、既定 512MB）"""
+    global _shared  # noqa: PLW0603
+    with _shared_lock:
+        if _shared is None:
+            raw = os.getenv("GDX_OHLCV_CACHE_MB", str(DEFAULT_CACHE_MB)).strip()
+            try:
+                mb = float(raw)
+            except ValueError:
+                mb = float(DEFAULT_CACHE_MB)
+            _shared = OhlcvFrameCache(int(mb * 1024 * 1024))
+        return _shared
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import contextlib
 import importlib
 import inspect
 import json
@@ -12,6 +13,88 @@ from typing import Any
 import numpy as np
 import pandas as pd
 
+from trade_app.adapters.parquet.hot_tier import read_hot_tier
+from trade_app.adapters.parquet.layout import (
+    LAYOUT_FILE,
+    LAYOUT_HIVE,
+    list_hive_files,
+    read_ohlcv,
+    resolve_layout,
+    single_file_path,
+    source_files,
+)
+from trade_app.adapters.parquet.ohlcv_dataset import normalize_timeseries
+
+
+def _parquet_root() -> Path:
+    return Path(os.environ.get("VBT_PARQUET_ROOT", "data/parquet")).resolve()
+
+
+def _env_on(name: str) -> bool:
+    return os.environ.get(name, "1").strip().lower() not in {"0", "false", "off", "no"}
+
+
+def parquet_fingerprint(symbols: Iterable[str], timeframe: str | None) -> tuple:
+    """
+    読込対象 Parquet の指紋（path, mtime_ns, size）。キャッシュ無効化キーに使う。
+    - 存在しないファイルは含めない（後から作成されれば指紋が変わる）
+    """
+    root = _parquet_root()
+    tf = timeframe or ""
+    out: list[tuple[str, int, int]] = []
+    for sym in symbols:
+        for p in source_files(root, sym, tf):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            out.append((str(p), int(st.st_mtime_ns), int(st.st_size)))
+    return tuple(out)
+
+
+def _pull_hot_tier(
+    root: Path,
+    symbols: list[str],
+    tf: str,
+    start: Any,
+    end: Any,
+    columns: Sequence[str],
+) -> pd.DataFrame | None:
+    """全シンボルのホット層が最新のときだけ返す（1つでも欠ければ None）"""
+    parts: list[pd.DataFrame] = []
+    for sym in symbols:
+        try:
+            frame = read_hot_tier(root, sym, tf, start, end, columns)
+        except Exception:
+            return None
+        if frame is None:
+            return None
+        parts.append(frame)
+    if not parts:
+        return None
+    if len(parts) == 1:
+        return parts[0]
+    return pd.concat(parts, axis=1, keys=symbols)
+
+
+def _read_pandas(
+    root: Path, sym: str, tf: str, layout: str | None, start: Any, end: Any
+) -> pd.DataFrame | None:
+    if layout == LAYOUT_HIVE:
+        hive_files = list_hive_files(root, sym, tf, start, end)
+        if not hive_files:
+            return None
+        frame = pd.concat([pd.read_parquet(p) for p in hive_files])
+    elif layout == LAYOUT_FILE:
+        frame = pd.read_parquet(single_file_path(root, sym, tf))
+    else:
+        return None
+    frame = normalize_timeseries(frame)
+    if start is not None or end is not None:
+        frame = frame.loc[start:end]
+    frame.columns = [str(c).lower() for c in frame.columns]
+    return frame
+
 
 def parquet_pull(
     symbols: Iterable[str],
@@ -22,32 +105,45 @@ def parquet_pull(
     tz: str,
 ) -> pd.DataFrame:
     """
-    VBT PRO の ParquetData.pull を "明示ファイルリスト" で呼ぶ方式。
-    - 期待レイアウト: {ROOT}/{symbol}/{timeframe}/ohlcv.parquet
-    - 見つからなければ pandas.read_parquet でフォールバック
+    {ROOT}/{symbol}/{timeframe}/ohlcv.parquet、または hive レイアウト
+    {ROOT}/symbol={symbol}/tf={timeframe}/year=/month=（期間が重なる月だけ開く）を読む。
+    0) ホット層 {ROOT}/{symbol}/{timeframe}/ohlcv.arrow が最新ならメモリマップで読む
+    1) pyarrow.dataset で期間フィルタ・列射影を押し込んで読む（既定）
+    2) 失敗時は VBT PRO の ParquetData.pull（"明示ファイルリスト"）
+    3) それも無理なら pandas.read_parquet でフォールバック
     - Index は tz-aware(UTC) を想定
+    - GDX_HOT_TIER=0 で 0) を、GDX_PARQUET_PUSHDOWN=0 で 1) を無効化
     """
-    vbt, _ = _import_vbt()
+    symbols = list(symbols)
+    root = _parquet_root()
+    tf = timeframe or ""
 
-    def _normalize_timeseries(df: pd.DataFrame) -> pd.DataFrame:
-        """DatetimeIndexをUTCに正規化し、重複を除去してソート。
-        - tz-naiveも強制的にUTCとみなしてtz-aware化
-        - インデックスが日時でない場合はto_datetimeを試みる
-        """
-        if not isinstance(df.index, pd.DatetimeIndex):
-            try:
-                df.index = pd.to_datetime(df.index, utc=True)
-            except Exception:
-                return df
-        # tz-naive -> UTC
-        elif df.index.tz is None:
-            df.index = df.index.tz_localize("UTC")
-        else:
-            # 一旦UTCへ
-            df.index = df.index.tz_convert("UTC")
-        df = df[~df.index.duplicated()].sort_index()
-        return df
+    # 0) ホット層（正規化済み Arrow IPC。列はマップ領域をコピーせず参照）
+    if _env_on("GDX_HOT_TIER"):
+        hot = _pull_hot_tier(root, symbols, tf, start, end, columns)
+        if hot is not None:
+            return hot
+
+    layouts = {sym: resolve_layout(root, sym, tf) for sym in symbols}
+    files: list[str] = [
+        str(single_file_path(root, sym, tf)) for sym in symbols if layouts[sym] == LAYOUT_FILE
+    ]
+
+    # 1) pyarrow.dataset 押し込み読込
+    if all(layouts.values()) and _env_on("GDX_PARQUET_PUSHDOWN"):
+        try:
+            parts = [read_ohlcv(root, sym, tf, start, end, columns) for sym in symbols]
+            if len(parts) == 1:
+                return parts[0]
+            return pd.concat(parts, axis=1, keys=symbols)
+        except Exception:
+            # 下の従来経路へ
+            pass
 
+    # 2) PRO 経由
+    vbt = None
+    with contextlib.suppress(Exception):
+        vbt, _ = _import_vbt()
     # UTC前提の設定（可能なら）
     try:  # pragma: no cover - 実環境依存
         if hasattr(vbt, "settings"):
@@ -56,21 +152,16 @@ def parquet_pull(
     except Exception:
         pass
 
-    root = Path(os.environ.get("VBT_PARQUET_ROOT", "data/parquet")).resolve()
-    tf = timeframe or ""
-
-    files: list[str] = []
-    for sym in symbols:
-        p = root / sym / tf / "ohlcv.parquet"
-        if p.exists():
-            files.append(str(p))
-
-    # 1) PRO 経由
-    if files and hasattr(vbt, "ParquetData") and hasattr(vbt.ParquetData, "pull"):
+    if (
+        files
+        and len(files) == len(symbols)
+        and hasattr(vbt, "ParquetData")
+        and hasattr(vbt.ParquetData, "pull")
+    ):
         try:
             data = vbt.ParquetData.pull(paths=files, tz=tz)  # type: ignore[attr-defined]
             df = data.to_pd()
-            df = _normalize_timeseries(df)
+            df = normalize_timeseries(df)
             if start is not None or end is not None:
                 df = df.loc[start:end]
             df.columns = [str(c).lower() for c in df.columns]
@@ -79,18 +170,12 @@ def parquet_pull(
             # 下のフォールバックへ
             pass
 
-    # 2) pandas フォールバック
-    parts: list[pd.DataFrame] = []
-    for sym in symbols:
-        p = root / sym / tf / "ohlcv.parquet"
-        if not p.exists():
-            continue
-        frame = pd.read_parquet(p)
-        frame = _normalize_timeseries(frame)
-        if start is not None or end is not None:
-            frame = frame.loc[start:end]
-        frame.columns = [str(c).lower() for c in frame.columns]
-        parts.append(frame)
+    # 3) pandas フォールバック
+    parts = [
+        frame
+        for sym in symbols
+        if (frame := _read_pandas(root, sym, tf, layouts[sym], start, end)) is not None
+    ]
 
     if not parts:
         raise FileNotFoundError(
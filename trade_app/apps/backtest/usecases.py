@@ -4,14 +4,14 @@ from collections.abc import Iterable, Mapping, Sequence
 from typing import Any, ClassVar
 
 from trade_app.apps.features.pipeline.run_pipeline_full import run_pipeline_full
+
+# features + plan から signals を生成（decide は純関数。既定はコンパイル版で結果は同一）
+from trade_app.apps.features.pipeline.run_to_signals import decide_signals
 from trade_app.domain.ports.backtest import BacktestPort
 from trade_app.domain.ports.data_feed import DataFeedPort
 from trade_app.domain.ports.feature_calc import FeatureCalcPort
 from trade_app.domain.ports.plan_builder import PlanBuilderPort
 
-# features + plan から signals を生成（decide は純関数）
-from trade_app.domain.services.decider import decide
-
 __responsibility__: ClassVar[str] = "仕様（features/plan）からsignalsを作り、BacktestPortを実行"
 
 
@@ -46,7 +46,7 @@ def backtest_from_specs(
         run_params=params,
     )
 
-    signals = decide(pipe.features, pipe.plan)
+    signals = decide_signals(pipe.features, pipe.plan)
 
     # BacktestPort.run_from_signals に委譲
     return backtester.run_from_signals(
@@ -1,16 +1,35 @@
 from __future__ import annotations
 
-from collections.abc import Callable, Mapping
+import os
+import warnings
+from collections.abc import Callable, Collection, Hashable, Iterable, Mapping
 from typing import Any
 
 import pandas as pd
 
+from trade_app.apps.features.feature_dag import (
+    DAG_BUILDERS,
+    PrimitiveGraph,
+    feature_dag_enabled,
+)
+from trade_app.apps.features.feature_memo import (
+    FeatureMemo,
+    content_digest,
+    normalize_params,
+    shared_feature_memo,
+    store_key,
+)
+from trade_app.apps.features.feature_prefetch import batch_groups, evaluate_batch
 from trade_app.apps.features.indicators.atr import atr
+from trade_app.apps.features.indicators.batched import BATCHED_KINDS
 from trade_app.apps.features.indicators.bb import bb
+from trade_app.apps.features.indicators.compiled import COMPILED_REGISTRY, HAS_NUMBA
 from trade_app.apps.features.indicators.donchian import donchian
+from trade_app.apps.features.indicators.htf import HTF_KIND, htf, htf_cached, htf_spec
 from trade_app.apps.features.indicators.keltner import keltner
 from trade_app.apps.features.indicators.ma import ema, sma
 from trade_app.apps.features.indicators.macd import macd
+from trade_app.apps.features.indicators.meta import INDICATOR_META
 from trade_app.apps.features.indicators.roc import roc
 from trade_app.apps.features.indicators.rsi import rsi
 from trade_app.apps.features.indicators.session import session_feature as session
@@ -21,17 +40,24 @@ from trade_app.apps.features.pipeline.feature_bundler import bundle_features
 from trade_app.domain.dto.feature_bundle import FeatureBundleDTO
 from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
 from trade_app.domain.ports.feature_calc import FeatureCalcPort
+from trade_app.domain.ports.feature_store import FeatureStorePort
 
 IndicatorFn = Callable[..., pd.Series]  # 単一出力
 MultiIndicatorFn = Callable[..., dict[str, pd.Series]]  # 複数出力
 
-DEFAULT_REGISTRY: dict[str, Callable[..., Any]] = {
+
+def _identity(s: pd.Series, **_: Any) -> pd.Series:
+    return s
+
+
+# 参照実装（pandas）。コンパイル版の検証基準であり、numba が無い環境のフォールバック
+PANDAS_REGISTRY: dict[str, Callable[..., Any]] = {
     # 単一出力
     "rsi": rsi,
     "sma": sma,
     "ema": ema,
     # 原始列をそのまま返す（on: "close" など）。検証・組み合わせ用途のための最小I/F。
-    "identity": lambda s, **_: s,
+    "identity": _identity,
     "atr": atr,
     "roc": roc,
     "zscore": zscore,
@@ -43,8 +69,67 @@ DEFAULT_REGISTRY: dict[str, Callable[..., Any]] = {
     "stoch": stoch,
     "donchian": donchian,
     "keltner": keltner,
+    # 上位足（params: tf, kind, params）。計算器が畳んだフレームで kind を評価して揃える
+    HTF_KIND: htf,
 }
 
+INDICATOR_BACKENDS = ("auto", "numba", "pandas")
+
+
+def indicator_backend() -> str:
+    """GDX_INDICATOR_BACKEND（auto|numba|pandas、既定 auto）を実際に使う backend へ解決"""
+    raw = os.getenv("GDX_INDICATOR_BACKEND", "auto").strip().lower()
+    if raw not in INDICATOR_BACKENDS:
+        raw = "auto"
+    if raw == "pandas":
+        return "pandas"
+    if not HAS_NUMBA:
+        if raw == "numba":
+            warnings.warn(
+                "GDX_INDICATOR_BACKEND=numba but numba is not installed; using pandas",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        return "pandas"
+    return "numba"
+
+
+def build_registry(backend: str | None = None) -> dict[str, Callable[..., Any]]:
+    """backend（numba|pandas、省略時は環境変数）のレジストリ。numba 版が無い kind は pandas 版"""
+    reg = dict(PANDAS_REGISTRY)
+    if (backend or indicator_backend()) == "numba" and HAS_NUMBA:
+        reg.update(COMPILED_REGISTRY)
+    return reg
+
+
+DEFAULT_REGISTRY: dict[str, Callable[..., Any]] = build_registry()
+
+
+_SHARED_MEMO = "__shared_feature_memo__"
+# (prefix, kind, インジ関数, 入力列, params)
+_Job = tuple[str, str, Callable[..., Any], tuple[str, ...], dict[str, Any]]
+
+
+def resolve_inputs(kind: str, on: Any) -> tuple[str, ...]:
+    """spec の on を、インジに位置引数で渡す入力列名の並びへ解決（session は index のみ）"""
+    meta = INDICATOR_META.get(kind)
+    if meta is None:
+        raise ValueError(f"unhandled indicator kind: {kind}")
+    defaults = meta.inputs
+    if len(defaults) == 1:
+        return (str(on) if isinstance(on, str) else defaults[0],)
+    if kind == "vwap" and isinstance(on, dict):
+        return (str(on.get("price", "close")), str(on.get("volume", "volume")))
+    cols = on if isinstance(on, list | tuple) else defaults
+    return tuple(str(c) for c in cols[: len(defaults)])
+
+
+def _declared(fn: Callable[[Mapping[str, Any]], int | None], params: dict[str, Any]) -> int | None:
+    try:
+        return fn(params)
+    except (TypeError, ValueError):
+        return None
+
 
 class DefaultFeatureCalculator(FeatureCalcPort):
     """
@@ -54,71 +139,251 @@ class DefaultFeatureCalculator(FeatureCalcPort):
       "stoch": {"kind":"stoch", "on":["high","low","close"], "params":{"k":14,"d":3,"smooth":1}}
       "vwap": {"kind":"vwap", "on":{"price":"close","volume":"volume"}, "params":{"window":30}}
     出力名は spec のキーを接頭辞に、マルチ出力は `${prefix}_${key}` を付ける。
+    インジ出力と束ね結果は FeatureMemo で試行間に再利用する（閾値だけ変わる試行は再計算しない）。
+    1回の compute 内では原始演算（TR/EMA/ローリング統計）を feature_dag で共有する。
+    memo 省略時はプロセス共有のメモ（GDX_FEATURE_MEMO_MB=0 で無効）。
+    store を渡すと、メモに無いインジは永続ストア → 計算 の順に引く（実行を跨いだ再利用）。
     """
 
     __responsibility__ = "features spec を解釈して各インジを決定的に計算（マルチ出力対応）"
 
-    def __init__(self, registry: Mapping[str, Callable[..., Any]] | None = None) -> None:
+    def __init__(
+        self,
+        registry: Mapping[str, Callable[..., Any]] | None = None,
+        *,
+        memo: FeatureMemo | None = None,
+        store: FeatureStorePort | None = None,
+    ) -> None:
         self._reg: dict[str, Callable[..., Any]] = dict(registry or DEFAULT_REGISTRY)
+        self._memo: FeatureMemo = memo if memo is not None else shared_feature_memo()
+        self._store = store
+        # defer_prefetch で預かった候補 spec 群（次の compute のフレームで先読みする）
+        self._pending: list[Mapping[str, Mapping[str, Any]]] = []
+        # numba 版のインジを使うレジストリなら、共有ノードも numba の原始演算で評価する
+        self._compiled = any(self._reg.get(k) is f for k, f in COMPILED_REGISTRY.items())
 
-    def compute(
+    def __getstate__(self) -> dict[str, Any]:
+        # プロセス共有メモは送らず、復元先プロセスの共有メモへ付け替える
+        state = self.__dict__.copy()
+        if self._memo is shared_feature_memo():
+            state["_memo"] = _SHARED_MEMO
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        if state.get("_memo") == _SHARED_MEMO:
+            state["_memo"] = shared_feature_memo()
+        self.__dict__.update(state)
+
+    @property
+    def memo(self) -> FeatureMemo:
+        return self._memo
+
+    def memo_stats(self) -> dict[str, Any]:
+        """メモのヒット/ミス等（hits, misses, evictions, entries, bytes, max_bytes）"""
+        return self._memo.stats()
+
+    def _call(
         self,
-        ohlcv: OhlcvFrameDTO,
-        spec: Mapping[str, Mapping[str, Any]],
-    ) -> FeatureBundleDTO:
-        frame = ohlcv.frame
-        produced: dict[str, pd.Series] = {}
+        fn: Callable[..., Any],
+        kind: str,
+        frame: pd.DataFrame,
+        inputs: tuple[str, ...],
+        params: dict[str, Any],
+    ) -> Any:
+        if kind == "session":
+            # session feature は DataFrame（index）から生成
+            return fn(frame, **params)
+        if kind == HTF_KIND:
+            return htf_cached(
+                frame,
+                inputs,
+                params,
+                registry=self._reg,
+                memo=self._memo if self._memo.enabled else None,
+                evaluate=lambda up, job: self._load_or_evaluate(up, None, job, {}),
+            )
+        return fn(*(frame[c] for c in inputs), **params)
 
+    def _evaluate(self, frame: pd.DataFrame, graph: PrimitiveGraph | None, job: _Job) -> Any:
+        _prefix, kind, fn, inputs, params = job
+        if graph is None:
+            return self._call(fn, kind, frame, inputs, params)
+        build = DAG_BUILDERS.get(kind)
+        if build is not None and fn in (PANDAS_REGISTRY.get(kind), COMPILED_REGISTRY.get(kind)):
+            return build(graph, *inputs, **params)
+        # 分解しない kind・差し替えたインジは呼び出し全体を1ノードにする（同一 spec の重複だけ除く）
+        key = ("call", kind, fn, inputs, normalize_params(params))
+        return graph[graph.node(key, lambda: self._call(fn, kind, frame, inputs, params))]
+
+    def _load_or_evaluate(
+        self,
+        frame: pd.DataFrame,
+        graph: PrimitiveGraph | None,
+        job: _Job,
+        digests: dict[tuple[str, ...], str],
+    ) -> Any:
+        """永続ストア → 計算（計算したものはストアへ保存）"""
+        if self._store is None or job[1] == HTF_KIND:
+            # htf は上位足のインジ出力だけをストアに置く（揃え直しは安い）
+            return self._evaluate(frame, graph, job)
+        _prefix, kind, fn, inputs, params = job
+        if inputs not in digests:
+            digests[inputs] = content_digest(frame, inputs)
+        key = store_key(fn, kind, params, inputs, digests[inputs])
+        hit = self._store.get(key, frame.index) if key is not None else None
+        if hit is not None:
+            return hit
+        out = self._evaluate(frame, graph, job)
+        if key is not None:
+            self._store.put(key, out)
+        return out
+
+    def _jobs(self, spec: Mapping[str, Mapping[str, Any]]) -> list[_Job]:
+        jobs: list[_Job] = []
         for prefix, cfg in spec.items():
             kind = str(cfg.get("kind", "")).lower()
             fn = self._reg.get(kind)
             if fn is None:
                 raise ValueError(f"unknown indicator kind: {kind}")
             params = dict(cfg.get("params", {}))
-            on = cfg.get("on", "close")
-
-            def get_series(name: str) -> pd.Series:
-                return frame[str(name)]
-
-            out_obj: Any
-            if kind in {"rsi", "sma", "ema", "zscore", "roc", "identity"}:
-                series = get_series(on if isinstance(on, str) else "close")
-                out_obj = fn(series, **params)
-            elif kind == "atr":
-                cols = on if isinstance(on, list | tuple) else ["high", "low", "close"]
-                out_obj = fn(frame[cols[0]], frame[cols[1]], frame[cols[2]], **params)
-            elif kind in {"bb", "macd"}:
-                series = get_series(on if isinstance(on, str) else "close")
-                out_obj = fn(series, **params)
-            elif kind == "session":
-                # session feature は DataFrame（index）から生成
-                out_obj = fn(frame, **params)
-            elif kind == "stoch":
-                cols = on if isinstance(on, list | tuple) else ["high", "low", "close"]
-                out_obj = fn(frame[cols[0]], frame[cols[1]], frame[cols[2]], **params)
-            elif kind == "donchian":
-                cols = on if isinstance(on, list | tuple) else ["high", "low"]
-                out_obj = fn(frame[cols[0]], frame[cols[1]], **params)
-            elif kind == "keltner":
-                cols = on if isinstance(on, list | tuple) else ["high", "low", "close"]
-                out_obj = fn(frame[cols[0]], frame[cols[1]], frame[cols[2]], **params)
-            elif kind == "vwap":
-                if isinstance(on, dict):
-                    price = get_series(on.get("price", "close"))
-                    volume = get_series(on.get("volume", "volume"))
-                else:
-                    cols = on if isinstance(on, list | tuple) else ["close", "volume"]
-                    price, volume = frame[cols[0]], frame[cols[1]]
-                out_obj = fn(price, volume, **params)
-            else:
-                raise ValueError(f"unhandled indicator kind: {kind}")
+            # htf の入力列は上位足で計算する kind のもの
+            inner = htf_spec(params)[1] if kind == HTF_KIND else kind
+            jobs.append((prefix, kind, fn, resolve_inputs(inner, cfg.get("on", "close")), params))
+        return jobs
+
+    def warmup_bars(self, spec: Mapping[str, Mapping[str, Any]]) -> dict[str, int]:
+        """出力列名 -> 宣言ウォームアップ（先頭有効位置）。メタの無い kind は含めない"""
+        out: dict[str, int] = {}
+        for prefix, kind, _fn, _inputs, params in self._jobs(spec):
+            meta = INDICATOR_META.get(kind)
+            bars = _declared(meta.warmup, params) if meta is not None else None
+            if bars is None:
+                continue
+            for name in [f"{prefix}_{k}" for k in meta.outputs] or [prefix]:
+                out[name] = bars
+        return out
+
+    def head_bars(self, spec: Mapping[str, Mapping[str, Any]]) -> int | None:
+        """spec 全体を束ねたときの先頭の切り位置（宣言 warmup の最大。宣言の無い kind は None）"""
+        need = 0
+        for _prefix, kind, _fn, _inputs, params in self._jobs(spec):
+            meta = INDICATOR_META.get(kind)
+            bars = _declared(meta.warmup, params) if meta is not None else None
+            if bars is None:
+                return None
+            need = max(need, bars)
+        return need
+
+    def lookback_bars(self, spec: Mapping[str, Mapping[str, Any]]) -> int | None:
+        """spec 全体で start より前に要る履歴の本数（全履歴に依存する kind があれば None）"""
+        need = 0
+        for _prefix, kind, _fn, _inputs, params in self._jobs(spec):
+            meta = INDICATOR_META.get(kind)
+            bars = _declared(meta.lookback, params) if meta is not None else None
+            if bars is None:
+                return None
+            need = max(need, bars)
+        return need
+
+    @staticmethod
+    def _keys(memo: FeatureMemo, frame: pd.DataFrame, jobs: list[_Job]) -> list[Hashable]:
+        """インジごとのメモキー（同一性トークンはそのインジの入力列だけで決まる）"""
+        tokens: dict[tuple[str, ...], Hashable] = {}
+        keys: list[Hashable] = []
+        for _prefix, kind, fn, inputs, params in jobs:
+            if inputs not in tokens:
+                tokens[inputs] = memo.frame_token(frame, inputs)
+            keys.append(memo.make_key(fn, kind, params, inputs, tokens[inputs]))
+        return keys
+
+    def compute(
+        self,
+        ohlcv: OhlcvFrameDTO,
+        spec: Mapping[str, Mapping[str, Any]],
+        *,
+        outputs: Mapping[str, Collection[str]] | None = None,
+    ) -> FeatureBundleDTO:
+        """
+        outputs: マルチ出力 prefix -> 束ねる出力キー（plan_deps.resolve_feature_deps の結果）。
+        指定の無い prefix は全出力を束ねる。インジ出力のメモは常に全キーで持つ。
+        """
+        frame = ohlcv.frame
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self.prefetch(ohlcv, pending)
+        select = {p: frozenset(k) for p, k in (outputs or {}).items()}
+        memo = self._memo if self._memo.enabled else None
+        jobs = self._jobs(spec)
+
+        keys: list[Hashable] = []
+        bundle_key: Hashable = None
+        if memo is not None:
+            keys = self._keys(memo, frame, jobs)
+            picked = tuple(sorted((p, tuple(sorted(k))) for p, k in select.items()))
+            bundle_key = ("bundle", tuple(zip([j[0] for j in jobs], keys, strict=True)), picked)
+            hit = memo.get(bundle_key)
+            if hit is not None:
+                # 閾値だけ変わる試行: インジも束ねも再計算しない（列の追加/削除は呼び手側に閉じる）
+                return FeatureBundleDTO.model_construct(features=hit.features.copy(deep=False))
+
+        graph = (
+            PrimitiveGraph(frame, compiled_kernels=self._compiled)
+            if feature_dag_enabled()
+            else None
+        )
+        produced: dict[str, pd.Series] = {}
+        digests: dict[tuple[str, ...], str] = {}
+        for i, job in enumerate(jobs):
+            prefix, kind = job[0], job[1]
+            out_obj = memo.get(keys[i]) if memo is not None else None
+            if out_obj is None:
+                out_obj = self._load_or_evaluate(frame, graph, job, digests)
+                if memo is not None:
+                    memo.put(keys[i], out_obj)
 
             if isinstance(out_obj, pd.Series):
                 produced[prefix] = out_obj
             elif isinstance(out_obj, dict):
+                want = select.get(prefix)
                 for k, series in out_obj.items():
-                    produced[f"{prefix}_{k}"] = series
+                    if want is None or k in want:
+                        produced[f"{prefix}_{k}"] = series
             else:
                 raise TypeError(f"indicator '{kind}' returned unsupported type: {type(out_obj)}")
 
-        return bundle_features(ohlcv, produced, nan_policy="drop_head")
+        bundle = bundle_features(
+            ohlcv, produced, nan_policy="drop_head", warmup=self.warmup_bars(spec)
+        )
+        if memo is None:
+            return bundle
+        memo.put(bundle_key, bundle)
+        return FeatureBundleDTO.model_construct(features=bundle.features.copy(deep=False))
+
+    def defer_prefetch(self, specs: Iterable[Mapping[str, Mapping[str, Any]]]) -> None:
+        """候補 spec 群を預け、次の compute が受け取ったフレームで prefetch する（再読込しない）"""
+        self._pending = list(specs)
+
+    def prefetch(
+        self,
+        ohlcv: OhlcvFrameDTO,
+        specs: Iterable[Mapping[str, Mapping[str, Any]]],
+    ) -> int:
+        """
+        候補 spec 群（Sobol 初期点・グリッド）のインジをバッチ版でまとめて計算し、メモへ載せる。
+        - (kind, 入力列, 他 params) が同じで長さ/窓だけ違うものを1回の呼び出しで計算
+        - バッチ版は単発版とビット一致するもの（indicators/batched.py）だけ。差し替えた kind や
+          NaN を含む入力は compute に任せる
+        戻り値はメモへ載せた出力数（メモ無効なら 0）。
+        """
+        if not self._memo.enabled:
+            return 0
+        frame = ohlcv.frame
+        jobs = [job for spec in specs for job in self._jobs(spec)]
+        singles = {k: (PANDAS_REGISTRY.get(k), COMPILED_REGISTRY.get(k)) for k in BATCHED_KINDS}
+        seeded = 0
+        for group in batch_groups(jobs, singles):
+            values = evaluate_batch(frame, group)
+            for key, value in zip(self._keys(self._memo, frame, group), values, strict=False):
+                self._memo.put(key, value)
+            seeded += len(values)
+        return seeded
@@ -0,0 +1,225 @@
+"""
+特徴量 spec を原始演算の DAG に分解し、共有ノードを compute 1回につき1回だけ評価する。
+
+- 原始演算: True Range / EMA(span) / ローリング mean・std・min・max(window) / 差分
+- ノードキーは (演算, 入力ノード, 窓) のタプル。keltner の ATR と atr、macd の EMA と ema、
+  bb と zscore のローリング mean/std は同じキーになり、同じ Series を共有する
+- 出力は各インジ関数（pandas 版 / numba 版）とビット単位で一致する（tests/src4 で検証）。
+  numba 版の原始演算は pandas 版とビット一致するため、backend をまたいで共有してよい
+- 分解しない kind（rsi/roc/vwap/session 等）は呼び出し全体を1ノードとして重複だけ除く
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Hashable
+from typing import Any
+
+import pandas as pd
+
+from trade_app.apps.features.indicators import compiled
+from trade_app.apps.features.indicators.compiled import HAS_NUMBA
+
+Ref = Hashable  # 列名（str）またはノードキー（tuple）
+
+
+def feature_dag_enabled() -> bool:
+    """GDX_FEATURE_DAG=0 で共有ノード評価を無効化（インジ関数を個別に呼ぶ）"""
+    return os.getenv("GDX_FEATURE_DAG", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _arg(v: Any) -> tuple[str, Any]:
+    # 14 と 14.0 は別ノード（rolling は float 窓を拒否するため、共有で挙動を変えない）
+    return (type(v).__name__, v)
+
+
+class PrimitiveGraph:
+    """1フレーム・1回の compute の間だけ生きる原始演算ノードの表"""
+
+    __responsibility__ = "原始演算ノードを共有評価（同じキーは1回だけ計算）"
+
+    def __init__(self, frame: pd.DataFrame, *, compiled_kernels: bool = False) -> None:
+        self.frame = frame
+        self._compiled = compiled_kernels and HAS_NUMBA
+        self._nodes: dict[Hashable, Any] = {}
+        self.evaluated = 0
+        self.reused = 0
+
+    def __getitem__(self, ref: Ref) -> Any:
+        if isinstance(ref, str):
+            return self.frame[ref]
+        return self._nodes[ref]
+
+    def node(self, key: Hashable, make: Callable[[], Any]) -> Hashable:
+        if key in self._nodes:
+            self.reused += 1
+        else:
+            self._nodes[key] = make()
+            self.evaluated += 1
+        return key
+
+    def tr(self, high: Ref, low: Ref, close: Ref) -> Hashable:
+        def make() -> pd.Series:
+            h, lo, c = self[high], self[low], self[close]
+            if self._compiled:
+                return compiled.true_range(h, lo, c)
+            prev_close = c.shift(1)
+            parts = [(h - lo).abs(), (h - prev_close).abs(), (lo - prev_close).abs()]
+            return pd.concat(parts, axis=1).max(axis=1)
+
+        return self.node(("tr", high, low, close), make)
+
+    def ema(self, src: Ref, span: Any) -> Hashable:
+        def make() -> pd.Series:
+            if self._compiled:
+                return compiled.ewm_span(self[src], span)
+            return self[src].ewm(span=span, adjust=False).mean()
+
+        return self.node(("ema", src, _arg(span)), make)
+
+    def mean(self, src: Ref, window: Any) -> Hashable:
+        def make() -> pd.Series:
+            if self._compiled:
+                return compiled.rolling_mean(self[src], window)
+            return self[src].rolling(window, min_periods=window).mean()
+
+        return self.node(("mean", src, _arg(window)), make)
+
+    def std(self, src: Ref, window: Any) -> Hashable:
+        def make() -> pd.Series:
+            return self[src].rolling(window, min_periods=window).std(ddof=0)
+
+        return self.node(("std", src, _arg(window)), make)
+
+    def extreme(self, src: Ref, window: Any, *, is_max: bool) -> Hashable:
+        def make() -> pd.Series:
+            if self._compiled:
+                return compiled.rolling_extreme(self[src], window, is_max=is_max)
+            roll = self[src].rolling(window, min_periods=window)
+            return roll.max() if is_max else roll.min()
+
+        return self.node(("max" if is_max else "min", src, _arg(window)), make)
+
+    def sub(self, a: Ref, b: Ref) -> Hashable:
+        return self.node(("sub", a, b), lambda: self[a] - self[b])
+
+
+def _named(s: pd.Series, name: str) -> pd.Series:
+    # ノードの Series は他のインジと共有するため、名前だけ違う別オブジェクトにする
+    return pd.Series(s, name=name, copy=False)
+
+
+def _bands(mid: pd.Series, width: pd.Series, mult: float) -> dict[str, pd.Series]:
+    band = mult * width
+    return {
+        "upper": _named(mid + band, "upper"),
+        "middle": _named(mid, "middle"),
+        "lower": _named(mid - band, "lower"),
+    }
+
+
+def _sma(g: PrimitiveGraph, series: Ref, length: int = 20) -> pd.Series:
+    return _named(g[g.mean(series, length)], f"sma_{length}")
+
+
+def _ema(g: PrimitiveGraph, series: Ref, length: int = 20) -> pd.Series:
+    return _named(g[g.ema(series, length)], f"ema_{length}")
+
+
+def _atr(g: PrimitiveGraph, high: Ref, low: Ref, close: Ref, length: int = 14) -> pd.Series:
+    return _named(g[g.mean(g.tr(high, low, close), length)], f"atr_{length}")
+
+
+def _zscore(g: PrimitiveGraph, series: Ref, window: int = 20) -> pd.Series:
+    out = (g[series] - g[g.mean(series, window)]) / g[g.std(series, window)]
+    return _named(out, f"z_{window}")
+
+
+def _bb(
+    g: PrimitiveGraph,
+    close: Ref,
+    window: int = 20,
+    mult: float = 2.0,
+    use_ema: bool = False,
+) -> dict[str, pd.Series]:
+    if use_ema:
+        mid = g.ema(close, window)
+        dev = g.node(("absdev", close, mid), lambda: (g[close] - g[mid]).abs())
+        return _bands(g[mid], g[g.ema(dev, window)], mult)
+    return _bands(g[g.mean(close, window)], g[g.std(close, window)], mult)
+
+
+def _keltner(
+    g: PrimitiveGraph,
+    high: Ref,
+    low: Ref,
+    close: Ref,
+    ema_len: int = 20,
+    atr_len: int = 14,
+    mult: float = 2.0,
+) -> dict[str, pd.Series]:
+    atr = g.mean(g.tr(high, low, close), atr_len)
+    return _bands(g[g.ema(close, ema_len)], g[atr], mult)
+
+
+def _macd(
+    g: PrimitiveGraph,
+    close: Ref,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+) -> dict[str, pd.Series]:
+    line = g.sub(g.ema(close, fast), g.ema(close, slow))
+    sig = g[g.ema(line, signal)]
+    return {
+        "macd": _named(g[line], "macd"),
+        "signal": _named(sig, "signal"),
+        "hist": _named(g[line] - sig, "hist"),
+    }
+
+
+def _donchian(g: PrimitiveGraph, high: Ref, low: Ref, window: int = 20) -> dict[str, pd.Series]:
+    upper = g[g.extreme(high, window, is_max=True)]
+    lower = g[g.extreme(low, window, is_max=False)]
+    return {
+        "upper": _named(upper, "upper"),
+        "middle": _named((upper + lower) / 2.0, "middle"),
+        "lower": _named(lower, "lower"),
+    }
+
+
+def _stoch(
+    g: PrimitiveGraph,
+    high: Ref,
+    low: Ref,
+    close: Ref,
+    k: int = 14,
+    d: int = 3,
+    smooth: int = 1,
+) -> dict[str, pd.Series]:
+    lowest = g.extreme(low, k, is_max=False)
+    highest = g.extreme(high, k, is_max=True)
+
+    def fast_k() -> pd.Series:
+        denom = g[highest] - g[lowest]
+        # 高安が同値の窓は NaN（numba 版と同じ。pandas 版は object 化して後段で落ちる）
+        return (g[close] - g[lowest]) / denom.where(denom != 0) * 100.0
+
+    k_line = g.node(("stoch_k", close, lowest, highest), fast_k)
+    if smooth and smooth > 1:
+        k_line = g.mean(k_line, smooth)
+    return {"k": _named(g[k_line], "k"), "d": _named(g[g.mean(k_line, d)], "d")}
+
+
+# kind -> 原始演算への分解（引数は (graph, *入力列名, **params)。未知の params は TypeError）
+DAG_BUILDERS: dict[str, Callable[..., Any]] = {
+    "sma": _sma,
+    "ema": _ema,
+    "atr": _atr,
+    "zscore": _zscore,
+    "bb": _bb,
+    "keltner": _keltner,
+    "macd": _macd,
+    "donchian": _donchian,
+    "stoch": _stoch,
+}
@@ -0,0 +1,259 @@
+"""
+インジケータ出力の試行間メモ化（プロセス内・バイト予算付き LRU）。
+
+探索では閾値だけが変わる試行が多く、同じ (kind, params, 入力列, OHLCV) の
+インジ計算が繰り返される。その出力を ByteBudgetLRU に保持して再利用する。
+
+入力フレームの同一性トークン:
+- 読み取り専用の配列（OhlcvFrameCache の凍結フレーム、共有メモリ/ホットティアのビュー）は
+  アドレスで識別する。配列自体を pin 表で保持するため、同じアドレスが別データに再利用されて
+  誤ヒットすることはない（pin 表から外れた配列は新しいトークンになる＝ミスになるだけ）
+- 書き込み可能な配列は内容ハッシュ（blake2b）で識別する
+- index は常に内容ハッシュ（ns 単位の時刻）。列が読み取り専用でも index は読込ごとに作り直される
+  ことがある（共有メモリの feed は load ごとに tz 付きの index を新しく作る）
+
+永続ストア（FeatureStorePort）のキーは store_key: データ内容・kind・params・コード版のハッシュ。
+コード版はインジ関数のモジュールに加え、出力を作りうる評価系（feature_dag の共有ノード評価、
+numba 版の原始演算）のソースも含む（どちらを編集してもストアの旧出力は引かれない）。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import inspect
+import itertools
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping, Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, ClassVar
+
+import numpy as np
+import pandas as pd
+
+from trade_app.utils.lru import ByteBudgetLRU
+
+# 既定のバイト予算（MB）。GDX_FEATURE_MEMO_MB=0 で無効化
+DEFAULT_MEMO_MB = 256
+# アドレス識別のために保持する配列数の上限
+DEFAULT_PIN_SLOTS = 64
+
+
+def memo_nbytes(value: Any) -> int:
+    """メモ値（Series / dict[str, Series] / DataFrame を持つ DTO）の実データ量（index 除く）"""
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=False, deep=False))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=False, deep=False).sum())
+    if isinstance(value, Mapping):
+        return sum(memo_nbytes(v) for v in value.values())
+    features = getattr(value, "features", None)
+    if isinstance(features, pd.DataFrame):
+        return memo_nbytes(features)
+    return 0
+
+
+def _norm(v: Any) -> Hashable:
+    """params 値をキー化（型も含める: 14 と 14.0 は別扱い）"""
+    if isinstance(v, np.generic):
+        v = v.item()
+    if isinstance(v, Mapping):
+        return ("map", tuple(sorted((str(k), _norm(x)) for k, x in v.items())))
+    if isinstance(v, list | tuple):
+        return ("seq", tuple(_norm(x) for x in v))
+    if isinstance(v, Hashable):
+        return (type(v).__name__, v)
+    return ("repr", repr(v))
+
+
+def normalize_params(params: Mapping[str, Any]) -> Hashable:
+    return tuple(sorted((str(k), _norm(v)) for k, v in params.items()))
+
+
+def _content_token(arr: np.ndarray) -> Hashable:
+    data = np.ascontiguousarray(arr)
+    if data.dtype == object:
+        return ("objects", data.shape, hash(tuple(data.tolist())))
+    digest = hashlib.blake2b(memoryview(data).cast("B"), digest_size=16).hexdigest()
+    return ("blake2b", data.dtype.str, data.shape, digest)
+
+
+class FeatureMemo:
+    """
+    インジ出力のメモ（スレッドセーフ）。
+    キー: (インジ関数, kind, 正規化 params, 入力列名, 入力列と index の同一性トークン)
+    - 値は呼び手間で共有される（in-place で書き換えない契約）
+    - hits/misses/evictions は stats() で参照できる
+    """
+
+    __responsibility__: ClassVar[str] = "インジ計算結果の試行間再利用（バイト予算・LRU）"
+
+    def __init__(self, max_bytes: int, *, pin_slots: int = DEFAULT_PIN_SLOTS) -> None:
+        self._lru: ByteBudgetLRU[Any] = ByteBudgetLRU(max_bytes, memo_nbytes)
+        self._pin_slots = int(pin_slots)
+        self._pins: OrderedDict[Hashable, tuple[np.ndarray, int]] = OrderedDict()
+        self._serial = itertools.count()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # 別プロセスへは設定だけ渡す（空のメモとして復元）
+        return {"max_bytes": self._lru.max_bytes, "pin_slots": self._pin_slots}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["max_bytes"], pin_slots=state["pin_slots"])  # type: ignore[misc]
+
+    @property
+    def enabled(self) -> bool:
+        return self._lru.enabled
+
+    def _pinned_token(self, arr: np.ndarray) -> Hashable:
+        iface = arr.__array_interface__
+        addr = (iface["data"][0], arr.shape, arr.strides, arr.dtype.str)
+        with self._lock:
+            item = self._pins.get(addr)
+            if item is None:
+                item = (arr, next(self._serial))
+                self._pins[addr] = item
+                while len(self._pins) > self._pin_slots:
+                    self._pins.popitem(last=False)
+            else:
+                self._pins.move_to_end(addr)
+            return ("pin", item[1])
+
+    def array_token(self, arr: np.ndarray, *, immutable: bool = False) -> Hashable:
+        """配列の同一性トークン（読み取り専用ならアドレス、そうでなければ内容ハッシュ）"""
+        if immutable or not arr.flags.writeable:
+            return self._pinned_token(arr)
+        return _content_token(arr)
+
+    def frame_token(self, frame: pd.DataFrame, columns: Sequence[str]) -> Hashable:
+        """frame の index（内容）と指定列の同一性トークン"""
+        index = frame.index
+        if isinstance(index, pd.DatetimeIndex):
+            idx_arr = index.as_unit("ns").asi8
+        else:
+            idx_arr = index.to_numpy()
+        parts: list[Hashable] = [str(getattr(index, "tz", None)), _content_token(idx_arr)]
+        parts.extend(self.array_token(a) for a in (frame[str(c)].to_numpy() for c in columns))
+        return tuple(parts)
+
+    @staticmethod
+    def make_key(
+        fn: Callable[..., Any],
+        kind: str,
+        params: Mapping[str, Any],
+        inputs: Sequence[str],
+        token: Hashable,
+    ) -> Hashable:
+        return (fn, kind, normalize_params(params), tuple(str(c) for c in inputs), token)
+
+    def get(self, key: Hashable) -> Any | None:
+        return self._lru.get(key)
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        return self._lru.put(key, value)
+
+    def clear(self) -> None:
+        self._lru.clear()
+        with self._lock:
+            self._pins.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return self._lru.stats()
+
+
+_shared: FeatureMemo | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_feature_memo() -> FeatureMemo:
+    """プロセス共有のメモ（予算は GDX_FEATURE_MEMO_MB、既定 256MB）"""
+    global _shared  # noqa: PLW0603
+    with _shared_lock:
+        if _shared is None:
+            raw = os.getenv("GDX_FEATURE_MEMO_MB", str(DEFAULT_MEMO_MB)).strip()
+            try:
+                mb = float(raw)
+            except ValueError:
+                mb = float(DEFAULT_MEMO_MB)
+            _shared = FeatureMemo(int(mb * 1024 * 1024))
+        return _shared
+
+
+# 永続ストアのキー（プロセスを跨ぐのでアドレスではなく内容とコードで決める）
+STORE_KEY_VERSION = "1"
+
+
+# GDX_FEATURE_DAG / GDX_INDICATOR_BACKEND でインジ関数の代わりに出力を作るモジュール
+ENGINE_MODULES = (
+    "trade_app.apps.features.feature_dag",
+    "trade_app.apps.features.indicators.compiled",
+)
+
+
+def _module_source(name: str) -> bytes | None:
+    try:
+        spec = importlib.util.find_spec(name)
+        origin = spec.origin if spec is not None else None
+        return Path(origin).read_bytes() if origin else None
+    except (ImportError, OSError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=1)
+def engine_version() -> str:
+    """ENGINE_MODULES のソースハッシュ（取れないモジュールは名前だけ混ぜる）"""
+    h = hashlib.blake2b(digest_size=16)
+    for name in ENGINE_MODULES:
+        h.update(name.encode())
+        h.update(_module_source(name) or b"")
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=128)
+def code_version(fn: Callable[..., Any]) -> str | None:
+    """
+    インジ関数の定義モジュールと評価系（ENGINE_MODULES）のソースハッシュ
+    （関数のソースが取れなければ None = ストア対象外）
+    """
+    try:
+        path = inspect.getsourcefile(fn)
+        src = Path(path).read_bytes() if path else None
+    except (OSError, TypeError):
+        return None
+    if src is None:
+        return None
+    h = hashlib.blake2b(src, digest_size=16)
+    h.update(f"{fn.__module__}.{fn.__qualname__}".encode())
+    h.update(engine_version().encode())
+    return h.hexdigest()
+
+
+def content_digest(frame: pd.DataFrame, columns: Sequence[str]) -> str:
+    """index（tz 含む）と指定列の内容ハッシュ"""
+    index = frame.index
+    h = hashlib.blake2b(str(getattr(index, "tz", None)).encode(), digest_size=16)
+    idx_arr = index.asi8 if isinstance(index, pd.DatetimeIndex) else index.to_numpy()
+    for arr in [idx_arr, *(frame[str(c)].to_numpy() for c in columns)]:
+        data = np.ascontiguousarray(arr)
+        h.update(f"{data.dtype.str}{data.shape}".encode())
+        h.update(memoryview(data).cast("B"))
+    return h.hexdigest()
+
+
+def store_key(
+    fn: Callable[..., Any],
+    kind: str,
+    params: Mapping[str, Any],
+    inputs: Sequence[str],
+    digest: str,
+) -> str | None:
+    """hash(データ内容, kind, params, 入力列名, コード版)。コード版が取れない関数は None"""
+    code = code_version(fn)
+    if code is None:
+        return None
+    parts = (STORE_KEY_VERSION, kind, normalize_params(params), tuple(inputs), digest, code)
+    return hashlib.blake2b(repr(parts).encode(), digest_size=20).hexdigest()
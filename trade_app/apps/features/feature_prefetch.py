@@ -0,0 +1,65 @@
+"""
+prefetch 用: 候補 spec 群のインジ呼び出しを「長さ/窓だけ違う」グループに分け、
+indicators/batched.py のバッチ版で1回に計算する。
+
+- バッチ版は単発版とビット一致するものだけ（メモへ compute と同じキーで載せてよい）
+- 対象は既定のインジ関数（pandas 版 / numba 版）だけ。差し替えた kind は単発で計算させる
+- 値が1つしかないグループ、NaN 等でバッチ版が ValueError を出すグループは計算しない
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Collection, Hashable, Iterable, Mapping
+from typing import Any
+
+import pandas as pd
+
+from trade_app.apps.features.feature_memo import normalize_params
+from trade_app.apps.features.indicators.batched import BATCHED_KINDS, SERIES_NAMES
+
+# (prefix, kind, インジ関数, 入力列, params)（feature_calc の job と同じ形）
+BatchJob = tuple[str, str, Callable[..., Any], tuple[str, ...], dict[str, Any]]
+
+# バッチ計算する最小の値数
+_MIN_BATCH = 2
+
+
+def batch_groups(
+    jobs: Iterable[BatchJob], singles: Mapping[str, Collection[Any]]
+) -> list[list[BatchJob]]:
+    """
+    (kind, 入力列, 他 params) ごとに、値の重複を除いた job の並び。
+    singles: kind -> 単発版として扱うインジ関数（これ以外の関数はグループに入れない）
+    """
+    groups: dict[Hashable, dict[Hashable, BatchJob]] = {}
+    for job in jobs:
+        _prefix, kind, fn, inputs, params = job
+        entry = BATCHED_KINDS.get(kind)
+        if entry is None or fn not in singles.get(kind, ()) or entry[0] not in params:
+            continue
+        rest = {k: v for k, v in params.items() if k != entry[0]}
+        group = groups.setdefault((kind, inputs, normalize_params(rest)), {})
+        group.setdefault(normalize_params(params), job)
+    # 1 値だけならバッチの利得が無い（通常の compute で計算）
+    return [list(g.values()) for g in groups.values() if len(g) >= _MIN_BATCH]
+
+
+def evaluate_batch(frame: pd.DataFrame, group: list[BatchJob]) -> list[Any]:
+    """グループの各 job の出力（単発版と同じ Series / {名前: Series}）。計算できなければ空"""
+    _prefix, kind, _fn, inputs, params = group[0]
+    arg, many = BATCHED_KINDS[kind]
+    rest = {k: v for k, v in params.items() if k != arg}
+    try:
+        out = many(*(frame[c] for c in inputs), [j[4][arg] for j in group], **rest)
+    except (TypeError, ValueError):
+        return []
+    index = frame.index
+    name = SERIES_NAMES.get(kind)
+    values: list[Any] = []
+    for i, job in enumerate(group):
+        if isinstance(out, dict):
+            values.append({k: pd.Series(v[:, i], index=index, name=k) for k, v in out.items()})
+        else:
+            label = name.format(job[4][arg]) if name else None
+            values.append(pd.Series(out[:, i], index=index, name=label))
+    return values
@@ -0,0 +1,254 @@
+"""
+複数パラメータを1回で計算するバッチ版インジケータ。
+
+戻り値は (bars × params) の 2-D ndarray（マルチ出力は {名前: 2-D}）。列順は渡した値の順。
+BATCHED_KINDS に載せるのは単発版（pandas 版 / numba 版 / feature_dag）とビット単位で
+一致するものだけ（prefetch はこの出力を compute と同じメモキーへ載せるため。tests/src4 で検証）。
+- EMA/RSI: 長さの並びを状態ベクトルに持つ ewm(adjust=False) の漸化式を1回だけ走査する
+  （numba 有りは compiled.ewm_mean_many、無しは行ごとの numpy 演算。列ごとの演算と順序が
+  単発版と同じなのでビット一致）。RSI の上げ幅/下げ幅は全長で共有
+- Donchian/Stoch: 2 冪窓の max/min 表（sparse table）から任意の窓長を O(n) で合成
+  （max/min は丸めが無いので単発版の deque / rolling と同じ値になる）
+- SMA/ATR: 入力（ATR は True Range）を全長で共有し、窓ごとの平均は単発版と同じ
+  補償付きローリング平均（compiled の原始演算。numba 無しは pandas rolling）で取る
+累積和版（sma_cumsum_many / bb_many / zscore_many）は和と二乗和の累積和を全窓で共有する
+単独 API。丸めが単発版と一致しない（近似。差は相対 1e-9 程度）ので BATCHED_KINDS には
+載せず、メモの先読みにも使わない。入力は有限値のみ（NaN/inf・-0.0 を含む系列は ValueError）。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+from trade_app.apps.features.indicators import compiled
+
+# 累積和の丸めで平らな窓の分散が 0 にならない分（二乗平均に対する比）を 0 とみなす
+_VAR_RTOL = 1e-9
+
+
+def _values(x: pd.Series | np.ndarray) -> np.ndarray:
+    arr = np.ascontiguousarray(x, dtype=np.float64)
+    if arr.ndim != 1:
+        raise ValueError("batched kernels take a 1-D series")
+    if not np.isfinite(arr).all():
+        raise ValueError("batched kernels require finite input (NaN/inf found)")
+    if (np.signbit(arr) & (arr == 0)).any():
+        # max(0.0, -0.0) の選び方が単発版と一致しない
+        raise ValueError("batched kernels reject -0.0 input")
+    return arr
+
+
+def _lengths(lengths: Sequence[int] | np.ndarray) -> np.ndarray:
+    raw = np.atleast_1d(np.asarray(lengths, dtype=np.float64))
+    out = raw.astype(np.int64)
+    if raw.ndim != 1 or len(out) == 0 or (out != raw).any() or (out < 1).any():
+        raise ValueError(f"lengths must be positive integers: {lengths}")
+    return out
+
+
+def _stack(cols: list[np.ndarray]) -> np.ndarray:
+    """列の並び → (n, k)（列ごとに連続な F 順。列の取り出しがコピー無しになる）"""
+    return np.stack(cols).T
+
+
+def _roll_mean(x: np.ndarray, w: int) -> np.ndarray:
+    """rolling(w, min_periods=w).mean()（単発版と同じ補償付き加減算）"""
+    if compiled.HAS_NUMBA:
+        return compiled.rolling_mean(pd.Series(x), w).to_numpy()
+    return pd.Series(x).rolling(w, min_periods=w).mean().to_numpy()
+
+
+def _true_range(h: np.ndarray, lo: np.ndarray, c: np.ndarray) -> np.ndarray:
+    if compiled.HAS_NUMBA:
+        return compiled.true_range(pd.Series(h), pd.Series(lo), pd.Series(c)).to_numpy()
+    high, low, close = pd.Series(h), pd.Series(lo), pd.Series(c)
+    prev = close.shift(1)
+    parts = [(high - low).abs(), (high - prev).abs(), (low - prev).abs()]
+    return pd.concat(parts, axis=1).max(axis=1).to_numpy()
+
+
+def _ewm_many(x: np.ndarray, coms: np.ndarray) -> np.ndarray:
+    """ewm(com=coms[j], adjust=False).mean() を列 j に（compiled._ewm_mean と同じ漸化式）"""
+    if compiled.HAS_NUMBA:
+        return compiled.ewm_mean_many(x, coms)
+    n, k = len(x), len(coms)
+    out = np.empty((n, k))
+    if n == 0:
+        return out
+    alpha = 1.0 / (1.0 + coms)
+    weighted = np.full(k, x[0])
+    old_wt = np.ones(k)
+    out[0] = weighted
+    for i in range(1, n):
+        cur = x[i]
+        has = ~np.isnan(weighted)
+        old_wt = np.where(has, old_wt * (1.0 - alpha), old_wt)
+        if not np.isnan(cur):
+            with np.errstate(invalid="ignore"):
+                moved = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+            weighted = np.where(has, np.where(weighted != cur, moved, weighted), cur)
+            old_wt = np.where(has, 1.0, old_wt)
+        out[i] = weighted
+    return out
+
+
+def _up_down(c: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """close.diff() の clip(lower=0) と (-diff).clip(lower=0)（先頭は NaN）"""
+    d = np.empty(len(c))
+    d[:1] = np.nan
+    d[1:] = c[1:] - c[:-1]
+    nd = -d
+    with np.errstate(invalid="ignore"):
+        up = np.where((d >= 0) | np.isnan(d), d, 0.0)
+        down = np.where((nd >= 0) | np.isnan(nd), nd, 0.0)
+    return up, down
+
+
+def _window_moments(x: np.ndarray, windows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(rolling(w).mean(), rolling(w).var(ddof=0)) を累積和から。先頭で中心化して桁落ちを抑える"""
+    n = len(x)
+    shift = x[0] if n else 0.0
+    y = x - shift
+    s = np.concatenate(([0.0], np.cumsum(y)))
+    q = np.concatenate(([0.0], np.cumsum(y * y)))
+    # (k, n) で埋めて転置（列ごとに連続。_rolling_extrema と同じ）
+    mean = np.full((len(windows), n), np.nan)
+    var = np.full((len(windows), n), np.nan)
+    for i, w in enumerate(windows):
+        if w > n:
+            continue
+        sw = np.subtract(s[w:], s[:-w])
+        sw /= w
+        qw = np.subtract(q[w:], q[:-w])
+        qw /= w
+        v = var[i, w - 1 :]
+        np.subtract(qw, sw * sw, out=v)
+        v[v <= _VAR_RTOL * qw] = 0.0
+        np.add(sw, shift, out=mean[i, w - 1 :])
+    return mean.T, var.T
+
+
+def _rolling_extrema(x: np.ndarray, windows: np.ndarray, op) -> np.ndarray:
+    """rolling(w).max()/min() を複数窓で（2 冪窓の表を共有）"""
+    n = len(x)
+    table = [x]
+    p = 1
+    while p * 2 <= windows.max():
+        prev = table[-1]
+        cur = prev.copy()
+        cur[p:] = op(prev[p:], prev[:-p])
+        table.append(cur)
+        p *= 2
+    out = np.full((len(windows), n), np.nan)
+    for i, w in enumerate(windows):
+        if w > n:
+            continue
+        lvl = int(w).bit_length() - 1
+        size = 1 << lvl
+        m = table[lvl]
+        out[i, w - 1 :] = op(m[w - 1 :], m[size - 1 : n - w + size])
+    return out.T
+
+
+def sma_many(series: pd.Series | np.ndarray, lengths: Sequence[int]) -> np.ndarray:
+    x, ls = _values(series), _lengths(lengths)
+    return _stack([_roll_mean(x, int(w)) for w in ls])
+
+
+def ema_many(series: pd.Series | np.ndarray, lengths: Sequence[int]) -> np.ndarray:
+    x, ls = _values(series), _lengths(lengths)
+    return _ewm_many(x, (ls.astype(np.float64) - 1) / 2)  # span -> com
+
+
+def rsi_many(close: pd.Series | np.ndarray, lengths: Sequence[int]) -> np.ndarray:
+    c, ls = _values(close), _lengths(lengths)
+    alpha = 1 / ls.astype(np.float64)
+    coms = (1 - alpha) / alpha  # ewm(alpha=1/length) と同じ換算
+    up, down = _up_down(c)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - (100 / (1 + _ewm_many(up, coms) / _ewm_many(down, coms)))
+
+
+def sma_cumsum_many(series: pd.Series | np.ndarray, lengths: Sequence[int]) -> np.ndarray:
+    """sma_many の近似（累積和を共有。単発版とはビット一致しない）"""
+    mean, _var = _window_moments(_values(series), _lengths(lengths))
+    return mean
+
+
+def bb_many(
+    close: pd.Series | np.ndarray, windows: Sequence[int], mult: float = 2.0
+) -> dict[str, np.ndarray]:
+    """bb(use_ema=False) の近似（累積和を共有。単発版とはビット一致しない）"""
+    mid, var = _window_moments(_values(close), _lengths(windows))
+    std = np.sqrt(var)
+    return {"upper": mid + mult * std, "middle": mid, "lower": mid - mult * std}
+
+
+def zscore_many(series: pd.Series | np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    """zscore の近似（累積和を共有。単発版とはビット一致しない）"""
+    x = _values(series)
+    mean, var = _window_moments(x, _lengths(windows))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (x[:, None] - mean) / np.sqrt(var)
+
+
+def atr_many(
+    high: pd.Series | np.ndarray,
+    low: pd.Series | np.ndarray,
+    close: pd.Series | np.ndarray,
+    lengths: Sequence[int],
+) -> np.ndarray:
+    h, lo, c, ls = _values(high), _values(low), _values(close), _lengths(lengths)
+    tr = _true_range(h, lo, c)
+    return _stack([_roll_mean(tr, int(w)) for w in ls])
+
+
+def donchian_many(
+    high: pd.Series | np.ndarray, low: pd.Series | np.ndarray, windows: Sequence[int]
+) -> dict[str, np.ndarray]:
+    h, lo, ws = _values(high), _values(low), _lengths(windows)
+    upper = _rolling_extrema(h, ws, np.maximum)
+    lower = _rolling_extrema(lo, ws, np.minimum)
+    return {"upper": upper, "middle": (upper + lower) / 2.0, "lower": lower}
+
+
+def stoch_many(
+    high: pd.Series | np.ndarray,
+    low: pd.Series | np.ndarray,
+    close: pd.Series | np.ndarray,
+    ks: Sequence[int],
+    d: int = 3,
+    smooth: int = 1,
+) -> dict[str, np.ndarray]:
+    h, lo, c, kk = _values(high), _values(low), _values(close), _lengths(ks)
+    lowest = _rolling_extrema(lo, kk, np.minimum)
+    highest = _rolling_extrema(h, kk, np.maximum)
+    denom = highest - lowest
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k_fast = np.where(denom == 0, np.nan, (c[:, None] - lowest) / denom * 100.0)
+    cols = [np.ascontiguousarray(k_fast[:, i]) for i in range(len(kk))]
+    if smooth and smooth > 1:
+        cols = [_roll_mean(col, int(smooth)) for col in cols]
+    return {"k": _stack(cols), "d": _stack([_roll_mean(col, int(d)) for col in cols])}
+
+
+# kind -> (バッチ対象の引数名, バッチ関数)。関数は (入力列..., 値の並び, **他 params) を取る
+BATCHED_KINDS = {
+    "sma": ("length", sma_many),
+    "ema": ("length", ema_many),
+    "rsi": ("length", rsi_many),
+    "atr": ("length", atr_many),
+    "donchian": ("window", donchian_many),
+    "stoch": ("k", stoch_many),
+}
+
+# 単発版が付ける Series 名（メモの値を単発版と揃える）
+SERIES_NAMES = {
+    "sma": "sma_{}",
+    "ema": "ema_{}",
+    "rsi": "rsi_{}",
+    "atr": "atr_{}",
+}
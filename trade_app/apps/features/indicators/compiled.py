@@ -0,0 +1,376 @@
+"""
+numba でコンパイルしたインジケータ（pandas 版と同じシグネチャ・同じ出力）。
+
+- EMA/Wilder RMA: pandas の ewm(adjust=False) と同じ更新式（com→alpha の換算、
+  一定値での更新省略、NaN の扱いまで揃える）
+- ローリング平均: pandas roll_mean と同じ補償付き加減算（Kahan）と丸め補正
+- ローリング max/min: 単調 deque（窓内の NaN 数を数え、min_periods に満たなければ NaN）
+- True Range: 3 候補の NaN 無視 max（pandas の concat().max(axis=1) 相当）
+ウォームアップの NaN 位置と値はビット単位で pandas 版と一致する（tests/src4 で検証）。
+numba が無い環境では HAS_NUMBA=False となり、レジストリは pandas 版のまま使う。
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - numba 無しは pandas 版へフォールバック
+    numba = None
+
+HAS_NUMBA = numba is not None
+
+
+def _njit(fn: Callable[..., Any]) -> Callable[..., Any]:
+    if numba is None:
+        return fn
+    return numba.njit(cache=True, nogil=True)(fn)
+
+
+@_njit
+def _ewm_mean(vals: np.ndarray, com: float) -> np.ndarray:
+    """ewm(com=com, adjust=False).mean()（ignore_na=False）"""
+    n = vals.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+    alpha = 1.0 / (1.0 + com)
+    old_wt_factor = 1.0 - alpha
+    new_wt = alpha
+    weighted = vals[0]
+    out[0] = weighted
+    old_wt = 1.0
+    for i in range(1, n):
+        cur = vals[i]
+        is_obs = not math.isnan(cur)
+        if not math.isnan(weighted):
+            old_wt *= old_wt_factor
+            if is_obs:
+                # pandas と同じく一定値では更新しない（丸め誤差を持ち込まない）
+                if weighted != cur:
+                    weighted = old_wt * weighted + new_wt * cur
+                    weighted /= old_wt + new_wt
+                old_wt = 1.0
+        elif is_obs:
+            weighted = cur
+        out[i] = weighted
+    return out
+
+
+@_njit
+def _ewm_mean_many(vals: np.ndarray, coms: np.ndarray) -> np.ndarray:
+    """列 j = _ewm_mean(vals, coms[j]) を1回の走査で（状態を com の数だけ持つ漸化式）"""
+    n = vals.shape[0]
+    k = coms.shape[0]
+    out = np.empty((n, k))
+    if n == 0:
+        return out
+    alpha = np.empty(k)
+    for j in range(k):
+        alpha[j] = 1.0 / (1.0 + coms[j])
+    weighted = np.full(k, vals[0])
+    old_wt = np.ones(k)
+    out[0, :] = vals[0]
+    for i in range(1, n):
+        cur = vals[i]
+        is_obs = not math.isnan(cur)
+        for j in range(k):
+            w = weighted[j]
+            if not math.isnan(w):
+                # _ewm_mean と同じ演算・同じ順序（列ごとの値はビット単位で一致）
+                ow = old_wt[j] * (1.0 - alpha[j])
+                if is_obs:
+                    if w != cur:
+                        w = ow * w + alpha[j] * cur
+                        w /= ow + alpha[j]
+                    ow = 1.0
+                old_wt[j] = ow
+            elif is_obs:
+                w = cur
+            weighted[j] = w
+            out[i, j] = w
+    return out
+
+
+@_njit
+def _kahan(sum_x: float, comp: float, v: float) -> tuple[float, float]:
+    """補償付き加算（pandas roll_mean の add/remove と同じ式）"""
+    y = v - comp
+    t = sum_x + y
+    return t, t - sum_x - y
+
+
+@_njit
+def _mean_result(sum_x: float, nobs: int, neg_ct: int, same: int, prev: float, minp: int) -> float:
+    if nobs < minp or nobs == 0:
+        return np.nan
+    r = sum_x / nobs
+    if same >= nobs:
+        return prev
+    # 符号が揃っている窓で丸め誤差により符号が反転した場合は 0 に丸める
+    if (neg_ct == 0 and r < 0) or (neg_ct == nobs and r > 0):
+        return 0.0
+    return r
+
+
+@_njit
+def _roll_mean(vals: np.ndarray, window: int, minp: int) -> np.ndarray:
+    """rolling(window, min_periods=minp).mean()"""
+    n = vals.shape[0]
+    out = np.empty(n)
+    nobs = neg_ct = same = 0
+    sum_x = comp_add = comp_rem = 0.0
+    prev = np.nan
+    for i in range(n):
+        s = max(0, i - window + 1)
+        lo = i
+        if i == 0 or s >= i:
+            # 窓を作り直す（window=1 では毎回）
+            prev = vals[s]
+            nobs = neg_ct = same = 0
+            sum_x = comp_add = comp_rem = 0.0
+            lo = s
+        elif s > 0 and not math.isnan(vals[s - 1]):
+            v = vals[s - 1]
+            nobs -= 1
+            sum_x, comp_rem = _kahan(sum_x, comp_rem, -v)
+            if math.copysign(1.0, v) < 0:
+                neg_ct -= 1
+        for j in range(lo, i + 1):
+            v = vals[j]
+            if math.isnan(v):
+                continue
+            nobs += 1
+            sum_x, comp_add = _kahan(sum_x, comp_add, v)
+            if math.copysign(1.0, v) < 0:
+                neg_ct += 1
+            same = same + 1 if v == prev else 1
+            prev = v
+        out[i] = _mean_result(sum_x, nobs, neg_ct, same, prev, minp)
+    return out
+
+
+@_njit
+def _roll_extreme(vals: np.ndarray, window: int, minp: int, is_max: bool) -> np.ndarray:
+    """rolling(window, min_periods=minp).max()/min()（単調 deque、NaN は数えて飛ばす）"""
+    n = vals.shape[0]
+    out = np.empty(n)
+    q = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    nan_ct = 0
+    for i in range(n):
+        v = vals[i]
+        if math.isnan(v):
+            nan_ct += 1
+        else:
+            if is_max:
+                while tail > head and vals[q[tail - 1]] <= v:
+                    tail -= 1
+            else:
+                while tail > head and vals[q[tail - 1]] >= v:
+                    tail -= 1
+            q[tail] = i
+            tail += 1
+        s = i - window + 1
+        if s > 0 and math.isnan(vals[s - 1]):
+            nan_ct -= 1
+        while tail > head and q[head] < s:
+            head += 1
+        nobs = min(i + 1, window) - nan_ct
+        if tail > head and nobs >= minp:
+            out[i] = vals[q[head]]
+        else:
+            out[i] = np.nan
+    return out
+
+
+@_njit
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    n = high.shape[0]
+    out = np.empty(n)
+    for i in range(n):
+        best = np.nan
+        a = abs(high[i] - low[i])
+        if not math.isnan(a):
+            best = a
+        if i > 0:
+            pc = close[i - 1]
+            b = abs(high[i] - pc)
+            if not math.isnan(b) and not (best >= b):
+                best = b
+            c = abs(low[i] - pc)
+            if not math.isnan(c) and not (best >= c):
+                best = c
+        out[i] = best
+    return out
+
+
+@_njit
+def _rsi_from_close(close: np.ndarray, com: float) -> tuple[np.ndarray, np.ndarray]:
+    n = close.shape[0]
+    up = np.empty(n)
+    down = np.empty(n)
+    for i in range(n):
+        d = close[i] - close[i - 1] if i > 0 else np.nan
+        # clip(lower=0): NaN と -0.0 はそのまま
+        up[i] = d if (d >= 0 or math.isnan(d)) else 0.0
+        nd = -d
+        down[i] = nd if (nd >= 0 or math.isnan(nd)) else 0.0
+    ru = _ewm_mean(up, com)
+    rd = _ewm_mean(down, com)
+    return ru, rd
+
+
+def _values(s: pd.Series) -> np.ndarray:
+    return np.ascontiguousarray(s.to_numpy(dtype=np.float64, na_value=np.nan))
+
+
+def _span_com(span: float) -> float:
+    return (float(span) - 1) / 2
+
+
+def _alpha_com(alpha: float) -> float:
+    return (1 - float(alpha)) / float(alpha)
+
+
+def _series(values: np.ndarray, like: pd.Series, name: str | None) -> pd.Series:
+    return pd.Series(values, index=like.index, name=name)
+
+
+# --- 原始演算（feature_dag が共有ノードの評価に使う。Series -> Series、名前なし） ---
+
+
+def ewm_span(series: pd.Series, span: float) -> pd.Series:
+    return _series(_ewm_mean(_values(series), _span_com(span)), series, None)
+
+
+def ewm_mean_many(values: np.ndarray, coms: np.ndarray) -> np.ndarray:
+    """1-D の values を複数の com で ewm(adjust=False).mean()。出力 (n, k)（batched が使う）"""
+    vals = np.ascontiguousarray(values, dtype=np.float64)
+    return _ewm_mean_many(vals, np.ascontiguousarray(coms, dtype=np.float64))
+
+
+def rolling_mean(series: pd.Series, window: int) -> pd.Series:
+    return _series(_roll_mean(_values(series), int(window), int(window)), series, None)
+
+
+def rolling_extreme(series: pd.Series, window: int, *, is_max: bool) -> pd.Series:
+    out = _roll_extreme(_values(series), int(window), int(window), is_max)
+    return _series(out, series, None)
+
+
+def true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
+    return _series(_true_range(_values(high), _values(low), _values(close)), close, None)
+
+
+def ema(series: pd.Series, length: int = 20) -> pd.Series:
+    return _series(_ewm_mean(_values(series), _span_com(length)), series, f"ema_{length}")
+
+
+def sma(series: pd.Series, length: int = 20) -> pd.Series:
+    out = _roll_mean(_values(series), int(length), int(length))
+    return _series(out, series, f"sma_{length}")
+
+
+def rsi(close: pd.Series, length: int = 14) -> pd.Series:
+    """標準RSI（Wilder RMA。NaNは先頭にのみ生成）"""
+    ru, rd = _rsi_from_close(_values(close), _alpha_com(1 / length))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100 - (100 / (1 + ru / rd))
+    return _series(out, close, f"rsi_{length}")
+
+
+def macd(
+    close: pd.Series,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+) -> dict[str, pd.Series]:
+    """MACD（macd/signal/hist）"""
+    x = _values(close)
+    line = _ewm_mean(x, _span_com(fast)) - _ewm_mean(x, _span_com(slow))
+    sig = _ewm_mean(line, _span_com(signal))
+    return {
+        "macd": _series(line, close, "macd"),
+        "signal": _series(sig, close, "signal"),
+        "hist": _series(line - sig, close, "hist"),
+    }
+
+
+def _atr_values(high: pd.Series, low: pd.Series, close: pd.Series, length: int) -> np.ndarray:
+    tr = _true_range(_values(high), _values(low), _values(close))
+    return _roll_mean(tr, int(length), int(length))
+
+
+def atr(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14) -> pd.Series:
+    return _series(_atr_values(high, low, close, length), close, f"atr_{length}")
+
+
+def keltner(
+    high: pd.Series,
+    low: pd.Series,
+    close: pd.Series,
+    ema_len: int = 20,
+    atr_len: int = 14,
+    mult: float = 2.0,
+) -> dict[str, pd.Series]:
+    """Keltner Channel（upper/middle/lower）"""
+    mid = _ewm_mean(_values(close), _span_com(ema_len))
+    band = mult * _atr_values(high, low, close, atr_len)
+    return {
+        "upper": _series(mid + band, close, "upper"),
+        "middle": _series(mid, close, "middle"),
+        "lower": _series(mid - band, close, "lower"),
+    }
+
+
+def donchian(high: pd.Series, low: pd.Series, window: int = 20) -> dict[str, pd.Series]:
+    """Donchian Channel（upper/middle/lower）"""
+    w = int(window)
+    upper = _roll_extreme(_values(high), w, w, True)
+    lower = _roll_extreme(_values(low), w, w, False)
+    return {
+        "upper": _series(upper, high, "upper"),
+        "middle": _series((upper + lower) / 2.0, high, "middle"),
+        "lower": _series(lower, high, "lower"),
+    }
+
+
+def stoch(
+    high: pd.Series,
+    low: pd.Series,
+    close: pd.Series,
+    k: int = 14,
+    d: int = 3,
+    smooth: int = 1,
+) -> dict[str, pd.Series]:
+    """Stochastic %K/%D（fast Kをsmooth、Dは移動平均）"""
+    lowest = _roll_extreme(_values(low), int(k), int(k), False)
+    highest = _roll_extreme(_values(high), int(k), int(k), True)
+    denom = highest - lowest
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k_fast = np.where(denom == 0, np.nan, (_values(close) - lowest) / denom * 100.0)
+    if smooth and smooth > 1:
+        k_fast = _roll_mean(k_fast, int(smooth), int(smooth))
+    d_line = _roll_mean(k_fast, int(d), int(d))
+    return {"k": _series(k_fast, close, "k"), "d": _series(d_line, close, "d")}
+
+
+# kind -> コンパイル版（feature_calc のレジストリで pandas 版を置き換える）
+COMPILED_REGISTRY: dict[str, Callable[..., Any]] = {
+    "rsi": rsi,
+    "sma": sma,
+    "ema": ema,
+    "atr": atr,
+    "macd": macd,
+    "keltner": keltner,
+    "donchian": donchian,
+    "stoch": stoch,
+}
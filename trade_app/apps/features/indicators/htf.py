@@ -0,0 +1,106 @@
+"""
+上位足（HTF）特徴量: 探索中の足を tf へ畳んでインジを計算し、確定済みの上位足だけを元の足へ揃える。
+
+- 畳み込みは utils.resample.resample_ohlcv（UTC 基準の左閉じ・左ラベル）
+- 先読み防止: 元の足 b は閉じた時点（b + 1本）で終わっている上位足のうち最後のものを参照する。
+  上位足 [t, t+tf) の値は、その区間の最後の足が閉じるまで使われない（欠けた足があっても同じ）
+- DefaultFeatureCalculator は畳んだフレームと上位足のインジ出力を FeatureMemo/ストアに載せて
+  試行間で再利用する（htf はそのキャッシュ無しの参照実装）
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Mapping, Sequence
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from trade_app.utils.resample import floor_labels, resample_ohlcv, span_origin
+
+HTF_KIND = "htf"
+
+
+def _bar_step(ns: np.ndarray) -> int:
+    """元の足の1本の長さ（正の最小間隔。1本しか無ければ 0 = 保守的に扱う）"""
+    diffs = np.diff(ns)
+    diffs = diffs[diffs > 0]
+    return int(diffs.min()) if diffs.size else 0
+
+
+def closed_positions(
+    htf_index: pd.DatetimeIndex, base_index: pd.DatetimeIndex, tf: str
+) -> np.ndarray:
+    """元の足ごとに、閉じた時点で確定している最後の上位足の位置（無ければ -1）"""
+    span, origin = span_origin(tf)
+    base = base_index.as_unit("ns").asi8  # span/origin は ns
+    closed_label = floor_labels(base + _bar_step(base), span, origin) - span
+    return np.searchsorted(htf_index.as_unit("ns").asi8, closed_label, side="right") - 1
+
+
+def _take(s: pd.Series, pos: np.ndarray, index: pd.Index) -> pd.Series:
+    v = s.to_numpy(dtype=np.float64, na_value=np.nan)
+    out = np.where(pos >= 0, v[np.maximum(pos, 0)] if len(v) else np.nan, np.nan)
+    return pd.Series(out, index=index, name=s.name)
+
+
+def align_closed(
+    value: Any, htf_index: pd.DatetimeIndex, base_index: pd.DatetimeIndex, tf: str
+) -> Any:
+    """上位足のインジ出力（Series / dict[str, Series]）を元の足の index へ先読み無しで揃える"""
+    pos = closed_positions(htf_index, base_index, tf)
+    if isinstance(value, Mapping):
+        return {k: _take(s, pos, base_index) for k, s in value.items()}
+    return _take(value, pos, base_index)
+
+
+def htf_spec(params: Mapping[str, Any]) -> tuple[str, str, dict[str, Any]]:
+    """params（tf, kind, params）→ (tf, 上位足で計算する kind, その params)"""
+    kind = str(params.get("kind", "")).lower()
+    if "tf" not in params or not kind or kind in (HTF_KIND, "session"):
+        raise ValueError(f"htf needs params.tf and an indicator kind: {dict(params)}")
+    return str(params["tf"]), kind, dict(params.get("params") or {})
+
+
+def htf(
+    frame: pd.DataFrame,
+    inner: Callable[..., Any],
+    inputs: Sequence[str],
+    params: Mapping[str, Any],
+) -> Any:
+    """参照実装: frame を畳んで inner(*入力列, **params) を計算し、元の index へ揃える"""
+    tf, _kind, inner_params = htf_spec(params)
+    up = resample_ohlcv(frame[list(inputs)], tf)
+    return align_closed(inner(*(up[c] for c in inputs), **inner_params), up.index, frame.index, tf)
+
+
+def htf_cached(
+    frame: pd.DataFrame,
+    inputs: tuple[str, ...],
+    params: Mapping[str, Any],
+    *,
+    registry: Mapping[str, Callable[..., Any]],
+    memo: Any,
+    evaluate: Callable[[pd.DataFrame, tuple], Any],
+) -> Any:
+    """
+    htf のキャッシュ付き版。memo（FeatureMemo、無効なら None）に畳んだフレームと
+    上位足のインジ出力を載せる。evaluate(畳んだフレーム, job) は計算器のストア経由の評価。
+    """
+    tf, kind, inner_params = htf_spec(params)
+    fn = registry.get(kind)
+    if fn is None:
+        raise ValueError(f"unknown indicator kind: {kind}")
+    job = (kind, kind, fn, inputs, inner_params)
+    if memo is None:
+        up = resample_ohlcv(frame[list(inputs)], tf)
+        return align_closed(evaluate(up, job), up.index, frame.index, tf)
+    up_key: Hashable = ("htf_resample", tf, memo.frame_token(frame, inputs))
+    up = memo.get(up_key)
+    if up is None:
+        up = memo.put(up_key, resample_ohlcv(frame[list(inputs)], tf))
+    key = memo.make_key(fn, kind, inner_params, inputs, memo.frame_token(up, inputs))
+    value = memo.get(key)
+    if value is None:
+        value = memo.put(key, evaluate(up, job))
+    return align_closed(value, up.index, frame.index, tf)
@@ -0,0 +1,146 @@
+"""
+インジのメタデータ（レジストリの kind ごとに1つ）。
+
+- inputs: on 省略時の入力列（1列の kind は on: "close" 等で差し替え可）
+- outputs: マルチ出力のキー（単一出力は空）
+- warmup(params): 入力に NaN が無いときの先頭有効位置（bundle の先頭削りの近道、実データで検証）。
+  None は宣言なし（bundle が走査で求める）
+- lookback(params): ある足の値を全履歴で計算した値と一致させるのに要る過去の本数。
+  EMA/RMA 系は残差の重みが 1e-9 未満になる本数、None は全履歴に依存（累積 VWAP）
+- incremental: 直近の状態だけで1本ずつ更新できる（ライブの逐次更新向け）
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any, ClassVar
+
+# 再帰型（EMA/RMA）で打ち切ってよい残差の重み
+_EWM_TOLERANCE = 1e-9
+
+Params = Mapping[str, Any]
+
+
+def _ewm_lookback(alpha: float) -> int:
+    """(1 - alpha)^n < 1e-9 となる最小の n（それ以前の履歴の影響は無視できる）"""
+    if alpha >= 1:
+        return 0
+    return math.ceil(math.log(_EWM_TOLERANCE) / math.log1p(-alpha))
+
+
+def _span(n: Any) -> int:
+    return _ewm_lookback(2.0 / (float(n) + 1.0))
+
+
+def _window(n: Any) -> int:
+    return max(0, int(n) - 1)
+
+
+def _zero(_params: Params) -> int:
+    return 0
+
+
+@dataclass(frozen=True)
+class IndicatorMeta:
+    __responsibility__: ClassVar[str] = "インジの入出力・ウォームアップ・逐次更新可否の宣言"
+
+    inputs: tuple[str, ...]
+    outputs: tuple[str, ...] = ()
+    warmup: Callable[[Params], int | None] = _zero
+    lookback: Callable[[Params], int | None] = _zero
+    incremental: bool = True
+
+
+def _stoch_warmup(p: Params) -> int:
+    smooth = int(p.get("smooth", 1) or 1)
+    return _window(p.get("k", 14)) + _window(smooth) + _window(p.get("d", 3))
+
+
+def _bb_warmup(p: Params) -> int:
+    return 0 if p.get("use_ema", False) else _window(p.get("window", 20))
+
+
+def _bb_lookback(p: Params) -> int:
+    # EMA 版は中心線と偏差の EMA を重ねる
+    return 2 * _span(p.get("window", 20)) if p.get("use_ema", False) else _bb_warmup(p)
+
+
+def _vwap_window(p: Params) -> int | None:
+    w = p.get("window")
+    return None if w is None else _window(w)
+
+
+_BANDS = ("upper", "middle", "lower")
+_HLC = ("high", "low", "close")
+
+INDICATOR_META: dict[str, IndicatorMeta] = {
+    # 単一出力
+    "rsi": IndicatorMeta(
+        inputs=("close",),
+        warmup=lambda p: 1,
+        lookback=lambda p: 1 + _ewm_lookback(1.0 / float(p.get("length", 14))),
+    ),
+    "sma": IndicatorMeta(
+        inputs=("close",),
+        warmup=lambda p: _window(p.get("length", 20)),
+        lookback=lambda p: _window(p.get("length", 20)),
+    ),
+    "ema": IndicatorMeta(inputs=("close",), lookback=lambda p: _span(p.get("length", 20))),
+    "identity": IndicatorMeta(inputs=("close",)),
+    "atr": IndicatorMeta(
+        inputs=_HLC,
+        warmup=lambda p: _window(p.get("length", 14)),
+        # 窓の先頭の TR が1本前の close を使う
+        lookback=lambda p: int(p.get("length", 14)),
+    ),
+    "roc": IndicatorMeta(
+        inputs=("close",),
+        warmup=lambda p: int(p.get("window", 12)),
+        lookback=lambda p: int(p.get("window", 12)),
+    ),
+    "zscore": IndicatorMeta(
+        inputs=("close",),
+        warmup=lambda p: _window(p.get("window", 20)),
+        lookback=lambda p: _window(p.get("window", 20)),
+    ),
+    "vwap": IndicatorMeta(
+        inputs=("close", "volume"),
+        warmup=lambda p: _vwap_window(p) or 0,
+        lookback=_vwap_window,
+    ),
+    # session は Index だけから作る
+    "session": IndicatorMeta(inputs=()),
+    # 上位足: 元の足の本数では決まらない（出力も中の kind 次第）
+    "htf": IndicatorMeta(
+        inputs=(), warmup=lambda p: None, lookback=lambda p: None, incremental=False
+    ),
+    # 複数出力
+    "bb": IndicatorMeta(
+        inputs=("close",), outputs=_BANDS, warmup=_bb_warmup, lookback=_bb_lookback
+    ),
+    "macd": IndicatorMeta(
+        inputs=("close",),
+        outputs=("macd", "signal", "hist"),
+        lookback=lambda p: _span(p.get("slow", 26)) + _span(p.get("signal", 9)),
+    ),
+    "stoch": IndicatorMeta(
+        inputs=_HLC,
+        outputs=("k", "d"),
+        warmup=_stoch_warmup,
+        lookback=_stoch_warmup,
+    ),
+    "donchian": IndicatorMeta(
+        inputs=("high", "low"),
+        outputs=_BANDS,
+        warmup=lambda p: _window(p.get("window", 20)),
+        lookback=lambda p: _window(p.get("window", 20)),
+    ),
+    "keltner": IndicatorMeta(
+        inputs=_HLC,
+        outputs=_BANDS,
+        warmup=lambda p: _window(p.get("atr_len", 14)),
+        lookback=lambda p: max(_span(p.get("ema_len", 20)), int(p.get("atr_len", 14))),
+    ),
+}
@@ -0,0 +1,160 @@
+"""
+セッションマスクのキャッシュと、tz_convert を使わない現地時刻の計算。
+
+- 現地の秒（0..86399）は UTC オフセット表（pytz の遷移表: UTC の遷移時刻 → オフセット）を
+  searchsorted で引いて求める。pandas の tz_convert が使うのと同じ表なので DST の扱いも同じ
+- マスクは (Index 指紋, 正規化したウィンドウ集合) をキーに packbits（1本 1bit）で保持する。
+  同じ Index・同じセッションを使う試行（run_pipeline_full と CombinedEntryGate）は1回だけ計算
+- Index 指紋は内容ハッシュ（blake2b）。同じ Index オブジェクトはハッシュも省く
+- GDX_SESSION_MASK_MB（既定 16、0 で無効）
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from trade_app.utils.lru import ByteBudgetLRU
+
+DEFAULT_SESSION_MASK_MB = 16
+_DAY_SECONDS = 86400
+_NS = 1_000_000_000
+# Index オブジェクト -> 指紋 の対応を覚えておく数
+_FINGERPRINT_SLOTS = 64
+
+
+def _parse_hhmm(s: str) -> tuple[int, int]:
+    h, m = s.split(":")
+    return int(h), int(m)
+
+
+@lru_cache(maxsize=64)
+def utc_offset_table(tz_name: str) -> tuple[np.ndarray, np.ndarray]:
+    """(遷移時刻[ns, 昇順], その時刻以降の UTC オフセット[秒])。固定オフセットの tz は1行"""
+    tz = pytz.timezone(tz_name)
+    times = getattr(tz, "_utc_transition_times", None)
+    info = getattr(tz, "_transition_info", None)
+    start = np.iinfo(np.int64).min
+    if not times or not info:
+        offset = tz.utcoffset(datetime(2000, 1, 1)) or pd.Timedelta(0)
+        return np.array([start], dtype=np.int64), np.array([offset.total_seconds()], dtype=np.int64)
+    # 先頭は datetime(1, 1, 1) の番兵（それ以前も最初のオフセット）
+    trans = [start] + [pd.Timestamp(t).value for t in times[1:]]
+    offsets = [int(i[0].total_seconds()) for i in info]
+    return np.asarray(trans, dtype=np.int64), np.asarray(offsets, dtype=np.int64)
+
+
+def local_seconds_of_day(index_utc: pd.DatetimeIndex, tz_name: str) -> np.ndarray:
+    """tz_name での時刻の、その日の 0 時からの秒（秒未満は切り捨て）"""
+    ns = index_utc.as_unit("ns").asi8  # µs 等の Index も遷移表（ns）と同じ単位にそろえる
+    trans, offsets = utc_offset_table(tz_name)
+    pos = np.searchsorted(trans, ns, side="right") - 1
+    return (ns // _NS + offsets[pos]) % _DAY_SECONDS
+
+
+def _window_mask(index_utc: pd.DatetimeIndex, w: Mapping[str, Any]) -> np.ndarray:
+    secs = local_seconds_of_day(index_utc, str(w.get("tz", "UTC")))
+    sh, sm = _parse_hhmm(str(w["start"]))
+    eh, em = _parse_hhmm(str(w["end"]))
+    start_sec = sh * 3600 + sm * 60
+    end_sec = eh * 3600 + em * 60
+    if start_sec <= end_sec:
+        return (secs >= start_sec) & (secs < end_sec)  # [start, end)
+    # 日跨ぎ（例 22:00-06:00）
+    return (secs >= start_sec) | (secs < end_sec)
+
+
+def compute_mask(index_utc: pd.DatetimeIndex, windows: list[Mapping[str, Any]]) -> np.ndarray:
+    """ウィンドウ群の OR（type=all があれば全 True、未知の type は無視）"""
+    mask = np.zeros(len(index_utc), dtype=bool)
+    for w in windows:
+        if w.get("type") == "all":
+            return np.ones(len(index_utc), dtype=bool)
+        if w.get("type") == "window":
+            mask |= _window_mask(index_utc, w)
+    return mask
+
+
+def _windows_key(windows: list[Mapping[str, Any]]) -> Hashable:
+    return tuple(tuple(sorted((str(k), str(v)) for k, v in w.items())) for w in windows)
+
+
+class SessionMaskCache:
+    """(Index 指紋, ウィンドウ集合) → packbits したマスク"""
+
+    __responsibility__ = "セッションマスクを Index とウィンドウ集合ごとに1回だけ計算して共有"
+
+    def __init__(self, max_bytes: int) -> None:
+        self._lru: ByteBudgetLRU[tuple[np.ndarray, int]] = ByteBudgetLRU(
+            max_bytes, lambda v: int(v[0].nbytes)
+        )
+        self._fingerprints: OrderedDict[int, tuple[weakref.ref, Hashable]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"max_bytes": self._lru.max_bytes}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["max_bytes"])  # type: ignore[misc]
+
+    def fingerprint(self, index: pd.DatetimeIndex) -> Hashable:
+        with self._lock:
+            hit = self._fingerprints.get(id(index))
+            if hit is not None and hit[0]() is index:
+                return hit[1]
+        ticks = np.ascontiguousarray(index.asi8)
+        # 同じ整数列でも単位が違えば別の時刻なので単位もキーに含める
+        digest = hashlib.blake2b(memoryview(ticks).cast("B"), digest_size=16).hexdigest()
+        token = (str(index.unit), len(ticks), digest)
+        with self._lock:
+            self._fingerprints[id(index)] = (weakref.ref(index), token)
+            while len(self._fingerprints) > _FINGERPRINT_SLOTS:
+                self._fingerprints.popitem(last=False)
+        return token
+
+    def mask(self, index_utc: pd.DatetimeIndex, windows: list[Mapping[str, Any]]) -> np.ndarray:
+        if not self._lru.enabled:
+            return compute_mask(index_utc, windows)
+        key = (self.fingerprint(index_utc), _windows_key(windows))
+        hit = self._lru.get(key)
+        if hit is not None:
+            packed, n = hit
+            return np.unpackbits(packed, count=n).view(bool)
+        out = compute_mask(index_utc, windows)
+        self._lru.put(key, (np.packbits(out), len(out)))
+        return out
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return self._lru.stats()
+
+
+_shared: SessionMaskCache | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_session_masks() -> SessionMaskCache:
+    """プロセス共有のマスクキャッシュ（予算は GDX_SESSION_MASK_MB、既定 16MB）"""
+    global _shared  # noqa: PLW0603
+    with _shared_lock:
+        if _shared is None:
+            raw = os.getenv("GDX_SESSION_MASK_MB", str(DEFAULT_SESSION_MASK_MB)).strip()
+            try:
+                mb = float(raw)
+            except ValueError:
+                mb = float(DEFAULT_SESSION_MASK_MB)
+            _shared = SessionMaskCache(int(mb * 1024 * 1024))
+        return _shared
@@ -1,29 +1,111 @@
 from __future__ import annotations
 
+import math
 from collections.abc import Mapping
 
+import numpy as np
 import pandas as pd
 
 from trade_app.domain.dto.feature_bundle import FeatureBundleDTO
 from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
 
+# 先頭有効位置の探索で最初に見る行数（見つからなければ倍々で広げる）
+_HEAD_CHUNK = 256
+
+
+def _aligned_values(series: pd.Series, index: pd.Index) -> np.ndarray:
+    # 既に同じ Index なら reindex（全量コピー）を省く
+    if series.index is not index and not series.index.equals(index):
+        series = series.reindex(index)
+    return series.to_numpy()
+
+
+def _declared_first_valid(col: np.ndarray, hint: int | None) -> int | None:
+    """宣言ウォームアップ hint が実データの先頭有効位置と一致すればそれを返す"""
+    if hint is None or not 0 <= hint < len(col):
+        return None
+    if math.isnan(col[hint]) or (hint > 0 and not math.isnan(col[hint - 1])):
+        return None
+    return hint
+
+
+def _first_valid_offset(
+    block: np.ndarray,
+    names: list[str],
+    warmup: Mapping[str, int],
+) -> int | None:
+    """各列の先頭有効位置の最大（全 NaN の列があれば None）。先頭だけを走査する"""
+    n, k = block.shape
+    first = np.zeros(k, dtype=np.int64)
+    pending: list[int] = []
+    for j, name in enumerate(names):
+        pos = _declared_first_valid(block[:, j], warmup.get(name))
+        if pos is None:
+            pending.append(j)
+        else:
+            first[j] = pos
+    cols = np.asarray(pending, dtype=np.intp)
+    lo, step = 0, _HEAD_CHUNK
+    while cols.size and lo < n:
+        seg = ~np.isnan(block[lo : lo + step, cols])
+        hit = seg.any(axis=0)
+        first[cols[hit]] = lo + seg[:, hit].argmax(axis=0)
+        cols = cols[~hit]
+        lo += step
+        step *= 2
+    if cols.size:
+        return None
+    return int(first.max()) if k else 0
+
+
+def _bundle_float_block(
+    ohlcv: OhlcvFrameDTO,
+    feats: Mapping[str, pd.Series],
+    warmup: Mapping[str, int],
+) -> FeatureBundleDTO:
+    """全列 float64 の高速経路: 連続 2 次元ブロック1つに束ね、先頭だけ走査・末尾だけ NaN 検査"""
+    index = ohlcv.frame.index
+    names = list(feats)
+    block = np.empty((len(index), len(names)), dtype=np.float64, order="F")
+    for j, series in enumerate(feats.values()):
+        block[:, j] = _aligned_values(series, index)
+
+    offset = _first_valid_offset(block, names, warmup) if len(index) else 0
+    # min は NaN を伝播する（inf は通す）。bool の全量マスクを作らずに末尾の NaN を検出
+    if offset is None or np.isnan(block[offset:].min(axis=0, initial=np.inf)).any():
+        raise ValueError("features contain NaN after bundling")
+    df = pd.DataFrame(block[offset:], index=index[offset:], columns=names, copy=False)
+    if not isinstance(index, pd.DatetimeIndex) or index.tz is None:
+        return FeatureBundleDTO(features=df)  # 契約違反は DTO の検証に任せる
+    # NaN/Index の契約はここで確認済み（DTO の全量 isna 走査を省く）
+    return FeatureBundleDTO.model_construct(features=df)
+
 
 def bundle_features(
     ohlcv: OhlcvFrameDTO,
     feats: Mapping[str, pd.Series],
     nan_policy: str = "drop_head",  # "drop_all" 等に拡張可
+    *,
+    warmup: Mapping[str, int] | None = None,
 ) -> FeatureBundleDTO:
     """
     features を同Indexに束ね、NaNを前処理で解消（純関数にはNaNを入れない契約）
     - ループ変数の上書きを避けてRuff PLW2901を解消
     - 列名は受け取った辞書キーを優先（Series.nameは無視）
+    - drop_head かつ全列 float64 なら高速経路（結果は従来経路と同じ）。
+      warmup（列名 -> 先頭有効位置の宣言値）は探索の近道で、実データと合わなければ走査する
     """
+    if nan_policy == "drop_head" and all(s.dtype == np.float64 for s in feats.values()):
+        return _bundle_float_block(ohlcv, feats, warmup or {})
+
     df = pd.DataFrame(index=ohlcv.frame.index)
     for name, series in feats.items():
         aligned = series.reindex(df.index)
         df[name] = aligned
 
-    if nan_policy == "drop_head":
+    if nan_policy == "drop_head" and len(df.columns) == 0:
+        pass  # 参照される特徴量が無い Plan（列なし）は Index だけ返す
+    elif nan_policy == "drop_head":
         # 各列の先頭有効位置の最大を採用し、まとめて先頭NaNを落とす
         first_valid_per_col = df.apply(pd.Series.first_valid_index)
         first_valid = first_valid_per_col.max()
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from collections.abc import Iterable, Sequence
-from typing import ClassVar
+from typing import Any, ClassVar
+
+import pandas as pd
 
 from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
 from trade_app.domain.ports.data_feed import DataFeedPort
+from trade_app.utils.timeframes import timeframe_delta
 
 __responsibility__: ClassVar[str] = "DataFeedPortを呼んでOHLCV DTOを得る（I/O禁止・整形はPort側）"
 
@@ -28,3 +31,49 @@ def load_ohlcv(
         timeframe=timeframe,
         tz=tz,
     )
+
+
+# 週末・休場で実時間が本数より長くなるぶんの余裕（読み始めを広げる倍率と固定幅）
+_LOOKBACK_PAD_FACTOR = 2
+_LOOKBACK_PAD_FIXED = pd.Timedelta(days=4)
+_LOOKBACK_TRIES = 4
+
+
+def to_utc(ts: Any) -> pd.Timestamp:
+    t = pd.Timestamp(ts)
+    return t.tz_localize("UTC") if t.tz is None else t.tz_convert("UTC")
+
+
+def load_ohlcv_with_lookback(
+    feed: DataFeedPort,
+    symbols: Iterable[str],
+    *,
+    start: Any,
+    end: Any = None,
+    bars: int,
+    columns: Sequence[str] = ("open", "high", "low", "close", "volume"),
+    timeframe: str | None = None,
+    tz: str = "UTC",
+) -> OhlcvFrameDTO:
+    """
+    start より前にちょうど bars 本の履歴を付けて読む（インジのウォームアップ分だけ）。
+    - 読み始めは bars×足長に余裕を持たせて見積もり、足りなければ広げて読み直す
+    - データがそこまで無い（先頭が読み始めより後）なら、ある分だけで打ち切る
+    - 足長が解釈できない timeframe は全履歴を読んでから切る
+    """
+    symbols = list(symbols)
+    t0 = to_utc(start)
+    bar = timeframe_delta(timeframe)
+    pad = None if bar is None else bar * bars * _LOOKBACK_PAD_FACTOR + _LOOKBACK_PAD_FIXED
+    for _ in range(_LOOKBACK_TRIES):
+        lo = None if pad is None else t0 - pad
+        ohlcv = load_ohlcv(
+            feed, symbols, start=lo, end=end, columns=columns, timeframe=timeframe, tz=tz
+        )
+        index = ohlcv.frame.index
+        pos = int(index.searchsorted(t0))
+        if lo is None or pos >= bars or len(index) == 0 or index[0] > lo:
+            break
+        pad = pad * _LOOKBACK_PAD_FACTOR**2
+    frame = ohlcv.frame.iloc[max(0, pos - bars) :]
+    return OhlcvFrameDTO.model_construct(frame=frame, freq=ohlcv.freq)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, ClassVar
+
+from trade_app.domain.dto.plan_models import Clause, Plan
+
+# Plan の外（エントリゲート等）で読まれる列。参照が無くても spec から落とさない
+ALWAYS_KEEP: frozenset[str] = frozenset({"session_active"})
+
+
+def _operand_refs(value: Any) -> Iterable[str]:
+    # decide は str を列名として扱う（数値は定数）。between は [low, high] の各要素
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list | tuple):
+        for v in value:
+            if isinstance(v, str):
+                yield v
+
+
+def _clause_refs(clauses: Iterable[Clause]) -> Iterable[str]:
+    for c in clauses:
+        yield str(c.left)
+        yield from _operand_refs(c.right)
+
+
+def plan_feature_refs(plan: Plan) -> set[str]:
+    """束縛済み Plan の全ブロック（entries/short_entries/exits）が参照する特徴量名"""
+    refs: set[str] = set()
+    for block in (plan.entries, plan.short_entries, plan.exits):
+        refs.update(_clause_refs(block))
+    return refs
+
+
+@dataclass(frozen=True)
+class FeatureDeps:
+    """
+    spec: 計算が必要な spec 項目だけ（元の順序を保つ）
+    outputs: マルチ出力のうち一部キーだけ参照される prefix -> 必要な出力キー
+    unused: どの Clause からも参照されない spec のキー（timing の notes 用）
+    """
+
+    __responsibility__: ClassVar[str] = "Plan 参照から必要な特徴量 spec/出力キーを決める"
+
+    spec: dict[str, Mapping[str, Any]] = field(default_factory=dict)
+    outputs: dict[str, frozenset[str]] = field(default_factory=dict)
+    unused: tuple[str, ...] = ()
+
+    def notes(self) -> str:
+        return f"unused={','.join(self.unused)}" if self.unused else ""
+
+
+def resolve_feature_deps(
+    spec: Mapping[str, Mapping[str, Any]],
+    plan: Plan,
+    *,
+    keep: Iterable[str] = ALWAYS_KEEP,
+) -> FeatureDeps:
+    """
+    出力名の規約（単一出力は prefix、マルチ出力は `${prefix}_${key}`）で参照を spec へ割り当てる。
+    - prefix そのものが参照されれば全出力を残す
+    - `${prefix}_` で始まる参照だけなら、その出力キーだけを残す
+    - 接頭辞が重なる（bb と bb_20 など）場合はどちらも残す（多く計算する側に倒す）
+    """
+    refs = plan_feature_refs(plan) | set(keep)
+    kept: dict[str, Mapping[str, Any]] = {}
+    outputs: dict[str, frozenset[str]] = {}
+    unused: list[str] = []
+    for prefix, cfg in spec.items():
+        head = f"{prefix}_"
+        keys = frozenset(r[len(head) :] for r in refs if r.startswith(head))
+        if prefix not in refs and not keys:
+            unused.append(prefix)
+            continue
+        kept[prefix] = cfg
+        if prefix not in refs:
+            outputs[prefix] = keys
+    return FeatureDeps(spec=kept, outputs=outputs, unused=tuple(unused))
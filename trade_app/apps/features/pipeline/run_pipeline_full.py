@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import os
 from collections.abc import Iterable, Mapping, Sequence
 from typing import Any, ClassVar
 
 from trade_app.apps.features.indicators.session import session_feature
-from trade_app.apps.features.pipeline.loader import load_ohlcv
+from trade_app.apps.features.pipeline.loader import (
+    load_ohlcv,
+    load_ohlcv_with_lookback,
+    to_utc,
+)
+from trade_app.apps.features.pipeline.plan_deps import FeatureDeps, resolve_feature_deps
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
 from trade_app.domain.dto.pipeline_full_output import PipelineFullOutputDTO
 from trade_app.domain.ports.data_feed import DataFeedPort
 from trade_app.domain.ports.feature_calc import FeatureCalcPort
@@ -14,6 +21,51 @@ from trade_app.utils.timing import build_logger, time_phase
 __responsibility__: ClassVar[str] = "OHLCV→features→plan をまとめて返す（OHLCV込み）"
 
 
+def lazy_features_enabled() -> bool:
+    """
+    GDX_LAZY_FEATURES=0 で Plan 参照による特徴量の絞り込みを無効化（既定 ON）。
+    絞り込んでも先頭の切り位置は全 spec を束ねたときと同じ（_lazy_deps）
+    """
+    return os.getenv("GDX_LAZY_FEATURES", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def warmup_lookback_enabled() -> bool:
+    """GDX_WARMUP_LOOKBACK=1 で start 前のウォームアップ分だけ履歴を読み足す（既定 OFF）"""
+    return os.getenv("GDX_WARMUP_LOOKBACK", "0").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _lookback(
+    calc: FeatureCalcPort,
+    spec: Mapping[str, Mapping[str, Any]],
+    start: Any,
+    enabled: bool | None,
+) -> int | None:
+    if start is None or not (warmup_lookback_enabled() if enabled is None else enabled):
+        return None
+    lookback_bars = getattr(calc, "lookback_bars", None)
+    return lookback_bars(spec) if callable(lookback_bars) else None
+
+
+def _lazy_deps(
+    calc: FeatureCalcPort,
+    feature_spec: Mapping[str, Mapping[str, Any]],
+    plan: Any,
+) -> tuple[FeatureDeps, int]:
+    """
+    (計算する依存, 全 spec を束ねたときの先頭の切り位置)。切り位置は宣言ウォームアップ
+    （INDICATOR_META）の最大で、未使用の長期インジもバックテストの開始バーを動かす（eager と同じ）。
+    宣言の無い kind（htf 等）を含む spec は切り位置が決まらないので全 spec を計算する
+    """
+    full = FeatureDeps(spec=dict(feature_spec))
+    head_bars = getattr(calc, "head_bars", None)
+    if not lazy_features_enabled() or not callable(head_bars):
+        return full, 0
+    head = head_bars(feature_spec)
+    if head is None:
+        return full, 0
+    return resolve_feature_deps(feature_spec, plan), head
+
+
 def run_pipeline_full(
     *,
     feed: DataFeedPort,
@@ -28,34 +80,43 @@ def run_pipeline_full(
     timeframe: str | None = None,
     tz: str = "UTC",
     run_params: Mapping[str, Any] | None = None,
+    warmup_lookback: bool | None = None,
 ) -> PipelineFullOutputDTO:
+    """
+    warmup_lookback（None は GDX_WARMUP_LOOKBACK）が有効で start があれば、インジの宣言
+    lookback の本数だけ start より前を読み、計算後に start 以降へ切る
+    （features も OHLCV も start から始まる）。
+    全履歴に依存する kind（累積 VWAP）を含む spec は従来どおり [start, end] を読む。
+    """
     log = build_logger()
-    with time_phase(
-        log,
-        "load_ohlcv",
-        symbol=",".join(list(symbols)),
-        timeframe=str(timeframe or ""),
-        session="",
-    ):
-        ohlcv = load_ohlcv(
-            feed,
-            symbols,
-            start=start,
-            end=end,
-            columns=columns,
-            timeframe=timeframe,
-            tz=tz,
-        )
-    with time_phase(
-        log,
-        "calc_features",
-        symbol=",".join(list(symbols)),
-        timeframe=str(timeframe or ""),
-        session="",
-    ):
-        bundle = calc.compute(ohlcv, feature_spec)
+    symbols = list(symbols)
+    meta = {"symbol": ",".join(symbols), "timeframe": str(timeframe or ""), "session": ""}
+    # Plan を先に組み、参照される特徴量（マルチ出力はキー単位）だけを計算する
+    plan = planner.build(plan_spec)
+    deps, head = _lazy_deps(calc, feature_spec, plan)
+    # 読み足す本数も全 spec で決める（絞り込みの有無で読む範囲を変えない）
+    bars = _lookback(calc, feature_spec, start, warmup_lookback)
+    load_kw = {"end": end, "columns": columns, "timeframe": timeframe, "tz": tz}
+    with time_phase(log, "load_ohlcv", **meta, notes="" if bars is None else f"lookback={bars}"):
+        if bars is None:
+            ohlcv = load_ohlcv(feed, symbols, start=start, **load_kw)
+        else:
+            ohlcv = load_ohlcv_with_lookback(feed, symbols, start=start, bars=bars, **load_kw)
+    with time_phase(log, "calc_features", **meta, notes=deps.notes()):
+        bundle = calc.compute(ohlcv, deps.spec, outputs=deps.outputs)
+    features_df = bundle.features.copy(deep=False)
+    if head > 0:
+        index = ohlcv.frame.index
+        if head < len(index):
+            features_df = features_df.loc[features_df.index >= index[head]]
+        else:
+            features_df = features_df.iloc[:0]
+    if bars is not None:
+        t0 = to_utc(start)
+        features_df = features_df.loc[features_df.index >= t0]
+        frame = ohlcv.frame
+        ohlcv = OhlcvFrameDTO.model_construct(frame=frame.loc[frame.index >= t0], freq=ohlcv.freq)
     # Inject session_active if session_preset/windows is provided via run_params
-    features_df = bundle.features.copy()
     sess = (run_params or {}).get("session_preset") if run_params else None
     if isinstance(sess, dict):
         # Accept preset name or explicit window dict
@@ -75,5 +136,4 @@ def run_pipeline_full(
             # セッション機能は任意。失敗時もパイプラインは継続
             # （features不足なら後段で0スコアに収束）
             pass
-    plan = planner.build(plan_spec)
     return PipelineFullOutputDTO(ohlcv=ohlcv, features=features_df, plan=plan)
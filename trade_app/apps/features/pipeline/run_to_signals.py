@@ -1,16 +1,33 @@
 from __future__ import annotations
 
+import os
 from typing import ClassVar
 
+import pandas as pd
+
 from trade_app.domain.dto.pipeline_output import PipelineOutputDTO
+from trade_app.domain.dto.plan_models import Plan
 from trade_app.domain.dto.signals import SignalsDTO
 from trade_app.domain.services.decider import decide
+from trade_app.domain.services.plan_compiler import decide_compiled
 
 __responsibility__: ClassVar[str] = (
     "src4出力（features+plan）を純関数decideに渡してSignalsDTOを返す"
 )
 
 
+def plan_compiler_enabled() -> bool:
+    """GDX_PLAN_COMPILER=0 で pandas 版の decide を使う（既定はコンパイル版、結果は同一）"""
+    return os.getenv("GDX_PLAN_COMPILER", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def decide_signals(features: pd.DataFrame, plan: Plan) -> SignalsDTO:
+    """decide と同じ結果。既定では Plan をコンパイルして numpy で評価する"""
+    if plan_compiler_enabled():
+        return decide_compiled(features, plan)
+    return decide(features, plan)
+
+
 def build_signals(pipeline_out: PipelineOutputDTO) -> SignalsDTO:
     """features + plan → decide → signals"""
-    return decide(pipeline_out.features, pipeline_out.plan)
+    return decide_signals(pipeline_out.features, pipeline_out.plan)
@@ -25,11 +25,31 @@ def ingest_history_to_parquet(
     origin_tz: str | None = "UTC",
     target_tz: str = "UTC",
     sink_kwargs: Mapping[str, Any] | None = None,
+    incremental: bool = False,
 ) -> list[IngestResultDTO]:
-    """各シンボルについて fetch→normalize→write を実行。結果サマリを返す。"""
+    """
+    各シンボルについて fetch→normalize→write を実行。結果サマリを返す。
+    incremental=True のときは保存済みの最終時刻以降だけを取得し、
+    既存と重なる足を落としてから末尾へ追記する（rows は追記件数）。
+    """
+    kw = dict(sink_kwargs or {})
+    # append は engine を取らない（pyarrow 固定）
+    append_kw = {k: v for k, v in kw.items() if k != "engine"}
     results: list[IngestResultDTO] = []
     for sym in symbols:
-        raw = source.fetch_ohlcv(sym, timeframe, start, end)
+        last = (
+            sink.last_timestamp(
+                base_dir, sym, timeframe, filename=kw.get("filename"), layout=kw.get("layout")
+            )
+            if incremental
+            else None
+        )
+        fetch_start = start if last is None else max(start, last)
+        if fetch_start > end:
+            # 既に end まで保存済み（取得も書込もしない）
+            results.append(IngestResultDTO(symbol=sym, timeframe=timeframe, rows=0, path=base_dir))
+            continue
+        raw = source.fetch_ohlcv(sym, timeframe, fetch_start, end)
         # colmap未指定ならデフォルトマップを使う（空dictで上書きしない）
         norm = normalize_ohlcv(
             raw,
@@ -37,12 +57,18 @@ def ingest_history_to_parquet(
             origin_tz=origin_tz,
             target_tz=target_tz,
         )
-        path = sink.write(
-            norm,
-            base_dir=base_dir,
-            symbol=sym,
-            timeframe=timeframe,
-            **(sink_kwargs or {}),
-        )
+        if last is None:
+            path = sink.write(norm, base_dir=base_dir, symbol=sym, timeframe=timeframe, **kw)
+        else:
+            # 境界の足は両方に含まれ得る（取得は last を含む）→ 保存済み側を残す
+            norm = norm[norm.index > last]
+            if norm.empty:
+                results.append(
+                    IngestResultDTO(symbol=sym, timeframe=timeframe, rows=0, path=base_dir)
+                )
+                continue
+            path = sink.append(
+                norm, base_dir=base_dir, symbol=sym, timeframe=timeframe, **append_kw
+            )
         results.append(IngestResultDTO(symbol=sym, timeframe=timeframe, rows=len(norm), path=path))
     return results
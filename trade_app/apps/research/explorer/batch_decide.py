@@ -0,0 +1,57 @@
+"""
+閾値違いの Plan をまとめて decide する（特徴量は1回、シグナルは bars × K の行列）。
+
+- param_matrix の各行を plan_template に埋め込んで Plan を作り、decide_batch で一括評価する
+  （比較定数だけが違う行は numpy のブロードキャスト1回で K 列ぶんを作る）
+- group_by_features: 探索点を「特徴量 spec が同じもの」ごとに分ける。グループ内は特徴量を共有して
+  decide_many に渡せる（Sobol 初期点や閾値だけの近傍をまとめて採点する用途）
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import pandas as pd
+
+from trade_app.apps.features.pipeline.plan_builder import DefaultPlanBuilder
+from trade_app.apps.research.explorer.spec_binding import bind_params_to_spec
+from trade_app.domain.dto.signals import SignalMatrixDTO
+from trade_app.domain.ports.plan_builder import PlanBuilderPort
+from trade_app.domain.services.plan_compiler import decide_batch
+
+
+def _rows(param_matrix: Sequence[Mapping[str, Any]] | pd.DataFrame) -> list[dict[str, Any]]:
+    if isinstance(param_matrix, pd.DataFrame):
+        return param_matrix.to_dict(orient="records")
+    return [dict(p) for p in param_matrix]
+
+
+def decide_many(
+    features: pd.DataFrame,
+    plan_template: Mapping[str, Any],
+    param_matrix: Sequence[Mapping[str, Any]] | pd.DataFrame,
+    *,
+    planner: PlanBuilderPort | None = None,
+) -> SignalMatrixDTO:
+    """
+    param_matrix の K 行それぞれで plan_template を埋めて decide した結果（bars × K）。
+    列 k は decide(features, planner.build(bind_params_to_spec(plan_template, rows[k]))) と一致
+    """
+    planner = planner or DefaultPlanBuilder()
+    rows = _rows(param_matrix)
+    plans = [planner.build(bind_params_to_spec(plan_template, row)) for row in rows]
+    return decide_batch(features, plans, rows)
+
+
+def group_by_features(
+    features_spec: Any, param_matrix: Sequence[Mapping[str, Any]] | pd.DataFrame
+) -> list[tuple[Any, list[int]]]:
+    """[(埋め込み済みの特徴量 spec, その spec を共有する行番号)] を初出順で返す"""
+    groups: dict[str, tuple[Any, list[int]]] = {}
+    for i, row in enumerate(_rows(param_matrix)):
+        spec = bind_params_to_spec(features_spec, row)
+        key = json.dumps(spec, sort_keys=True, default=str)
+        groups.setdefault(key, (spec, []))[1].append(i)
+    return list(groups.values())
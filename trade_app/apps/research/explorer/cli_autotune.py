@@ -8,17 +8,18 @@ import pandas as pd
 import typer
 import yaml
 
+from trade_app.adapters.native.backtest_adapter import backtester_from_env
 from trade_app.adapters.optimizer.optuna_optimizer import OptunaOptimizerAdapter
+from trade_app.adapters.parquet.feature_store import feature_store_from_env
 from trade_app.adapters.results.lock_sink_file import FileLockSinkAdapter
 from trade_app.adapters.sampler.sobol_sampler import SobolSamplerAdapter
 from trade_app.adapters.universe.config_universe import ConfigUniverseAdapter
-from trade_app.adapters.vbtpro.backtest_adapter import VbtProBacktestAdapter
-from trade_app.adapters.vbtpro.data_feed_adapter import VbtProDataFeedAdapter
+from trade_app.adapters.vbtpro.derived_feed import data_feed_from_env
 from trade_app.adapters.vbtpro.vbtpro_bindings import parquet_pull
 from trade_app.adapters.yaml.spec_loader_yaml import YamlSpecLoader
 from trade_app.apps.features.feature_calc import DefaultFeatureCalculator
 from trade_app.apps.features.pipeline.plan_builder import DefaultPlanBuilder
-from trade_app.apps.research.explorer.batch_runner import run_batch_explorer
+from trade_app.apps.research.explorer.batch_runner import EXECUTORS, run_batch_explorer
 from trade_app.apps.research.explorer.run_explorer import DefaultScorer
 from trade_app.apps.research.splitters.purged_walkforward import (
     PurgedWalkForwardSplitter,
@@ -44,6 +45,17 @@ def autotune(  # noqa: PLR0915
             help="外側ループ並列度（symbols×TF×sessions）",
         ),
     ] = None,
+    executor: Annotated[
+        str,
+        typer.Option(
+            "--executor",
+            help="外側ループの並列方式: 'thread' or 'process'（process は GIL を回避）",
+        ),
+    ] = "thread",
+    threads_per_worker: Annotated[
+        int,
+        typer.Option("--threads-per-worker", help="process 時のワーカー毎 BLAS/numexpr スレッド数"),
+    ] = 1,
     purge: Annotated[
         int, typer.Option("--purge", help="Purged 本数（テスト直前を学習から除外）")
     ] = 0,
@@ -109,6 +121,8 @@ def autotune(  # noqa: PLR0915
     ] = False,
 ):
     """Universe×TF×Session で自動探索→lock.json を出力（最小CLI）"""
+    if executor not in EXECUTORS:
+        raise typer.BadParameter(f"--executor は {EXECUTORS} のいずれか: {executor}")
     # ---- spec 読み込み（features/plan/space）----
     features_spec, plan_spec = YamlSpecLoader().load(spec)
     with spec.open("r", encoding="utf-8") as f:
@@ -223,10 +237,10 @@ def autotune(  # noqa: PLR0915
             pass
 
     # ---- DI: 実装束ね ----
-    feed = VbtProDataFeedAdapter()
-    calc = DefaultFeatureCalculator()
+    feed = data_feed_from_env()
+    calc = DefaultFeatureCalculator(store=feature_store_from_env())
     planner = DefaultPlanBuilder()
-    backtester = VbtProBacktestAdapter()
+    backtester = backtester_from_env()
     base_splitter = WalkForwardSplitter(train_size=252 * 2, test_size=252 // 2)  # 例
     splitter = (
         PurgedWalkForwardSplitter(
@@ -300,6 +314,12 @@ def autotune(  # noqa: PLR0915
         max_workers=max_workers,
         run_params=rp,
         scorer=scorer,
+        executor=executor,
+        threads_per_worker=threads_per_worker,
+        on_result=lambda rec: typer.echo(
+            f"[{rec['status']}] {rec['symbol']} {rec['timeframe']} {rec['session']}"
+            f" best={rec['best_score']}"
+        ),
     )
     out = out_dir / "summary.csv"
     out.parent.mkdir(parents=True, exist_ok=True)
@@ -363,10 +383,10 @@ def autotune_plan(
     ]
 
     # DI
-    feed = VbtProDataFeedAdapter()
-    calc = DefaultFeatureCalculator()
+    feed = data_feed_from_env()
+    calc = DefaultFeatureCalculator(store=feature_store_from_env())
     planner = DefaultPlanBuilder()
-    backtester = VbtProBacktestAdapter()
+    backtester = backtester_from_env()
     splitter = WalkForwardSplitter(train_size=252 * 2, test_size=252 // 2)
     sampler = SobolSamplerAdapter()
     optimizer = OptunaOptimizerAdapter()
@@ -0,0 +1,108 @@
+"""
+run_batch_explorer の executor="process" 実装。
+
+- 共通依存（ComboContext）はワーカー起動時に1回だけ送り、以降はジョブ記述子（ComboJob）だけを送る
+- BLAS/OpenMP/numexpr のスレッド数をワーカーごとに固定（コア数×スレッド数の過剰並列を防ぐ）
+- share_ohlcv=True なら親が (symbol, timeframe) ごとに OHLCV を共有メモリへ一度だけ載せ、
+  ワーカーは SharedMemoryDataFeed で参照する（ワーカー数に比例して RAM が増えない）。
+  載せるのは [full_start, full_end]。GDX_WARMUP_LOOKBACK の読み足し等その外側は元の feed から読む
+- 結果は完了順に on_done へ流す（summary の行順は呼び手がジョブ順に並べ直す）
+"""
+
+from __future__ import annotations
+
+import contextlib
+import multiprocessing as mp
+import os
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+from typing import Any
+
+from trade_app.adapters.shm.shared_frames import SharedFramePublisher
+from trade_app.adapters.shm.shm_data_feed import SharedMemoryDataFeed
+from trade_app.apps.research.explorer.batch_runner import ComboContext, ComboJob, run_combo_job
+
+# ワーカーで固定するスレッド数の環境変数（numpy/scipy の BLAS・numexpr・numba）
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "NUMEXPR_MAX_THREADS",
+    "NUMBA_NUM_THREADS",
+)
+
+_WORKER_CTX: ComboContext | None = None
+
+
+@contextlib.contextmanager
+def pinned_thread_env(threads: int) -> Iterator[None]:
+    """
+    子プロセス起動中だけスレッド数の環境変数を固定する（spawn の子は起動時の環境を継承し、
+    BLAS 初期化前に読まれる）。抜けると親の値に戻す。
+    """
+    saved = {k: os.environ.get(k) for k in THREAD_ENV_VARS}
+    for k in THREAD_ENV_VARS:
+        os.environ[k] = str(max(1, int(threads)))
+    try:
+        yield
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def _init_worker(ctx: ComboContext, threads: int) -> None:
+    global _WORKER_CTX  # noqa: PLW0603
+    _WORKER_CTX = ctx
+    # 既に読み込まれた BLAS にも上限を掛ける（threadpoolctl は任意依存）
+    with contextlib.suppress(Exception):
+        from threadpoolctl import threadpool_limits  # noqa: PLC0415
+
+        threadpool_limits(max(1, int(threads)))
+
+
+def _run_in_worker(job: ComboJob) -> dict[str, Any]:
+    if _WORKER_CTX is None:  # pragma: no cover - 初期化子の失敗時のみ
+        raise RuntimeError("worker context is not initialized")
+    return run_combo_job(job, _WORKER_CTX)
+
+
+def run_jobs_in_processes(
+    jobs: Sequence[ComboJob],
+    ctx: ComboContext,
+    *,
+    max_workers: int,
+    threads_per_worker: int = 1,
+    share_ohlcv: bool = True,
+    on_done: Callable[[int, dict[str, Any]], None],
+) -> None:
+    """jobs をプロセスプールで実行し、完了順に on_done(ジョブ番号, 1行分) を呼ぶ"""
+    with SharedFramePublisher() as pub:
+        if share_ohlcv:
+            symbols = list(dict.fromkeys(j.symbol for j in jobs))
+            tfs = list(dict.fromkeys(j.timeframe for j in jobs))
+            handles = pub.publish_ohlcv(
+                ctx.feed, symbols, tfs, start=ctx.full_start, end=ctx.full_end, tz=ctx.tz
+            )
+            # 公開範囲の外（ウォームアップの読み足し等）は元の feed から継ぎ足す
+            shm_feed = SharedMemoryDataFeed(
+                handles, fallback=ctx.feed, published=(ctx.full_start, ctx.full_end)
+            )
+            ctx = replace(ctx, feed=shm_feed)
+        with (
+            pinned_thread_env(threads_per_worker),
+            ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=mp.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(ctx, threads_per_worker),
+            ) as ex,
+        ):
+            futures = {ex.submit(_run_in_worker, job): i for i, job in enumerate(jobs)}
+            for fut in as_completed(futures):
+                on_done(futures[fut], fut.result())
@@ -84,6 +84,30 @@ class RobustScorer(ScorerPort):
         return float(sharpe - pen_dd - pen_var - pen_tr)
 
 
+def _prefetch_features(
+    *,
+    calc,
+    features_spec: Mapping[str, Any],
+    points: Iterable[Mapping[str, Any]],
+    params_template: Mapping[str, Any],
+) -> None:
+    """
+    初期点（Sobol/グリッド）の特徴量をバッチ版インジでまとめて計算するよう calc に預ける。
+    計算は最初の試行の compute が読んだフレームで行う（OHLCV を別に読み直さない）。
+    calc が defer_prefetch を持たない場合は何もしない（各試行で個別に計算される）。
+    """
+    defer = getattr(calc, "defer_prefetch", None)
+    if defer is None:
+        return
+    specs = []
+    for p in points:
+        merged = dict(params_template)
+        merged.update(p)
+        specs.append(bind_params_to_spec(features_spec, merged))
+    if specs:
+        defer(specs)
+
+
 def run_explorer(
     *,
     feed,
@@ -131,6 +155,12 @@ def run_explorer(
     )
 
     initial_points = sampler.sample(space, n=n_init, seed=seed)
+    _prefetch_features(
+        calc=calc,
+        features_spec=features_spec,
+        points=initial_points,
+        params_template=params_template or {},
+    )
     best_params, best_score, trials = optimizer.optimize(
         objective,
         space,
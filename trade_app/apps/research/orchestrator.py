@@ -6,6 +6,7 @@ from typing import Any
 import pandas as pd
 
 from trade_app.apps.features.pipeline.run_pipeline_full import run_pipeline_full
+from trade_app.apps.features.pipeline.run_to_signals import decide_signals
 from trade_app.apps.research.policies.entry_gate import CombinedEntryGate
 from trade_app.domain.ports.backtest import BacktestPort
 from trade_app.domain.ports.data_feed import DataFeedPort
@@ -13,7 +14,6 @@ from trade_app.domain.ports.entry_gate import EntryGatePort
 from trade_app.domain.ports.feature_calc import FeatureCalcPort
 from trade_app.domain.ports.plan_builder import PlanBuilderPort
 from trade_app.domain.ports.split_strategy import SplitStrategyPort
-from trade_app.domain.services.decider import decide
 from trade_app.utils.timing import build_logger, time_phase
 
 
@@ -48,7 +48,7 @@ def run_single_backtest(
     )
     log = build_logger()
     with time_phase(log, "decide"):
-        sig = decide(pipe.features, pipe.plan)
+        sig = decide_signals(pipe.features, pipe.plan)
     entries_to_use = sig.entries
     exits_to_use = sig.exits
     # オプトイン: params に max_positions があり、
@@ -112,7 +112,7 @@ def run_wfa(
     folds = splitter.split(index)
 
     # 1) シグナルを全期間で評価
-    sig = decide(pipe_full.features, pipe_full.plan)
+    sig = decide_signals(pipe_full.features, pipe_full.plan)
     entries = sig.entries.reindex(index).fillna(False)
     exits = sig.exits.reindex(index).fillna(False)
 
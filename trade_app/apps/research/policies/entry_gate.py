@@ -3,10 +3,18 @@ from __future__ import annotations
 from collections.abc import Mapping
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from trade_app.apps.features.indicators.session import DefaultSessionPolicy
-from trade_app.apps.research.policies.position_limiter import limit_positions
+from trade_app.apps.research.policies.position_limiter import (
+    limit_positions,
+    limit_positions_events,
+    limit_positions_matrix,
+    limit_positions_packed,
+)
+from trade_app.domain.dto.packed_signals import PackedBits
+from trade_app.domain.dto.signals import EventSignalsDTO
 
 
 class CombinedEntryGate:
@@ -28,23 +36,82 @@ class CombinedEntryGate:
         context: Mapping[str, Any] | None = None,
     ) -> pd.Series:
         ctx = dict(context or {})
-        raw_max = ctx.get("max_positions", self.default_max_positions)
-        max_pos = int(raw_max) if raw_max is not None else None
-
-        # セッションマスクの決定
-        if "session_active" in features.columns:
-            session_mask = features["session_active"].fillna(False).astype(bool)
-        else:
-            preset = ctx.get("session")
-            if preset:
-                session_mask = DefaultSessionPolicy().make_mask(features.index, preset=preset)
-            else:
-                session_mask = pd.Series(True, index=features.index, dtype=bool)
+        max_pos = self._max_positions(ctx)
 
         # まずセッションでゲート
-        gated = entries.fillna(False).astype(bool) & session_mask
+        gated = entries.fillna(False).astype(bool) & self._session_mask(features, ctx)
 
         # 次に同時保有数でゲート
         if max_pos is not None:
             gated = limit_positions(gated, exits, max_positions=max_pos, exit_first=True)
         return gated
+
+    def gate_many(
+        self,
+        *,
+        entries: np.ndarray,
+        exits: np.ndarray,
+        features: pd.DataFrame,
+        context: Mapping[str, Any] | None = None,
+    ) -> np.ndarray:
+        """
+        gate の (bars × K) 版（decide_many の行列をそのまま受ける）。列 k は
+        gate(entries=列 k, exits=列 k, ...) と一致。セッションマスクは全列で1回だけ作る
+        """
+        ctx = dict(context or {})
+        max_pos = self._max_positions(ctx)
+        session = self._session_mask(features, ctx).to_numpy(dtype=bool)
+        gated = np.asarray(entries, dtype=bool) & session[:, None]
+        if max_pos is not None:
+            gated = limit_positions_matrix(gated, exits, max_positions=max_pos, exit_first=True)
+        return gated
+
+    def gate_events(
+        self,
+        *,
+        events: EventSignalsDTO,
+        features: pd.DataFrame,
+        context: Mapping[str, Any] | None = None,
+    ) -> EventSignalsDTO:
+        """
+        gate のイベント位置版: entries を絞った EventSignalsDTO を返す（O(イベント数)。
+        セッションマスクはエントリー位置だけ引く）
+        """
+        ctx = dict(context or {})
+        max_pos = self._max_positions(ctx)
+        session = self._session_mask(features, ctx).to_numpy(dtype=bool)
+        gated = events.entries[session[events.entries]]
+        if max_pos is not None:
+            gated = limit_positions_events(
+                gated, events.exits, max_positions=max_pos, exit_first=True
+            )
+        return events.model_copy(update={"entries": gated})
+
+    def gate_packed(
+        self,
+        *,
+        entries: PackedBits,
+        exits: PackedBits,
+        features: pd.DataFrame,
+        context: Mapping[str, Any] | None = None,
+    ) -> PackedBits:
+        """gate_many のビット詰め版（セッションマスクは行マスクとしてバイト単位で AND）"""
+        ctx = dict(context or {})
+        max_pos = self._max_positions(ctx)
+        gated = entries & self._session_mask(features, ctx).to_numpy(dtype=bool)
+        if max_pos is not None:
+            gated = limit_positions_packed(gated, exits, max_positions=max_pos, exit_first=True)
+        return gated
+
+    def _max_positions(self, ctx: Mapping[str, Any]) -> int | None:
+        raw_max = ctx.get("max_positions", self.default_max_positions)
+        return int(raw_max) if raw_max is not None else None
+
+    def _session_mask(self, features: pd.DataFrame, ctx: Mapping[str, Any]) -> pd.Series:
+        # features に session_active 列があればそれを優先
+        if "session_active" in features.columns:
+            return features["session_active"].fillna(False).astype(bool)
+        preset = ctx.get("session")
+        if preset:
+            return DefaultSessionPolicy().make_mask(features.index, preset=preset)
+        return pd.Series(True, index=features.index, dtype=bool)
@@ -1,7 +1,126 @@
+"""
+同時保有数の上限で entries をゲートする（exit を先に/後に処理する状態機械）。
+
+- 状態機械は bool 配列上のカーネル（numba があればコンパイル版、無ければ同じ関数を Python で）
+- limit_positions_matrix: (bars × K) のシグナル行列を列ごとに独立してゲートする
+  （K 点の一括評価用）。行を外側・列を内側に回すので C 順の行列をそのまま読む
+- limit_positions_packed: ビット詰め（PackedBits）の行列を展開せずにゲートする
+- limit_positions_events: イベント位置（昇順 int32）のまま2本をマージして回す（O(イベント数)）
+"""
+
 from __future__ import annotations
 
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
 import pandas as pd
 
+from trade_app.domain.dto.packed_signals import PackedBits
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - numba 無しは同じカーネルを Python で回す
+    numba = None
+
+_MATRIX_NDIM = 2
+
+
+def _njit(fn: Callable[..., Any]) -> Callable[..., Any]:
+    if numba is None:
+        return fn
+    return numba.njit(cache=True, nogil=True)(fn)
+
+
+@_njit
+def _gate_kernel(
+    entries: np.ndarray, exits: np.ndarray, max_positions: int, exit_first: bool
+) -> np.ndarray:
+    n, k = entries.shape
+    out = np.zeros((n, k), dtype=np.bool_)
+    open_pos = np.zeros(k, dtype=np.int64)
+    for i in range(n):
+        for j in range(k):
+            e_out = exits[i, j]
+            if exit_first and e_out and open_pos[j] > 0:
+                open_pos[j] -= 1
+            if entries[i, j] and open_pos[j] < max_positions:
+                out[i, j] = True
+                open_pos[j] += 1
+            if not exit_first and e_out and open_pos[j] > 0:
+                open_pos[j] -= 1
+    return out
+
+
+@_njit
+def _gate_events_kernel(
+    entries: np.ndarray, exits: np.ndarray, max_positions: int, exit_first: bool
+) -> np.ndarray:
+    out = np.empty(entries.shape[0], dtype=np.int32)
+    m = 0
+    open_pos = 0
+    i = 0
+    j = 0
+    while i < entries.shape[0]:
+        t_in = entries[i]
+        # 同じバーでは exit_first なら exit、そうでなければ entry を先に処理する
+        if j < exits.shape[0] and (exits[j] < t_in or (exits[j] == t_in and exit_first)):
+            if open_pos > 0:
+                open_pos -= 1
+            j += 1
+            continue
+        if open_pos < max_positions:
+            out[m] = t_in
+            m += 1
+            open_pos += 1
+        i += 1
+    return out[:m]
+
+
+@_njit
+def _gate_packed_kernel(
+    entries: np.ndarray, exits: np.ndarray, k: int, max_positions: int, exit_first: bool
+) -> np.ndarray:
+    n, nb = entries.shape
+    out = np.zeros((n, nb), dtype=np.uint8)
+    open_pos = np.zeros(k, dtype=np.int64)
+    for i in range(n):
+        for j in range(k):
+            b = j >> 3
+            bit = 1 << (j & 7)
+            e_out = (exits[i, b] & bit) != 0
+            if exit_first and e_out and open_pos[j] > 0:
+                open_pos[j] -= 1
+            if (entries[i, b] & bit) != 0 and open_pos[j] < max_positions:
+                out[i, b] |= bit
+                open_pos[j] += 1
+            if not exit_first and e_out and open_pos[j] > 0:
+                open_pos[j] -= 1
+    return out
+
+
+def limit_positions_matrix(
+    entries: np.ndarray,
+    exits: np.ndarray,
+    *,
+    max_positions: int = 1,
+    exit_first: bool = True,
+) -> np.ndarray:
+    """
+    (bars × K) の bool 行列の各列に limit_positions を適用した行列。
+    exits は entries と同じ形か (bars,) / (bars × 1)（全列で共有）
+    """
+    entries = np.asarray(entries, dtype=bool)
+    if entries.ndim != _MATRIX_NDIM:
+        raise ValueError("entries must be a (bars x K) matrix")
+    if max_positions is None or max_positions <= 0:
+        return np.zeros(entries.shape, dtype=bool)
+    exits = np.asarray(exits, dtype=bool)
+    if exits.ndim == 1:
+        exits = exits[:, None]
+    exits = np.ascontiguousarray(np.broadcast_to(exits, entries.shape))
+    return _gate_kernel(np.ascontiguousarray(entries), exits, int(max_positions), bool(exit_first))
+
 
 def limit_positions(
     entries: pd.Series,
@@ -20,24 +139,54 @@ def limit_positions(
 
     entries = entries.fillna(False).astype(bool)
     exits = exits.fillna(False).astype(bool)
+    if not exits.index.equals(entries.index):
+        # entries の時刻で exits を引く（無い時刻は KeyError）
+        exits = exits.loc[entries.index]
 
-    open_pos = 0
-    gated: list[bool] = []
-    for t in entries.index:
-        e_out = bool(exits.loc[t])
-        e_in = bool(entries.loc[t])
-
-        if exit_first and e_out and open_pos > 0:
-            open_pos -= 1
+    gated = limit_positions_matrix(
+        entries.to_numpy()[:, None],
+        exits.to_numpy()[:, None],
+        max_positions=max_positions,
+        exit_first=exit_first,
+    )
+    return pd.Series(gated[:, 0], index=entries.index, dtype=bool)
 
-        allow = False
-        if e_in and open_pos < max_positions:
-            allow = True
-            open_pos += 1
 
-        if not exit_first and e_out and open_pos > 0:
-            open_pos -= 1
+def limit_positions_events(
+    entries: np.ndarray,
+    exits: np.ndarray,
+    *,
+    max_positions: int = 1,
+    exit_first: bool = True,
+) -> np.ndarray:
+    """limit_positions のイベント位置版（入出力は昇順の int32 位置。結果は entries の部分集合）"""
+    if max_positions is None or max_positions <= 0:
+        return np.empty(0, dtype=np.int32)
+    return _gate_events_kernel(
+        np.ascontiguousarray(entries, dtype=np.int32),
+        np.ascontiguousarray(exits, dtype=np.int32),
+        int(max_positions),
+        bool(exit_first),
+    )
 
-        gated.append(allow)
 
-    return pd.Series(gated, index=entries.index, dtype=bool)
+def limit_positions_packed(
+    entries: PackedBits,
+    exits: PackedBits,
+    *,
+    max_positions: int = 1,
+    exit_first: bool = True,
+) -> PackedBits:
+    """limit_positions_matrix のビット詰め版（列ごとに独立。展開した bool 行列を作らない）"""
+    if entries.shape != exits.shape:
+        raise ValueError(f"shape mismatch: {entries.shape} vs {exits.shape}")
+    if max_positions is None or max_positions <= 0:
+        return PackedBits(np.zeros_like(entries.bits), entries.n_columns)
+    bits = _gate_packed_kernel(
+        np.ascontiguousarray(entries.bits),
+        np.ascontiguousarray(exits.bits),
+        entries.n_columns,
+        int(max_positions),
+        bool(exit_first),
+    )
+    return PackedBits(bits, entries.n_columns)
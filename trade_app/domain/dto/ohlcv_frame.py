@@ -29,6 +29,7 @@ class OhlcvFrameDTO(BaseModel):
         if not req.issubset(set(lower_cols)):
             missing = req - set(lower_cols)
             raise ValueError(f"required columns missing: {missing}")
-        v = v.copy()
+        # 浅いコピー：列名だけ差し替え、配列は共有（キャッシュ済みフレームを複製しない）
+        v = v.copy(deep=False)
         v.columns = lower_cols
         return v
@@ -0,0 +1,169 @@
+"""
+ビット詰めのシグナル行列（bars × K を 1 要素 1 bit で持つ。bool 行列の 1/8）。
+
+- 詰める向きは列（試行）方向: 行 i の K 列を ceil(K/8) バイトに（numpy packbits, bitorder=little）。
+  バー方向の shift は行のずらしだけで済み、行マスク（セッション等）の AND は行ごとの 0x00/0xFF
+- 演算子 & | ^ ~ はバイト単位（端数列の余りビットは常に 0 に保つ）。shift(k) は
+  Series.shift(k, fill_value=False) と同じ（decide の pre_shift と同じ規則）
+"""
+
+from __future__ import annotations
+
+from typing import Any, ClassVar
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, ConfigDict, Field
+
+from trade_app.domain.dto.signals import SignalMatrixDTO, SignalsDTO
+
+_BITS = 8
+_MATRIX_NDIM = 2
+
+
+class PackedBits:
+    """(bars × K) の bool 行列をビット詰めした値オブジェクト（演算は新しい PackedBits を返す）"""
+
+    __responsibility__: ClassVar[str] = "bars × K の bool 行列をビット詰めで保持し論理演算する"
+    __slots__ = ("bits", "n_columns")
+
+    def __init__(self, bits: np.ndarray, n_columns: int) -> None:
+        bits = np.asarray(bits, dtype=np.uint8)
+        if bits.ndim != _MATRIX_NDIM or bits.shape[1] != -(-n_columns // _BITS):
+            raise ValueError("bits must be (bars, ceil(n_columns / 8)) uint8")
+        self.bits = bits
+        self.n_columns = int(n_columns)
+
+    @classmethod
+    def pack(cls, mat: np.ndarray) -> PackedBits:
+        mat = np.asarray(mat, dtype=bool)
+        if mat.ndim == 1:
+            mat = mat[:, None]
+        return cls(np.packbits(mat, axis=1, bitorder="little"), mat.shape[1])
+
+    @classmethod
+    def broadcast_row(cls, mask: np.ndarray, n_columns: int) -> PackedBits:
+        """(bars,) の bool を全列に同じ値で並べた PackedBits"""
+        full = cls.pack(np.ones((1, n_columns), dtype=bool)).bits[0]
+        rows = np.asarray(mask, dtype=bool)[:, None]
+        return cls(np.where(rows, full[None, :], np.uint8(0)).astype(np.uint8), n_columns)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return int(self.bits.shape[0]), self.n_columns
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.bits.nbytes)
+
+    def unpack(self) -> np.ndarray:
+        out = np.unpackbits(self.bits, axis=1, count=self.n_columns, bitorder="little")
+        return out.view(bool)
+
+    def column(self, k: int) -> np.ndarray:
+        if not 0 <= k < self.n_columns:
+            raise IndexError(k)
+        return ((self.bits[:, k >> 3] >> (k & 7)) & 1).astype(bool)
+
+    def columns(self, start: int, stop: int) -> np.ndarray:
+        """列 [start, stop) だけを bool 行列に戻す（チャンク処理用）"""
+        lo, hi = start >> 3, -(-stop // _BITS)
+        part = np.unpackbits(self.bits[:, lo:hi], axis=1, bitorder="little")
+        off = start - lo * _BITS
+        return part[:, off : off + (stop - start)].view(bool)
+
+    def _operand(self, other: Any) -> np.ndarray:
+        if isinstance(other, PackedBits):
+            if other.shape != self.shape:
+                raise ValueError(f"shape mismatch: {self.shape} vs {other.shape}")
+            return other.bits
+        mask = np.asarray(other, dtype=bool)
+        if mask.shape != (self.shape[0],):
+            raise ValueError("row mask must be (bars,)")
+        return PackedBits.broadcast_row(mask, self.n_columns).bits
+
+    def __and__(self, other: Any) -> PackedBits:
+        return PackedBits(self.bits & self._operand(other), self.n_columns)
+
+    def __or__(self, other: Any) -> PackedBits:
+        return PackedBits(self.bits | self._operand(other), self.n_columns)
+
+    def __xor__(self, other: Any) -> PackedBits:
+        return PackedBits(self.bits ^ self._operand(other), self.n_columns)
+
+    def __invert__(self) -> PackedBits:
+        full = PackedBits.broadcast_row(np.ones(1, dtype=bool), self.n_columns).bits
+        return PackedBits(~self.bits & full, self.n_columns)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PackedBits):
+            return NotImplemented
+        return self.shape == other.shape and np.array_equal(self.bits, other.bits)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def shift(self, k: int) -> PackedBits:
+        """各列を k 本ずらす（空いた行は False）"""
+        n = self.bits.shape[0]
+        out = np.zeros_like(self.bits)
+        if k == 0:
+            out[:] = self.bits
+        elif 0 < k < n:
+            out[k:] = self.bits[: n - k]
+        elif -n < k < 0:
+            out[: n + k] = self.bits[-k:]
+        return PackedBits(out, self.n_columns)
+
+    def any(self) -> bool:
+        return bool(self.bits.any())
+
+    def count(self) -> np.ndarray:
+        """列ごとの True の数（ビット位置ごとに数える。一時配列は詰めた配列と同じ大きさ）"""
+        per_bit = np.empty((self.bits.shape[1], _BITS), dtype=np.int64)
+        for j in range(_BITS):
+            per_bit[:, j] = ((self.bits >> j) & 1).sum(axis=0, dtype=np.int64)
+        # 列 k はバイト k >> 3 のビット k & 7（bitorder=little）
+        return per_bit.reshape(-1)[: self.n_columns]
+
+
+class PackedSignalsDTO(BaseModel):
+    """SignalMatrixDTO のビット詰め版（entries/short_entries/exits を PackedBits で持つ）"""
+
+    __responsibility__: ClassVar[str] = "大規模スイープのシグナル行列をビット詰めで受け渡すDTO"
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    index: pd.DatetimeIndex = Field(...)
+    entries: PackedBits = Field(...)
+    short_entries: PackedBits = Field(...)
+    exits: PackedBits = Field(...)
+    params: list[dict[str, Any]] = Field(default_factory=list)
+
+    @classmethod
+    def from_matrix(cls, mat: SignalMatrixDTO) -> PackedSignalsDTO:
+        return cls(
+            index=mat.index,
+            entries=PackedBits.pack(mat.entries),
+            short_entries=PackedBits.pack(mat.short_entries),
+            exits=PackedBits.pack(mat.exits),
+            params=mat.params,
+        )
+
+    def to_matrix(self) -> SignalMatrixDTO:
+        return SignalMatrixDTO(
+            index=self.index,
+            entries=self.entries.unpack(),
+            short_entries=self.short_entries.unpack(),
+            exits=self.exits.unpack(),
+            params=self.params,
+        )
+
+    @property
+    def n_columns(self) -> int:
+        return self.entries.n_columns
+
+    def column(self, k: int) -> SignalsDTO:
+        return SignalsDTO(
+            entries=pd.Series(self.entries.column(k), index=self.index),
+            short_entries=pd.Series(self.short_entries.column(k), index=self.index),
+            exits=pd.Series(self.exits.column(k), index=self.index),
+        )
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import ClassVar
+from typing import Any, ClassVar
 
+import numpy as np
 import pandas as pd
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
 
 
 class SignalsDTO(BaseModel):
@@ -42,3 +43,95 @@ class SignalsDTO(BaseModel):
     @classmethod
     def _v_exits(cls, v: pd.Series) -> pd.Series:
         return cls._validate_series(v)
+
+
+class SignalMatrixDTO(BaseModel):
+    """
+    decide_many の出力: K 個の Plan（閾値違い）のシグナルを列に並べた bool 行列（bars × K）。
+    列 k は decide(features, plans[k]) の値と一致する。
+    """
+
+    __responsibility__: ClassVar[str] = "閾値違いの戦略シグナルを列方向に束ねた受け渡しDTO"
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    index: pd.DatetimeIndex = Field(...)
+    entries: np.ndarray = Field(...)
+    short_entries: np.ndarray = Field(...)
+    exits: np.ndarray = Field(...)
+    params: list[dict[str, Any]] = Field(default_factory=list)
+
+    @property
+    def n_columns(self) -> int:
+        return int(self.entries.shape[1])
+
+    def column(self, k: int) -> SignalsDTO:
+        """列 k を SignalsDTO に（名前は付かない）"""
+        return SignalsDTO(
+            entries=pd.Series(self.entries[:, k], index=self.index),
+            short_entries=pd.Series(self.short_entries[:, k], index=self.index),
+            exits=pd.Series(self.exits[:, k], index=self.index),
+        )
+
+
+class EventSignalsDTO(BaseModel):
+    """
+    疎なシグナル: 各ブロックを「True のバー位置」の昇順 int32 配列で持つ（index は共有）。
+    発火が全バーの 1% 未満なら dense な bool Series より桁違いに小さい。
+    """
+
+    __responsibility__: ClassVar[str] = "戦略シグナルをイベント位置で受け渡す疎なDTO"
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    index: pd.DatetimeIndex = Field(...)
+    entries: np.ndarray = Field(...)
+    short_entries: np.ndarray = Field(...)
+    exits: np.ndarray = Field(...)
+
+    @field_validator("index")
+    @classmethod
+    def _v_index(cls, v: pd.DatetimeIndex) -> pd.DatetimeIndex:
+        if v.tz is None:
+            raise ValueError("signal.index must be timezone-aware")
+        return v
+
+    @field_validator("entries", "short_entries", "exits", mode="before")
+    @classmethod
+    def _v_positions(cls, v: Any, info: ValidationInfo) -> np.ndarray:
+        v = np.asarray(v)
+        if v.ndim != 1 or (v.size and v.dtype.kind not in "iu"):
+            raise ValueError("event positions must be a 1-D integer array")
+        v = v.astype(np.int32, copy=False)
+        n = len(info.data.get("index", ()))
+        if v.size and (v[0] < 0 or v[-1] >= n or (np.diff(v) <= 0).any()):
+            raise ValueError("event positions must be strictly increasing within the index")
+        return v
+
+    @classmethod
+    def from_dense(cls, signals: SignalsDTO) -> EventSignalsDTO:
+        def _pos(s: pd.Series) -> np.ndarray:
+            return np.flatnonzero(s.to_numpy(dtype=bool)).astype(np.int32)
+
+        return cls(
+            index=signals.entries.index,
+            entries=_pos(signals.entries),
+            short_entries=_pos(signals.short_entries),
+            exits=_pos(signals.exits),
+        )
+
+    def mask(self, name: str) -> np.ndarray:
+        """ブロック name の bool 配列（バー数ぶん）"""
+        out = np.zeros(len(self.index), dtype=bool)
+        out[getattr(self, name)] = True
+        return out
+
+    def to_dense(self) -> SignalsDTO:
+        return SignalsDTO(
+            entries=pd.Series(self.mask("entries"), index=self.index),
+            short_entries=pd.Series(self.mask("short_entries"), index=self.index),
+            exits=pd.Series(self.mask("exits"), index=self.index),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """イベント配列の合計バイト数（index を除く）"""
+        return int(self.entries.nbytes + self.short_entries.nbytes + self.exits.nbytes)
@@ -3,6 +3,7 @@ from __future__ import annotations
 from collections.abc import Mapping
 from typing import Any, Protocol
 
+import numpy as np
 import pandas as pd
 
 from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
@@ -29,3 +30,19 @@ class BacktestPort(Protocol):
         splits: list[tuple[pd.Index, pd.Index]],  # [(train_idx, test_idx), ...]
         params: Mapping[str, Any] | None = None,
     ) -> list[Mapping[str, Any]]: ...
+
+
+class BatchBacktestPort(BacktestPort, Protocol):
+    """(bars × K) のシグナル行列を1回で検証できる BacktestPort"""
+
+    __responsibility__ = "K 列のシグナルを列ごとの params で一括検証し評価額を (bars, K) で返す"
+
+    def run_many(
+        self,
+        ohlcv: OhlcvFrameDTO,
+        entries: np.ndarray | pd.DataFrame,  # (bars, K) bool
+        exits: np.ndarray | pd.DataFrame | pd.Series,  # (bars, K) か全列共通の (bars,)
+        params: Mapping[str, Any] | None = None,  # 全列共通
+        *,
+        column_params: list[Mapping[str, Any]] | None = None,  # 列ごとの上書き（長さ K）
+    ) -> Mapping[str, Any]: ...
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Collection, Mapping
 from typing import Any, Protocol
 
 from trade_app.domain.dto.feature_bundle import FeatureBundleDTO
@@ -16,4 +16,6 @@ class FeatureCalcPort(Protocol):
         self,
         ohlcv: OhlcvFrameDTO,
         spec: Mapping[str, Mapping[str, Any]],
+        *,
+        outputs: Mapping[str, Collection[str]] | None = None,
     ) -> FeatureBundleDTO: ...
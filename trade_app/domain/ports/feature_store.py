@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from typing import Any, Protocol
+
+import pandas as pd
+
+
+class FeatureStorePort(Protocol):
+    """インジ出力の永続キャッシュ（内容アドレス。キーの決め方は呼び手側）"""
+
+    __responsibility__ = "インジ出力を実行・プロセスを跨いで再利用（保存先/形式は実装側）"
+
+    def get(self, key: str, index: pd.Index) -> pd.Series | dict[str, pd.Series] | None:
+        """保存済みの出力を index に載せて返す。無い・壊れている・長さが違うなら None"""
+        ...
+
+    def put(self, key: str, value: pd.Series | dict[str, pd.Series]) -> None:
+        """出力を保存（保存できない型は黙って見送る）"""
+        ...
+
+    def gc(self, max_bytes: int | None = None) -> dict[str, Any]:
+        """古いものから消してサイズ上限に収める（戻り値は removed/files/bytes）"""
+        ...
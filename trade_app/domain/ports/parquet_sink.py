@@ -21,4 +21,33 @@ class ParquetSinkPort(Protocol):
         filename: str | None = None,  # 省略時 "symbol_timeframe.parquet"
         engine: str = "pyarrow",
         compression: str = "snappy",
+        row_group_freq: str | None = None,  # 例 "month": 期間ごとの行グループ＋統計で保存
+        layout: str | None = None,  # "hive": symbol=/tf=/year=/month= パーティション
     ) -> Path: ...
+
+    def last_timestamp(
+        self,
+        base_dir: Path,
+        symbol: str,
+        timeframe: str,
+        *,
+        filename: str | None = None,
+        layout: str | None = None,
+    ) -> pd.Timestamp | None:
+        """保存済みデータの最終時刻（UTC）。未保存なら None"""
+        ...
+
+    def append(
+        self,
+        df: pd.DataFrame,  # last_timestamp より新しい正規化済みOHLCV
+        base_dir: Path,
+        symbol: str,
+        timeframe: str,
+        *,
+        filename: str | None = None,
+        compression: str = "snappy",
+        row_group_freq: str | None = None,
+        layout: str | None = None,
+    ) -> Path:
+        """既存データの末尾へ原子的に追記（重なる時刻は既存側を残す）"""
+        ...
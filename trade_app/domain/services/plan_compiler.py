@@ -0,0 +1,385 @@
+"""
+Plan のコンパイル評価（decide と同じ結果を numpy の1パスで作る）。
+
+- 参照列の位置は評価ごとに1回だけ引く（Plan のコンパイル結果は JSON をキーにキャッシュ）
+- 各 Clause は比較を作業バッファへ書き（ufunc の out=）、pre_shift はスライスで AND に融合する
+  （shift した一時配列を作らない）。ブロックの結果は事前確保した bool 配列へ直接積む
+- 特徴量が同じ数値 dtype の1ブロック（bundle_features の出力）なら列は行列のビュー
+- 数値/bool 以外の列・重複列名・tz の無い index は decide（pandas 版）へそのまま委ねる
+  （例外も含めて decide と同じ振る舞い）
+- Series 名も decide と同じ規則（pandas の演算結果の名前）で付ける
+- decide_events: 同じ評価の結果を True の位置（int32 の昇順配列）で返す
+- decide_batch: 閾値（定数）だけが違う Plan 群は構造ごとにまとめ、定数を (K,) ベクトルにして
+  bars × K の bool 行列を1回のブロードキャストで作る（列だけの Clause は1回計算して全列で共有）
+- decide_batch_packed: decide_batch を chunk 列ずつ評価してその場でビット詰めする
+  （bool の一時行列は bars × chunk × 3 まで。全 K 列の bool 行列は作らない）
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from trade_app.domain.dto.packed_signals import PackedBits, PackedSignalsDTO
+from trade_app.domain.dto.plan_models import Clause, Plan
+from trade_app.domain.dto.signals import EventSignalsDTO, SignalMatrixDTO, SignalsDTO
+from trade_app.domain.services.decider import decide
+
+__all__ = [
+    "CompiledPlan",
+    "compile_plan",
+    "decide_batch",
+    "decide_batch_packed",
+    "decide_compiled",
+    "decide_events",
+]
+
+_CMP = {
+    "gt": np.greater,
+    "ge": np.greater_equal,
+    "lt": np.less,
+    "le": np.less_equal,
+    "eq": np.equal,
+}
+_BLOCKS = ("entries", "short_entries", "exits")
+_NUMERIC_KINDS = "biuf"
+_PAIR = 2
+_BITS = 8
+DEFAULT_PACK_CHUNK = 1024
+
+
+@dataclass(frozen=True)
+class _Operand:
+    slot: int | None  # 参照列の位置（None なら定数）
+    const: float = 0.0
+    name: str | None = None
+
+    def value(self, cols: Sequence[np.ndarray]) -> np.ndarray | float:
+        return self.const if self.slot is None else cols[self.slot]
+
+
+@dataclass(frozen=True)
+class _Step:
+    op: str
+    left: int
+    right: tuple[_Operand, ...]
+    shift: int
+    name: str | None  # この Clause の結果 Series の名前（decide と同じ）
+
+
+def _match(a: str | None, b: str | None) -> str | None:
+    # pandas の二項演算の結果名: 両辺の名前が同じときだけ残る
+    return a if a == b else None
+
+
+class CompiledPlan:
+    """compile_plan の結果。evaluate(features) は decide(features, plan) と同じ SignalsDTO"""
+
+    __responsibility__ = "Plan を参照列の位置と融合済みの評価手順へ落として繰り返し評価"
+
+    def __init__(self, columns: tuple[str, ...], blocks: dict[str, tuple[_Step, ...]]) -> None:
+        self.columns = columns
+        self.blocks = blocks
+        steps = [st for blk in _BLOCKS for st in blocks[blk]]
+        # 定数を除いた構造（decide_batch のまとめ単位）と定数の並び
+        self.structure = (
+            columns,
+            tuple(
+                tuple(
+                    (st.op, st.left, tuple(r.slot for r in st.right), st.shift) for st in blocks[b]
+                )
+                for b in _BLOCKS
+            ),
+        )
+        self.consts = tuple(r.const for st in steps for r in st.right if r.slot is None)
+
+    def _columns(self, features: pd.DataFrame) -> list[np.ndarray] | None:
+        if not features.columns.is_unique:
+            return None
+        pos = features.columns.get_indexer(list(self.columns))
+        if (pos < 0).any():
+            return None  # decide が KeyError を出す
+        dtypes = features.dtypes.iloc[pos]
+        if any(not isinstance(d, np.dtype) or d.kind not in _NUMERIC_KINDS for d in dtypes):
+            return None  # 拡張 dtype（NA を持つ）等
+        if features.dtypes.nunique() == 1:
+            mat = features.to_numpy()  # 1ブロックならコピーしない
+            return [mat[:, p] for p in pos]
+        return [features.iloc[:, p].to_numpy() for p in pos]
+
+    def _arrays(self, features: pd.DataFrame) -> dict[str, tuple[np.ndarray, str | None]] | None:
+        """ブロックごとの (bool 配列, Series 名)。評価できなければ None（decide に委ねる）"""
+        index = features.index
+        cols = self._columns(features) if _tz_aware(index) else None
+        if cols is None:
+            return None
+        n = len(index)
+        tmp = np.empty(n, dtype=bool)
+        tmp2 = np.empty(n, dtype=bool)
+        return {blk: _run_block(self.blocks[blk], cols, n, tmp, tmp2) for blk in _BLOCKS}
+
+    def evaluate(self, features: pd.DataFrame, plan: Plan) -> SignalsDTO:
+        arrays = self._arrays(features)
+        if arrays is None:
+            return decide(features, plan)
+        out = {
+            blk: pd.Series(acc, index=features.index, name=name)
+            for blk, (acc, name) in arrays.items()
+        }
+        # 値は bool・index は tz 付き（decide の検証と同じ条件）なので再検証しない
+        return SignalsDTO.model_construct(**out)
+
+    def evaluate_events(self, features: pd.DataFrame, plan: Plan) -> EventSignalsDTO:
+        arrays = self._arrays(features)
+        if arrays is None:
+            return EventSignalsDTO.from_dense(decide(features, plan))
+        pos = {blk: np.flatnonzero(acc).astype(np.int32) for blk, (acc, _name) in arrays.items()}
+        # 位置は flatnonzero なので昇順・範囲内（検証を省く）
+        return EventSignalsDTO.model_construct(index=features.index, **pos)
+
+
+def _tz_aware(index: pd.Index) -> bool:
+    return isinstance(index, pd.DatetimeIndex) and index.tz is not None
+
+
+def _compare(st: _Step, cols: Sequence[np.ndarray], tmp: np.ndarray, tmp2: np.ndarray) -> None:
+    left = cols[st.left]
+    if st.op in _CMP:
+        _CMP[st.op](left, st.right[0].value(cols), out=tmp)
+    elif st.op == "between":
+        np.greater_equal(left, st.right[0].value(cols), out=tmp)
+        np.less_equal(left, st.right[1].value(cols), out=tmp2)
+        tmp &= tmp2
+    else:
+        # cross: 当バーの比較 & 前バーの逆比較（先頭は前バーが無いので False）
+        r = st.right[0].value(cols)
+        r_now = r[1:] if isinstance(r, np.ndarray) else r
+        r_prev = r[:-1] if isinstance(r, np.ndarray) else r
+        now, prev = (
+            (np.greater, np.less_equal) if st.op == "cross_over" else (np.less, np.greater_equal)
+        )
+        now(left[1:], r_now, out=tmp[1:])
+        prev(left[:-1], r_prev, out=tmp2[1:])
+        tmp[1:] &= tmp2[1:]
+        tmp[:1] = False
+
+
+def _and_shifted(acc: np.ndarray, cond: np.ndarray, k: int) -> None:
+    """acc &= cond.shift(k, fill_value=False) を一時配列なしで"""
+    n = len(acc)
+    if abs(k) >= n:
+        acc[:] = False
+    elif k > 0:
+        acc[k:] &= cond[: n - k]
+        acc[:k] = False
+    elif k < 0:
+        acc[: n + k] &= cond[-k:]
+        acc[n + k :] = False
+    else:
+        acc &= cond
+
+
+def _run_block(
+    steps: tuple[_Step, ...],
+    cols: Sequence[np.ndarray],
+    n: int,
+    tmp: np.ndarray,
+    tmp2: np.ndarray,
+) -> tuple[np.ndarray, str | None]:
+    if not steps:
+        return np.zeros(n, dtype=bool), None
+    acc = np.ones(n, dtype=bool)
+    name = steps[0].name
+    for st in steps:
+        _compare(st, cols, tmp, tmp2)
+        _and_shifted(acc, tmp, st.shift)
+        name = _match(name, st.name)
+    return acc, name
+
+
+class _Builder:
+    def __init__(self) -> None:
+        self.slots: dict[str, int] = {}
+
+    def column(self, name: str) -> int:
+        return self.slots.setdefault(name, len(self.slots))
+
+    def operand(self, v: Any) -> _Operand:
+        if isinstance(v, str):
+            return _Operand(self.column(v), name=v)
+        if isinstance(v, int | float):
+            return _Operand(None, float(v))
+        raise TypeError(f"unsupported operand: {v!r}")
+
+    def step(self, c: Clause) -> _Step:
+        left = str(c.left)
+        slot = self.column(left)
+        if c.op in _CMP:
+            right = (self.operand(c.right),)
+            name = left if right[0].slot is None else _match(left, right[0].name)
+        elif c.op == "between":
+            if not isinstance(c.right, list | tuple) or len(c.right) != _PAIR:
+                raise ValueError("between.right must be [low, high]")
+            right = (self.operand(c.right[0]), self.operand(c.right[1]))
+            names = [left if r.slot is None else _match(left, r.name) for r in right]
+            name = _match(names[0], names[1])
+        elif c.op in ("cross_over", "cross_under"):
+            right = (self.operand(c.right),)
+            # 定数の右辺は名前なしの Series になる
+            name = None if right[0].slot is None else _match(left, right[0].name)
+        else:
+            raise ValueError(f"unsupported op: {c.op}")
+        return _Step(c.op, slot, right, int(getattr(c, "pre_shift", 1)), name)
+
+
+@lru_cache(maxsize=256)
+def _compile_json(raw: str) -> CompiledPlan:
+    plan = Plan.model_validate_json(raw)
+    b = _Builder()
+    blocks = {blk: tuple(b.step(c) for c in getattr(plan, blk)) for blk in _BLOCKS}
+    return CompiledPlan(tuple(b.slots), blocks)
+
+
+def compile_plan(plan: Plan) -> CompiledPlan:
+    """Plan をコンパイル（同じ内容の Plan は同じ CompiledPlan を返す）"""
+    return _compile_json(plan.model_dump_json(exclude={"meta"}))
+
+
+def decide_compiled(features: pd.DataFrame, plan: Plan) -> SignalsDTO:
+    """decide と同じ結果（値・dtype・index・名前）をコンパイル済みの手順で作る"""
+    try:
+        compiled = compile_plan(plan)
+    except (TypeError, ValueError):
+        return decide(features, plan)  # 不正な Plan は decide と同じ例外にする
+    return compiled.evaluate(features, plan)
+
+
+def decide_events(features: pd.DataFrame, plan: Plan) -> EventSignalsDTO:
+    """decide の結果をイベント位置（EventSignalsDTO）で返す（bool Series を作らない）"""
+    try:
+        compiled = compile_plan(plan)
+    except (TypeError, ValueError):
+        return EventSignalsDTO.from_dense(decide(features, plan))
+    return compiled.evaluate_events(features, plan)
+
+
+def _compare_wide(
+    st: _Step, cols: Sequence[np.ndarray], consts: np.ndarray, j: int
+) -> tuple[np.ndarray, int]:
+    """_compare の K 列版。定数 j 番目以降を消費し (bars × K か bars × 1, 次の j) を返す"""
+    vals: list[np.ndarray] = []
+    for r in st.right:
+        if r.slot is None:
+            vals.append(consts[None, :, j])
+            j += 1
+        else:
+            vals.append(cols[r.slot][:, None])
+    left = cols[st.left][:, None]
+    if st.op in _CMP:
+        return _CMP[st.op](left, vals[0]), j
+    if st.op == "between":
+        return np.greater_equal(left, vals[0]) & np.less_equal(left, vals[1]), j
+    r = vals[0]
+    r_now, r_prev = (r[1:], r[:-1]) if r.shape[0] > 1 else (r, r)
+    now, prev = (
+        (np.greater, np.less_equal) if st.op == "cross_over" else (np.less, np.greater_equal)
+    )
+    both = now(left[1:], r_now) & prev(left[:-1], r_prev)
+    out = np.zeros((len(left), both.shape[1]), dtype=bool)
+    out[1:] = both
+    return out, j
+
+
+def _evaluate_group(
+    compiled: CompiledPlan, cols: Sequence[np.ndarray], consts: np.ndarray, n: int
+) -> dict[str, np.ndarray]:
+    k = consts.shape[0]
+    out: dict[str, np.ndarray] = {}
+    j = 0
+    for block in _BLOCKS:
+        steps = compiled.blocks[block]
+        acc = np.zeros((n, k), dtype=bool) if not steps else np.ones((n, k), dtype=bool)
+        for st in steps:
+            cond, j = _compare_wide(st, cols, consts, j)
+            _and_shifted(acc, cond, st.shift)  # (bars × 1) の条件は全列へブロードキャスト
+        out[block] = acc
+    return out
+
+
+def decide_batch(
+    features: pd.DataFrame,
+    plans: Sequence[Plan],
+    params: Sequence[dict[str, Any]] | None = None,
+) -> SignalMatrixDTO:
+    """
+    plans の各 Plan を decide した結果を列に並べた SignalMatrixDTO（列 k は plans[k]）。
+    同じ構造の Plan は定数をベクトル化してまとめて評価する（メモリは bars × K × 3 の bool）
+    """
+    index = features.index
+    n, k_all = len(index), len(plans)
+    groups: dict[Any, list[tuple[int, CompiledPlan]]] = {}
+    fallback: dict[int, SignalsDTO] = {}
+    views: dict[tuple[str, ...], list[np.ndarray] | None] = {}
+    for i, plan in enumerate(plans):
+        try:
+            compiled = compile_plan(plan)
+        except (TypeError, ValueError):
+            compiled = None
+        cols = None
+        if compiled is not None and _tz_aware(index):
+            if compiled.columns not in views:
+                views[compiled.columns] = compiled._columns(features)
+            cols = views[compiled.columns]
+        if cols is None:
+            # 評価できない Plan は decide に委ねる（例外も decide と同じ）
+            fallback[i] = decide(features, plan)
+        else:
+            groups.setdefault(compiled.structure, []).append((i, compiled))
+    results = []
+    for members in groups.values():
+        first = members[0][1]
+        consts = np.array([c.consts for _i, c in members], dtype=float).reshape(len(members), -1)
+        cols = views[first.columns]
+        results.append(([i for i, _c in members], _evaluate_group(first, cols, consts, n)))
+    if not fallback and len(results) == 1:
+        mats = results[0][1]  # 全列が同じ構造（閾値だけ違う）なら並べ替え不要
+    else:
+        mats = {b: np.zeros((n, k_all), dtype=bool) for b in _BLOCKS}
+        for pos, group in results:
+            for b, mat in group.items():
+                mats[b][:, pos] = mat
+        for i, sig in fallback.items():
+            for b in _BLOCKS:
+                mats[b][:, i] = getattr(sig, b).to_numpy(dtype=bool)
+    rows = [dict(p) for p in params] if params is not None else []
+    return SignalMatrixDTO(index=index, params=rows, **mats)
+
+
+def decide_batch_packed(
+    features: pd.DataFrame,
+    plans: Sequence[Plan],
+    params: Sequence[dict[str, Any]] | None = None,
+    *,
+    chunk: int = DEFAULT_PACK_CHUNK,
+) -> PackedSignalsDTO:
+    """
+    decide_batch と同じ結果をビット詰め（PackedSignalsDTO）で返す。
+    chunk 列（8 の倍数へ切り上げ）ずつ decide_batch して詰めるので、ピークは bars × chunk の bool
+    """
+    n, k_all = len(features.index), len(plans)
+    step = -(-max(int(chunk), 1) // _BITS) * _BITS
+    bits = {b: np.zeros((n, -(-k_all // _BITS)), dtype=np.uint8) for b in _BLOCKS}
+    for start in range(0, k_all, step):
+        mat = decide_batch(features, plans[start : start + step])
+        lo = start // _BITS
+        for b in _BLOCKS:
+            packed = PackedBits.pack(getattr(mat, b)).bits
+            bits[b][:, lo : lo + packed.shape[1]] = packed
+    rows = [dict(p) for p in params] if params is not None else []
+    packed_blocks = {b: PackedBits(v, k_all) for b, v in bits.items()}
+    return PackedSignalsDTO(index=features.index, params=rows, **packed_blocks)
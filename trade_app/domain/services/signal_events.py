@@ -0,0 +1,31 @@
+"""
+イベント位置（昇順 int32 配列）のままシグナルを加工する純関数群（O(イベント数)）。
+
+- shift_events: Series.shift(k, fill_value=False) 相当（範囲外に出たイベントは消える）
+- union_events: 2つのイベント列の OR
+- time_exit_events: エントリーから max_bars_hold 本後の強制 exit を exits に足す
+  （bindings の max_bars_hold と同じ規則: exits | entries.shift(n)）
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from trade_app.domain.dto.signals import EventSignalsDTO
+
+
+def shift_events(pos: np.ndarray, k: int, n_bars: int) -> np.ndarray:
+    out = np.asarray(pos, dtype=np.int64) + int(k)
+    return out[(out >= 0) & (out < n_bars)].astype(np.int32)
+
+
+def union_events(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.union1d(a, b).astype(np.int32)
+
+
+def time_exit_events(events: EventSignalsDTO, max_bars_hold: int) -> EventSignalsDTO:
+    """exits に entries を max_bars_hold 本ずらしたイベントを足した EventSignalsDTO"""
+    if int(max_bars_hold) <= 0:
+        return events
+    forced = shift_events(events.entries, int(max_bars_hold), len(events.index))
+    return events.model_copy(update={"exits": union_events(events.exits, forced)})
@@ -0,0 +1,100 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.adapters.parquet.layout import LAYOUT_HIVE, read_ohlcv
+from trade_app.adapters.parquet.ohlcv_dataset import read_ohlcv_parquet
+from trade_app.adapters.parquet.parquet_sink_adapter import ParquetSinkAdapter
+from trade_app.apps.ingest.usecases import ingest_history_to_parquet
+from trade_app.domain.ports.history_source import HistorySourcePort
+
+pytest.importorskip("pyarrow")
+
+T0 = pd.Timestamp("2024-01-30 00:00", tz=pytz.UTC)
+
+
+class RangeSource(HistorySourcePort):
+    """[start, end] の足だけ返す（MT5 と同じく両端含む）。取得範囲を記録"""
+
+    def __init__(self, periods: int = 24 * 5) -> None:
+        idx = pd.date_range(T0, periods=periods, freq="h", tz=pytz.UTC)
+        px = np.arange(periods, dtype=float) + 1.0
+        self.bars = pd.DataFrame(
+            {
+                "time": idx.tz_convert(None).asi8 // 10**9,
+                "open": px,
+                "high": px + 0.5,
+                "low": px - 0.5,
+                "close": px,
+                "tick_volume": np.arange(periods, dtype=np.uint64),
+            },
+            index=idx,
+        )
+        self.calls: list[tuple[pd.Timestamp, pd.Timestamp]] = []
+
+    def fetch_ohlcv(self, symbol, timeframe, start, end):
+        self.calls.append((start, end))
+        return self.bars.loc[start:end].reset_index(drop=True)
+
+
+def _ingest(src, tmp_path, end, *, incremental, **sink_kwargs):
+    return ingest_history_to_parquet(
+        source=src,
+        sink=ParquetSinkAdapter(),
+        symbols=["EURUSD"],
+        timeframe="h1",
+        start=T0,
+        end=end,
+        base_dir=tmp_path,
+        sink_kwargs=sink_kwargs,
+        incremental=incremental,
+    )
+
+
+@pytest.mark.parametrize(
+    "sink_kwargs",
+    [{"filename": "ohlcv.parquet", "row_group_freq": "month"}, {"layout": LAYOUT_HIVE}],
+)
+def test_incremental_fetches_only_new_bars(tmp_path: Path, sink_kwargs):
+    src = RangeSource()
+    mid = T0 + pd.Timedelta(hours=47)  # 2024-01-31 23:00（月跨ぎ直前）
+    end = T0 + pd.Timedelta(hours=24 * 5 - 1)
+    first = _ingest(src, tmp_path, mid, incremental=True, **sink_kwargs)
+    assert first[0].rows == 48
+
+    res = _ingest(src, tmp_path, end, incremental=True, **sink_kwargs)
+    # 取得は最終足から（境界1本だけ重複）→ 重複は落として追記
+    assert src.calls[-1][0] == mid
+    assert res[0].rows == 24 * 5 - 48
+
+    if sink_kwargs.get("layout") == LAYOUT_HIVE:
+        got = read_ohlcv(tmp_path, "EURUSD", "h1")
+    else:
+        got = read_ohlcv_parquet(tmp_path / "ohlcv.parquet")
+    assert len(got) == 24 * 5
+    assert got.index.is_monotonic_increasing and not got.index.has_duplicates
+    np.testing.assert_array_equal(got["close"].to_numpy(), src.bars["close"].to_numpy())
+
+    # 最新まで保存済みなら取得しない
+    n_calls = len(src.calls)
+    again = _ingest(src, tmp_path, end, incremental=True, **sink_kwargs)
+    assert again[0].rows == 0
+    assert len(src.calls) == n_calls + 1  # 境界足のみ取得し、書込なし
+
+
+def test_hive_append_keeps_existing_month_files(tmp_path: Path):
+    src = RangeSource(periods=24)
+    _ingest(src, tmp_path, T0 + pd.Timedelta(hours=11), incremental=True, layout=LAYOUT_HIVE)
+    month_dir = tmp_path / "symbol=EURUSD" / "tf=h1" / "year=2024" / "month=01"
+    part0 = month_dir / "part-0.parquet"
+    before = part0.stat().st_mtime_ns
+    _ingest(src, tmp_path, T0 + pd.Timedelta(hours=23), incremental=True, layout=LAYOUT_HIVE)
+    assert part0.stat().st_mtime_ns == before
+    assert (month_dir / "part-1.parquet").exists()
+
+    # 月の全面書き直しでは追記分の part-N を片付ける
+    _ingest(src, tmp_path, T0 + pd.Timedelta(hours=23), incremental=False, layout=LAYOUT_HIVE)
+    assert sorted(p.name for p in month_dir.glob("*.parquet")) == ["part-0.parquet"]
@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.adapters.parquet.layout import (
+    LAYOUT_HIVE,
+    list_hive_files,
+    migrate_file_to_hive,
+    read_ohlcv,
+    resolve_layout,
+)
+from trade_app.adapters.parquet.parquet_sink_adapter import ParquetSinkAdapter
+from trade_app.adapters.vbtpro.vbtpro_bindings import parquet_pull
+
+pytest.importorskip("pyarrow")
+
+
+def _ohlcv(start: str = "2024-01-01", periods: int = 24 * 150) -> pd.DataFrame:
+    idx = pd.date_range(start, periods=periods, freq="h", tz=pytz.UTC)
+    close = np.linspace(1.0, 2.0, periods)
+    return pd.DataFrame(
+        {"open": close, "high": close + 0.1, "low": close - 0.1, "close": close, "volume": 1.0},
+        index=pd.DatetimeIndex(idx, name="time"),
+    )
+
+
+def test_hive_sink_and_pull_prunes_partitions(tmp_path: Path, monkeypatch):
+    df = _ohlcv()
+    ParquetSinkAdapter().write(df, tmp_path, "EURUSD", "h1", layout=LAYOUT_HIVE)
+    assert resolve_layout(tmp_path, "EURUSD", "h1") == LAYOUT_HIVE
+    # 2024-01..05 の5パーティション、期間 03/10-04/02 は 03,04 の2つだけ
+    assert len(list_hive_files(tmp_path, "EURUSD", "h1")) == 5
+    assert len(list_hive_files(tmp_path, "EURUSD", "h1", "2024-03-10", "2024-04-02")) == 2
+
+    monkeypatch.setenv("VBT_PARQUET_ROOT", str(tmp_path))
+    got = parquet_pull(["EURUSD"], "2024-03-10", "2024-04-02", ["close"], "h1", "UTC")
+    exp = df.loc["2024-03-10":"2024-04-02", ["close"]]
+    np.testing.assert_array_equal(got.index.asi8, exp.index.asi8)
+    np.testing.assert_array_equal(got["close"].to_numpy(), exp["close"].to_numpy())
+
+
+def test_hive_write_replaces_only_touched_months(tmp_path: Path):
+    sink = ParquetSinkAdapter()
+    sink.write(_ohlcv(), tmp_path, "EURUSD", "h1", layout=LAYOUT_HIVE)
+    jan = list_hive_files(tmp_path, "EURUSD", "h1", "2024-01", "2024-01")[0]
+    before = jan.stat().st_mtime_ns
+    sink.write(_ohlcv("2024-05-01", 24), tmp_path, "EURUSD", "h1", layout=LAYOUT_HIVE)
+    assert jan.stat().st_mtime_ns == before
+
+
+def test_hive_write_keeps_existing_rows_of_partial_month(tmp_path: Path):
+    # 月の途中だけの書込でも、その月の既存の足は消えない（重なる時刻は新しい値）
+    sink = ParquetSinkAdapter()
+    df = _ohlcv(periods=24 * 60)
+    sink.write(df, tmp_path, "EURUSD", "h1", layout=LAYOUT_HIVE)
+    patch = df.loc["2024-01-20":"2024-01-25"].copy()
+    patch["close"] = 9.0
+    sink.write(patch, tmp_path, "EURUSD", "h1", layout=LAYOUT_HIVE)
+
+    jan = list_hive_files(tmp_path, "EURUSD", "h1", "2024-01", "2024-01")
+    assert len(jan) == 1
+    got = read_ohlcv(tmp_path, "EURUSD", "h1")
+    exp = df.copy()
+    exp.loc["2024-01-20":"2024-01-25", "close"] = 9.0
+    np.testing.assert_array_equal(got.index.asi8, exp.index.as_unit("ns").asi8)
+    np.testing.assert_array_equal(got["close"].to_numpy(), exp["close"].to_numpy())
+    np.testing.assert_array_equal(got["open"].to_numpy(), exp["open"].to_numpy())
+
+
+def test_migrate_single_file_to_hive(tmp_path: Path, monkeypatch):
+    df = _ohlcv()
+    src = tmp_path / "USDJPY" / "h1"
+    ParquetSinkAdapter().write(df, src, "USDJPY", "h1", filename="ohlcv.parquet")
+    paths = migrate_file_to_hive(tmp_path, "USDJPY", "h1", remove_source=True)
+    assert len(paths) == 5
+    assert not (src / "ohlcv.parquet").exists()
+
+    monkeypatch.setenv("VBT_PARQUET_ROOT", str(tmp_path))
+    got = parquet_pull(["USDJPY"], None, None, ["open", "close"], "h1", "UTC")
+    assert len(got) == len(df)
+    assert got.index.is_monotonic_increasing
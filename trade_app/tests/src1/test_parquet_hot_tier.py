@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.adapters.parquet.hot_tier import (
+    build_hot_tier,
+    hot_tier_is_fresh,
+    read_hot_tier,
+)
+from trade_app.adapters.parquet.layout import LAYOUT_HIVE
+from trade_app.adapters.parquet.parquet_sink_adapter import ParquetSinkAdapter
+from trade_app.adapters.vbtpro.vbtpro_bindings import parquet_pull
+
+pytest.importorskip("pyarrow")
+
+
+def _ohlcv(periods: int = 24 * 60) -> pd.DataFrame:
+    idx = pd.date_range("2024-01-01", periods=periods, freq="h", tz=pytz.UTC, name="time")
+    close = np.linspace(1.0, 2.0, periods)
+    df = pd.DataFrame(
+        {"open": close, "high": close + 0.1, "low": close - 0.1, "close": close, "volume": 1.0},
+        index=idx,
+    )
+    # 未正規化（逆順＋重複）でもホット層は正規化済みで保存されること
+    return pd.concat([df.iloc[::-1], df.iloc[:5]])
+
+
+@pytest.mark.parametrize("layout", [None, LAYOUT_HIVE])
+def test_hot_tier_matches_parquet_pull(tmp_path: Path, monkeypatch, layout):
+    sink = ParquetSinkAdapter()
+    if layout == LAYOUT_HIVE:
+        sink.write(_ohlcv(), tmp_path, "EURUSD", "h1", layout=LAYOUT_HIVE)
+    else:
+        sink.write(_ohlcv(), tmp_path / "EURUSD" / "h1", "EURUSD", "h1", filename="ohlcv.parquet")
+    monkeypatch.setenv("VBT_PARQUET_ROOT", str(tmp_path))
+    monkeypatch.setenv("GDX_HOT_TIER", "0")
+    exp = parquet_pull(["EURUSD"], "2024-01-10", "2024-02-03", ["close", "open"], "h1", "UTC")
+
+    build_hot_tier(tmp_path, "EURUSD", "h1")
+    assert hot_tier_is_fresh(tmp_path, "EURUSD", "h1")
+    monkeypatch.setenv("GDX_HOT_TIER", "1")
+    got = parquet_pull(["EURUSD"], "2024-01-10", "2024-02-03", ["close", "open"], "h1", "UTC")
+    pd.testing.assert_frame_equal(got, exp, check_freq=False)
+    # 列はマップ領域の参照（読み取り専用）
+    assert not got["close"].to_numpy().flags.writeable
+
+
+def test_hot_tier_ignored_when_parquet_updated(tmp_path: Path):
+    sink = ParquetSinkAdapter()
+    out = tmp_path / "EURUSD" / "h1"
+    sink.write(_ohlcv(), out, "EURUSD", "h1", filename="ohlcv.parquet")
+    build_hot_tier(tmp_path, "EURUSD", "h1")
+    assert read_hot_tier(tmp_path, "EURUSD", "h1") is not None
+
+    nxt = pd.date_range("2024-03-01", periods=3, freq="h", tz=pytz.UTC, name="time")
+    bars = pd.DataFrame({c: 1.0 for c in ("open", "high", "low", "close", "volume")}, index=nxt)
+    sink.append(bars, out, "EURUSD", "h1", filename="ohlcv.parquet")
+    assert not hot_tier_is_fresh(tmp_path, "EURUSD", "h1")
+    assert read_hot_tier(tmp_path, "EURUSD", "h1") is None
+
+
+def test_hot_tier_keeps_microsecond_source_timestamps(tmp_path: Path):
+    # µs 単位の index を持つ Parquet でも 1970 年にならず、期間切り出しが効くこと
+    import pyarrow as pa  # noqa: PLC0415
+    import pyarrow.parquet as pq  # noqa: PLC0415
+
+    df = _ohlcv().sort_index()
+    df = df[~df.index.duplicated()]
+    df.index = df.index.as_unit("us")
+    out = tmp_path / "EURUSD" / "h1"
+    out.mkdir(parents=True)
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    assert table.schema.field("time").type.unit == "us"
+    pq.write_table(table, out / "ohlcv.parquet")
+
+    build_hot_tier(tmp_path, "EURUSD", "h1")
+    got = read_hot_tier(tmp_path, "EURUSD", "h1", start="2024-01-10", end="2024-01-11")
+    exp = df.loc["2024-01-10":"2024-01-11"]
+    assert got is not None and len(got) == len(exp) == 48
+    assert (got.index.as_unit("ns") == exp.index.as_unit("ns")).all()
+    np.testing.assert_array_equal(got["close"].to_numpy(), exp["close"].to_numpy())
@@ -0,0 +1,66 @@
+from itertools import pairwise
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.adapters.parquet.ohlcv_dataset import row_group_time_ranges, scan_bounds
+from trade_app.adapters.parquet.parquet_sink_adapter import ParquetSinkAdapter
+from trade_app.adapters.vbtpro.vbtpro_bindings import parquet_pull
+
+pytest.importorskip("pyarrow")
+
+
+def _ohlcv(periods: int = 24 * 120) -> pd.DataFrame:
+    idx = pd.date_range("2024-01-01", periods=periods, freq="h", tz=pytz.UTC)
+    close = np.linspace(1.0, 2.0, periods)
+    df = pd.DataFrame(
+        {"open": close, "high": close + 0.1, "low": close - 0.1, "close": close, "volume": 1.0},
+        index=idx,
+    )
+    df.index.name = "time"
+    # 逆順で渡しても書込側でソートされること
+    return df.iloc[::-1]
+
+
+def test_sink_writes_sorted_monthly_row_groups(tmp_path: Path):
+    path = ParquetSinkAdapter().write(
+        _ohlcv(),
+        tmp_path / "EURUSD" / "h1",
+        "EURUSD",
+        "h1",
+        filename="ohlcv.parquet",
+        row_group_freq="month",
+    )
+    ranges = row_group_time_ranges(path)
+    assert len(ranges) == 4  # 2024-01..04
+    # 各行グループは月内に収まり、互いに重ならない
+    for (lo, hi), (nlo, _nhi) in pairwise(ranges):
+        assert lo.month == hi.month
+        assert hi < nlo
+
+
+def test_parquet_pull_pushes_down_window_and_columns(tmp_path: Path, monkeypatch):
+    ParquetSinkAdapter().write(
+        _ohlcv(),
+        tmp_path / "EURUSD" / "h1",
+        "EURUSD",
+        "h1",
+        filename="ohlcv.parquet",
+        row_group_freq="month",
+    )
+    monkeypatch.setenv("VBT_PARQUET_ROOT", str(tmp_path))
+    df = parquet_pull(["EURUSD"], "2024-02-10", "2024-02-11", ["open", "close"], "h1", "UTC")
+    # 文字列 end は df.loc と同じく当日末まで含む
+    assert df.index[0] == pd.Timestamp("2024-02-10 00:00", tz="UTC")
+    assert df.index[-1] == pd.Timestamp("2024-02-11 23:00", tz="UTC")
+    assert list(df.columns) == ["open", "close"]
+    assert df.index.is_monotonic_increasing
+
+
+def test_scan_bounds_expand_partial_strings():
+    lo, hi = scan_bounds("2024-03", "2024-03")
+    assert lo == pd.Timestamp("2024-03-01", tz="UTC")
+    assert hi.day == 31 and hi.hour == 23
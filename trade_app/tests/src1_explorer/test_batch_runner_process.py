@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import json
+import pickle
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.adapters.parquet.ohlcv_dataset import scan_bounds
+from trade_app.adapters.vbtpro.data_feed_adapter import VbtProDataFeedAdapter
+from trade_app.adapters.vbtpro.frame_cache import shared_frame_cache
+from trade_app.apps.features.feature_calc import DefaultFeatureCalculator
+from trade_app.apps.features.pipeline.plan_builder import DefaultPlanBuilder
+from trade_app.apps.research.explorer.batch_runner import run_batch_explorer
+from trade_app.apps.research.splitters.walkforward import WalkForwardSplitter
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+
+# プロセス実行ではワーカーへ pickle されるため、Fake はすべてモジュール直下に置く
+
+
+class FakeUniverse:
+    def list_symbols(self):
+        return ["EURUSD", "USDJPY"]
+
+    def list_timeframes(self):
+        return ["h"]
+
+
+class FakeFeed:
+    def load(self, symbols, start=None, end=None, columns=(), timeframe=None, tz="UTC"):
+        k = 1.0 if next(iter(symbols)) == "EURUSD" else 2.0
+        idx = pd.date_range("2024-01-01", periods=60, freq="h", tz=pytz.UTC)
+        base = pd.Series(range(60), index=idx, dtype=float) * k
+        df = pd.DataFrame(
+            {"open": base, "high": base + 1, "low": base - 1, "close": base, "volume": 1.0}
+        )
+        return OhlcvFrameDTO(frame=df, freq="h")
+
+
+class RangedFeed:
+    """[start, end] で切る feed（公開範囲の外を読むウォームアップの確認用）"""
+
+    def load(self, symbols, start=None, end=None, columns=(), timeframe=None, tz="UTC"):
+        idx = pd.date_range("2024-01-01", periods=120, freq="h", tz=pytz.UTC)
+        base = pd.Series(range(120), index=idx, dtype=float) % 17
+        df = pd.DataFrame(
+            {"open": base, "high": base + 1, "low": base - 1, "close": base, "volume": 1.0}
+        )
+        lo, hi = scan_bounds(start, end)
+        df = df.loc[(df.index >= (lo or idx[0])) & (df.index <= (hi or idx[-1]))]
+        return OhlcvFrameDTO(frame=df, freq="h")
+
+
+class SignalBacktester:
+    """entries の本数と最初の位置で評価額が変わる（特徴量の先頭 NaN が結果に出る）"""
+
+    def run_from_signals(self, ohlcv, entries, exits, params=None):
+        eq = ohlcv.frame["close"] * 0 + 100.0 + entries.cumsum().reindex(ohlcv.frame.index)
+        return {"portfolio": SimpleNamespace(equity=eq.fillna(100.0)), "metrics": {}}
+
+
+class FakeBacktester:
+    def run_from_signals(self, ohlcv, entries, exits, params=None):
+        eq = ohlcv.frame["close"] + 100.0
+        return {"portfolio": SimpleNamespace(equity=eq), "metrics": {}}
+
+
+class FakeSampler:
+    def sample(self, space, n, seed=None):
+        return [{"sma.len": 5}, {"sma.len": 10}][:n]
+
+
+class FakeOptimizer:
+    def optimize(self, obj, space, *, n_trials, timeout_sec=None, seed=None, initial_points=None):
+        scored = [(dict(p), float(obj(p))) for p in initial_points or []]
+        best = max(scored, key=lambda x: x[1])
+        return best[0], best[1], [{"params": p, "value": v} for p, v in scored]
+
+
+class FakeLockSink:
+    def write(self, *, best_params, best_score, out_dir, **_):
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = out_dir / "lock.json"
+        path.write_text(json.dumps({"best_params": best_params, "best_score": best_score}))
+        return path
+
+
+def _run(out_dir: Path, **kwargs) -> pd.DataFrame:
+    kwargs = {
+        "feed": FakeFeed(),
+        "backtester": FakeBacktester(),
+        "full_start": pd.Timestamp("2024-01-01", tz=pytz.UTC),
+        **kwargs,
+    }
+    return run_batch_explorer(
+        universe=FakeUniverse(),
+        sessions=[
+            {"name": "ALLDAY", "type": "all", "tz": "UTC"},
+            {"name": "LONDON", "type": "window", "start": "08:00", "end": "17:00", "tz": "UTC"},
+        ],
+        calc=DefaultFeatureCalculator(),
+        planner=DefaultPlanBuilder(),
+        splitter=WalkForwardSplitter(train_size=30, test_size=10),
+        features_spec={
+            "sma_5": {"kind": "sma", "on": "close", "params": {"length": "{{sma.len}}"}}
+        },
+        plan_spec={"entries": [{"op": "gt", "left": "sma_5", "right": 0}]},
+        space={"sma.len": {"type": "int", "low": 5, "high": 10, "step": 5}},
+        full_end=pd.Timestamp("2024-01-05", tz=pytz.UTC),
+        tz="UTC",
+        sampler=FakeSampler(),
+        optimizer=FakeOptimizer(),
+        lock_sink=FakeLockSink(),
+        out_dir=out_dir,
+        n_init=2,
+        n_trials=2,
+        **kwargs,
+    )
+
+
+def _locks(root: Path) -> dict[str, dict]:
+    return {
+        str(p.relative_to(root)): json.loads(p.read_text()) for p in sorted(root.rglob("lock.json"))
+    }
+
+
+@pytest.mark.parametrize("share_ohlcv", [True, False])
+def test_process_executor_matches_sequential(tmp_path: Path, share_ohlcv):
+    seq = _run(tmp_path / "seq")
+    streamed: list[dict] = []
+    par = _run(
+        tmp_path / "proc",
+        max_workers=2,
+        executor="process",
+        share_ohlcv=share_ohlcv,
+        on_result=streamed.append,
+    )
+    assert len(seq) == 4 and (seq["status"] == "ok").all()
+    # lock_path 以外は同一、行順もジョブ順
+    cols = ["symbol", "timeframe", "session", "best_score", "status"]
+    pd.testing.assert_frame_equal(seq[cols], par[cols])
+    assert _locks(tmp_path / "seq") == _locks(tmp_path / "proc")
+    assert len(streamed) == 4
+
+
+def test_process_shared_memory_reads_warmup_lookback(tmp_path: Path, monkeypatch):
+    # 共有メモリには [full_start, full_end] だけ載る。start 前のウォームアップは元の feed から
+    monkeypatch.setenv("GDX_WARMUP_LOOKBACK", "1")
+    kw = {
+        "feed": RangedFeed(),
+        "backtester": SignalBacktester(),
+        "full_start": pd.Timestamp("2024-01-03", tz=pytz.UTC),
+    }
+    seq = _run(tmp_path / "seq", **kw)
+    par = _run(tmp_path / "proc", max_workers=2, executor="process", share_ohlcv=True, **kw)
+    cols = ["symbol", "timeframe", "session", "best_score", "status"]
+    pd.testing.assert_frame_equal(seq[cols], par[cols])
+    assert _locks(tmp_path / "seq") == _locks(tmp_path / "proc")
+    monkeypatch.setenv("GDX_WARMUP_LOOKBACK", "0")
+    assert not _run(tmp_path / "cold", **kw)["best_score"].equals(seq["best_score"])
+
+
+def test_default_adapters_are_picklable():
+    feed = pickle.loads(pickle.dumps(VbtProDataFeedAdapter()))
+    # プロセス共有キャッシュは送り先の共有キャッシュに付け替わる
+    assert feed._cache is shared_frame_cache()
+    pickle.dumps(DefaultFeatureCalculator())
+
+
+def test_unknown_executor_rejected(tmp_path: Path):
+    with pytest.raises(ValueError):
+        _run(tmp_path, executor="gpu")
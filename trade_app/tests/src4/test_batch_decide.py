@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytz
+
+from trade_app.apps.features.pipeline.plan_builder import DefaultPlanBuilder
+from trade_app.apps.research.explorer.batch_decide import decide_many, group_by_features
+from trade_app.apps.research.explorer.spec_binding import bind_params_to_spec
+from trade_app.domain.dto.packed_signals import PackedSignalsDTO
+from trade_app.domain.dto.plan_models import Clause, Plan
+from trade_app.domain.services.decider import decide
+from trade_app.domain.services.plan_compiler import decide_batch, decide_batch_packed
+
+TEMPLATE = {
+    "entries": [
+        {"op": "gt", "left": "rsi", "right": "{{entry.rsi_gt}}"},
+        {"op": "cross_over", "left": "close", "right": "ema"},
+    ],
+    "short_entries": [{"op": "between", "left": "rsi", "right": ["{{lo}}", "{{hi}}"]}],
+    "exits": [{"op": "lt", "left": "rsi", "right": "{{exit.rsi_lt}}", "pre_shift": 2}],
+}
+
+
+def _features(n: int = 500) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    idx = pd.date_range("2024-01-01", periods=n, freq="h", tz=pytz.UTC)
+    close = np.cumsum(rng.normal(0, 1, n))
+    rsi = rng.uniform(0, 100, n).round()
+    rsi[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame(
+        {"close": close, "ema": pd.Series(close).ewm(span=10).mean().to_numpy(), "rsi": rsi},
+        index=idx,
+    )
+
+
+def _assert_column(mat, k: int, exp) -> None:
+    got = mat.column(k)
+    for name in ("entries", "short_entries", "exits"):
+        np.testing.assert_array_equal(getattr(got, name).to_numpy(), getattr(exp, name).to_numpy())
+
+
+def test_decide_many_matches_decide_per_row():
+    features = _features()
+    rng = np.random.default_rng(9)
+    grid = pd.DataFrame(
+        {
+            "entry.rsi_gt": rng.integers(50, 80, 32),
+            "exit.rsi_lt": rng.integers(20, 50, 32),
+            "lo": rng.integers(10, 40, 32),
+            "hi": rng.integers(60, 90, 32),
+        }
+    )
+    mat = decide_many(features, TEMPLATE, grid)
+    assert mat.entries.shape == (len(features), 32)
+    assert mat.params[0]["entry.rsi_gt"] == grid.iloc[0]["entry.rsi_gt"]
+    planner = DefaultPlanBuilder()
+    for k, row in enumerate(grid.to_dict(orient="records")):
+        _assert_column(mat, k, decide(features, planner.build(bind_params_to_spec(TEMPLATE, row))))
+
+
+def test_mixed_structures_and_fallback_keep_order():
+    features = _features()
+    plans = [
+        Plan(entries=[Clause(op="gt", left="rsi", right=60.0)]),
+        Plan(entries=[Clause(op="cross_under", left="close", right=0.0, pre_shift=0)]),
+        Plan(entries=[Clause(op="gt", left="rsi", right=70.0)]),
+        Plan(exits=[Clause(op="le", left="rsi", right="ema", pre_shift=-1)]),
+        Plan(),
+    ]
+    mat = decide_batch(features, plans)
+    for k, plan in enumerate(plans):
+        _assert_column(mat, k, decide(features, plan))
+    # 拡張 dtype は decide（pandas 版）に委ねる
+    ext = features.fillna(0.0).astype("Float64")
+    mat = decide_batch(ext, plans)
+    for k, plan in enumerate(plans):
+        _assert_column(mat, k, decide(ext, plan))
+
+
+def test_decide_batch_packed_matches_packed_matrix():
+    features = _features()
+    rng = np.random.default_rng(5)
+    planner = DefaultPlanBuilder()
+    rows = [
+        {"entry.rsi_gt": a, "exit.rsi_lt": b, "lo": 20, "hi": 70}
+        for a, b in zip(rng.integers(50, 80, 21), rng.integers(20, 50, 21), strict=True)
+    ]
+    plans = [planner.build(bind_params_to_spec(TEMPLATE, row)) for row in rows]
+    plans[4] = Plan(exits=[Clause(op="le", left="rsi", right="ema", pre_shift=-1)])
+    exp = PackedSignalsDTO.from_matrix(decide_batch(features, plans, rows))
+    # chunk は 8 の倍数へ切り上げ（13 -> 16）。K=21 は端数の詰め位置も見る
+    for chunk in (1, 13, 64):
+        got = decide_batch_packed(features, plans, rows, chunk=chunk)
+        for name in ("entries", "short_entries", "exits"):
+            assert getattr(got, name) == getattr(exp, name)
+        assert got.params == exp.params
+    empty = decide_batch_packed(features, [])
+    assert empty.entries.shape == (len(features), 0)
+
+
+def test_group_by_features_splits_on_feature_params():
+    spec = {"features": [{"kind": "rsi", "on": "close", "params": {"length": "{{n}}"}}]}
+    rows = [{"n": 14, "x": 1}, {"n": 7, "x": 1}, {"n": 14, "x": 2}]
+    groups = group_by_features(spec, rows)
+    assert [idx for _spec, idx in groups] == [[0, 2], [1]]
+    assert groups[0][0]["features"][0]["params"]["length"] == 14
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.apps.features.feature_calc import DefaultFeatureCalculator, build_registry
+from trade_app.apps.features.feature_memo import FeatureMemo
+from trade_app.apps.features.indicators import batched, compiled
+from trade_app.apps.features.indicators.atr import atr
+from trade_app.apps.features.indicators.bb import bb
+from trade_app.apps.features.indicators.donchian import donchian
+from trade_app.apps.features.indicators.ma import ema, sma
+from trade_app.apps.features.indicators.rsi import rsi
+from trade_app.apps.features.indicators.stoch import stoch
+from trade_app.apps.features.indicators.zscore import zscore
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+
+LENGTHS = [5, 14, 33, 40]
+
+
+def _ohlc(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    idx = pd.date_range("2024-01-01", periods=n, freq="min", tz=pytz.UTC)
+    close = pd.Series(np.cumsum(rng.normal(0, 0.01, n)) + 150.0, index=idx)
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + rng.random(n) * 0.02,
+            "low": close - rng.random(n) * 0.02,
+            "close": close,
+            "volume": 1.0,
+        }
+    )
+
+
+def _assert_cols(got: np.ndarray, refs: list[pd.Series]) -> None:
+    # prefetch は compute と同じメモキーへ載せるため、単発版とビット単位で一致すること
+    assert got.shape == (len(refs[0]), len(refs))
+    np.testing.assert_array_equal(got, np.column_stack([r.astype(float) for r in refs]))
+
+
+def _singles():
+    yield sma, atr, donchian, stoch
+    if compiled.HAS_NUMBA:
+        yield compiled.sma, compiled.atr, compiled.donchian, compiled.stoch
+
+
+# 窓長より短い系列と、長い系列の両方で確認
+@pytest.mark.parametrize("n", [20, 3000])
+def test_batched_is_bit_identical_to_single(n):
+    df = _ohlc(n)
+    h, lo, c = df["high"], df["low"], df["close"]
+    for sma_fn, atr_fn, donchian_fn, stoch_fn in _singles():
+        _assert_cols(batched.sma_many(c, LENGTHS), [sma_fn(c, w) for w in LENGTHS])
+        _assert_cols(batched.atr_many(h, lo, c, LENGTHS), [atr_fn(h, lo, c, w) for w in LENGTHS])
+        got = batched.donchian_many(h, lo, LENGTHS)
+        for k in ("upper", "middle", "lower"):
+            _assert_cols(got[k], [donchian_fn(h, lo, w)[k] for w in LENGTHS])
+        got = batched.stoch_many(h, lo, c, LENGTHS, d=3, smooth=2)
+        for k in ("k", "d"):
+            _assert_cols(got[k], [stoch_fn(h, lo, c, w, 3, 2)[k] for w in LENGTHS])
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_ewm_batches_are_bit_identical_to_single(monkeypatch, use_numba):
+    if use_numba and not compiled.HAS_NUMBA:
+        pytest.skip("numba 無し")
+    singles = [(ema, rsi)] + ([(compiled.ema, compiled.rsi)] if compiled.HAS_NUMBA else [])
+    # numba 無しの経路（行ごとの numpy 演算）でも同じ値
+    monkeypatch.setattr(compiled, "HAS_NUMBA", use_numba)
+    c = _ohlc(3000)["close"].copy()
+    c.iloc[100:130] = c.iloc[100]  # 一定値の区間（更新省略）と RSI の 0/0
+    lengths = [1, 2, *LENGTHS]
+    for ema_fn, rsi_fn in singles:
+        _assert_cols(batched.ema_many(c, lengths), [ema_fn(c, w) for w in lengths])
+        _assert_cols(batched.rsi_many(c, lengths), [rsi_fn(c, w) for w in lengths])
+
+
+def test_cumsum_batches_match_single_closely():
+    c = _ohlc(3000)["close"]
+    windows = [5, 20, 40, 5000]  # 系列より長い窓は全 NaN
+    mean = batched.sma_cumsum_many(c, windows)
+    bands = batched.bb_many(c, windows, mult=1.5)
+    z = batched.zscore_many(c, windows)
+    for i, w in enumerate(windows):
+        np.testing.assert_allclose(mean[:, i], sma(c, w), rtol=1e-9)
+        ref = bb(c, w, mult=1.5)
+        for k in ("upper", "middle", "lower"):
+            np.testing.assert_allclose(bands[k][:, i], ref[k], rtol=1e-9)
+        np.testing.assert_allclose(z[:, i], zscore(c, w), atol=1e-5)
+    assert np.isnan(z[:, 3]).all()
+
+
+def test_batched_rejects_nan_and_bad_lengths():
+    c = _ohlc(50)["close"].copy()
+    with pytest.raises(ValueError):
+        batched.sma_many(c, [0, 5])
+    with pytest.raises(ValueError):
+        batched.sma_many(c, [2.5])
+    with pytest.raises(ValueError):
+        batched.sma_many(c.where(c.index != c.index[3], -0.0), [5])
+    c.iloc[10] = np.nan
+    with pytest.raises(ValueError):
+        batched.sma_many(c, [5])
+
+
+@pytest.mark.parametrize("backend", ["pandas", "numba"])
+@pytest.mark.parametrize("dag", ["1", "0"])
+def test_prefetch_matches_plain_compute_exactly(monkeypatch, backend, dag):
+    monkeypatch.setenv("GDX_FEATURE_DAG", dag)
+    dto = OhlcvFrameDTO(frame=_ohlc(3000), freq="min")
+    specs = [
+        {
+            "sma": {"kind": "sma", "on": "close", "params": {"length": n}},
+            "atr": {"kind": "atr", "on": ["high", "low", "close"], "params": {"length": n}},
+            "dc": {"kind": "donchian", "on": ["high", "low"], "params": {"window": n + 6}},
+            "st": {
+                "kind": "stoch",
+                "on": ["high", "low", "close"],
+                "params": {"k": n, "d": 3, "smooth": 2},
+            },
+            "rsi": {"kind": "rsi", "on": "close", "params": {"length": n}},
+            "ema": {"kind": "ema", "on": "close", "params": {"length": n + 1}},
+            "z": {"kind": "zscore", "on": "close", "params": {"window": n}},  # バッチ対象外
+        }
+        for n in (5, 14, 30)
+    ]
+    reg = build_registry(backend)
+    calc = DefaultFeatureCalculator(reg, memo=FeatureMemo(64 * 1024 * 1024))
+    calc.defer_prefetch(specs)
+    plain = DefaultFeatureCalculator(reg, memo=FeatureMemo(0))
+    for i, spec in enumerate(specs):
+        before = calc.memo_stats()["hits"]
+        got = calc.compute(dto, spec).features
+        if i > 0:
+            # bundle はミス、バッチ対象の 6 インジはヒット（zscore は毎回計算）
+            assert calc.memo_stats()["hits"] - before == 6
+        pd.testing.assert_frame_equal(got, plain.compute(dto, spec).features, check_exact=True)
+    assert calc.prefetch(dto, specs) == 18
@@ -1,7 +1,9 @@
+import numpy as np
 import pandas as pd
 import pytz
 
 from trade_app.adapters.vbtpro.data_feed_adapter import VbtProDataFeedAdapter
+from trade_app.adapters.vbtpro.frame_cache import OhlcvFrameCache, frame_nbytes
 
 
 def test_data_feed_adapter_calls_pull(monkeypatch):
@@ -18,3 +20,44 @@ def test_data_feed_adapter_calls_pull(monkeypatch):
     adapter = VbtProDataFeedAdapter(pull_fn=fake_pull)
     dto = adapter.load(["EURUSD"])
     assert dto.frame.equals(df)
+
+
+def test_data_feed_adapter_cache_hits_share_readonly_frame():
+    idx = pd.date_range("2024-01-01", periods=3, freq="h", tz=pytz.UTC)
+    calls = {"n": 0}
+    stamp = {"v": 1}
+
+    def fake_pull(symbols, start, end, columns, timeframe, tz):
+        calls["n"] += 1
+        return pd.DataFrame(
+            {"open": [1.0, 2, 3], "high": [2.0, 3, 4], "low": [0.0, 1, 2], "close": [1.0, 2, 3]},
+            index=idx,
+        )
+
+    adapter = VbtProDataFeedAdapter(
+        pull_fn=fake_pull,
+        cache=OhlcvFrameCache(max_bytes=1 << 20),
+        fingerprint_fn=lambda symbols, tf: stamp["v"],
+    )
+    a = adapter.load(["EURUSD"], timeframe="h1")
+    b = adapter.load(["EURUSD"], timeframe="h1")
+    assert calls["n"] == 1
+    # 同じバッファを共有し、書き込みは拒否される
+    assert np.shares_memory(a.frame["close"].to_numpy(), b.frame["close"].to_numpy())
+    assert not b.frame["close"].to_numpy().flags.writeable
+    # ファイル指紋（mtime）が変われば再読込
+    stamp["v"] = 2
+    adapter.load(["EURUSD"], timeframe="h1")
+    assert calls["n"] == 2
+    assert adapter.cache_stats()["hits"] == 1
+
+
+def test_frame_cache_evicts_lru_over_budget():
+    idx = pd.date_range("2024-01-01", periods=100, freq="h", tz=pytz.UTC)
+    df = pd.DataFrame({"open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0}, index=idx)
+    cache = OhlcvFrameCache(max_bytes=int(frame_nbytes(df) * 2.5))
+    for k in ("a", "b", "c"):
+        cache.put(k, df)
+    assert cache.get("a") is None
+    assert cache.get("b") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,113 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.adapters.parquet.parquet_sink_adapter import ParquetSinkAdapter
+from trade_app.adapters.vbtpro import derived_feed
+from trade_app.adapters.vbtpro.data_feed_adapter import VbtProDataFeedAdapter
+from trade_app.adapters.vbtpro.derived_feed import DerivedTimeframeDataFeed
+from trade_app.adapters.vbtpro.frame_cache import OhlcvFrameCache
+
+pytest.importorskip("pyarrow")
+
+AGG = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+
+def _m15(days: int = 60) -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    idx = pd.date_range("2024-02-01", periods=days * 96, freq="15min", tz=pytz.UTC, name="time")
+    idx = idx[idx.dayofweek != 5]  # 土曜は欠ける
+    close = np.cumsum(rng.normal(0, 0.01, len(idx))) + 1.1
+    return pd.DataFrame(
+        {
+            "open": close + rng.normal(0, 0.001, len(idx)),
+            "high": close + 0.002,
+            "low": close - 0.002,
+            "close": close,
+            "volume": rng.integers(1, 100, len(idx)).astype(float),
+        },
+        index=idx,
+    )
+
+
+@pytest.fixture
+def store(tmp_path: Path, monkeypatch) -> tuple[Path, pd.DataFrame]:
+    df = _m15()
+    ParquetSinkAdapter().write(
+        df, tmp_path / "EURUSD" / "m15", "EURUSD", "m15", filename="ohlcv.parquet"
+    )
+    monkeypatch.setenv("VBT_PARQUET_ROOT", str(tmp_path))
+    monkeypatch.setenv("GDX_HOT_TIER", "0")
+    return tmp_path, df
+
+
+def _feed(root: Path, **kw) -> DerivedTimeframeDataFeed:
+    base = VbtProDataFeedAdapter(cache=OhlcvFrameCache(0))
+    return DerivedTimeframeDataFeed(base, root=root, cache=OhlcvFrameCache(1 << 26), **kw)
+
+
+def test_derives_unstored_timeframes(store):
+    root, df = store
+    feed = _feed(root)
+    assert feed.source_timeframe(["EURUSD"], "m15") == "m15"
+    assert feed.source_timeframe(["EURUSD"], "h2") == "m15"
+    assert feed.source_timeframe(["EURUSD"], "m20") is None
+    for tf, rule in (("m30", "30min"), ("h2", "2h"), ("d1", "1D")):
+        ref = df.resample(rule, label="left", closed="left").agg(AGG).dropna(subset=["close"])
+        got = feed.load(["EURUSD"], timeframe=tf).frame
+        pd.testing.assert_frame_equal(got, ref, check_freq=False, check_names=False)
+    # start が区間の途中ならその区間は返さず、end を含む区間は最後まで畳む
+    got = feed.load(["EURUSD"], "2024-02-05 01:30", "2024-02-06 03:00", timeframe="h2").frame
+    ref = df.loc["2024-02-05 02:00":"2024-02-06 03:59"].resample("2h").agg(AGG)
+    assert got.index[0] == pd.Timestamp("2024-02-05 02:00", tz=pytz.UTC)
+    pd.testing.assert_frame_equal(got, ref, check_freq=False, check_names=False)
+
+
+def test_broker_day_boundary_follows_dst(store):
+    root, df = store
+    feed = _feed(root, session_tz="America/New_York", day_start="17:00")
+    got = feed.load(["EURUSD"], timeframe="d1").frame
+    # 参照: NY 17:00 を 0 時に寄せた現地時刻で日ごとに畳む
+    local = df.index.tz_convert("America/New_York").tz_localize(None) - pd.Timedelta("17h")
+    ref = df.groupby(local.floor("D")).agg(AGG)
+    ref.index = (ref.index + pd.Timedelta("17h")).tz_localize("America/New_York").tz_convert("UTC")
+    pd.testing.assert_frame_equal(got, ref, check_freq=False, check_names=False)
+    # 3/10 の DST 切替の前後で UTC 上の境界が 22:00 → 21:00 に動く
+    assert pd.Timestamp("2024-03-08 22:00", tz=pytz.UTC) in got.index
+    assert pd.Timestamp("2024-03-11 21:00", tz=pytz.UTC) in got.index
+
+
+def test_derived_frames_are_cached(store):
+    root, _df = store
+    feed = _feed(root)
+    first = feed.load(["EURUSD"], timeframe="h4").frame
+    again = feed.load(["EURUSD"], timeframe="h4").frame
+    pd.testing.assert_frame_equal(again, first)
+    stats = feed._cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert not again["close"].to_numpy().flags.writeable
+
+
+def test_stored_timeframes_are_resolved_once(store, monkeypatch):
+    root, df = store
+    calls = []
+    real = derived_feed.discover_datasets
+    monkeypatch.setattr(derived_feed, "discover_datasets", lambda r: calls.append(r) or real(r))
+    feed = _feed(root)
+    for _ in range(3):
+        feed.load(["EURUSD"], timeframe="h1")
+        feed.load(["EURUSD"], timeframe="m15")
+    assert len(calls) == 1
+    # 元の足が更新されたら一覧を引き直す（後から保存した h1 はそのまま読む）
+    h1 = df.resample("1h").agg(AGG).dropna(subset=["close"])
+    sink = ParquetSinkAdapter()
+    sink.write(h1, root / "EURUSD" / "h1", "EURUSD", "h1", filename="ohlcv.parquet")
+    sink.write(df.iloc[:-96], root / "EURUSD" / "m15", "EURUSD", "m15", filename="ohlcv.parquet")
+    assert feed.source_timeframe(["EURUSD"], "h1") == "m15"  # まだ覚えた一覧のまま
+    got = feed.load(["EURUSD"], timeframe="h1").frame
+    assert len(calls) == 2
+    assert feed.source_timeframe(["EURUSD"], "h1") == "h1"
+    pd.testing.assert_frame_equal(got, h1, check_freq=False, check_names=False)
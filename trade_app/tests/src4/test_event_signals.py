@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.adapters.vbtpro.backtest_adapter import VbtProBacktestAdapter
+from trade_app.apps.research.policies.entry_gate import CombinedEntryGate
+from trade_app.apps.research.policies.position_limiter import (
+    limit_positions,
+    limit_positions_events,
+)
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+from trade_app.domain.dto.plan_models import Clause, Plan
+from trade_app.domain.dto.signals import EventSignalsDTO
+from trade_app.domain.services.decider import decide
+from trade_app.domain.services.plan_compiler import decide_events
+from trade_app.domain.services.signal_events import time_exit_events
+
+N = 2000
+
+
+def _frame() -> pd.DataFrame:
+    rng = np.random.default_rng(21)
+    idx = pd.date_range("2024-01-01", periods=N, freq="15min", tz=pytz.UTC)
+    close = np.cumsum(rng.normal(0, 1, N))
+    return pd.DataFrame(
+        {"open": close, "high": close + 1, "low": close - 1, "close": close, "rsi": rng.random(N)},
+        index=idx,
+    )
+
+
+def _events(seed: int, rate: float = 0.05) -> EventSignalsDTO:
+    rng = np.random.default_rng(seed)
+    idx = _frame().index
+    return EventSignalsDTO(
+        index=idx,
+        entries=np.flatnonzero(rng.random(N) < rate),
+        short_entries=[],
+        exits=np.flatnonzero(rng.random(N) < rate),
+    )
+
+
+def test_decide_events_matches_dense_decide():
+    features = _frame()
+    plans = [
+        Plan(entries=[Clause(op="gt", left="rsi", right=0.98)]),
+        Plan(
+            entries=[Clause(op="cross_over", left="close", right="open", pre_shift=0)],
+            exits=[Clause(op="between", left="rsi", right=[0.1, 0.12], pre_shift=3)],
+        ),
+    ]
+    for plan in plans:
+        got = decide_events(features, plan)
+        exp = decide(features, plan)
+        for name in ("entries", "short_entries", "exits"):
+            assert getattr(got, name).dtype == np.int32
+            np.testing.assert_array_equal(got.mask(name), getattr(exp, name).to_numpy())
+    # 拡張 dtype は dense decide 経由でも同じ
+    ext = features.astype("Float64")
+    np.testing.assert_array_equal(
+        decide_events(ext, plans[0]).entries, decide_events(features, plans[0]).entries
+    )
+    assert EventSignalsDTO.from_dense(decide(features, plans[0])).nbytes < N // 10
+
+
+def test_positions_must_be_sorted_and_in_range():
+    idx = _frame().index
+    with pytest.raises(ValueError):
+        EventSignalsDTO(index=idx, entries=[3, 1], short_entries=[], exits=[])
+    with pytest.raises(ValueError):
+        EventSignalsDTO(index=idx, entries=[N], short_entries=[], exits=[])
+
+
+@pytest.mark.parametrize("exit_first", [True, False])
+@pytest.mark.parametrize("cap", [1, 3])
+def test_event_gate_matches_dense_gate(cap, exit_first):
+    ev = _events(seed=cap)
+    dense = limit_positions(
+        pd.Series(ev.mask("entries"), ev.index),
+        pd.Series(ev.mask("exits"), ev.index),
+        max_positions=cap,
+        exit_first=exit_first,
+    )
+    got = limit_positions_events(ev.entries, ev.exits, max_positions=cap, exit_first=exit_first)
+    np.testing.assert_array_equal(got, np.flatnonzero(dense.to_numpy()))
+
+
+def test_gate_events_and_time_exit_match_dense():
+    ev = _events(seed=5, rate=0.2)
+    features = pd.DataFrame({"session_active": np.arange(N) % 3 != 0}, index=ev.index)
+    gate = CombinedEntryGate(default_max_positions=1)
+    got = gate.gate_events(events=ev, features=features)
+    exp = gate.gate(
+        entries=pd.Series(ev.mask("entries"), ev.index),
+        exits=pd.Series(ev.mask("exits"), ev.index),
+        features=features,
+    )
+    np.testing.assert_array_equal(got.mask("entries"), exp.to_numpy())
+    timed = time_exit_events(got, 7)
+    entries = pd.Series(got.mask("entries"), ev.index)
+    expected_exits = pd.Series(got.mask("exits"), ev.index) | entries.shift(7, fill_value=False)
+    np.testing.assert_array_equal(timed.mask("exits"), expected_exits.to_numpy())
+
+
+def test_run_from_events_densifies_once_with_time_exit():
+    seen = {}
+
+    def _fake_from_signals(price, *, entries, exits, params):
+        seen.update(entries=entries, exits=exits, params=params)
+        return object()
+
+    frame = _frame()
+    ev = _events(seed=9)
+    bt = VbtProBacktestAdapter(from_signals_fn=_fake_from_signals, ohlc_builder_fn=lambda df: df)
+    bt.run_from_events(OhlcvFrameDTO(frame=frame, freq=None), ev, {"max_bars_hold": 4, "fees": 0})
+    np.testing.assert_array_equal(seen["entries"].to_numpy(), ev.mask("entries"))
+    np.testing.assert_array_equal(seen["exits"].to_numpy(), time_exit_events(ev, 4).mask("exits"))
+    assert seen["params"] == {"fees": 0}
@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+import pytest
 import pytz
 
 from trade_app.apps.features.pipeline.feature_bundler import bundle_features
@@ -13,3 +15,42 @@ def test_bundler_drops_head_nans():
     fb = bundle_features(ohlcv, {"feat": s}, nan_policy="drop_head")
     assert fb.features.index[0] == idx[2]
     assert not fb.features.isna().any().any()
+
+
+def _feats(n: int = 3000) -> tuple[OhlcvFrameDTO, dict[str, pd.Series]]:
+    idx = pd.date_range("2024-01-01", periods=n, freq="min", tz=pytz.UTC)
+    ohlcv = OhlcvFrameDTO(
+        frame=pd.DataFrame({"open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0}, index=idx)
+    )
+    rng = np.random.default_rng(5)
+    feats = {}
+    for name, warm in (("a", 0), ("b", 13), ("c", 700)):
+        values = rng.normal(size=n)
+        values[:warm] = np.nan
+        feats[name] = pd.Series(values, index=idx)
+    # 別 Index（部分区間）の列は reindex して揃える
+    feats["d"] = pd.Series(rng.normal(size=n - 5), index=idx[5:])
+    return ohlcv, feats
+
+
+@pytest.mark.parametrize("warmup", [None, {"b": 13, "c": 700}, {"b": 3, "c": 9999}])
+def test_fast_path_matches_label_based_trim(warmup):
+    ohlcv, feats = _feats()
+    got = bundle_features(ohlcv, feats, warmup=warmup).features
+    ref = pd.DataFrame({k: s.reindex(ohlcv.frame.index) for k, s in feats.items()})
+    ref = ref.loc[ref.apply(pd.Series.first_valid_index).max() :]
+    pd.testing.assert_frame_equal(got, ref, check_exact=True)
+    # 1 つの連続ブロック（列ごとの Block に分かれない）
+    assert got._mgr.nblocks == 1
+
+
+def test_fast_path_rejects_tail_and_all_nan_columns():
+    ohlcv, feats = _feats()
+    feats["a"] = feats["a"].copy()
+    feats["a"].iloc[2000] = np.nan
+    with pytest.raises(ValueError):
+        bundle_features(ohlcv, feats)
+    _, feats = _feats()
+    feats["e"] = pd.Series(np.nan, index=ohlcv.frame.index)
+    with pytest.raises(ValueError):
+        bundle_features(ohlcv, feats)
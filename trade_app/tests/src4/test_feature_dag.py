@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.apps.features.feature_calc import DefaultFeatureCalculator, build_registry
+from trade_app.apps.features.feature_dag import DAG_BUILDERS, PrimitiveGraph
+from trade_app.apps.features.feature_memo import FeatureMemo
+from trade_app.apps.features.indicators.compiled import HAS_NUMBA
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+
+HLC = ["high", "low", "close"]
+SPEC = {
+    "atr_14": {"kind": "atr", "on": HLC, "params": {"length": 14}},
+    "kc": {"kind": "keltner", "on": HLC, "params": {"ema_len": 12, "atr_len": 14, "mult": 1.5}},
+    "ema_12": {"kind": "ema", "on": "close", "params": {"length": 12}},
+    "ema_26": {"kind": "ema", "on": "close", "params": {"length": 26}},
+    "macd": {"kind": "macd", "on": "close", "params": {"fast": 12, "slow": 26, "signal": 9}},
+    "bb": {"kind": "bb", "on": "close", "params": {"window": 20, "mult": 2.0}},
+    "bbe": {"kind": "bb", "on": "close", "params": {"window": 20, "mult": 2.0, "use_ema": True}},
+    "z_20": {"kind": "zscore", "on": "close", "params": {"window": 20}},
+    "sma_20": {"kind": "sma", "on": "close", "params": {"length": 20}},
+    "dc": {"kind": "donchian", "on": ["high", "low"], "params": {"window": 14}},
+    "st": {"kind": "stoch", "on": HLC, "params": {"k": 14, "d": 3, "smooth": 2}},
+    "rsi_14": {"kind": "rsi", "on": "close", "params": {"length": 14}},
+}
+BACKENDS = [
+    "pandas",
+    pytest.param("numba", marks=pytest.mark.skipif(not HAS_NUMBA, reason="numba")),
+]
+
+
+def _dto(n: int = 2000) -> OhlcvFrameDTO:
+    rng = np.random.default_rng(11)
+    idx = pd.date_range("2024-01-01", periods=n, freq="min", tz=pytz.UTC)
+    close = np.round(np.cumsum(rng.normal(0, 0.05, n)) + 150.0, 3)
+    df = pd.DataFrame(
+        {
+            "open": close,
+            "high": close + np.round(rng.random(n) * 0.1, 3),
+            "low": close - np.round(rng.random(n) * 0.1, 3),
+            "close": close,
+            "volume": 1.0,
+        },
+        index=idx,
+    )
+    return OhlcvFrameDTO(frame=df, freq="min")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_dag_is_bit_identical_to_per_indicator_calls(backend, monkeypatch):
+    dto = _dto()
+    calc = DefaultFeatureCalculator(build_registry(backend), memo=FeatureMemo(0))
+    got = calc.compute(dto, SPEC).features
+    monkeypatch.setenv("GDX_FEATURE_DAG", "0")
+    ref = calc.compute(dto, SPEC).features
+    pd.testing.assert_frame_equal(got, ref, check_exact=True)
+
+
+def test_shared_primitives_are_evaluated_once():
+    g = PrimitiveGraph(_dto().frame)
+    DAG_BUILDERS["atr"](g, *HLC, length=14)
+    DAG_BUILDERS["keltner"](g, *HLC, ema_len=12, atr_len=14)
+    DAG_BUILDERS["macd"](g, "close", fast=12, slow=26)
+    DAG_BUILDERS["bb"](g, "close", window=20)
+    DAG_BUILDERS["zscore"](g, "close", window=20)
+    # tr, mean(tr,14), ema12, ema26, macd line, ema(line,9), mean20, std20
+    assert g.evaluated == 8
+    # keltner の TR/ATR、macd の ema12、zscore の mean/std は共有ノード
+    assert g.reused == 5
+    with pytest.raises(TypeError):
+        DAG_BUILDERS["sma"](g, "close", window=5)
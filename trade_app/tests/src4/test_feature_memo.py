@@ -0,0 +1,104 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from trade_app.adapters.shm.shared_frames import SharedFramePublisher
+from trade_app.adapters.shm.shm_data_feed import SharedMemoryDataFeed
+from trade_app.adapters.vbtpro.frame_cache import freeze_frame
+from trade_app.apps.features.feature_calc import DefaultFeatureCalculator
+from trade_app.apps.features.feature_memo import FeatureMemo, shared_feature_memo
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+
+SPEC = {
+    "rsi": {"kind": "rsi", "on": "close", "params": {"length": 14}},
+    "sma": {"kind": "sma", "on": "close", "params": {"length": 20}},
+    "bb": {"kind": "bb", "on": "close", "params": {"window": 20, "mult": 2}},
+}
+
+
+def _frame(n: int = 200) -> pd.DataFrame:
+    idx = pd.date_range("2024-01-01", periods=n, freq="h", tz=pytz.UTC)
+    close = pd.Series(np.sin(np.arange(n) / 7.0) + 100.0, index=idx)
+    return pd.DataFrame(
+        {"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 1.0}
+    )
+
+
+def _counting(calls: list[str]):
+    def sma(s, length):
+        calls.append("sma")
+        return s.rolling(int(length)).mean()
+
+    return sma
+
+
+def test_memo_matches_uncached_and_counts_hits():
+    dto = OhlcvFrameDTO(frame=_frame(), freq="h")
+    plain = DefaultFeatureCalculator(memo=FeatureMemo(0)).compute(dto, SPEC)
+    calc = DefaultFeatureCalculator(memo=FeatureMemo(64 * 1024 * 1024))
+    first = calc.compute(dto, SPEC)
+    # 閾値だけ変わる試行を想定: 同じ spec で再計算 → 束ね結果ごとヒット
+    second = calc.compute(OhlcvFrameDTO(frame=_frame(), freq="h"), SPEC)
+    pd.testing.assert_frame_equal(plain.features, first.features)
+    pd.testing.assert_frame_equal(first.features, second.features)
+    stats = calc.memo_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 4  # bundle + 3 インジ
+
+
+def test_memo_reuses_unchanged_indicators_only():
+    calls: list[str] = []
+    reg = {"sma": _counting(calls)}
+    calc = DefaultFeatureCalculator(registry=reg, memo=FeatureMemo(64 * 1024 * 1024))
+    dto = OhlcvFrameDTO(frame=freeze_frame(_frame()), freq="h")
+    calc.compute(dto, {"a": {"kind": "sma", "params": {"length": 5}}})
+    calc.compute(
+        dto,
+        {
+            "a": {"kind": "sma", "params": {"length": 5}},
+            "b": {"kind": "sma", "params": {"length": 9}},
+        },
+    )
+    assert calls == ["sma", "sma"]
+    # 型が違う params（5 と 5.0）は別キー
+    calc.compute(dto, {"a": {"kind": "sma", "params": {"length": 5.0}}})
+    assert len(calls) == 3
+
+
+def test_memo_misses_when_data_changes():
+    calls: list[str] = []
+    calc = DefaultFeatureCalculator(
+        registry={"sma": _counting(calls)}, memo=FeatureMemo(64 * 1024 * 1024)
+    )
+    spec = {"a": {"kind": "sma", "params": {"length": 5}}}
+    df = _frame()
+    a = calc.compute(OhlcvFrameDTO(frame=df, freq="h"), spec)
+    df.loc[df.index[-1], "close"] = 0.0  # 書き込み可能な列は内容で識別される
+    b = calc.compute(OhlcvFrameDTO(frame=df, freq="h"), spec)
+    assert calls == ["sma", "sma"]
+    assert a.features["a"].iloc[-1] != b.features["a"].iloc[-1]
+
+
+def test_calculator_pickles_without_memo_contents():
+    calc = DefaultFeatureCalculator()
+    assert pickle.loads(pickle.dumps(calc)).memo is shared_feature_memo()
+    own = DefaultFeatureCalculator(memo=FeatureMemo(1024))
+    own.compute(OhlcvFrameDTO(frame=_frame(), freq="h"), SPEC)
+    restored = pickle.loads(pickle.dumps(own))
+    assert restored.memo_stats()["entries"] == 0
+
+
+def test_memo_hits_across_shared_memory_loads():
+    # 共有メモリの feed は load ごとに index を作り直す（列は同じ領域のビュー）
+    with SharedFramePublisher() as pub:
+        handles = {("X", "h1"): pub.publish_frame(("X", "h1"), _frame())}
+        feed = SharedMemoryDataFeed(handles)
+        calc = DefaultFeatureCalculator(memo=FeatureMemo(64 * 1024 * 1024))
+        first = calc.compute(feed.load(["X"], timeframe="h1"), SPEC).features
+        second = calc.compute(feed.load(["X"], timeframe="h1"), SPEC).features
+        pd.testing.assert_frame_equal(first, second)
+        stats = calc.memo_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 4)
+        del first, second
+        feed.close()
@@ -0,0 +1,102 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from trade_app.adapters.parquet.feature_store import ArrowFeatureStore
+from trade_app.apps.features import feature_memo
+from trade_app.apps.features.feature_calc import PANDAS_REGISTRY, DefaultFeatureCalculator
+from trade_app.apps.features.feature_memo import FeatureMemo, code_version
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+
+SPEC = {
+    "rsi": {"kind": "rsi", "on": "close", "params": {"length": 14}},
+    "bb": {"kind": "bb", "on": "close", "params": {"window": 20, "mult": 2.0}},
+}
+
+
+def _ohlcv(n: int = 500, seed: int = 0) -> OhlcvFrameDTO:
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2024-01-01", periods=n, freq="h", tz=pytz.UTC)
+    close = np.cumsum(rng.normal(0, 0.2, n)) + 100.0
+    frame = pd.DataFrame(
+        {"open": close, "high": close + 0.1, "low": close - 0.1, "close": close}, index=idx
+    )
+    return OhlcvFrameDTO(frame=frame, freq="h")
+
+
+def _counting_registry(calls: list[str]) -> dict:
+    def wrap(kind):
+        fn = PANDAS_REGISTRY[kind]
+
+        def counted(*args, **kw):
+            calls.append(kind)
+            return fn(*args, **kw)
+
+        return counted
+
+    return {k: wrap(k) for k in ("rsi", "bb")}
+
+
+def test_store_hit_skips_compute_across_calculators(tmp_path, monkeypatch):
+    monkeypatch.setenv("GDX_FEATURE_DAG", "0")
+    store = ArrowFeatureStore(tmp_path, max_bytes=1 << 30)
+    calls: list[str] = []
+    reg = _counting_registry(calls)
+    ohlcv = _ohlcv()
+    first = DefaultFeatureCalculator(reg, memo=FeatureMemo(0), store=store).compute(ohlcv, SPEC)
+    assert sorted(calls) == ["bb", "rsi"]
+    assert store.stats()["files"] == 2
+    # 新しい計算器（= 別プロセス相当、メモは空）でもストアから読む
+    again = DefaultFeatureCalculator(reg, memo=FeatureMemo(0), store=store).compute(ohlcv, SPEC)
+    assert len(calls) == 2
+    pd.testing.assert_frame_equal(again.features, first.features)
+    # データが変われば別キー
+    DefaultFeatureCalculator(reg, memo=FeatureMemo(0), store=store).compute(_ohlcv(seed=1), SPEC)
+    assert len(calls) == 4
+
+
+def test_roundtrip_and_gc(tmp_path):
+    store = ArrowFeatureStore(tmp_path, max_bytes=1 << 30)
+    idx = pd.date_range("2024-01-01", periods=100, freq="h", tz=pytz.UTC)
+    s = pd.Series(np.arange(100.0), index=idx, name="rsi_14")
+    flags = pd.Series(np.arange(100) % 2 == 0, index=idx, name="session_active")
+    store.put("aa01", s)
+    store.put("bb02", {"upper": s + 1, "lower": s - 1})
+    store.put("cc03", flags)
+    pd.testing.assert_series_equal(store.get("aa01", idx), s)
+    pd.testing.assert_series_equal(store.get("cc03", idx), flags)
+    got = store.get("bb02", idx)
+    pd.testing.assert_series_equal(got["lower"], (s - 1).rename("lower"))
+    # 長さ違い（壊れた/別 index）は使わない
+    assert store.get("aa01", idx[:50]) is None
+    assert store.get("ffff", idx) is None
+
+    # 最終使用の古いものから消える
+    for i, key in enumerate(("bb02", "aa01", "cc03")):
+        os.utime(store.path(key), (1000 + i, 1000 + i))
+    keep = store.path("cc03").stat().st_size
+    out = store.gc(max_bytes=keep)
+    assert out["removed"] == 2 and out["files"] == 1
+    assert store.get("cc03", idx) is not None and store.get("aa01", idx) is None
+
+
+def test_code_version_tracks_evaluation_engine(monkeypatch):
+    fn = PANDAS_REGISTRY["rsi"]
+    before = code_version(fn)
+    assert before is not None
+    # feature_dag / compiled を編集したらストアの旧出力は引かない
+    real = feature_memo._module_source
+    monkeypatch.setattr(
+        feature_memo,
+        "_module_source",
+        lambda name: real(name) + b"#" if name.endswith("feature_dag") else real(name),
+    )
+    feature_memo.engine_version.cache_clear()
+    code_version.cache_clear()
+    try:
+        assert code_version(fn) != before
+    finally:
+        feature_memo.engine_version.cache_clear()
+        code_version.cache_clear()
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytz
+
+from trade_app.apps.features.feature_calc import PANDAS_REGISTRY, DefaultFeatureCalculator
+from trade_app.apps.features.feature_memo import FeatureMemo
+from trade_app.apps.features.indicators.htf import closed_positions
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+from trade_app.utils.resample import resample_ohlcv
+
+
+def _frame(n: int = 24 * 40) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    idx = pd.date_range("2024-01-01", periods=n, freq="h", tz=pytz.UTC)
+    idx = idx[idx.dayofweek < 5]  # 週末の欠け
+    idx = idx.delete([5, 6, 40])  # 区間内・区間末の欠け
+    close = np.cumsum(rng.normal(0, 0.2, len(idx))) + 100.0
+    return pd.DataFrame(
+        {
+            "open": close + rng.normal(0, 0.05, len(idx)),
+            "high": close + rng.random(len(idx)),
+            "low": close - rng.random(len(idx)),
+            "close": close,
+            "volume": rng.random(len(idx)) + 1.0,
+        },
+        index=idx,
+    )
+
+
+def _htf(length: int = 10, tf: str = "h4", kind: str = "ema") -> dict:
+    return {
+        "kind": "htf",
+        "on": "close",
+        "params": {"tf": tf, "kind": kind, "params": {"length": length}},
+    }
+
+
+def test_resample_matches_pandas():
+    frame = _frame()
+    agg = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    for tf, rule in (("h4", "4h"), ("d1", "1D")):
+        ref = frame.resample(rule, label="left", closed="left").agg(agg).dropna(subset=["close"])
+        got = resample_ohlcv(frame, tf)
+        pd.testing.assert_frame_equal(got, ref, check_freq=False)
+
+
+def test_microsecond_index_matches_ns():
+    # Parquet 読込で µs 単位になった Index でも ns と同じ足・同じ揃え方になること
+    frame = _frame()
+    us = frame.copy()
+    us.index = us.index.as_unit("us")
+    for tf in ("h4", "d1"):
+        got = resample_ohlcv(us, tf)
+        pd.testing.assert_frame_equal(got, resample_ohlcv(frame, tf), check_freq=False)
+    np.testing.assert_array_equal(
+        closed_positions(resample_ohlcv(us, "h4").index.as_unit("us"), us.index, "h4"),
+        closed_positions(resample_ohlcv(frame, "h4").index, frame.index, "h4"),
+    )
+    spec = {"h4": _htf()}
+    calc = DefaultFeatureCalculator(memo=FeatureMemo(0))
+    exp = calc.compute(OhlcvFrameDTO(frame=frame, freq="h"), spec).features["h4"]
+    got = calc.compute(OhlcvFrameDTO(frame=us, freq="h"), spec).features["h4"]
+    np.testing.assert_array_equal(got.to_numpy(), exp.to_numpy())
+
+
+def test_no_lookahead_and_closed_bar_shift():
+    frame = _frame()
+    calc = DefaultFeatureCalculator(memo=FeatureMemo(0))
+    spec = {"h4": _htf(), "d1": {**_htf(5, "d1"), "on": "high"}}
+    full = calc.compute(OhlcvFrameDTO(frame=frame, freq="h"), spec).features
+    # 途中で切ったデータで計算しても、それまでの値は変わらない（未来の足を見ていない）
+    for cut in (150, 151, 152, 153, 400, 555):
+        part = calc.compute(OhlcvFrameDTO(frame=frame.iloc[:cut], freq="h"), spec).features
+        common = part.index.intersection(full.index)
+        pd.testing.assert_frame_equal(part.loc[common], full.loc[common])
+    # h4 区間の最後の足（03:00）で、その区間の値が使える（02:00 ではまだ前の区間）
+    up = resample_ohlcv(frame[["close"]], "h4")
+    ema = PANDAS_REGISTRY["ema"](up["close"], length=10)
+    t = pd.Timestamp("2024-01-10 00:00", tz=pytz.UTC)
+    assert full.loc[t + pd.Timedelta("3h"), "h4"] == ema.loc[t]
+    assert full.loc[t + pd.Timedelta("2h"), "h4"] == ema.loc[t - pd.Timedelta("4h")]
+
+
+def test_resample_and_htf_outputs_cached_across_trials(monkeypatch):
+    monkeypatch.setenv("GDX_FEATURE_DAG", "0")
+    calls: list[int] = []
+
+    def counted(s, **kw):
+        calls.append(kw["length"])
+        return PANDAS_REGISTRY["ema"](s, **kw)
+
+    reg = {**PANDAS_REGISTRY, "ema": counted}
+    calc = DefaultFeatureCalculator(reg, memo=FeatureMemo(1 << 26))
+    ohlcv = OhlcvFrameDTO(frame=_frame(), freq="h")
+    calc.compute(ohlcv, {"a": _htf(10), "b": _htf(20)})
+    assert sorted(calls) == [10, 20]
+    before = calc.memo_stats()["hits"]
+    # 別の試行（組み合わせ違い）: 畳み込みも上位足の ema も再計算しない
+    calc.compute(ohlcv, {"b": _htf(20), "rsi": {"kind": "rsi", "params": {"length": 14}}})
+    calc.compute(ohlcv, {"c": _htf(10), "d": _htf(30)})
+    assert sorted(calls) == [10, 20, 30]
+    assert calc.memo_stats()["hits"] > before
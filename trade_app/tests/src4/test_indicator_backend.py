@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.apps.features import feature_calc
+from trade_app.apps.features.feature_calc import PANDAS_REGISTRY, build_registry
+from trade_app.apps.features.indicators import compiled
+from trade_app.apps.features.indicators.compiled import COMPILED_REGISTRY, HAS_NUMBA
+
+# (kind, 入力列, params)
+CASES = [
+    ("rsi", ("close",), {"length": 14}),
+    ("ema", ("close",), {"length": 20}),
+    ("sma", ("close",), {"length": 20}),
+    ("sma", ("close",), {"length": 1}),
+    ("macd", ("close",), {"fast": 12, "slow": 26, "signal": 9}),
+    ("atr", ("high", "low", "close"), {"length": 14}),
+    ("keltner", ("high", "low", "close"), {"ema_len": 20, "atr_len": 10, "mult": 1.5}),
+    ("donchian", ("high", "low"), {"window": 20}),
+    ("stoch", ("high", "low", "close"), {"k": 14, "d": 3, "smooth": 2}),
+]
+
+
+def _ohlc(n: int = 3000) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    idx = pd.date_range("2024-01-01", periods=n, freq="min", tz=pytz.UTC)
+    # 2 桁丸めで一定値の連続（pandas の丸め補正経路）も作る
+    close = np.round(np.cumsum(rng.normal(0, 1, n)) + 100.0, 2)
+    close[:3] = np.nan
+    close[rng.integers(3, n, 10)] = np.nan
+    return pd.DataFrame(
+        {
+            "high": close + np.round(rng.random(n), 2),
+            "low": close - np.round(rng.random(n), 2),
+            "close": close,
+        },
+        index=idx,
+    )
+
+
+def _as_dict(out) -> dict[str, pd.Series]:
+    return out if isinstance(out, dict) else {"": out}
+
+
+@pytest.mark.skipif(not HAS_NUMBA, reason="numba not installed")
+@pytest.mark.parametrize(("kind", "cols", "params"), CASES)
+def test_compiled_is_bit_compatible_with_pandas(kind, cols, params):
+    df = _ohlc()
+    ref = _as_dict(PANDAS_REGISTRY[kind](*(df[c] for c in cols), **params))
+    got = _as_dict(COMPILED_REGISTRY[kind](*(df[c] for c in cols), **params))
+    assert ref.keys() == got.keys()
+    for k, r in ref.items():
+        g = got[k]
+        assert g.name == r.name
+        assert g.index.equals(r.index)
+        # ウォームアップの NaN 位置も値もビット単位で一致
+        np.testing.assert_array_equal(g.to_numpy(float), r.to_numpy(float))
+
+
+def test_registry_backend_selection(monkeypatch):
+    pandas_reg = build_registry("pandas")
+    assert pandas_reg["rsi"] is PANDAS_REGISTRY["rsi"]
+    if HAS_NUMBA:
+        assert build_registry("numba")["rsi"] is compiled.rsi
+        # コンパイル版の無い kind は pandas 版のまま
+        assert build_registry("numba")["bb"] is PANDAS_REGISTRY["bb"]
+    monkeypatch.setenv("GDX_INDICATOR_BACKEND", "pandas")
+    assert feature_calc.indicator_backend() == "pandas"
+    monkeypatch.setenv("GDX_INDICATOR_BACKEND", "numba")
+    monkeypatch.setattr(feature_calc, "HAS_NUMBA", False)
+    with pytest.warns(RuntimeWarning):
+        assert feature_calc.indicator_backend() == "pandas"
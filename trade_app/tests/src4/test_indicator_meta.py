@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.apps.features.feature_calc import (
+    PANDAS_REGISTRY,
+    DefaultFeatureCalculator,
+    resolve_inputs,
+)
+from trade_app.apps.features.feature_memo import FeatureMemo
+from trade_app.apps.features.indicators.meta import INDICATOR_META
+from trade_app.apps.features.pipeline.loader import load_ohlcv_with_lookback
+from trade_app.apps.features.pipeline.plan_builder import DefaultPlanBuilder
+from trade_app.apps.features.pipeline.run_pipeline_full import run_pipeline_full
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+
+N_BARS = 3000
+CASES = [
+    ("rsi", {"length": 14}),
+    ("sma", {"length": 30}),
+    ("ema", {"length": 20}),
+    ("identity", {}),
+    ("atr", {"length": 14}),
+    ("roc", {"window": 12}),
+    ("zscore", {"window": 25}),
+    ("vwap", {"window": 30}),
+    ("bb", {"window": 20, "mult": 2.0}),
+    ("bb", {"window": 20, "mult": 2.0, "use_ema": True}),
+    ("macd", {"fast": 12, "slow": 26, "signal": 9}),
+    ("stoch", {"k": 14, "d": 3, "smooth": 3}),
+    ("donchian", {"window": 20}),
+    ("keltner", {"ema_len": 20, "atr_len": 10, "mult": 1.5}),
+]
+
+
+def _frame(n: int = N_BARS) -> pd.DataFrame:
+    rng = np.random.default_rng(2)
+    idx = pd.date_range("2024-01-01", periods=n, freq="h", tz=pytz.UTC)
+    close = np.cumsum(rng.normal(0, 0.2, n)) + 100.0
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + rng.random(n),
+            "low": close - rng.random(n),
+            "close": close,
+            "volume": rng.random(n) + 1.0,
+        },
+        index=idx,
+    )
+
+
+def _run(kind: str, frame: pd.DataFrame, params: dict) -> pd.DataFrame:
+    out = PANDAS_REGISTRY[kind](*(frame[c] for c in resolve_inputs(kind, "close")), **params)
+    return pd.DataFrame(out) if isinstance(out, dict) else out.to_frame()
+
+
+@pytest.mark.parametrize(("kind", "params"), CASES)
+def test_declared_warmup_and_lookback(kind, params):
+    meta = INDICATOR_META[kind]
+    frame = _frame()
+    full = _run(kind, frame, params)
+    assert list(full.columns) == (list(meta.outputs) or [full.columns[0]])
+    assert max(full[c].first_valid_index() for c in full) == frame.index[meta.warmup(params)]
+    # start 前に lookback 本だけ読んだ計算が、全履歴の計算と start 以降で一致
+    bars = meta.lookback(params)
+    start = N_BARS - 500
+    part = _run(kind, frame.iloc[start - bars :], params).iloc[bars:]
+    np.testing.assert_allclose(part.to_numpy(), full.iloc[start:].to_numpy(), rtol=1e-8)
+
+
+class CountingFeed:
+    def __init__(self) -> None:
+        self.frame = _frame()
+        self.calls: list = []
+
+    def load(self, symbols, start=None, end=None, columns=(), timeframe=None, tz="UTC"):
+        self.calls.append(start)
+        df = self.frame if start is None else self.frame.loc[pd.Timestamp(start) :]
+        return OhlcvFrameDTO(frame=df, freq="h")
+
+
+def test_lookback_loader_reads_exact_history():
+    feed = CountingFeed()
+    start = feed.frame.index[2000]
+    got = load_ohlcv_with_lookback(feed, ["X"], start=start, bars=300, timeframe="h1")
+    assert got.frame.index[0] == feed.frame.index[1700]
+    assert len(feed.calls) == 1
+    # 手前に足りない履歴しか無ければ、ある分だけで止まる
+    got = load_ohlcv_with_lookback(
+        feed, ["X"], start=feed.frame.index[10], bars=300, timeframe="h1"
+    )
+    assert got.frame.index[0] == feed.frame.index[0]
+
+
+def test_pipeline_warmup_lookback_starts_at_start():
+    feed = CountingFeed()
+    kwargs = {
+        "feed": feed,
+        "calc": DefaultFeatureCalculator(memo=FeatureMemo(0)),
+        "planner": DefaultPlanBuilder(),
+        "feature_spec": {"sma": {"kind": "sma", "on": "close", "params": {"length": 50}}},
+        "plan_spec": {"entries": [{"op": "gt", "left": "sma", "right": 0}]},
+        "symbols": ["X"],
+        "start": feed.frame.index[2000],
+        "timeframe": "h1",
+    }
+    plain = run_pipeline_full(**kwargs, warmup_lookback=False)
+    warm = run_pipeline_full(**kwargs, warmup_lookback=True)
+    assert plain.features.index[0] == feed.frame.index[2049]
+    assert warm.features.index[0] == warm.ohlcv.frame.index[0] == feed.frame.index[2000]
+    pd.testing.assert_frame_equal(warm.features.loc[plain.features.index], plain.features)
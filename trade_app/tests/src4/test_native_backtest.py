@@ -0,0 +1,163 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.adapters.native.backtest_adapter import NativeBacktestAdapter, backtester_from_env
+from trade_app.adapters.native.stops import atr_rel, resolve_stops
+from trade_app.apps.research.metrics.enricher import enrich_result
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+
+
+def _ohlcv(opens, highs=None, lows=None, closes=None) -> OhlcvFrameDTO:
+    o = np.asarray(opens, dtype=float)
+    idx = pd.date_range("2024-01-01", periods=len(o), freq="h", tz=pytz.UTC)
+    frame = pd.DataFrame(
+        {
+            "open": o,
+            "high": o + 1 if highs is None else highs,
+            "low": o - 1 if lows is None else lows,
+            "close": o if closes is None else closes,
+        },
+        index=idx,
+    )
+    return OhlcvFrameDTO(frame=frame, freq=None)
+
+
+def _sig(ohlcv: OhlcvFrameDTO, *bars: int) -> pd.Series:
+    s = pd.Series(False, index=ohlcv.frame.index)
+    s.iloc[list(bars)] = True
+    return s
+
+
+def _run(ohlcv, entries, exits, **params):
+    return NativeBacktestAdapter().run_from_signals(ohlcv, entries, exits, params)
+
+
+def test_fills_at_open_with_fees_and_slippage():
+    ohlcv = _ohlcv([10, 11, 12, 13, 14])
+    res = _run(ohlcv, _sig(ohlcv, 1), _sig(ohlcv, 3), init_cash=100.0, fees=0.01, slippage=0.001)
+    buy = 11 * 1.001
+    units = 100.0 / (buy * 1.01)
+    sell = 13 * 0.999
+    cash = units * sell * 0.99
+    rec = res["trade_records"].iloc[0]
+    assert res["trades"] == 1
+    assert (rec["entry_idx"], rec["exit_idx"], rec["reason"]) == (1, 3, "signal")
+    assert rec["entry_price"] == pytest.approx(buy)
+    assert rec["pnl"] == pytest.approx(cash - 100.0)
+    eq = res["equity_curve"]
+    assert eq.iloc[0] == pytest.approx(100.0)
+    assert eq.iloc[2] == pytest.approx(units * 12)  # 保有中は終値評価
+    assert eq.iloc[-1] == pytest.approx(cash)
+    assert res["total_return"] == pytest.approx(cash / 100.0 - 1.0)
+    assert "max_drawdown" in enrich_result(res)["metrics"]
+
+
+def test_stop_loss_take_profit_gap_and_trailing():
+    ohlcv = _ohlcv([100, 100, 99, 99], lows=[99, 99, 94, 98])
+    rec = _run(ohlcv, _sig(ohlcv, 1), _sig(ohlcv), sl_pct=0.05)["trade_records"].iloc[0]
+    assert (rec["exit_idx"], rec["reason"], rec["exit_price"]) == (2, "sl", pytest.approx(95.0))
+    # 窓を空けて水準を越えたら Open で約定
+    ohlcv = _ohlcv([100, 100, 90, 90])
+    rec = _run(ohlcv, _sig(ohlcv, 1), _sig(ohlcv), sl_pct=0.05)["trade_records"].iloc[0]
+    assert (rec["exit_idx"], rec["exit_price"]) == (2, pytest.approx(90.0))
+    # rr で tp = 2 × sl
+    ohlcv = _ohlcv([100, 100, 105, 105], highs=[101, 101, 111, 106])
+    rec = _run(ohlcv, _sig(ohlcv, 1), _sig(ohlcv), sl_pct=0.05, rr=2.0)["trade_records"].iloc[0]
+    assert (rec["reason"], rec["exit_price"]) == ("tp", pytest.approx(110.0))
+    # トレーリング: 高値 110 から 5%
+    ohlcv = _ohlcv([100, 100, 108, 106], highs=[101, 101, 110, 107], lows=[99, 99, 107, 104])
+    rec = _run(ohlcv, _sig(ohlcv, 1), _sig(ohlcv), sl_pct=0.05, sl_trail=True)
+    rec = rec["trade_records"].iloc[0]
+    assert (rec["exit_idx"], rec["reason"], rec["exit_price"]) == (
+        3,
+        "trail",
+        pytest.approx(104.5),
+    )
+
+
+def test_time_exit_accumulate_and_conflicts():
+    ohlcv = _ohlcv([10, 11, 12, 13, 14, 15])
+    rec = _run(ohlcv, _sig(ohlcv, 1), _sig(ohlcv), max_bars_hold=2)["trade_records"].iloc[0]
+    assert (rec["exit_idx"], rec["reason"]) == (3, "time")
+    res = _run(
+        ohlcv,
+        _sig(ohlcv, 1, 2, 3),
+        _sig(ohlcv, 5),
+        size=1.0,
+        accumulate=True,
+        max_entries=2,
+    )
+    # accumulate では exit も size ぶん減らすだけ（残りは未決済）
+    recs = res["trade_records"]
+    rec = recs.iloc[0]
+    assert (rec["n_entries"], rec["size"], rec["entry_price"]) == (2, 1.0, pytest.approx(11.5))
+    assert rec["pnl"] == pytest.approx(15 - 11.5)
+    assert recs["status"].tolist() == ["closed", "open"]
+    # 同じバーの entry と exit は無視
+    res = _run(ohlcv, _sig(ohlcv, 1), _sig(ohlcv, 1))
+    assert res["trade_records"].empty
+    # 未決済は open として残る
+    res = _run(ohlcv, _sig(ohlcv, 4), _sig(ohlcv))
+    assert (res["trades"], res["trade_records"]["status"].tolist()) == (0, ["open"])
+
+
+def test_short_entries_and_reversal():
+    ohlcv = _ohlcv([100, 100, 95, 90, 92])
+    res = NativeBacktestAdapter().run_from_signals(
+        ohlcv,
+        _sig(ohlcv, 2),
+        _sig(ohlcv, 4),
+        {"init_cash": 1000.0, "size": 1.0},
+        short_entries=_sig(ohlcv, 1),
+    )
+    recs = res["trade_records"]
+    # 1: ショート 100 → 2: ロング entry でドテン（95 で買い戻し）→ 4: exit
+    assert recs["direction"].tolist() == [-1, 1]
+    assert recs["pnl"].tolist() == pytest.approx([5.0, -3.0])
+    assert res["equity_curve"].iloc[-1] == pytest.approx(1002.0)
+
+
+def test_stop_resolution_matches_bindings_rules(monkeypatch):
+    ohlcv = _ohlcv(np.linspace(100, 110, 50))
+    frame = ohlcv.frame
+    sl, tp = resolve_stops({"sl_atr_mult": 1.5, "tp_atr_mult": 3.0, "atr_window": 5}, frame)
+    rel = atr_rel(frame, 5).to_numpy()
+    np.testing.assert_allclose(sl, rel * 1.5)
+    np.testing.assert_allclose(tp, rel * 3.0)
+    sl, tp = resolve_stops({"sl_pct": 0.01, "rr": 2.0, "tp_atr_mult": 3.0}, frame)
+    assert (sl[0], tp[0]) == (0.01, 0.02)
+    monkeypatch.setenv("GDX_BACKTEST_ENGINE", "native")
+    assert isinstance(backtester_from_env(), NativeBacktestAdapter)
+
+
+_FIXTURE = Path(__file__).parent / "fixtures" / "native_vs_vbt.npz"
+
+
+def _fixture_cases() -> list[str]:
+    with np.load(_FIXTURE) as z:
+        return list(json.loads(str(z["cases"])))
+
+
+@pytest.mark.parametrize("name", _fixture_cases())
+def test_matches_recorded_vectorbt_values(name):
+    # tools/record_native_fixtures.py が vectorbt で記録した評価額と照合（vectorbt 不要）
+    with np.load(_FIXTURE) as z:
+        case = json.loads(str(z["cases"]))[name]
+        ohlcv = _ohlcv(z["open"], z["high"], z["low"], z["close"])
+        index = ohlcv.frame.index
+        sig = {k: pd.Series(z[k], index=index) for k in ("entries", "exits")}
+        shorts = {
+            k: pd.Series(z[k] & case["short"], index=index)
+            for k in ("short_entries", "short_exits")
+        }
+        expected = z[f"value_{name}"]
+    params = {"init_cash": 100.0, **case["params"]}
+    res = NativeBacktestAdapter().run_from_signals(
+        ohlcv, sig["entries"], sig["exits"], params, **shorts
+    )
+    np.testing.assert_allclose(res["equity_curve"].to_numpy(), expected, rtol=1e-9)
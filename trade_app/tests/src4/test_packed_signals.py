@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.adapters.vbtpro.backtest_adapter import VbtProBacktestAdapter
+from trade_app.apps.research.policies.entry_gate import CombinedEntryGate
+from trade_app.apps.research.policies.position_limiter import (
+    limit_positions_matrix,
+    limit_positions_packed,
+)
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+from trade_app.domain.dto.packed_signals import PackedBits, PackedSignalsDTO
+from trade_app.domain.dto.signals import SignalMatrixDTO
+
+N, K = 500, 21  # K は 8 の倍数でない（余りビットの扱いを見る）
+
+
+def _mats(seed: int = 1) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return rng.random((N, K)) < 0.3, rng.random((N, K)) < 0.2
+
+
+def test_pack_roundtrip_and_operators():
+    a, b = _mats()
+    pa, pb = PackedBits.pack(a), PackedBits.pack(b)
+    assert pa.nbytes == N * 3
+    np.testing.assert_array_equal(pa.unpack(), a)
+    np.testing.assert_array_equal((pa & pb).unpack(), a & b)
+    np.testing.assert_array_equal((pa | pb).unpack(), a | b)
+    np.testing.assert_array_equal((pa ^ pb).unpack(), a ^ b)
+    np.testing.assert_array_equal((~pa).unpack(), ~a)
+    assert (~pa).count().sum() == (~a).sum()  # 余りビットは立たない
+    np.testing.assert_array_equal(pa.count(), a.sum(axis=0))
+    row = np.arange(N) % 3 == 0
+    np.testing.assert_array_equal((pa & row).unpack(), a & row[:, None])
+    np.testing.assert_array_equal(pa.column(13), a[:, 13])
+    np.testing.assert_array_equal(pa.columns(5, 19), a[:, 5:19])
+    with pytest.raises(ValueError):
+        _ = pa & PackedBits.pack(a[:, :3])
+
+
+@pytest.mark.parametrize("k", [0, 1, 3, -2, N, -N - 1])
+def test_shift_matches_series_shift(k):
+    a, _b = _mats(2)
+    got = PackedBits.pack(a).shift(k).unpack()
+    exp = pd.DataFrame(a).shift(k, fill_value=False).to_numpy(dtype=bool)
+    np.testing.assert_array_equal(got, exp)
+
+
+def test_packed_gate_matches_bool_matrix():
+    a, b = _mats(3)
+    idx = pd.date_range("2024-01-01", periods=N, freq="15min", tz=pytz.UTC)
+    for exit_first in (True, False):
+        got = limit_positions_packed(
+            PackedBits.pack(a), PackedBits.pack(b), max_positions=2, exit_first=exit_first
+        )
+        exp = limit_positions_matrix(a, b, max_positions=2, exit_first=exit_first)
+        np.testing.assert_array_equal(got.unpack(), exp)
+    features = pd.DataFrame({"session_active": np.arange(N) % 4 != 0}, index=idx)
+    gate = CombinedEntryGate()
+    got = gate.gate_packed(entries=PackedBits.pack(a), exits=PackedBits.pack(b), features=features)
+    exp = gate.gate_many(entries=a, exits=b, features=features)
+    np.testing.assert_array_equal(got.unpack(), exp)
+
+
+def test_packed_dto_and_backtest_chunks():
+    a, b = _mats(4)
+    idx = pd.date_range("2024-01-01", periods=N, freq="15min", tz=pytz.UTC)
+    mat = SignalMatrixDTO(index=idx, entries=a, short_entries=np.zeros_like(a), exits=b)
+    packed = PackedSignalsDTO.from_matrix(mat)
+    np.testing.assert_array_equal(packed.to_matrix().entries, a)
+    np.testing.assert_array_equal(packed.column(7).exits.to_numpy(), b[:, 7])
+
+    seen = []
+
+    def _fake_from_signals(price, *, entries, exits, params):
+        seen.append((entries, exits))
+        return object()
+
+    frame = pd.DataFrame({c: np.ones(N) for c in ("open", "high", "low", "close")}, index=idx)
+    bt = VbtProBacktestAdapter(from_signals_fn=_fake_from_signals, ohlc_builder_fn=lambda df: df)
+    out = bt.run_from_packed(OhlcvFrameDTO(frame=frame, freq=None), packed, chunk=8)
+    assert len(out) == 3
+    assert [e.shape[1] for e, _x in seen] == [8, 8, 5]
+    np.testing.assert_array_equal(pd.concat([e for e, _x in seen], axis=1).to_numpy(), a)
+    np.testing.assert_array_equal(pd.concat([x for _e, x in seen], axis=1).to_numpy(), b)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.domain.dto.plan_models import Clause, Plan
+from trade_app.domain.services.decider import decide
+from trade_app.domain.services.plan_compiler import compile_plan, decide_compiled
+
+COLS = ["a", "b", "c", "flag", "n"]
+OPS = ["gt", "ge", "lt", "le", "eq", "between", "cross_over", "cross_under"]
+
+
+def _features(n: int = 300, *, uniform: bool = False) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    idx = pd.date_range("2024-01-01", periods=n, freq="h", tz=pytz.UTC)
+    a = rng.normal(0, 1, n).round(1)
+    a[rng.random(n) < 0.1] = np.nan
+    df = pd.DataFrame(
+        {
+            "a": a,
+            "b": rng.normal(0, 1, n).round(1),
+            "c": np.cumsum(rng.normal(0, 0.3, n)).round(1),
+            "flag": rng.random(n) < 0.5,
+            "n": rng.integers(-2, 3, n),
+        },
+        index=idx,
+    )
+    return df.astype(float) if uniform else df
+
+
+def _clause(rng: np.random.Generator) -> Clause:
+    op = str(rng.choice(OPS))
+    left = str(rng.choice(COLS))
+    shift = int(rng.choice([0, 1, 1, 2, -1, 400]))
+    if op == "between":
+        lo = float(rng.choice([-1.0, -0.5, 0.0]))
+        return Clause(op=op, left=left, right=[lo, lo + 1.0], pre_shift=shift)
+    right = str(rng.choice(COLS)) if rng.random() < 0.5 else float(rng.choice([-1, 0, 0.5, 1]))
+    return Clause(op=op, left=left, right=right, pre_shift=shift)
+
+
+def _assert_same(got, exp) -> None:
+    for name in ("entries", "short_entries", "exits"):
+        pd.testing.assert_series_equal(getattr(got, name), getattr(exp, name))
+
+
+@pytest.mark.parametrize("uniform", [False, True])
+def test_bit_identical_to_decide(uniform):
+    rng = np.random.default_rng(11)
+    features = _features(uniform=uniform)
+    for _ in range(200):
+        plan = Plan(
+            entries=[_clause(rng) for _ in range(int(rng.integers(0, 4)))],
+            short_entries=[_clause(rng) for _ in range(int(rng.integers(0, 3)))],
+            exits=[_clause(rng) for _ in range(int(rng.integers(0, 3)))],
+        )
+        _assert_same(decide_compiled(features, plan), decide(features, plan))
+
+
+def test_compiled_plan_is_cached_and_falls_back():
+    plan = Plan(entries=[Clause(op="cross_over", left="a", right="c")])
+    assert compile_plan(plan) is compile_plan(plan.model_copy(update={"meta": {"x": 1}}))
+    assert compile_plan(plan).columns == ("a", "c")
+    # 列名が足りなければ decide と同じ例外
+    with pytest.raises(KeyError):
+        decide_compiled(_features().drop(columns="c"), plan)
+    # 拡張 dtype の列は pandas 版に委ねる
+    features = _features()
+    features["a"] = features["a"].fillna(0.0).astype("Float64")
+    features["c"] = features["c"].astype("Float64")
+    _assert_same(decide_compiled(features, plan), decide(features, plan))
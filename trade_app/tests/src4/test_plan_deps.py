@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytz
+
+from trade_app.apps.features.feature_calc import DefaultFeatureCalculator
+from trade_app.apps.features.feature_memo import FeatureMemo
+from trade_app.apps.features.pipeline.plan_builder import DefaultPlanBuilder
+from trade_app.apps.features.pipeline.plan_deps import plan_feature_refs, resolve_feature_deps
+from trade_app.apps.features.pipeline.run_pipeline_full import run_pipeline_full
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+
+FEATURE_SPEC = {
+    "rsi_14": {"kind": "rsi", "on": "close", "params": {"length": 14}},
+    "bb": {"kind": "bb", "on": "close", "params": {"window": 20, "mult": 2.0}},
+    "bb_50": {"kind": "bb", "on": "close", "params": {"window": 50, "mult": 2.0}},
+    "sma_200": {"kind": "sma", "on": "close", "params": {"length": 200}},
+}
+PLAN_SPEC = {
+    "entries": [
+        {"op": "cross_over", "left": "close_id", "right": "bb_middle"},
+        {"op": "between", "left": "rsi_14", "right": [30, 70]},
+    ],
+    "exits": [{"op": "lt", "left": "rsi_14", "right": 70}],
+}
+
+
+class FakeFeed:
+    def load(self, symbols, start=None, end=None, columns=(), timeframe=None, tz="UTC"):
+        idx = pd.date_range("2024-01-01", periods=400, freq="h", tz=pytz.UTC)
+        close = np.cumsum(np.random.default_rng(1).normal(0, 1, 400)) + 100.0
+        df = pd.DataFrame({c: close for c in ("open", "high", "low", "close")}, index=idx)
+        df["volume"] = 1.0
+        return OhlcvFrameDTO(frame=df, freq="h")
+
+
+def test_resolver_keeps_only_referenced_specs_and_keys():
+    plan = DefaultPlanBuilder().build(PLAN_SPEC)
+    assert plan_feature_refs(plan) == {"close_id", "bb_middle", "rsi_14"}
+    deps = resolve_feature_deps(FEATURE_SPEC, plan)
+    assert list(deps.spec) == ["rsi_14", "bb"]
+    assert deps.outputs == {"bb": frozenset({"middle"})}
+    assert deps.unused == ("bb_50", "sma_200")
+    assert deps.notes() == "unused=bb_50,sma_200"
+
+
+def test_compute_bundles_only_selected_outputs():
+    dto = FakeFeed().load(["X"])
+    calc = DefaultFeatureCalculator(memo=FeatureMemo(16 * 1024 * 1024))
+    spec = {"bb": FEATURE_SPEC["bb"]}
+    full = calc.compute(dto, spec).features
+    got = calc.compute(dto, spec, outputs={"bb": ["middle"]}).features
+    assert list(full.columns) == ["bb_upper", "bb_middle", "bb_lower"]
+    assert list(got.columns) == ["bb_middle"]
+    # 絞り込みは束ねキーに入る（全出力の束ねを返さない）
+    pd.testing.assert_series_equal(got["bb_middle"], full["bb_middle"])
+
+
+def test_pipeline_skips_unused_specs(monkeypatch):
+    kwargs = {
+        "feed": FakeFeed(),
+        "calc": DefaultFeatureCalculator(memo=FeatureMemo(0)),
+        "planner": DefaultPlanBuilder(),
+        "feature_spec": {**FEATURE_SPEC, "close_id": {"kind": "identity", "on": "close"}},
+        "plan_spec": PLAN_SPEC,
+        "symbols": ["X"],
+    }
+    lazy = run_pipeline_full(**kwargs).features
+    assert set(lazy.columns) == {"rsi_14", "bb_middle", "close_id"}
+    monkeypatch.setenv("GDX_LAZY_FEATURES", "0")
+    eager = run_pipeline_full(**kwargs).features
+    assert "sma_200" in eager.columns
+    # 未使用の長期インジ（sma_200）の分も先頭を削る（バックテストの開始バーが eager と同じ）
+    pd.testing.assert_frame_equal(lazy, eager[lazy.columns])
+    assert eager.index[0] == FakeFeed().load(["X"]).frame.index[199]
+    # 宣言の無い kind（htf）を含む spec は全 spec を計算する
+    monkeypatch.setenv("GDX_LAZY_FEATURES", "1")
+    htf = {"kind": "htf", "params": {"tf": "h4", "kind": "sma", "params": {"length": 3}}}
+    wide = run_pipeline_full(**{**kwargs, "feature_spec": {**kwargs["feature_spec"], "h": htf}})
+    assert "sma_200" in wide.features.columns
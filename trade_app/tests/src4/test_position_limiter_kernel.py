@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.apps.research.policies.entry_gate import CombinedEntryGate
+from trade_app.apps.research.policies.position_limiter import (
+    limit_positions,
+    limit_positions_matrix,
+)
+
+
+def _reference(entries: pd.Series, exits: pd.Series, cap: int, exit_first: bool) -> list[bool]:
+    # 旧実装（.loc で1バーずつ）
+    entries = entries.fillna(False).astype(bool)
+    exits = exits.fillna(False).astype(bool)
+    open_pos, gated = 0, []
+    for t in entries.index:
+        e_out, e_in = bool(exits.loc[t]), bool(entries.loc[t])
+        if exit_first and e_out and open_pos > 0:
+            open_pos -= 1
+        allow = e_in and open_pos < cap
+        open_pos += int(allow)
+        if not exit_first and e_out and open_pos > 0:
+            open_pos -= 1
+        gated.append(allow)
+    return gated
+
+
+def _signals(n: int, k: int, seed: int) -> tuple[pd.DatetimeIndex, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2024-01-01", periods=n, freq="15min", tz=pytz.UTC)
+    return idx, rng.random((n, k)) < 0.3, rng.random((n, k)) < 0.2
+
+
+@pytest.mark.parametrize("exit_first", [True, False])
+@pytest.mark.parametrize("cap", [1, 2, 3])
+def test_matches_reference_loop(cap, exit_first):
+    idx, ent, ex = _signals(400, 1, seed=cap)
+    entries = pd.Series(ent[:, 0], index=idx).astype(object)
+    entries.iloc[::17] = np.nan
+    exits = pd.Series(ex[:, 0], index=idx)
+    got = limit_positions(entries, exits, max_positions=cap, exit_first=exit_first)
+    assert got.dtype == bool
+    assert got.tolist() == _reference(entries, exits, cap, exit_first)
+
+
+def test_matrix_columns_are_independent():
+    idx, ent, ex = _signals(300, 8, seed=4)
+    got = limit_positions_matrix(ent, ex, max_positions=2, exit_first=False)
+    shared = limit_positions_matrix(ent, ex[:, 0], max_positions=2)
+    for k in range(8):
+        exp = _reference(pd.Series(ent[:, k], idx), pd.Series(ex[:, k], idx), 2, False)
+        assert got[:, k].tolist() == exp
+        exp = _reference(pd.Series(ent[:, k], idx), pd.Series(ex[:, 0], idx), 2, True)
+        assert shared[:, k].tolist() == exp
+    assert not limit_positions_matrix(ent, ex, max_positions=0).any()
+
+
+def test_gate_many_matches_gate_per_column():
+    idx, ent, ex = _signals(300, 5, seed=8)
+    features = pd.DataFrame({"session_active": np.arange(300) % 4 != 0}, index=idx)
+    gate = CombinedEntryGate(default_max_positions=1)
+    got = gate.gate_many(entries=ent, exits=ex, features=features)
+    for k in range(5):
+        exp = gate.gate(
+            entries=pd.Series(ent[:, k], idx), exits=pd.Series(ex[:, k], idx), features=features
+        )
+        np.testing.assert_array_equal(got[:, k], exp.to_numpy())
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.adapters.native.backtest_adapter import NativeBacktestAdapter
+from trade_app.adapters.native.stops import atr_rel
+from trade_app.adapters.vbtpro.backtest_adapter import VbtProBacktestAdapter
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+from trade_app.domain.ports.backtest import BatchBacktestPort
+
+N, K = 300, 6
+
+
+def _ohlcv(seed: int = 5) -> OhlcvFrameDTO:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, N))
+    o = close + rng.normal(0, 0.1, N)
+    idx = pd.date_range("2024-01-01", periods=N, freq="h", tz=pytz.UTC)
+    frame = pd.DataFrame(
+        {
+            "open": o,
+            "high": np.maximum(o, close) + 0.3,
+            "low": np.minimum(o, close) - 0.3,
+            "close": close,
+        },
+        index=idx,
+    )
+    return OhlcvFrameDTO(frame=frame, freq=None)
+
+
+COLUMN_PARAMS = [
+    {},
+    {"sl_pct": 0.01, "rr": 2.0},
+    {"sl_atr_mult": 1.5, "tp_atr_mult": 3.0},
+    {"sl_atr_mult": 2.0, "atr_window": 7, "sl_trail": True},
+    {"fees": 0.001, "max_bars_hold": 5},
+    {"size": 1.0, "accumulate": True, "max_entries": 2, "tp_pct": 0.02},
+]
+
+
+def test_native_run_many_matches_single_runs():
+    ohlcv = _ohlcv()
+    rng = np.random.default_rng(9)
+    entries = rng.random((N, K)) < 0.05
+    exits = rng.random(N) < 0.05  # 全列共通
+    base = {"init_cash": 1000.0, "slippage": 0.0002}
+    bt: BatchBacktestPort = NativeBacktestAdapter()
+    res = bt.run_many(ohlcv, entries, exits, base, column_params=COLUMN_PARAMS)
+    assert res["equity"].shape == (N, K)
+    idx = ohlcv.frame.index
+    for k, cp in enumerate(COLUMN_PARAMS):
+        one = NativeBacktestAdapter().run_from_signals(
+            ohlcv, pd.Series(entries[:, k], idx), pd.Series(exits, idx), {**base, **cp}
+        )
+        np.testing.assert_allclose(res["equity"][:, k], one["equity_curve"].to_numpy())
+        assert res["total_return"][k] == pytest.approx(one["total_return"])
+        assert res["trades"][k] == one["trades"]
+    with pytest.raises(ValueError):
+        bt.run_many(ohlcv, entries, exits, column_params=COLUMN_PARAMS[:2])
+    with pytest.raises(ValueError):
+        bt.run_many(ohlcv, entries[:-1], exits)
+
+
+def test_vbt_run_many_broadcasts_columns_and_stops():
+    ohlcv = _ohlcv()
+    frame = ohlcv.frame
+    entries = np.zeros((N, 3), dtype=bool)
+    seen = {}
+
+    class _Pf:
+        init_cash = 100.0
+
+        def value(self):
+            return pd.DataFrame(np.full((N, 3), 110.0), index=frame.index)
+
+    def _fake_from_signals(price, *, entries, exits, params):
+        seen.update(entries=entries, exits=exits, params=params)
+        return _Pf()
+
+    bt = VbtProBacktestAdapter(from_signals_fn=_fake_from_signals, ohlc_builder_fn=lambda df: df)
+    cps = [{"sl_pct": 0.01}, {"sl_pct": None, "sl_atr_mult": 2.0}, {"sl_pct": 0.02}]
+    res = bt.run_many(
+        ohlcv, entries, np.zeros(N, dtype=bool), {"sl_pct": 0.5, "tp_pct": 0.03}, column_params=cps
+    )
+    assert seen["entries"].shape == seen["exits"].shape == (N, 3)
+    p = seen["params"]
+    assert "sl_pct" not in p and p["tp_stop"] == 0.03
+    sl = p["sl_stop"]
+    np.testing.assert_allclose(sl[0], 0.01)
+    np.testing.assert_allclose(sl[1], atr_rel(frame, 14).to_numpy() * 2.0)
+    np.testing.assert_allclose(sl[2], 0.02)
+    assert res["equity"].shape == (N, 3)
+    np.testing.assert_allclose(res["total_return"], 0.1)
+
+
+def test_vbt_run_many_rejects_per_column_non_stop_keys():
+    ohlcv = _ohlcv()
+    seen = {}
+
+    class _Pf:
+        init_cash = 100.0
+
+        def value(self):
+            return pd.DataFrame(np.full((N, 2), 100.0), index=ohlcv.frame.index)
+
+    def _fake_from_signals(price, *, entries, exits, params):
+        seen.update(params=params)
+        return _Pf()
+
+    bt = VbtProBacktestAdapter(from_signals_fn=_fake_from_signals, ohlc_builder_fn=lambda df: df)
+    entries = np.zeros((N, 2), dtype=bool)
+    exits = np.zeros(N, dtype=bool)
+    # fees / max_bars_hold / size / accumulate 等は列方向に渡せないので黙って無視せず ValueError
+    for cps in (COLUMN_PARAMS[4:6], COLUMN_PARAMS[2:4], [{"fees": 0.001}, {}]):
+        with pytest.raises(ValueError, match="cannot broadcast"):
+            bt.run_many(ohlcv, entries, exits, {"fees": 0.0}, column_params=cps)
+    # 全列で同じ値なら params として渡す（atr_window は sl/tp の解決にだけ使う）
+    cps = [
+        {"fees": 0.001, "sl_atr_mult": 2.0, "atr_window": 7},
+        {"fees": 0.001, "sl_pct": 0.01},
+    ]
+    bt.run_many(ohlcv, entries, exits, {"fees": 0.0}, column_params=cps)
+    p = seen["params"]
+    assert p["fees"] == 0.001 and "atr_window" not in p
+    np.testing.assert_allclose(p["sl_stop"][0], atr_rel(ohlcv.frame, 7).to_numpy() * 2.0)
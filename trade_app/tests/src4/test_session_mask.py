@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.apps.features.indicators.session_mask import (
+    SessionMaskCache,
+    compute_mask,
+    local_seconds_of_day,
+)
+
+TZS = ["Europe/London", "America/New_York", "Asia/Tokyo", "Australia/Sydney", "UTC", "Etc/GMT+3"]
+
+
+def _index() -> pd.DatetimeIndex:
+    # DST 切替を多数含む期間 + 1970 年以前、秒未満の端数も混ぜる
+    rng = np.random.default_rng(4)
+    ns = np.sort(rng.integers(-2 * 10**18, 2 * 10**18, 20000))
+    return pd.DatetimeIndex(ns, tz=pytz.UTC).append(
+        pd.date_range("2024-03-30", "2024-04-01", freq="15min", tz=pytz.UTC)
+    )
+
+
+@pytest.mark.parametrize("tz", TZS)
+def test_offset_table_matches_tz_convert(tz):
+    idx = _index()
+    local = idx.tz_convert(pytz.timezone(tz))
+    ref = local.hour * 3600 + local.minute * 60 + local.second
+    np.testing.assert_array_equal(local_seconds_of_day(idx, tz), np.asarray(ref))
+
+
+def test_cache_reuses_packed_masks():
+    idx = _index()
+    windows = [
+        {"type": "window", "start": "08:00", "end": "17:00", "tz": "Europe/London"},
+        {"type": "window", "start": "22:00", "end": "06:00", "tz": "Asia/Tokyo"},
+    ]
+    cache = SessionMaskCache(1 << 20)
+    first = cache.mask(idx, windows)
+    # 別オブジェクトでも同じ内容の Index はヒットする
+    again = cache.mask(pd.DatetimeIndex(idx.asi8.copy(), tz=pytz.UTC), windows)
+    np.testing.assert_array_equal(first, again)
+    np.testing.assert_array_equal(first, compute_mask(idx, windows))
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["bytes"] == (len(idx) + 7) // 8
+    # ウィンドウが違えば別キー
+    cache.mask(idx, windows[:1])
+    assert cache.stats()["misses"] == 2
+
+
+def test_microsecond_index_matches_ns():
+    # µs 単位の Index（Parquet 読込で起こる）でも ns と同じマスクになること
+    idx = pd.date_range("2024-03-25", "2024-04-05", freq="15min", tz=pytz.UTC)
+    idx_us = idx.as_unit("us")
+    windows = [{"type": "window", "start": "08:00", "end": "17:00", "tz": "Europe/London"}]
+    exp = compute_mask(idx, windows)
+    assert exp.any()
+    np.testing.assert_array_equal(
+        local_seconds_of_day(idx_us, "Europe/London"), local_seconds_of_day(idx, "Europe/London")
+    )
+    cache = SessionMaskCache(1 << 20)
+    np.testing.assert_array_equal(cache.mask(idx_us, windows), exp)
+    # 整数列が同じでも単位が違う Index は別キー（ns の 1970 年付近と取り違えない）
+    same_ticks = pd.DatetimeIndex(idx_us.asi8, tz=pytz.UTC)
+    np.testing.assert_array_equal(
+        cache.mask(same_ticks, windows), compute_mask(same_ticks, windows)
+    )
+    assert cache.stats()["misses"] == 2
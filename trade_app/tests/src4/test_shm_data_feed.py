@@ -0,0 +1,114 @@
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from trade_app.adapters.parquet.ohlcv_dataset import scan_bounds
+from trade_app.adapters.shm.shared_frames import SharedFramePublisher
+from trade_app.adapters.shm.shm_data_feed import SharedMemoryDataFeed
+from trade_app.domain.dto.ohlcv_frame import OhlcvFrameDTO
+
+
+def _frame(periods: int = 24 * 40) -> pd.DataFrame:
+    idx = pd.date_range("2024-01-01", periods=periods, freq="h", tz=pytz.UTC, name="time")
+    close = np.linspace(1.0, 2.0, periods)
+    return pd.DataFrame(
+        {"open": close, "high": close + 0.1, "low": close - 0.1, "close": close, "volume": 1.0},
+        index=idx,
+    )
+
+
+class FakeFeed:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str]] = []
+
+    def load(self, symbols, start=None, end=None, columns=(), timeframe=None, tz="UTC"):
+        sym = next(iter(symbols))
+        self.calls.append((sym, timeframe))
+        if sym == "MISSING":
+            raise FileNotFoundError(sym)
+        return OhlcvFrameDTO(frame=_frame()[list(columns)])
+
+
+def _worker_close_sum(handles, start, end) -> float:
+    feed = SharedMemoryDataFeed(handles)
+    df = feed.load(["EURUSD"], start=start, end=end, timeframe="h1").frame
+    return float(df["close"].sum())
+
+
+def test_shm_feed_returns_readonly_views_of_published_frames():
+    feed = FakeFeed()
+    with SharedFramePublisher() as pub:
+        handles = pub.publish_ohlcv(feed, ["EURUSD", "MISSING"], ["h1"])
+        assert list(handles) == [("EURUSD", "h1")]
+        shm_feed = SharedMemoryDataFeed(handles)
+
+        cols = ("open", "high", "low", "close")
+        got = shm_feed.load(["EURUSD"], "2024-01-10", "2024-01-12", cols, "h1").frame
+        exp = _frame().loc["2024-01-10":"2024-01-12", list(cols)]
+        pd.testing.assert_frame_equal(got, exp, check_freq=False)
+        assert not got["close"].to_numpy().flags.writeable
+        # 同じブロックを参照（2回目の load もコピーしない）
+        again = shm_feed.load(["EURUSD"], timeframe="h1").frame
+        assert np.shares_memory(got["close"].to_numpy(), again["close"].to_numpy())
+
+        with pytest.raises(FileNotFoundError):
+            shm_feed.load(["EURUSD"], timeframe="m15")
+        del got, again
+        shm_feed.close()
+
+
+def test_shm_feed_stores_microsecond_index_in_ns():
+    # Parquet 読込で µs 単位になった Index でも 1970 年にならず期間で切り出せること
+    df = _frame()
+    df.index = df.index.as_unit("us")
+    with SharedFramePublisher() as pub:
+        handles = {("EURUSD", "h1"): pub.publish_frame(("EURUSD", "h1"), df)}
+        shm_feed = SharedMemoryDataFeed(handles)
+        cols = ("open", "high", "low", "close")
+        got = shm_feed.load(["EURUSD"], "2024-01-10", "2024-01-12", cols, "h1").frame
+        exp = _frame().loc["2024-01-10":"2024-01-12", list(cols)]
+        pd.testing.assert_frame_equal(got, exp, check_freq=False)
+        del got
+        shm_feed.close()
+
+
+@pytest.mark.skipif("fork" not in mp.get_all_start_methods(), reason="fork 前提")
+def test_shm_feed_attaches_from_worker_processes():
+    with SharedFramePublisher() as pub:
+        handles = pub.publish_ohlcv(FakeFeed(), ["EURUSD"], ["h1"])
+        exp = float(_frame().loc["2024-01-05":"2024-01-20", "close"].sum())
+        ctx = mp.get_context("fork")
+        with ProcessPoolExecutor(max_workers=2, mp_context=ctx) as ex:
+            futs = [
+                ex.submit(_worker_close_sum, handles, "2024-01-05", "2024-01-20") for _ in range(2)
+            ]
+            assert [f.result() for f in futs] == [pytest.approx(exp)] * 2
+
+
+class SlicedFeed:
+    def load(self, symbols, start=None, end=None, columns=(), timeframe=None, tz="UTC"):
+        lo, hi = scan_bounds(start, end)
+        df = _frame()[list(columns)]
+        return OhlcvFrameDTO(frame=df.loc[(df.index >= lo) & (df.index <= hi)])
+
+
+def test_shm_feed_reads_outside_published_range_from_fallback():
+    disk = SlicedFeed()
+    with SharedFramePublisher() as pub:
+        window = ("2024-01-10", "2024-01-20")
+        handles = pub.publish_ohlcv(disk, ["EURUSD"], ["h1"], start=window[0], end=window[1])
+        cols = ("open", "high", "low", "close")
+        plain = SharedMemoryDataFeed(handles)
+        got = plain.load(["EURUSD"], "2024-01-08", "2024-01-22", cols, "h1").frame
+        assert got.index[0] == pd.Timestamp("2024-01-10", tz=pytz.UTC)
+        shm_feed = SharedMemoryDataFeed(handles, fallback=disk, published=window)
+        got = shm_feed.load(["EURUSD"], "2024-01-08 05:00", "2024-01-22", cols, "h1").frame
+        exp = _frame().loc["2024-01-08 05:00":"2024-01-22", list(cols)]
+        pd.testing.assert_frame_equal(got, exp, check_freq=False)
+        del got
+        plain.close()
+        shm_feed.close()
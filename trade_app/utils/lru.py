@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+V = TypeVar("V")
+
+
+class ByteBudgetLRU(Generic[V]):
+    """
+    バイト予算付きの LRU キャッシュ（スレッドセーフ）。
+    - sizeof(value) の合計が max_bytes を超えたら古いものから追い出す
+    - 単体で予算を超える値は保持しない（呼び手には値をそのまま返す）
+    - max_bytes <= 0 なら無効（常にミス）
+    """
+
+    __responsibility__ = "計算/読込結果の再利用（上限付き・LRU追い出し）"
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[V], int]) -> None:
+        self.max_bytes = int(max_bytes)
+        self._sizeof = sizeof
+        self._data: OrderedDict[Hashable, tuple[V, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: Hashable) -> V | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: Hashable, value: V) -> V:
+        if not self.enabled:
+            return value
+        size = int(self._sizeof(value))
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._data:
+                _k, (_v, sz) = self._data.popitem(last=False)
+                self._bytes -= sz
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # 別プロセスへは設定だけ渡す（中身とロックは送らない＝空のキャッシュとして復元）
+        return {"max_bytes": self.max_bytes, "sizeof": self._sizeof}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["max_bytes"], state["sizeof"])  # type: ignore[misc]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
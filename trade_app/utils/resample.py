@@ -0,0 +1,112 @@
+"""
+OHLCV の時間足の畳み込み（ベクトル化、左閉じ・左ラベル）。
+
+- 区間は UTC 基準（h4 は 00/04/08.. 時、d1 は 0 時、w1 は日曜 0 時始まり）。
+  tz と day_start を渡すとブローカーの日付境界に揃える（例 America/New_York の 17:00。
+  DST で UTC 上の境界が動き、切替を跨ぐ区間はその分だけ長く/短くなる）
+- open は最初、high は最大、low は最小、volume は合計、それ以外（close 等）は最後の値
+- 空の区間（週末等）は作らない。出力の列は読み取り専用
+- 入力 index の単位（µs 等）に関わらず計算と出力ラベルは ns
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from trade_app.utils.timeframes import timeframe_delta
+
+# 週足の起点（1970-01-04 は日曜。FX の週は日曜夜に始まる）
+_WEEK_ORIGIN = pd.Timestamp("1970-01-04").value
+_FIRST = ("open",)
+_MAX = ("high",)
+_MIN = ("low",)
+_SUM = ("volume", "tick_volume", "real_volume")
+
+
+def span_origin(tf: str) -> tuple[int, int]:
+    """(区間の長さ[ns], 区間の起点[ns])。解釈できない tf は ValueError"""
+    delta = timeframe_delta(tf)
+    if delta is None:
+        raise ValueError(f"invalid timeframe: {tf}")
+    origin = _WEEK_ORIGIN if str(tf).strip().lower().startswith("w") else 0
+    return int(delta.value), origin
+
+
+def floor_labels(ns: np.ndarray, span: int, origin: int) -> np.ndarray:
+    return (ns - origin) // span * span + origin
+
+
+def _local_shift(index: pd.DatetimeIndex, tz: str | None, day_start: str | None) -> np.ndarray:
+    """各時刻の (現地 - UTC) - day_start [ns]。足すと境界が 0 時に来る"""
+    utc = index.tz_localize("UTC") if index.tz is None else index
+    local = utc.tz_convert(tz or "UTC").tz_localize(None).asi8
+    h, m = (int(x) for x in str(day_start or "00:00").split(":"))
+    return local - utc.asi8 - (h * 3600 + m * 60) * 1_000_000_000
+
+
+def bin_starts(
+    index: pd.DatetimeIndex,
+    tf: str,
+    *,
+    tz: str | None = None,
+    day_start: str | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """(各区間の先頭行の位置, 各区間の開始時刻 UTC ns)。index は昇順"""
+    span, origin = span_origin(tf)
+    index = index.as_unit("ns")  # µs 等（Parquet 読込）も ns の区間長・起点と同じ単位にそろえる
+    ns = index.asi8
+    if not len(ns):
+        return np.array([], dtype=np.intp), np.array([], dtype=np.int64)
+    if tz is None and day_start is None:
+        local = floor_labels(ns, span, origin)
+        starts = np.flatnonzero(np.r_[True, local[1:] != local[:-1]])
+        return starts, local[starts]
+    shift = _local_shift(index, tz, day_start)
+    local = floor_labels(ns + shift, span, origin)
+    starts = np.flatnonzero(np.r_[True, local[1:] != local[:-1]])
+    # 区間の開始は先頭行の時点のオフセットで UTC へ戻す
+    return starts, local[starts] - shift[starts]
+
+
+def bin_start(
+    ts: pd.Timestamp, tf: str, *, tz: str | None = None, day_start: str | None = None
+) -> pd.Timestamp:
+    """ts を含む区間の開始時刻（UTC）"""
+    one = pd.DatetimeIndex([ts])
+    _pos, labels = bin_starts(one, tf, tz=tz, day_start=day_start)
+    return pd.Timestamp(int(labels[0]), tz="UTC")
+
+
+def resample_ohlcv(
+    frame: pd.DataFrame,
+    tf: str,
+    *,
+    tz: str | None = None,
+    day_start: str | None = None,
+) -> pd.DataFrame:
+    """frame（昇順の DatetimeIndex）を tf の足へ畳む"""
+    starts, labels = bin_starts(frame.index, tf, tz=tz, day_start=day_start)
+    ends = np.r_[starts[1:], len(frame)] - 1
+    cols: dict[str, np.ndarray] = {}
+    for name in frame.columns:
+        v = frame[name].to_numpy()
+        low = str(name).lower()
+        if not len(starts):
+            out = v[:0].copy()
+        elif low in _FIRST:
+            out = v[starts]
+        elif low in _MAX:
+            out = np.maximum.reduceat(v, starts)
+        elif low in _MIN:
+            out = np.minimum.reduceat(v, starts)
+        elif low in _SUM:
+            out = np.add.reduceat(v, starts)
+        else:
+            out = v[ends]
+        out.flags.writeable = False  # FeatureMemo/フレームキャッシュがアドレスで識別できるように
+        cols[name] = out
+    index = pd.DatetimeIndex(labels.view("M8[ns]"), name=frame.index.name)
+    if frame.index.tz is not None:
+        index = index.tz_localize("UTC").tz_convert(frame.index.tz)
+    return pd.DataFrame(cols, index=index, copy=False)
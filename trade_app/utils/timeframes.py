@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import re
+
+import pandas as pd
+
+# MT5 流の表記（m15/h1/h4/d1/w1）→ pandas の単位
+_UNITS = {"m": "min", "h": "h", "d": "D", "w": "W"}
+_TF_RE = re.compile(r"^([mhdw])(\d+)$")
+
+
+def timeframe_delta(timeframe: str | None) -> pd.Timedelta | None:
+    """1本の長さ（m15 → 15分）。解釈できない表記は None"""
+    m = _TF_RE.match(str(timeframe or "").strip().lower())
+    if m is None or int(m.group(2)) <= 0:
+        return None
+    return pd.Timedelta(int(m.group(2)), unit=_UNITS[m.group(1)])